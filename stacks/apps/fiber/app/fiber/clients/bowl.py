@@ -1,20 +1,126 @@
 from __future__ import annotations
 
+import fcntl
 import hashlib
 import json
 import os
 import shutil
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO
 
-from fiber.domain.models import BowlEntry
+from fiber.domain.dumps import merkle_root
+from fiber.domain.models import BowlEntry, FileDigest
 
 _PARTIAL = ".partial"
+_MANIFEST = ".manifest.json"
+_STAMP = "%Y%m%dT%H%M%S"
+_FICLONE = 0x40049409  # linux/fs.h: share a file's extents (btrfs, XFS)
+
+
+class BowlCatalog:
+    """In-memory index of every Bowl root's top-level entries, sizes and mtimes.
+
+    Shared by all BowlStorage instances (the dashboard's and each movement's), which
+    keep it current as they promote, delete and write receipts/samples. A root is
+    indexed from disk on first use, and BowlStorage.reconcile() re-walks known roots
+    in the background to pick up drift (manual deletes, crashed runs). Usage is a
+    running total per root, so reads never touch the filesystem; files hard-linked
+    between entries are reference-counted by inode and counted once.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._roots: dict[str, dict[str, dict[str, BowlEntry]]] = {}
+        self._used: dict[str, int] = {}
+        self._inodes: dict[str, Counter[tuple[int, int]]] = {}
+
+    def _add(self, root: str, entry: BowlEntry) -> None:
+        inodes = self._inodes.setdefault(root, Counter())
+        n = entry.size_bytes
+        for dev, ino, size in entry.links:
+            if inodes[(dev, ino)]:
+                n -= size
+            inodes[(dev, ino)] += 1
+        self._used[root] = self._used.get(root, 0) + n
+
+    def _remove(self, root: str, entry: BowlEntry) -> None:
+        inodes = self._inodes.setdefault(root, Counter())
+        n = entry.size_bytes
+        for dev, ino, size in entry.links:
+            inodes[(dev, ino)] -= 1
+            if inodes[(dev, ino)] > 0:
+                n -= size
+            else:
+                del inodes[(dev, ino)]
+        self._used[root] -= n
+
+    def indexed(self, root: str) -> bool:
+        with self._lock:
+            return root in self._roots
+
+    def roots(self) -> list[str]:
+        with self._lock:
+            return list(self._roots)
+
+    def replace(self, root: str, services: dict[str, dict[str, BowlEntry]]) -> None:
+        with self._lock:
+            self._roots[root] = services
+            self._used[root] = 0
+            self._inodes[root] = Counter()
+            for entries in services.values():
+                for e in entries.values():
+                    self._add(root, e)
+
+    def put(self, root: str, service: str, entry: BowlEntry) -> None:
+        """Add/refresh one entry; a no-op until the root has been indexed from disk."""
+        with self._lock:
+            services = self._roots.get(root)
+            if services is None:
+                return
+            entries = services.setdefault(service, {})
+            old = entries.get(Path(entry.path).name)
+            if old is not None:
+                self._remove(root, old)
+            self._add(root, entry)
+            entries[Path(entry.path).name] = entry
+
+    def discard(self, root: str, service: str, path: str) -> None:
+        self.discard_many(root, [(service, path)])
+
+    def discard_many(self, root: str, items: Iterable[tuple[str, str]]) -> None:
+        """Drop each (service, path) under one lock hold."""
+        with self._lock:
+            services = self._roots.get(root, {})
+            for service, path in items:
+                old = services.get(service, {}).pop(Path(path).name, None)
+                if old is not None:
+                    self._remove(root, old)
+
+    def entries(self, root: str, service: str) -> list[BowlEntry]:
+        with self._lock:
+            return list(self._roots.get(root, {}).get(service, {}).values())
+
+    def used(self, root: str) -> int:
+        with self._lock:
+            return self._used.get(root, 0)
 
 
 class BowlStorage:
-    def __init__(self, root: str) -> None:
+    # Root-level names that belong to the storage itself, not to any service.
+    _reserved: frozenset[str] = frozenset()
+
+    def __init__(self, root: str, hash_workers: int | None = None,
+                 catalog: BowlCatalog | None = None) -> None:
         self._root = Path(root)
+        self._key = str(self._root)
+        self._hash_workers = hash_workers or os.cpu_count() or 1
+        self._catalog = catalog if catalog is not None else BowlCatalog()
 
     def _dir(self, service: str) -> Path:
         d = self._root / service
@@ -22,29 +128,73 @@ class BowlStorage:
         return d
 
     def temp_path(self, service: str, timestamp: str, ext: str) -> str:
-        return str(self._dir(service) / f"{timestamp}.{ext}{_PARTIAL}")
+        temp = str(self._dir(service) / f"{timestamp}.{ext}{_PARTIAL}")
+        # Sized live by list_entries while the dump lands.
+        self._catalog.put(self._key, service, BowlEntry(
+            path=temp, size_bytes=0, modified_at=datetime.now(timezone.utc), is_temp=True))
+        return temp
+
+    def open_temp(self, temp_path: str) -> IO[bytes]:
+        """Where a streamed dump for temp_path is written; promote() takes it from there."""
+        return open(temp_path, "wb")
 
     def promote(self, temp_path: str) -> str:
         final = temp_path[: -len(_PARTIAL)]
         # Ensure the temp file exists (handle empty files)
         Path(temp_path).touch(exist_ok=True)
         os.replace(temp_path, final)
+        service = Path(final).parent.name
+        self._catalog.discard(self._key, service, temp_path)
+        self._track(service, Path(final))
         return final
 
+    def _track(self, service: str, p: Path) -> None:
+        self._catalog.put(self._key, service, self._entry(p))
+
+    def _entry(self, p: Path) -> BowlEntry:
+        size, links = _footprint(p)
+        return BowlEntry(
+            path=str(p),
+            size_bytes=size,
+            modified_at=_stamped_at(p),
+            is_temp=p.name.endswith(_PARTIAL),
+            links=links,
+        )
+
+    def _ensure_indexed(self) -> None:
+        if not self._catalog.indexed(self._key):
+            self._index(self._root)
+
+    def _index(self, root: Path) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        services: dict[str, dict[str, BowlEntry]] = {}
+        for child in root.iterdir():
+            if child.name in self._reserved:
+                continue
+            # Files directly under the root have no service; they still count as used.
+            service, items = (child.name, list(child.iterdir())) if child.is_dir() else ("", [child])
+            entries = services.setdefault(service, {})
+            for p in items:
+                try:
+                    e = self._entry(p)
+                    entries[Path(e.path).name] = e
+                except FileNotFoundError:
+                    continue  # deleted mid-walk; the next reconcile settles it
+        self._catalog.replace(str(root), services)
+
+    def reconcile(self) -> None:
+        """Re-walk this root and every other root in the shared catalog from disk."""
+        for root in {self._key, *self._catalog.roots()}:
+            self._index(Path(root))
+
     def has_room(self, required_bytes: int) -> bool:
         self._root.mkdir(parents=True, exist_ok=True)
         return shutil.disk_usage(self._root).free >= required_bytes
 
     def usage(self) -> tuple[int, int]:
-        """Return (used_bytes, free_bytes) for the bowl root."""
-        self._root.mkdir(parents=True, exist_ok=True)
-        used = sum(
-            f.stat().st_size
-            for f in self._root.rglob("*")
-            if f.is_file()
-        )
-        free = shutil.disk_usage(self._root).free
-        return used, free
+        """Return (used_bytes, free_bytes) for the bowl root, used from the catalog."""
+        self._ensure_indexed()
+        return self._catalog.used(self._key), shutil.disk_usage(self._root).free
 
     def size(self, path: str) -> int:
         p = Path(path)
@@ -53,41 +203,101 @@ class BowlStorage:
         return p.stat().st_size
 
     def checksum(self, path: str) -> str:
-        h = hashlib.sha256()
+        """sha256 of a file; for a directory dump, the Merkle root of its per-file digests."""
         p = Path(path)
         if p.is_dir():
-            for _, f in _walk_files(p):
-                with f.open("rb") as fh:
-                    for chunk in iter(lambda: fh.read(1 << 20), b""):
-                        h.update(chunk)
-        else:
-            with p.open("rb") as fh:
-                for chunk in iter(lambda: fh.read(1 << 20), b""):
-                    h.update(chunk)
-        return h.hexdigest()
+            return merkle_root(self.digest_files(path))
+        return _hash_file(p)[0]
+
+    def digest_files(self, path: str) -> list[FileDigest]:
+        """Per-file digests of a directory dump, sorted by relative path.
+
+        Files are hashed on a thread pool (hashlib releases the GIL on large updates),
+        so hashing a pg_dump -Fd / mydumper directory scales with cores.
+        """
+        files = _walk_files(Path(path))
+        with ThreadPoolExecutor(max_workers=self._hash_workers) as pool:
+            hashed = list(pool.map(lambda t: _hash_file(t[1]), files))
+        return [FileDigest(path=rel, sha256=sha, bytes=n) for (rel, _), (sha, n) in zip(files, hashed)]
 
     def list_entries(self, service: str) -> list[BowlEntry]:
+        """Catalogued entries for a service; only in-flight .partial dumps are sized live."""
+        self._ensure_indexed()
         entries: list[BowlEntry] = []
-        for p in self._dir(service).iterdir():
-            if p.name.endswith(".manifest.json"):
+        for e in self._catalog.entries(self._key, service):
+            if e.path.endswith(_MANIFEST):
                 continue
-            stat = p.stat()
-            entries.append(BowlEntry(
-                path=str(p),
-                size_bytes=self.size(str(p)),
-                modified_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-                is_temp=p.name.endswith(_PARTIAL),
-            ))
+            if e.is_temp:
+                try:
+                    e = replace(e, size_bytes=self.size(e.path))
+                except FileNotFoundError:
+                    e = replace(e, size_bytes=0)
+            entries.append(e)
         return entries
 
+    def files(self, path: str) -> list[tuple[str, str]]:
+        """(relative path, absolute path) of every file in a directory dump, sorted."""
+        return [(rel, str(p)) for rel, p in _walk_files(Path(path))]
+
+    def stream(self, path: str) -> Iterator[bytes]:
+        """The bytes of a single-file dump, in order, a chunk at a time."""
+        with Path(path).open("rb") as fh:
+            yield from iter(lambda: fh.read(1 << 20), b"")
+
+    def materialise(self, path: str, dest: str) -> str:
+        """Write a full copy of a single-file dump to dest (for restores and exports)."""
+        with open(dest, "wb") as out:
+            for chunk in self.stream(path):
+                out.write(chunk)
+        return dest
+
+    def link_previous(self, final: str, sha256: str, files: Sequence[FileDigest] = ()) -> int:
+        """Store an unchanged dump as links to the previous one; returns the bytes now shared.
+
+        The previous dump is the newest earlier one of the same kind (by its timestamped
+        name) that has a receipt. A single-file dump whose sha256 matches that receipt is
+        replaced by a hard link to it; a directory dump has each file linked whose digest
+        in ``files`` matches the receipt's. Where hard links fail (say, at the link limit)
+        a reflink is tried, which shares extents but not the inode, so usage() counts it
+        in full. Deleting either dump later only drops a name.
+        """
+        p = Path(final)
+        prev = self._previous(p)
+        if prev is None or not p.exists():
+            return 0
+        receipt = json.loads(Path(f"{prev}{_MANIFEST}").read_text())
+        if p.is_dir():
+            theirs = {f["path"]: f["sha256"] for f in receipt.get("files", [])}
+            pairs = [(prev / f.path, p / f.path) for f in files if theirs.get(f.path) == f.sha256]
+        else:
+            pairs = [(prev, p)] if receipt.get("sha256") == sha256 else []
+        shared = 0
+        for src, dst in pairs:
+            size = dst.stat().st_size
+            if src.is_file() and src.stat().st_size == size and _link(src, dst):
+                shared += size
+        if shared:
+            self._track(p.parent.name, prev)
+            self._track(p.parent.name, p)
+        return shared
+
+    def _previous(self, p: Path) -> Path | None:
+        self._ensure_indexed()
+        kind = "".join(p.suffixes)
+        earlier = [e.path[: -len(_MANIFEST)] for e in self._catalog.entries(self._key, p.parent.name)
+                   if e.path.endswith(f"{kind}{_MANIFEST}") and Path(e.path[: -len(_MANIFEST)]).name < p.name]
+        return Path(max(earlier, key=lambda path: Path(path).name)) if earlier else None
+
     def write_receipt(self, final_path: str, manifest: dict[str, object]) -> str:
-        receipt = f"{final_path}.manifest.json"
+        receipt = f"{final_path}{_MANIFEST}"
         Path(receipt).write_text(json.dumps(manifest, indent=2))
+        self._track(Path(receipt).parent.name, Path(receipt))
         return receipt
 
     def write_sample(self, service: str, timestamp: str, text: str) -> str:
         sample = self._dir(service) / f"{timestamp}.stool.log"
         sample.write_text(text)
+        self._track(service, sample)
         return str(sample)
 
     def read_text(self, path: str) -> str | None:
@@ -98,11 +308,66 @@ class BowlStorage:
             return None
 
     def delete(self, path: str) -> None:
-        p = Path(path)
-        if p.is_dir():
-            shutil.rmtree(p, ignore_errors=True)
-        else:
-            p.unlink(missing_ok=True)
+        self.delete_many([path])
+
+    def delete_many(self, paths: Sequence[str]) -> None:
+        """Remove several dumps (e.g. one retention sweep) with a single catalog update."""
+        for path in paths:
+            p = Path(path)
+            if p.is_dir():
+                shutil.rmtree(p, ignore_errors=True)
+            else:
+                p.unlink(missing_ok=True)
+        self._catalog.discard_many(self._key, [(Path(path).parent.name, path) for path in paths])
+
+
+def _hash_file(path: Path) -> tuple[str, int]:
+    h = hashlib.sha256()
+    n = 0
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+            n += len(chunk)
+    return h.hexdigest(), n
+
+
+def _footprint(p: Path) -> tuple[int, tuple[tuple[int, int, int], ...]]:
+    """Bytes under p, and (device, inode, bytes) of each of its files that has other hard links."""
+    size = 0
+    links: list[tuple[int, int, int]] = []
+    for f in [f for _, f in _walk_files(p)] if p.is_dir() else [p]:
+        st = f.stat()
+        size += st.st_size
+        if st.st_nlink > 1:
+            links.append((st.st_dev, st.st_ino, st.st_size))
+    return size, tuple(links)
+
+
+def _stamped_at(p: Path) -> datetime:
+    """When the entry was taken, from its <YYYYmmddTHHMMSS> name; the mtime for other names.
+
+    Hard-linked dumps share one inode and so one mtime, so the name is what orders them.
+    """
+    try:
+        return datetime.strptime(p.name[:15], _STAMP).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return datetime.fromtimestamp(p.stat().st_mtime, tz=timezone.utc)
+
+
+def _link(src: Path, dst: Path) -> bool:
+    """Replace dst with a hard link to src, or failing that a reflink; False if neither works."""
+    tmp = dst.with_name(f"{dst.name}.link")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        try:
+            with open(src, "rb") as s, open(tmp, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return False
+    os.replace(tmp, dst)
+    return True
 
 
 def _walk_files(root: Path) -> list[tuple[str, Path]]:
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fiber.domain.models import Codec, Compression
+
+
+def compressor_argv(compression: Compression) -> list[str]:
+    """stdin->stdout compressor for a streamed dump: zstd, or pigz for multi-threaded gzip."""
+    level = [f"-{compression.level}"] if compression.level is not None else []
+    if compression.codec is Codec.ZSTD:
+        return ["zstd", "-q", "-c", *level, f"-T{compression.threads}"]
+    return ["pigz", "-c", *level, "-p", str(compression.threads)]
+
+
+def decompressor_argv(codec: Codec) -> list[str]:
+    """stdin->stdout decompressor for feeding a compressed dump to a restore."""
+    if codec is Codec.ZSTD:
+        return ["zstd", "-q", "-d", "-c"]
+    return ["pigz", "-d", "-c"]
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from typing import Any
 
-from fiber.clients.discovery import LazyDockerGateway
+import docker
+
+from fiber.clients.discovery import LazyDockerGateway, change_from_event
+
+# A container counts as discovered while it runs, matching list_dump_services.
+_CONTAINER_CHANGES = {"start": "upsert", "unpause": "upsert", "update": "upsert",
+                      "die": "remove", "pause": "remove", "destroy": "remove"}
 
 
 def extract_containers(containers: list[Any]) -> dict[str, dict[str, str]]:
@@ -31,3 +37,20 @@ class DockerContainerGateway(LazyDockerGateway):
     def image_of(self, name: str) -> tuple[str | None, str | None]:
         client = self._get_client()
         return extract_container_image(client.containers.get(name))
+
+    def event_stream(self) -> Any:
+        return self._get_client().events(
+            decode=True, filters={"type": "container", "label": "fiber.enable=true"})
+
+    def event_change(self, event: dict[str, Any]) -> tuple[str, str] | None:
+        return change_from_event(event, "container", _CONTAINER_CHANGES)
+
+    def labels_of(self, name: str) -> dict[str, str] | None:
+        try:
+            container = self._get_client().containers.get(name)
+        except docker.errors.NotFound:
+            return None
+        labels = dict(container.labels or {})
+        if container.status != "running" or labels.get("fiber.enable") != "true":
+            return None
+        return labels
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import IO, Any, BinaryIO, cast
+
+from fiber.clients.bowl import _PARTIAL, BowlCatalog, BowlStorage, _stamped_at
+from fiber.domain.models import BowlEntry
+
+_POOL = ".pool"
+_RECIPE = ".recipe.json"
+_MIN_CHUNK = 128 << 10
+_MAX_CHUNK = 4 << 20
+_BOUNDARY_MASK = 0x3FFF  # ~1 in 16384 positions past _MIN_CHUNK ends a chunk
+_WINDOW = 64  # bytes a boundary depends on
+# Each byte value falls in class 0 or 1; a boundary candidate is a run of bytes whose
+# classes spell out _ANCHOR. The anchor has no period shorter than itself, so runs of
+# one byte (zero padding, say) or short repeats never match it.
+_CLASS = bytes(hashlib.sha256(bytes([b])).digest()[0] & 1 for b in range(256))
+_ANCHOR = bytes((1, 0, 1, 1, 0, 0, 0, 0))
+_SCAN = 64 << 10
+
+
+class _Chunker:
+    """Splits a byte stream into content-defined chunks as it arrives.
+
+    A chunk ends once it has reached _MIN_CHUNK where the classes of its last bytes
+    spell out the anchor and a hash of its last _WINDOW bytes has its top bits clear,
+    together as likely as _BOUNDARY_MASK's bit count says; failing that, at _MAX_CHUNK.
+    The anchor is found with translate()/find() and only those candidates are hashed,
+    so no Python code runs per byte. Boundaries depend only on nearby bytes, and come
+    out the same however the stream is split into feed() calls.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._start = 0  # where the current chunk begins in _buf
+        self._scanned = 0  # cut points below this are known not to be boundaries
+
+    def _boundary(self, end: int) -> int | None:
+        """The first boundary at or below end (a length from the chunk's start), if any."""
+        bits = _BOUNDARY_MASK.bit_length()
+        anchor = _ANCHOR[: min(len(_ANCHOR), bits)]
+        k = len(anchor)
+        buf, s = self._buf, self._start
+        lo = max(self._scanned, _MIN_CHUNK, k)
+        while lo <= end:
+            # A bounded stretch at a time: most chunks end well short of _MAX_CHUNK.
+            hi = min(lo + _SCAN, end + 1)
+            marks = buf[s + lo - k:s + hi - 1].translate(_CLASS)
+            j = marks.find(anchor)
+            while j >= 0:
+                cut = lo + j
+                if bits <= k or not int.from_bytes(
+                        hashlib.blake2b(buf[s + max(cut - _WINDOW, 0):s + cut], digest_size=8).digest(),
+                        "big") >> (64 - bits + k):
+                    return cut
+                j = marks.find(anchor, j + 1)
+            lo = self._scanned = hi
+        return None
+
+    def _take(self, cut: int) -> bytes:
+        chunk = bytes(self._buf[self._start:self._start + cut])
+        self._start += cut
+        self._scanned = 0
+        return chunk
+
+    def _pending(self) -> int:
+        return len(self._buf) - self._start
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add data; returns the chunks it completed."""
+        del self._buf[:self._start]
+        self._start = 0
+        self._buf += data
+        chunks: list[bytes] = []
+        while True:
+            cut = self._boundary(min(self._pending(), _MAX_CHUNK))
+            if cut is None:
+                if self._pending() < _MAX_CHUNK:
+                    return chunks
+                cut = _MAX_CHUNK
+            chunks.append(self._take(cut))
+
+    def finish(self) -> list[bytes]:
+        """The chunks left once the stream has ended."""
+        chunks: list[bytes] = []
+        while self._pending():
+            end = min(self._pending(), _MAX_CHUNK)
+            cut = self._boundary(end)
+            chunks.append(self._take(end if cut is None else cut))
+        return chunks
+
+
+def chunk_stream(fh: BinaryIO) -> Iterator[bytes]:
+    """Split a dump into content-defined chunks (see _Chunker).
+
+    Rows changed mid-table alter the chunks they land in and leave the rest, and their
+    pool entries, untouched, whether the dump is SQL text or a binary archive.
+    Compressed output still dedups poorly: one changed row changes every compressed
+    byte after it.
+    """
+    chunker = _Chunker()
+    for block in iter(lambda: fh.read(_MAX_CHUNK), b""):
+        yield from chunker.feed(block)
+    yield from chunker.finish()
+
+
+class ChunkPool:
+    """Content-addressed chunk files under <root>/.pool, with reference counts.
+
+    Counts are not persisted: they are rebuilt from the recipes on disk the first
+    time the pool is used, and chunks nothing references (left by a promote that
+    died before writing its recipe) are collected then.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._dir = root / _POOL
+        self._lock = threading.Lock()
+        self._refs: Counter[str] | None = None
+        self._bytes = 0
+        self._writing: dict[str, threading.Event] = {}
+        self._staged: dict[str, dict[str, Any]] = {}
+
+    def _path(self, digest: str) -> Path:
+        return self._dir / digest[:2] / digest
+
+    def _loaded(self) -> Counter[str]:
+        if self._refs is None:
+            refs: Counter[str] = Counter()
+            for recipe in self._root.glob(f"*/*{_RECIPE}"):
+                try:
+                    refs.update(json.loads(recipe.read_text())["chunks"])
+                except (OSError, ValueError, KeyError):
+                    continue
+            size = 0
+            for chunk in self._dir.glob("*/*"):
+                if refs[chunk.name]:
+                    size += chunk.stat().st_size
+                else:
+                    chunk.unlink(missing_ok=True)
+            self._refs, self._bytes = refs, size
+        return self._refs
+
+    def put(self, data: bytes) -> str:
+        """Reference one chunk, writing it only if the pool doesn't already hold it.
+
+        The lock only covers the lookup and the reference count; the write itself
+        runs outside it, with other puts of the same digest waiting on that write.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        while True:
+            with self._lock:
+                refs = self._loaded()
+                writing = self._writing.get(digest)
+                if writing is None:
+                    if refs[digest] and path.exists():
+                        refs[digest] += 1
+                        return digest
+                    writing = self._writing[digest] = threading.Event()
+                    break
+            writing.wait()
+        written = False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}{_PARTIAL}")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            written = True
+        finally:
+            with self._lock:
+                del self._writing[digest]
+                if written:
+                    refs[digest] += 1
+                    self._bytes += len(data)
+            writing.set()
+        return digest
+
+    def release(self, digests: Iterable[str]) -> None:
+        with self._lock:
+            refs = self._loaded()
+            for digest in digests:
+                refs[digest] -= 1
+                if refs[digest] <= 0:
+                    del refs[digest]
+                    path = self._path(digest)
+                    try:
+                        self._bytes -= path.stat().st_size
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+
+    def read(self, digest: str) -> bytes:
+        return self._path(digest).read_bytes()
+
+    def stage(self, temp_path: str) -> dict[str, Any]:
+        """The recipe of a dump being streamed into the pool, filled in as it lands."""
+        recipe: dict[str, Any] = {"size": 0, "chunks": []}
+        with self._lock:
+            self._staged[temp_path] = recipe
+        return recipe
+
+    def staged(self, temp_path: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._staged.get(temp_path)
+
+    def unstage(self, temp_path: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._staged.pop(temp_path, None)
+
+    def used(self) -> int:
+        with self._lock:
+            self._loaded()
+            return self._bytes
+
+
+class ChunkPools:
+    """One ChunkPool per Bowl root, shared by every DedupBowlStorage on that root."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, ChunkPool] = {}
+
+    def get(self, root: Path) -> ChunkPool:
+        with self._lock:
+            return self._pools.setdefault(str(root), ChunkPool(root))
+
+
+class _PoolWriter(io.RawIOBase):
+    """A streamed dump's temp file: chunks go into the pool as they are written.
+
+    Only an empty placeholder lands at the temp path; the recipe is staged in the pool
+    until promote() writes it out, so the dump is never read back to be chunked.
+    """
+
+    def __init__(self, pool: ChunkPool, temp_path: str) -> None:
+        super().__init__()
+        self._pool = pool
+        self._chunker = _Chunker()
+        self._hash = hashlib.sha256()
+        open(temp_path, "wb").close()
+        self._recipe = pool.stage(temp_path)
+
+    def writable(self) -> bool:
+        return True
+
+    def _put(self, chunks: list[bytes]) -> None:
+        for chunk in chunks:
+            self._recipe["chunks"].append(self._pool.put(chunk))
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._hash.update(data)
+        self._put(self._chunker.feed(data))
+        self._recipe["size"] += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._put(self._chunker.finish())
+                self._recipe["sha256"] = self._hash.hexdigest()
+            finally:
+                super().close()
+
+
+class DedupBowlStorage(BowlStorage):
+    """BowlStorage that keeps single-file dumps as chunk recipes over a shared pool.
+
+    A streamed dump is split into content-defined chunks as it is written (open_temp),
+    each new chunk stored once, and promoting it leaves <final>.recipe.json listing
+    them; a temp file written any other way is read back and chunked on promote.
+    Deleting (including retention sweeps) releases the references. Callers keep using
+    the logical <final> path, and stream/materialise rebuild the bytes on demand.
+    Directory dumps are stored as-is.
+    """
+
+    _reserved = frozenset({_POOL})
+
+    def __init__(self, root: str, hash_workers: int | None = None,
+                 catalog: BowlCatalog | None = None, pools: ChunkPools | None = None) -> None:
+        super().__init__(root, hash_workers=hash_workers, catalog=catalog)
+        self._pool = (pools if pools is not None else ChunkPools()).get(self._root)
+
+    @staticmethod
+    def _recipe(path: str) -> dict[str, object] | None:
+        try:
+            return json.loads(Path(f"{path}{_RECIPE}").read_text())
+        except FileNotFoundError:
+            return None
+
+    def open_temp(self, temp_path: str) -> IO[bytes]:
+        return cast(IO[bytes], _PoolWriter(self._pool, temp_path))
+
+    def _chunk_file(self, temp_path: str) -> dict[str, Any]:
+        Path(temp_path).touch(exist_ok=True)
+        h = hashlib.sha256()
+        size = 0
+        chunks: list[str] = []
+        with open(temp_path, "rb") as fh:
+            for chunk in chunk_stream(fh):
+                chunks.append(self._pool.put(chunk))
+                h.update(chunk)
+                size += len(chunk)
+        return {"size": size, "sha256": h.hexdigest(), "chunks": chunks}
+
+    def promote(self, temp_path: str) -> str:
+        if Path(temp_path).is_dir():
+            return super().promote(temp_path)
+        final = temp_path[: -len(_PARTIAL)]
+        staged = self._pool.unstage(temp_path)
+        if staged is not None and "sha256" not in staged:
+            # Its writer was never closed: the chunks may be short of the file.
+            self._pool.release(staged["chunks"])
+            staged = None
+        body = staged if staged is not None else self._chunk_file(temp_path)
+        recipe = Path(f"{final}{_RECIPE}")
+        tmp = Path(f"{recipe}{_PARTIAL}")
+        tmp.write_text(json.dumps(body))
+        os.replace(tmp, recipe)
+        os.unlink(temp_path)
+        service = recipe.parent.name
+        self._catalog.discard(self._key, service, temp_path)
+        self._track(service, recipe)
+        return final
+
+    def _entry(self, p: Path) -> BowlEntry:
+        if not p.name.endswith(_RECIPE):
+            return super()._entry(p)
+        # Catalogued under the logical dump path, sized by what the recipe itself occupies.
+        return BowlEntry(
+            path=str(p)[: -len(_RECIPE)],
+            size_bytes=p.stat().st_size,
+            modified_at=_stamped_at(p),
+            is_temp=False,
+        )
+
+    def usage(self) -> tuple[int, int]:
+        used, free = super().usage()
+        return used + self._pool.used(), free
+
+    def size(self, path: str) -> int:
+        staged = self._pool.staged(path)
+        if staged is not None:
+            return int(staged["size"])
+        recipe = self._recipe(path)
+        return int(recipe["size"]) if recipe is not None else super().size(path)  # type: ignore[call-overload]
+
+    def checksum(self, path: str) -> str:
+        recipe = self._recipe(path)
+        return str(recipe["sha256"]) if recipe is not None else super().checksum(path)
+
+    def stream(self, path: str) -> Iterator[bytes]:
+        recipe = self._recipe(path)
+        if recipe is None:
+            yield from super().stream(path)
+            return
+        for digest in recipe["chunks"]:  # type: ignore[attr-defined]
+            yield self._pool.read(digest)
+
+    def delete_many(self, paths: Sequence[str]) -> None:
+        """Release every recipe's (or staged temp's) chunks in one pool pass; the rest are plain files."""
+        chunks: list[str] = []
+        recipes: list[str] = []
+        plain: list[str] = []
+        for path in paths:
+            staged = self._pool.unstage(path)
+            if staged is not None:
+                chunks.extend(staged["chunks"])
+            recipe = self._recipe(path)
+            if recipe is None:
+                plain.append(path)
+            else:
+                chunks.extend(recipe["chunks"])  # type: ignore[arg-type]
+                recipes.append(path)
+        if chunks:
+            self._pool.release(chunks)
+        for path in recipes:
+            Path(f"{path}{_RECIPE}").unlink(missing_ok=True)
+        self._catalog.discard_many(self._key, [(Path(path).parent.name, path) for path in recipes])
+        if plain:
+            super().delete_many(plain)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from collections.abc import Mapping
 from typing import Any, Callable, Protocol, runtime_checkable
 
 
@@ -12,6 +16,28 @@ class DiscoveryProvider(Protocol):
     def image_of(self, name: str) -> tuple[str | None, str | None]: ...
 
 
+@runtime_checkable
+class WatchableDiscovery(DiscoveryProvider, Protocol):
+    """A gateway that can also stream Docker events and look up one name's labels."""
+
+    def event_stream(self) -> Any: ...
+
+    def event_change(self, event: dict[str, Any]) -> tuple[str, str] | None: ...
+
+    def labels_of(self, name: str) -> dict[str, str] | None: ...
+
+
+def change_from_event(event: dict[str, Any], kind: str, actions: Mapping[str, str]) -> tuple[str, str] | None:
+    """Map a raw Docker event to ``("upsert" | "remove", name)``, or None if it can't change discovery."""
+    if event.get("Type") != kind:
+        return None
+    change = actions.get(event.get("Action", ""))
+    name = (event.get("Actor") or {}).get("Attributes", {}).get("name")
+    if change is None or not name:
+        return None
+    return change, name
+
+
 class LazyDockerGateway:
     """Shared lazy/cached Docker client wiring for the discovery gateways.
 
@@ -29,3 +55,73 @@ class LazyDockerGateway:
         if self._client is None:
             self._client = self._client_factory()
         return self._client
+
+
+class EventDrivenDiscovery:
+    """DiscoveryProvider that answers from memory, kept current by Docker events.
+
+    list_dump_services() lists through the gateway only on first use and then every
+    ``resync_interval`` seconds as a safety net; in between, watch() folds each
+    create/update/remove event for a single name into the map. Whenever the event
+    stream is (re)opened the map is marked stale, since events may have been missed.
+    """
+
+    def __init__(self, gateway: WatchableDiscovery, resync_interval: float = 900.0,
+                 now: Callable[[], float] = time.monotonic) -> None:
+        self._gateway = gateway
+        self._resync_interval = resync_interval
+        self._now = now
+        self._lock = threading.Lock()
+        self._labels: dict[str, dict[str, str]] | None = None
+        self._synced_at = 0.0
+
+    def list_dump_services(self) -> dict[str, dict[str, str]]:
+        with self._lock:
+            if self._labels is None or self._now() - self._synced_at >= self._resync_interval:
+                self._labels = self._gateway.list_dump_services()
+                self._synced_at = self._now()
+            return dict(self._labels)
+
+    def image_of(self, name: str) -> tuple[str | None, str | None]:
+        return self._gateway.image_of(name)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._labels = None
+
+    def apply(self, change: str, name: str) -> bool:
+        """Fold one event in; True if what list_dump_services() returns has changed."""
+        labels = self._gateway.labels_of(name) if change == "upsert" else None
+        with self._lock:
+            if self._labels is None:
+                return True  # the next list resyncs in full
+            if labels is None:
+                return self._labels.pop(name, None) is not None
+            if self._labels.get(name) == labels:
+                return False
+            self._labels[name] = labels
+            return True
+
+    async def watch(self, on_change: Callable[[], None]) -> None:
+        """Follow the event stream until it ends, calling on_change (on the loop) per effective change."""
+        stream = await asyncio.to_thread(self._gateway.event_stream)
+        self.invalidate()
+        on_change()
+        loop = asyncio.get_running_loop()
+        closed = threading.Event()
+
+        def pump() -> None:
+            try:
+                for event in stream:
+                    change = self._gateway.event_change(event)
+                    if change is not None and self.apply(*change):
+                        loop.call_soon_threadsafe(on_change)
+            except Exception:
+                if not closed.is_set():
+                    raise  # a failure, not our own close() below
+
+        try:
+            await asyncio.to_thread(pump)
+        finally:
+            closed.set()
+            stream.close()
@@ -1,14 +1,46 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 import tempfile
 from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
-from typing import Any
+from typing import IO, Any
 
+from fiber.clients.compress import compressor_argv
 from fiber.clients.engines import DumpEngine, build_default_engines
 from fiber.domain.models import DumpJob, Engine
+from fiber.platform.executors import Executors
+
+
+_CHUNK = 1 << 20
+
+
+def write_creds(content: str) -> str:
+    """Write a 0600 temp creds file (honours $TMPDIR); the caller unlinks it."""
+    fd, path = tempfile.mkstemp(suffix=".cnf")  # mkstemp opens with mode 0600
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+    return path
+
+
+def _absorb(h: Any, fh: IO[bytes], chunk: bytes) -> None:
+    h.update(chunk)
+    fh.write(chunk)
+
+
+async def stop_process(proc: asyncio.subprocess.Process) -> None:
+    """Terminate a child that is still running, killing it if it ignores that for 10s."""
+    if proc.returncode is None:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
 
 
 @dataclass(frozen=True)
@@ -16,11 +48,23 @@ class RunOutcome:
     returncode: int
     stderr_tail: str
     cancelled: bool
+    sha256: str | None = None
+    bytes_written: int | None = None  # as stored, i.e. after any compression stage
+    raw_bytes: int | None = None  # as the engine produced them
 
 
 class DumpRunner:
-    """Runs an engine's dump command, streaming straight to disk; the dump body never
-    enters this process.
+    """Runs an engine's dump command, streaming it to disk.
+
+    When the engine can write to stdout (CUSTOM/PLAIN), the dump is piped through this
+    process: each chunk is hashed and counted as it is written to out_path, so the
+    outcome carries sha256/bytes_written and nobody has to re-read the file. Formats
+    that can't be piped (DIRECTORY) are written by the engine itself and come back
+    with sha256=None.
+
+    A job with a compression stage has its stream fed through a zstd/pigz child on the
+    way: raw bytes are counted going in, stored bytes hashed and counted coming out.
+    Hashing and writing run on the disk pool, one chunk behind the pipe reads.
 
     Engine-specific argv/credentials live in the DumpEngine strategies. This class only
     orchestrates: pick the engine, materialise its temp creds file, spawn the process,
@@ -31,34 +75,59 @@ class DumpRunner:
         self,
         engines: Mapping[Engine, DumpEngine] | None = None,
         process_factory: Callable[..., Awaitable[asyncio.subprocess.Process]] | None = None,
+        executors: Executors | None = None,
     ) -> None:
         self._engines = engines if engines is not None else build_default_engines()
+        self._disk = executors.disk if executors is not None else asyncio.to_thread
         self._process_factory: Callable[..., Awaitable[Any]] = (
             process_factory if process_factory is not None else asyncio.create_subprocess_exec
         )
 
-    async def run(self, job: DumpJob, password: str, out_path: str) -> RunOutcome:
+    async def run(
+        self, job: DumpJob, password: str, out_path: str,
+        open_out: Callable[[str], IO[bytes]] | None = None,
+    ) -> RunOutcome:
         engine = self._engines[job.engine]
         creds_path: str | None = None
         try:
             content = engine.credentials_content(password)
             if content is not None:
-                creds_path = self._write_creds(content)
+                creds_path = write_creds(content)
             env = {**os.environ, **engine.dump_env(password)}
-            argv = engine.build_argv(job, out_path, creds_path)
+            stream_argv = engine.build_stream_argv(job, creds_path)
+            argv = stream_argv if stream_argv is not None else engine.build_argv(job, out_path, creds_path)
             proc = await self._process_factory(
-                *argv, env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                *argv, env=env,
+                stdout=asyncio.subprocess.PIPE if stream_argv is not None else asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
             )
+            compressor = None
+            if stream_argv is not None and job.compression is not None:
+                compressor = await self._process_factory(
+                    *compressor_argv(job.compression),
+                    stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            digest: tuple[str, int, int] | None = None
             try:
+                waiter = (self._pump(proc, out_path, compressor, open_out) if stream_argv is not None
+                          else self._wait(proc))
                 if job.timeout:
-                    stderr = await asyncio.wait_for(self._wait(proc), timeout=job.timeout)
+                    stderr, digest = await asyncio.wait_for(waiter, timeout=job.timeout)
                 else:
-                    stderr = await self._wait(proc)
+                    stderr, digest = await waiter
             except (asyncio.TimeoutError, asyncio.CancelledError):
-                await self._kill(proc)
+                await stop_process(proc)
+                if compressor is not None:
+                    await stop_process(compressor)
                 return RunOutcome(returncode=-1, stderr_tail="cancelled", cancelled=True)
             assert proc.returncode is not None
-            return RunOutcome(returncode=proc.returncode, stderr_tail=stderr[-4000:], cancelled=False)
+            returncode = proc.returncode
+            if returncode == 0 and compressor is not None and compressor.returncode:
+                returncode = compressor.returncode
+            sha, nbytes, raw = digest if digest is not None else (None, None, None)
+            return RunOutcome(returncode=returncode, stderr_tail=stderr[-4000:], cancelled=False,
+                              sha256=sha, bytes_written=nbytes, raw_bytes=raw)
         finally:
             if creds_path is not None:
                 try:
@@ -66,27 +135,77 @@ class DumpRunner:
                 except FileNotFoundError:
                     pass
 
-    @staticmethod
-    def _write_creds(content: str) -> str:
-        """Write a 0600 temp creds file (honours $TMPDIR); the caller unlinks it."""
-        fd, path = tempfile.mkstemp(suffix=".cnf")  # mkstemp opens with mode 0600
-        try:
-            os.write(fd, content.encode())
-        finally:
-            os.close(fd)
-        return path
-
-    async def _wait(self, proc: asyncio.subprocess.Process) -> str:
+    async def _wait(self, proc: asyncio.subprocess.Process) -> tuple[str, None]:
         assert proc.stderr is not None
         data = await proc.stderr.read()
         await proc.wait()
-        return data.decode(errors="replace")
+        return data.decode(errors="replace"), None
+
+    async def _pump(
+        self, proc: asyncio.subprocess.Process, out_path: str,
+        compressor: asyncio.subprocess.Process | None = None,
+        open_out: Callable[[str], IO[bytes]] | None = None,
+    ) -> tuple[str, tuple[str, int, int]]:
+        """Copy the dump's stdout into out_path, hashing and counting on the way through.
 
-    async def _kill(self, proc: asyncio.subprocess.Process) -> None:
-        if proc.returncode is None:
-            proc.terminate()
+        open_out, if given, opens out_path for writing in place of a plain file (a
+        storage that takes the bytes as they land, say).
+
+        With a compressor, the dump feeds its stdin and its stdout is what lands on disk.
+        stderr is drained concurrently so a chatty dump can't deadlock on a full pipe.
+        """
+        assert proc.stdout is not None and proc.stderr is not None
+        source = proc.stdout
+        h = hashlib.sha256()
+        nbytes = 0
+        raw = 0
+
+        async def store(stream: asyncio.StreamReader) -> None:
+            # One chunk is hashed and written on a disk worker while the next is read;
+            # awaiting the previous write first keeps them in order.
+            nonlocal nbytes
+            fh = await (self._disk(open_out, out_path) if open_out is not None
+                        else self._disk(open, out_path, "wb"))
+            pending: asyncio.Future[None] | None = None
             try:
-                await asyncio.wait_for(proc.wait(), timeout=10)
-            except asyncio.TimeoutError:
-                proc.kill()
-                await proc.wait()
+                while chunk := await stream.read(_CHUNK):
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.ensure_future(self._disk(_absorb, h, fh, chunk))
+                    nbytes += len(chunk)
+                if pending is not None:
+                    await pending
+            finally:
+                if pending is not None and not pending.done():
+                    await asyncio.wait([pending])
+                await self._disk(fh.close)
+
+        if compressor is None:
+            data, _ = await asyncio.gather(proc.stderr.read(), store(source))
+            await proc.wait()
+            return data.decode(errors="replace"), (h.hexdigest(), nbytes, nbytes)
+
+        assert compressor.stdin is not None and compressor.stdout is not None
+        assert compressor.stderr is not None
+        sink = compressor.stdin
+
+        async def feed() -> None:
+            nonlocal raw
+            broken = False
+            while chunk := await source.read(_CHUNK):
+                raw += len(chunk)
+                if broken:
+                    continue  # keep draining so the dump can exit; the compressor's rc reports it
+                try:
+                    sink.write(chunk)
+                    await sink.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    broken = True
+            sink.close()
+
+        data, comp_err, _, _ = await asyncio.gather(
+            proc.stderr.read(), compressor.stderr.read(), feed(), store(compressor.stdout))
+        await proc.wait()
+        await compressor.wait()
+        stderr = data if proc.returncode or not compressor.returncode else b"compressor: " + comp_err
+        return stderr.decode(errors="replace"), (h.hexdigest(), nbytes, raw)
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Protocol, runtime_checkable
 
-from fiber.domain.models import DumpJob
+from fiber.domain.models import DumpJob, RestoreTarget
+
+
+class RestoreFilter(Protocol):
+    """Rewrites a dump on its way into the restore command, one piece at a time."""
+
+    def feed(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
 
 
 @runtime_checkable
@@ -10,13 +19,20 @@ class DumpEngine(Protocol):
     """Everything engine-specific about producing a dump and probing reachability.
 
     Implementations are pure (no filesystem/subprocess I/O): DumpRunner owns the
-    creds-file write and the subprocess, ConnectivityProbe owns the probe subprocess.
+    creds-file write and the subprocess, ConnectivityProbe owns the probe subprocess
+    and the probe connection (the engine only speaks its handshake over the streams
+    it is handed).
     """
 
     def build_argv(self, job: DumpJob, out_path: str, creds_path: str | None = None) -> list[str]:
         """The dump command argv, streaming straight to out_path."""
         ...
 
+    def build_stream_argv(self, job: DumpJob, creds_path: str | None = None) -> list[str] | None:
+        """The dump command argv writing to stdout, or None if the format can't be piped
+        (multi-file DIRECTORY output). The runner hashes and counts the pipe as it lands."""
+        ...
+
     def dump_env(self, password: str) -> dict[str, str]:
         """Extra env for the dump process (merged over os.environ)."""
         ...
@@ -25,6 +41,35 @@ class DumpEngine(Protocol):
         """Body of a temp creds file the runner should write, or None if not needed."""
         ...
 
+    def build_restore_argv(self, job: DumpJob, target: RestoreTarget, dbname: str, in_path: str,
+                           creds_path: str | None = None) -> list[str]:
+        """The restore command argv, reading the dump (in ``job.fmt``) from in_path into
+        ``dbname`` on the target; parallel (job.jobs) where the format allows it."""
+        ...
+
+    def build_restore_stream_argv(self, job: DumpJob, target: RestoreTarget, dbname: str,
+                                  creds_path: str | None = None) -> list[str] | None:
+        """The restore command argv reading the dump from stdin, or None if the format
+        (or a parallel restore) needs a file on disk."""
+        ...
+
+    def build_recreate_argv(self, target: RestoreTarget, dbname: str,
+                            creds_path: str | None = None) -> list[str]:
+        """Drop ``dbname`` on the target if it exists and create it empty."""
+        ...
+
+    def restore_filter(self, job: DumpJob) -> RestoreFilter | None:
+        """A filter the (decompressed) dump passes through before the restore reads it,
+        or None to feed it unchanged."""
+        ...
+
     def probe_argv(self, job: DumpJob) -> list[str]:
         """A password-free reachability probe argv."""
         ...
+
+    async def probe_handshake(
+        self, job: DumpJob, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[bool, str]:
+        """Password-free, in-process reachability check over an open TCP connection:
+        (ready, detail), judged the way the probe_argv binary would judge it."""
+        ...
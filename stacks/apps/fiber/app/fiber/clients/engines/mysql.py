@@ -1,15 +1,55 @@
 from __future__ import annotations
 
-from fiber.domain.models import DumpFormat, DumpJob
+import asyncio
+import struct
+
+from fiber.domain.models import DumpFormat, DumpJob, RestoreTarget
+
+_PROTOCOL_10 = 0x0A
+# CLIENT_LONG_PASSWORD | CLIENT_PROTOCOL_41 | CLIENT_SECURE_CONNECTION | CLIENT_PLUGIN_AUTH
+_CAPABILITIES = 0x1 | 0x200 | 0x8000 | 0x80000
+_NATIVE_AUTH = b"mysql_native_password"
+_COM_QUIT = b"\x01"
+
+
+def _packet(seq: int, payload: bytes) -> bytes:
+    return len(payload).to_bytes(3, "little") + bytes([seq & 0xFF]) + payload
+
+
+def handshake_response(user: str) -> bytes:
+    """HandshakeResponse41 with an empty password: enough for the server to answer with
+    OK or access-denied, so the probe ends as a finished login attempt rather than an
+    aborted connection (which counts towards max_connect_errors and can block the host)."""
+    return (struct.pack("<IIB", _CAPABILITIES, 1 << 24, 33) + bytes(23)
+            + user.encode() + b"\0" + b"\0" + _NATIVE_AUTH + b"\0")
+
+
+async def _read_packet(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    header = await reader.readexactly(4)
+    return header[3], await reader.readexactly(int.from_bytes(header[:3], "little"))
+
+
+def _error_message(payload: bytes) -> str:
+    code = int.from_bytes(payload[1:3], "little")
+    message = payload[3:]
+    if message.startswith(b"#"):
+        message = message[6:]  # '#' + SQLSTATE
+    return f"error {code}: {message.decode(errors='replace')}"
 
 
 def mysql_defaults_body(password: str) -> str:
     """Body of the mysql --defaults-extra-file (keeps the password off argv/env).
 
-    Written under both [client] (read by mariadb-dump) and [mydumper] (mydumper's own
-    group) so one creds file works for either tool; each ignores the other's group.
+    Written under [client] (read by mariadb-dump and the mariadb client), [mydumper]
+    and [myloader] (their own groups) so one creds file works for every tool; each
+    ignores the others' groups.
     """
-    return f"[client]\npassword={password}\n[mydumper]\npassword={password}\n"
+    return (f"[client]\npassword={password}\n[mydumper]\npassword={password}\n"
+            f"[myloader]\npassword={password}\n")
+
+
+def _ident(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
 
 
 class MysqlEngine:
@@ -21,10 +61,13 @@ class MysqlEngine:
     """
 
     def __init__(self, dump_binary: str = "mariadb-dump", mydumper_binary: str = "mydumper",
-                 probe_binary: str = "mariadb-admin") -> None:
+                 probe_binary: str = "mariadb-admin", client_binary: str = "mariadb",
+                 myloader_binary: str = "myloader") -> None:
         self._dump_binary = dump_binary
         self._mydumper_binary = mydumper_binary
         self._probe_binary = probe_binary
+        self._client_binary = client_binary
+        self._myloader_binary = myloader_binary
 
     def _conn_flags(self, job: DumpJob, creds_path: str | None) -> list[str]:
         # --defaults-extra-file must be the first option for the mysql client tools.
@@ -37,12 +80,50 @@ class MysqlEngine:
             # mydumper writes a directory; -t threads reuse job.jobs. All-flags, no positional.
             # --protocol=tcp: Fiber always dumps DBs over the network, and mydumper otherwise
             # routes a "localhost" host to the local unix socket (which isn't there).
-            return [self._mydumper_binary, *conn, "--protocol=tcp", "-B", job.dbname,
-                    "-o", out_path, "-t", str(job.jobs), *job.options]
+            argv = [self._mydumper_binary, *conn, "--protocol=tcp", "-B", job.dbname,
+                    "-o", out_path, "-t", str(job.jobs)]
+            if job.compression is not None:
+                # mydumper compresses each output file itself; it takes no level or threads.
+                argv.append(f"--compress={job.compression.codec.value.upper()}")
+            return [*argv, *job.options]
         # PLAIN: options + --result-file MUST precede the <db> positional (trailing words
         # after <db> are parsed as a table list by mariadb-dump).
         return [self._dump_binary, *conn, *job.options, "--result-file", out_path, job.dbname]
 
+    def build_stream_argv(self, job: DumpJob, creds_path: str | None = None) -> list[str] | None:
+        # mydumper only writes a directory; mariadb-dump without --result-file writes stdout.
+        if job.fmt is DumpFormat.DIRECTORY:
+            return None
+        return [self._dump_binary, *self._conn_flags(job, creds_path), *job.options, job.dbname]
+
+    @staticmethod
+    def _target_flags(target: RestoreTarget, creds_path: str | None) -> list[str]:
+        return [f"--defaults-extra-file={creds_path}", "-h", target.host, "-P", str(target.port),
+                "-u", target.user]
+
+    def build_restore_argv(self, job: DumpJob, target: RestoreTarget, dbname: str, in_path: str,
+                           creds_path: str | None = None) -> list[str]:
+        conn = self._target_flags(target, creds_path)
+        if job.fmt is DumpFormat.DIRECTORY:
+            # myloader: -B renames the database on the way in, -o overwrites existing tables.
+            return [self._myloader_binary, *conn, "--protocol=tcp", "-d", in_path, "-B", dbname,
+                    "-t", str(job.jobs), "-o"]
+        return [self._client_binary, *conn, "-e", f"source {in_path}", dbname]
+
+    def build_restore_stream_argv(self, job: DumpJob, target: RestoreTarget, dbname: str,
+                                  creds_path: str | None = None) -> list[str] | None:
+        if job.fmt is DumpFormat.DIRECTORY:
+            return None
+        return [self._client_binary, *self._target_flags(target, creds_path), dbname]
+
+    def build_recreate_argv(self, target: RestoreTarget, dbname: str,
+                            creds_path: str | None = None) -> list[str]:
+        return [self._client_binary, *self._target_flags(target, creds_path),
+                "-e", f"DROP DATABASE IF EXISTS {_ident(dbname)}; CREATE DATABASE {_ident(dbname)}"]
+
+    def restore_filter(self, job: DumpJob) -> None:
+        return None
+
     def dump_env(self, password: str) -> dict[str, str]:
         return {}
 
@@ -51,3 +132,25 @@ class MysqlEngine:
 
     def probe_argv(self, job: DumpJob) -> list[str]:
         return [self._probe_binary, "ping", "-h", job.host, "-P", str(job.port), "-u", job.user]
+
+    async def probe_handshake(
+        self, job: DumpJob, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[bool, str]:
+        seq, greeting = await _read_packet(reader)
+        if greeting[:1] == b"\xff":  # refused before login: too many connections, host blocked
+            return False, _error_message(greeting)
+        if greeting[:1] != bytes([_PROTOCOL_10]):
+            return False, f"unexpected greeting (protocol {greeting[:1].hex() or 'none'})"
+        version = greeting[1:greeting.find(b"\0", 1)].decode(errors="replace")
+        writer.write(_packet(seq + 1, handshake_response(job.user)))
+        await writer.drain()
+        seq, reply = await _read_packet(reader)
+        if reply[:1] == b"\xfe":  # auth switch: answer with an empty password too
+            writer.write(_packet(seq + 1, b""))
+            await writer.drain()
+            seq, reply = await _read_packet(reader)
+        if reply[:1] == b"\x00":
+            writer.write(_packet(0, _COM_QUIT))
+            await writer.drain()
+        # Like mariadb-admin ping, a server that answers the login at all (even access denied) is alive.
+        return True, f"{version} is alive"
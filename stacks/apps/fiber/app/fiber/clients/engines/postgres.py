@@ -1,10 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import re
+import struct
 
-from fiber.domain.models import DumpFormat, DumpJob
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob, RestoreTarget
 
 _FORMAT_FLAG = {DumpFormat.CUSTOM: "c", DumpFormat.DIRECTORY: "d", DumpFormat.PLAIN: "p"}
+_SSL_REQUEST = struct.pack("!II", 8, 80877103)
+_PROTOCOL_3_0 = 196608
+_CANNOT_CONNECT_NOW = "57P03"  # starting up, shutting down or in recovery: pg_isready's "rejecting"
+_MAX_REPLY = 1 << 16
+# What pg_restore --no-owner --no-privileges leaves out, as pg_dump writes it in a plain
+# dump: one statement per line, starting in the first column.
+_ACL_STATEMENT = re.compile(
+    rb"(?:ALTER [A-Z ]+ .+ OWNER TO .+|GRANT .+|REVOKE .+|ALTER DEFAULT PRIVILEGES .+"
+    rb"|SET SESSION AUTHORIZATION .+);\s*$")
+_COPY_END = b"\\.\n"
+
+
+def startup_packet(user: str, dbname: str) -> bytes:
+    params = (("user", user), ("database", dbname), ("application_name", "fiber-probe"))
+    body = struct.pack("!I", _PROTOCOL_3_0) + b"".join(f"{k}\0{v}\0".encode() for k, v in params) + b"\0"
+    return struct.pack("!I", len(body) + 4) + body
+
+
+def _error_fields(body: bytes) -> dict[str, str]:
+    return {chr(part[0]): part[1:].decode(errors="replace") for part in body.split(b"\0") if part}
 
 
 def select_pg_dump_binary(bindir: str = "/usr/lib/postgresql") -> str:
@@ -24,21 +47,157 @@ def select_pg_dump_binary(bindir: str = "/usr/lib/postgresql") -> str:
     return f"{bindir}/{max(majors)}/bin/pg_dump"
 
 
+def _major(binary: str) -> int | None:
+    """The major version in a /usr/lib/postgresql/<major>/bin path, or None if it has none."""
+    match = re.search(r"/(\d+)/bin/[^/]+$", binary)
+    return int(match.group(1)) if match else None
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class PlainAclFilter:
+    """Drops owner and privilege statements from a plain dump on its way to psql.
+
+    They name roles a scratch restore target doesn't have, and psql with ON_ERROR_STOP
+    would fail the whole restore on the first one. COPY data passes through untouched.
+    """
+
+    def __init__(self) -> None:
+        self._partial = b""
+        self._in_copy = False
+
+    def feed(self, data: bytes) -> bytes:
+        buf = self._partial + data
+        out = bytearray()
+        pos = 0
+        while pos < len(buf):
+            if self._in_copy:
+                end = self._copy_end(buf, pos)
+                if end < 0:  # the data runs on: pass whole lines, keep the last partial one
+                    cut = buf.rfind(b"\n", pos) + 1 or pos
+                    out += buf[pos:cut]
+                    pos = cut
+                    break
+                out += buf[pos:end]
+                pos = end
+                self._in_copy = False
+                continue
+            nl = buf.find(b"\n", pos)
+            if nl < 0:
+                break
+            line = buf[pos:nl + 1]
+            pos = nl + 1
+            out += self._keep(line)
+        self._partial = buf[pos:]
+        return bytes(out)
+
+    def finish(self) -> bytes:
+        tail, self._partial = self._partial, b""
+        return tail if self._in_copy else self._keep(tail)
+
+    def _keep(self, line: bytes) -> bytes:
+        if line.startswith(b"COPY ") and line.rstrip().endswith(b"FROM stdin;"):
+            self._in_copy = True
+        return b"" if _ACL_STATEMENT.match(line) else line
+
+    @staticmethod
+    def _copy_end(buf: bytes, pos: int) -> int:
+        """Offset just past the \\. line closing the COPY data, or -1 if it isn't in ``buf``."""
+        i = pos
+        while (i := buf.find(_COPY_END, i)) >= 0:
+            if i == pos or buf[i - 1] == 0x0A:
+                return i + len(_COPY_END)
+            i += 1
+        return -1
+
+
 class PostgresEngine:
     """Dump/probe strategy for PostgreSQL (pg_dump, PGPASSWORD env, pg_isready)."""
 
     def __init__(self, binary: str | None = None) -> None:
         self._binary = binary if binary is not None else select_pg_dump_binary()
+        self._major = _major(self._binary)
 
-    def build_argv(self, job: DumpJob, out_path: str, creds_path: str | None = None) -> list[str]:
+    def _base_argv(self, job: DumpJob) -> list[str]:
         argv = [self._binary, "-h", job.host, "-p", str(job.port), "-U", job.user,
                 "-d", job.dbname, "-F", _FORMAT_FLAG[job.fmt]]
         if job.fmt is DumpFormat.DIRECTORY and job.jobs > 1:
             argv += ["-j", str(job.jobs)]
+        if job.fmt is DumpFormat.DIRECTORY and job.compression is not None:
+            # -Fd compresses each table file itself; PLAIN is compressed by the runner's stage.
+            argv += self._compress_flags(job.compression)
         argv += list(job.options)
-        argv += ["-f", out_path]
         return argv
 
+    def _compress_flags(self, c: Compression) -> list[str]:
+        """-Z for a directory dump. pg_dump before 16 only takes a gzip level (0-9), so a
+        zstd request there falls back to gzip; a pg_dump on $PATH is assumed to be 16+."""
+        if self._major is None or self._major >= 16:
+            return ["-Z", c.codec.value if c.level is None else f"{c.codec.value}:{c.level}"]
+        if c.level is None or c.codec is not Codec.GZIP:
+            return []  # -Fd is gzip-compressed at the default level already
+        return ["-Z", str(min(c.level, 9))]
+
+    def build_argv(self, job: DumpJob, out_path: str, creds_path: str | None = None) -> list[str]:
+        return [*self._base_argv(job), "-f", out_path]
+
+    def build_stream_argv(self, job: DumpJob, creds_path: str | None = None) -> list[str] | None:
+        # pg_dump writes CUSTOM/PLAIN to stdout when -f is omitted; -Fd needs a directory.
+        if job.fmt is DumpFormat.DIRECTORY:
+            return None
+        return self._base_argv(job)
+
+    def _tool(self, name: str) -> str:
+        """A sibling of the selected pg_dump (pg_restore, psql), so versions match."""
+        bindir = os.path.dirname(self._binary)
+        return os.path.join(bindir, name) if bindir else name
+
+    @staticmethod
+    def _target_flags(target: RestoreTarget, dbname: str) -> list[str]:
+        return ["-h", target.host, "-p", str(target.port), "-U", target.user, "-d", dbname]
+
+    def build_restore_argv(self, job: DumpJob, target: RestoreTarget, dbname: str, in_path: str,
+                           creds_path: str | None = None) -> list[str]:
+        if job.fmt is DumpFormat.PLAIN:
+            # restore_filter strips owners and grants, so the runner feeds psql on stdin.
+            return [self._tool("psql"), *self._target_flags(target, dbname),
+                    "-v", "ON_ERROR_STOP=1", "-q", "-f", in_path]
+        # Owners and grants name roles the target may not have; the data is what matters.
+        argv = [self._tool("pg_restore"), *self._target_flags(target, dbname),
+                "--no-owner", "--no-privileges", "--exit-on-error"]
+        if job.jobs > 1:
+            argv += ["-j", str(job.jobs)]
+        return [*argv, in_path]
+
+    def build_restore_stream_argv(self, job: DumpJob, target: RestoreTarget, dbname: str,
+                                  creds_path: str | None = None) -> list[str] | None:
+        # psql and pg_restore read stdin without a file argument; pg_restore -j needs to
+        # seek, and a -Fd dump is a directory.
+        if job.fmt is DumpFormat.DIRECTORY or (job.fmt is DumpFormat.CUSTOM and job.jobs > 1):
+            return None
+        argv = self.build_restore_argv(job, target, dbname, "-", creds_path)
+        return argv if job.fmt is DumpFormat.PLAIN else argv[:-1]
+
+    def build_recreate_argv(self, target: RestoreTarget, dbname: str,
+                            creds_path: str | None = None) -> list[str]:
+        # Separate -c commands: DROP/CREATE DATABASE cannot run inside one transaction.
+        # Sessions are ended by hand rather than with DROP ... WITH (FORCE), which needs
+        # PostgreSQL 13; this works on any server a scratch instance is likely to run.
+        return [self._tool("psql"), *self._target_flags(target, "postgres"), "-v", "ON_ERROR_STOP=1",
+                "-c", ("SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                       f"WHERE datname = {_literal(dbname)} AND pid <> pg_backend_pid()"),
+                "-c", f"DROP DATABASE IF EXISTS {_ident(dbname)}",
+                "-c", f"CREATE DATABASE {_ident(dbname)}"]
+
+    def restore_filter(self, job: DumpJob) -> PlainAclFilter | None:
+        return PlainAclFilter() if job.fmt is DumpFormat.PLAIN else None
+
     def dump_env(self, password: str) -> dict[str, str]:
         return {"PGPASSWORD": password}
 
@@ -47,3 +206,29 @@ class PostgresEngine:
 
     def probe_argv(self, job: DumpJob) -> list[str]:
         return ["pg_isready", "-h", job.host, "-p", str(job.port), "-U", job.user]
+
+    async def probe_handshake(
+        self, job: DumpJob, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[bool, str]:
+        # SSLRequest first: only a postgres server answers it with a single S or N.
+        writer.write(_SSL_REQUEST)
+        await writer.drain()
+        answer = await reader.readexactly(1)
+        if answer == b"S":
+            # Going further needs TLS; the postmaster answering at all is what pg_isready checks.
+            return True, "accepting connections (TLS offered)"
+        if answer != b"N":
+            return False, f"not a postgres server (answered {answer!r} to SSLRequest)"
+        writer.write(startup_packet(job.user, job.dbname))
+        await writer.drain()
+        header = await reader.readexactly(5)
+        kind, length = header[:1], struct.unpack("!I", header[1:])[0]
+        if kind in (b"R", b"v"):  # authentication request / protocol negotiation
+            return True, "accepting connections"
+        if kind == b"E" and 4 <= length <= _MAX_REPLY:
+            fields = _error_fields(await reader.readexactly(length - 4))
+            # Like libpq's PQping, any error but "cannot connect now" means the server is up.
+            if fields.get("C") == _CANNOT_CONNECT_NOW:
+                return False, fields.get("M", "rejecting connections")
+            return True, "accepting connections"
+        return False, f"unexpected startup reply {kind!r}"
@@ -1,20 +1,80 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Generic, TypeVar
+
+from fiber.platform.metrics import Metrics
+
+T = TypeVar("T")
+
+
+class Mailbox(Generic[T]):
+    """A subscriber's bounded inbox holding at most one pending item per key.
+
+    Putting a key that is already pending replaces its value in place (merge), so a
+    burst about one service is delivered once. When the mailbox is full, the oldest
+    pending key is dropped to make room. put() never waits, so a stalled reader
+    cannot hold up the writer, and memory stays bounded.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._maxsize = maxsize
+        self._pending: dict[str, T] = {}
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, key: str, value: T) -> bool:
+        """Queue ``value`` under ``key``; returns False if an older key was dropped for it."""
+        kept = True
+        if key not in self._pending and len(self._pending) >= self._maxsize:
+            del self._pending[next(iter(self._pending))]
+            self.dropped += 1
+            kept = False
+        self._pending[key] = value
+        self._ready.set()
+        return kept
+
+    def get_nowait(self) -> T:
+        if not self._pending:
+            raise asyncio.QueueEmpty
+        key = next(iter(self._pending))
+        value = self._pending.pop(key)
+        if not self._pending:
+            self._ready.clear()
+        return value
+
+    async def get(self) -> T:
+        while not self._pending:
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def empty(self) -> bool:
+        return not self._pending
+
+    def qsize(self) -> int:
+        return len(self._pending)
 
 
 class EventBroker:
-    def __init__(self) -> None:
-        self.subscribers: set[asyncio.Queue[str]] = set()
+    def __init__(self, metrics: Metrics | None = None, maxsize: int = 256) -> None:
+        self.subscribers: set[Mailbox[str]] = set()
+        self._metrics = metrics
+        self._maxsize = maxsize
 
-    def subscribe(self) -> asyncio.Queue[str]:
-        q: asyncio.Queue[str] = asyncio.Queue()
+    def subscribe(self) -> Mailbox[str]:
+        q: Mailbox[str] = Mailbox(self._maxsize)
         self.subscribers.add(q)
         return q
 
-    def unsubscribe(self, q: asyncio.Queue[str]) -> None:
+    def unsubscribe(self, q: Mailbox[str]) -> None:
         self.subscribers.discard(q)
 
     async def publish(self, service: str) -> None:
+        """Notify every subscriber that ``service`` changed, without waiting on any of them."""
+        dropped = 0
         for q in list(self.subscribers):
-            await q.put(service)
+            dropped += not q.put(service, service)
+        if self._metrics is not None:
+            self._metrics.event_queue_depth.set(max((q.qsize() for q in self.subscribers), default=0))
+            if dropped:
+                self._metrics.events_dropped.inc(dropped)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable, Mapping
+import contextlib
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
 from dataclasses import dataclass
 from typing import Any
 
 from fiber.clients.engines import DumpEngine, build_default_engines
 from fiber.domain.models import DumpJob, Engine
+from fiber.platform.metrics import Metrics
 
 
 @dataclass(frozen=True)
@@ -16,20 +19,116 @@ class ProbeResult:
 
 
 class ConnectivityProbe:
-    """Runs the engine's reachability probe. Engine-specific argv lives in the DumpEngine
-    strategies; this class only spawns the probe process via an injected factory."""
+    """Runs the engine's reachability probe. Engine-specific argv and handshakes live in
+    the DumpEngine strategies; this class only opens the connection (mode "wire", the
+    default) or spawns the probe binary (mode "process") via injected factories.
+
+    Each probe is cut off after ``timeout`` seconds. Results are cached per host:port
+    for ``ttl`` seconds, and concurrent checks of one endpoint share a single process,
+    so a batch of services on one database server costs one probe."""
 
     def __init__(
         self,
         engines: Mapping[Engine, DumpEngine] | None = None,
         process_factory: Callable[..., Awaitable[Any]] | None = None,
+        timeout: float = 5.0,
+        ttl: float = 15.0,
+        max_parallel: int = 8,
+        now: Callable[[], float] = time.monotonic,
+        mode: str = "wire",
+        metrics: Metrics | None = None,
+        connect: Callable[..., Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] | None = None,
     ) -> None:
         self._engines = engines if engines is not None else build_default_engines()
         self._process_factory: Callable[..., Awaitable[Any]] = (
             process_factory if process_factory is not None else asyncio.create_subprocess_exec
         )
+        self._timeout = timeout
+        self._ttl = ttl
+        self._max_parallel = max_parallel
+        self._now = now
+        self._mode = mode
+        self._metrics = metrics
+        self._connect = connect if connect is not None else asyncio.open_connection
+        self._cache: dict[tuple[str, int], tuple[float, ProbeResult]] = {}
+        self._inflight: dict[tuple[str, int], asyncio.Task[ProbeResult]] = {}
+
+    def cached(self, job: DumpJob) -> ProbeResult | None:
+        """The last result for the job's endpoint, if it is younger than the TTL."""
+        hit = self._cache.get((job.host, job.port))
+        if hit is None or self._now() - hit[0] > self._ttl:
+            return None
+        return hit[1]
 
     async def check(self, job: DumpJob) -> ProbeResult:
+        result = self.cached(job)
+        if result is not None:
+            return result
+        key = (job.host, job.port)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(job))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def check_many(self, jobs: Iterable[DumpJob]) -> dict[str, ProbeResult]:
+        """Probe every job's endpoint at once, at most ``max_parallel`` processes at a time."""
+        sem = asyncio.Semaphore(self._max_parallel)
+
+        async def bounded(job: DumpJob) -> ProbeResult:
+            if (result := self.cached(job)) is not None:
+                return result
+            async with sem:
+                return await self.check(job)
+
+        batch = list(jobs)
+        results = await asyncio.gather(*(bounded(j) for j in batch))
+        return {job.service: result for job, result in zip(batch, results)}
+
+    async def _probe(self, job: DumpJob) -> ProbeResult:
+        result = await self._run(job)
+        self._cache[(job.host, job.port)] = (self._now(), result)
+        return result
+
+    async def _run(self, job: DumpJob) -> ProbeResult:
+        if self._mode == "wire":
+            return await self._run_wire(job)
+        started = time.perf_counter()
+        result = await self._run_process(job)
+        self._observe(job, "process", started)
+        return result
+
+    def _observe(self, job: DumpJob, phase: str, started: float) -> None:
+        if self._metrics is not None:
+            self._metrics.probe_latency.labels(db=job.service, phase=phase).observe(
+                time.perf_counter() - started)
+
+    async def _run_wire(self, job: DumpJob) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(self._connect(job.host, job.port), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            return ProbeResult(ok=False, detail=f"no answer within {self._timeout:g}s")
+        except OSError as exc:
+            return ProbeResult(ok=False, detail=f"cannot connect: {exc}")
+        self._observe(job, "connect", started)
+        started = time.perf_counter()
+        try:
+            ok, detail = await asyncio.wait_for(
+                self._engines[job.engine].probe_handshake(job, reader, writer), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            return ProbeResult(ok=False, detail=f"no answer within {self._timeout:g}s")
+        except (OSError, asyncio.IncompleteReadError) as exc:
+            return ProbeResult(ok=False, detail=f"handshake failed: {exc}")
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+        self._observe(job, "handshake", started)
+        return ProbeResult(ok=ok, detail=detail)
+
+    async def _run_process(self, job: DumpJob) -> ProbeResult:
         argv = self._engines[job.engine].probe_argv(job)
         try:
             proc = await self._process_factory(
@@ -40,8 +139,18 @@ class ConnectivityProbe:
         except FileNotFoundError as exc:
             return ProbeResult(ok=False, detail=f"probe binary not found: {exc}")
 
-        stdout_data = await proc.stdout.read()  # type: ignore[union-attr]
-        await proc.wait()
+        async def collect() -> bytes:
+            data = await proc.stdout.read()  # type: ignore[union-attr]
+            await proc.wait()
+            return data
+
+        try:
+            stdout_data = await asyncio.wait_for(collect(), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()  # reap it, or each hung probe leaves a zombie behind
+            return ProbeResult(ok=False, detail=f"no answer within {self._timeout:g}s")
         detail = stdout_data.decode(errors="replace").strip()
         ok = proc.returncode == 0
         return ProbeResult(ok=ok, detail=detail)
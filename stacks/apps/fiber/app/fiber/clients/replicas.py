@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import subprocess
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Protocol, runtime_checkable
+
+from fiber.clients.s3 import S3Client
+from fiber.clients.secrets import SecretReader
+from fiber.domain.models import Part, ReplicaSpec
+from fiber.domain.replication import multipart_etag, plan_parts
+
+_PARTIAL = ".partial"
+_SENT = re.compile(r"Total bytes sent:\s*([\d,]+)")
+
+
+@runtime_checkable
+class Replica(Protocol):
+    """An offsite destination for Bowl files.
+
+    put() is blocking and idempotent. It copies ``src`` to ``key`` (a Bowl-relative
+    path) and returns the bytes it had to send; a copy already there and verified
+    costs 0. An interrupted put() resumes on the next call, re-sending only the
+    parts whose checksums don't match.
+    """
+
+    name: str
+
+    def put(self, src: str, key: str) -> int: ...
+
+
+def _read(fd: int, part: Part) -> bytes:
+    return os.pread(fd, part.length, part.offset)
+
+
+class LocalReplica:
+    """Copies into a directory (a second disk, an NFS or SMB mount), ``parallel`` parts at a time.
+
+    The copy lands in <key>.partial and is renamed into place once every part matches
+    the source, so the directory never shows a half-written dump under its real name.
+    """
+
+    def __init__(self, root: str, part_size: int = 16 << 20, parallel: int = 4) -> None:
+        self.name = root
+        self._root = Path(root)
+        self._part_size = part_size
+        self._parallel = parallel
+
+    def put(self, src: str, key: str) -> int:
+        dest = self._root / key
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        size = os.path.getsize(src)
+        parts = plan_parts(size, self._part_size)
+        if dest.exists() and dest.stat().st_size == size and self._matches(src, str(dest), parts):
+            return 0
+        partial = dest.with_name(dest.name + _PARTIAL)
+        src_fd = os.open(src, os.O_RDONLY)
+        dst_fd = os.open(partial, os.O_RDWR | os.O_CREAT, 0o640)
+        try:
+            os.ftruncate(dst_fd, size)
+
+            def copy(part: Part) -> int:
+                data = _read(src_fd, part)
+                if _read(dst_fd, part) == data:
+                    return 0  # landed before an interruption
+                os.pwrite(dst_fd, data, part.offset)
+                return len(data)
+
+            with ThreadPoolExecutor(max_workers=self._parallel) as pool:
+                sent = sum(pool.map(copy, parts))
+            os.fsync(dst_fd)
+        finally:
+            os.close(src_fd)
+            os.close(dst_fd)
+        os.replace(partial, dest)
+        return sent
+
+    def _matches(self, src: str, dest: str, parts: list[Part]) -> bool:
+        src_fd, dst_fd = os.open(src, os.O_RDONLY), os.open(dest, os.O_RDONLY)
+        try:
+            with ThreadPoolExecutor(max_workers=self._parallel) as pool:
+                return all(pool.map(lambda p: _read(src_fd, p) == _read(dst_fd, p), parts))
+        finally:
+            os.close(src_fd)
+            os.close(dst_fd)
+
+
+class RsyncReplica:
+    """Copies over SSH with rsync, which does its own checksum-verified resume.
+
+    --partial keeps an interrupted transfer and --append-verify continues it, then
+    checks the whole file and re-sends it if the checksums disagree. rsync moves one
+    stream per file, so there are no parallel parts here. SSH runs in batch mode with
+    the keys and known_hosts of the Fiber container.
+    """
+
+    def __init__(self, dest: str, ssh: str = "ssh -o BatchMode=yes",
+                 run: Callable[..., subprocess.CompletedProcess[str]] = subprocess.run) -> None:
+        self.name = dest
+        self._dest = dest
+        self._ssh = ssh
+        self._run = run
+
+    def argv(self, src: str, key: str) -> list[str]:
+        return ["rsync", "--partial", "--append-verify", "--mkpath", "--protect-args", "--stats",
+                "-e", self._ssh, src, f"{self._dest}/{key}"]
+
+    def put(self, src: str, key: str) -> int:
+        proc = self._run(self.argv(src, key), capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise OSError(f"rsync to {self._dest} exited {proc.returncode}: {proc.stderr.strip()[-500:]}")
+        m = _SENT.search(proc.stdout)
+        return int(m.group(1).replace(",", "")) if m else 0
+
+
+class S3Replica:
+    """Uploads to an S3-compatible bucket as a multipart upload, ``parallel`` parts at a time.
+
+    Files that fit in one part go up with a single PUT. For larger ones, an
+    unfinished upload of the same key is picked up where it stopped. S3's ETag for a
+    part is its MD5, so each part is read, hashed and compared with what the bucket
+    already has, and only mismatches are sent. Every request carries Content-MD5, so
+    the server rejects a part that arrives corrupted.
+    """
+
+    def __init__(self, client: S3Client, name: str, prefix: str = "", part_size: int = 16 << 20,
+                 parallel: int = 4) -> None:
+        self.name = name
+        self._client = client
+        self._prefix = prefix
+        self._part_size = part_size
+        self._parallel = parallel
+
+    def put(self, src: str, key: str) -> int:
+        key = f"{self._prefix}/{key}" if self._prefix else key
+        parts = plan_parts(os.path.getsize(src), self._part_size)
+        fd = os.open(src, os.O_RDONLY)
+        try:
+            existing = self._client.head(key)
+            if existing is not None and existing[0] == sum(p.length for p in parts):
+                with ThreadPoolExecutor(max_workers=self._parallel) as pool:
+                    md5s = list(pool.map(lambda p: hashlib.md5(_read(fd, p)).digest(), parts))
+                if existing[1] == multipart_etag(md5s):
+                    return 0
+            if len(parts) == 1:
+                data = _read(fd, parts[0])
+                self._client.put(key, data)
+                return len(data)
+            return self._multipart(fd, key, parts)
+        finally:
+            os.close(fd)
+
+    def _multipart(self, fd: int, key: str, parts: list[Part]) -> int:
+        upload_id = self._client.find_upload(key)
+        uploaded = self._client.list_parts(key, upload_id) if upload_id else {}
+        if upload_id is None:
+            upload_id = self._client.create_upload(key)
+
+        def send(part: Part) -> tuple[int, str, int]:
+            data = _read(fd, part)
+            md5 = hashlib.md5(data).hexdigest()
+            if uploaded.get(part.number) == md5:
+                return part.number, md5, 0
+            return part.number, self._client.upload_part(key, upload_id, part.number, data), len(data)
+
+        with ThreadPoolExecutor(max_workers=self._parallel) as pool:
+            results = list(pool.map(send, parts))
+        self._client.complete(key, upload_id, {n: etag for n, etag, _ in results})
+        return sum(n for _, _, n in results)
+
+
+def build_replicas(specs: Sequence[ReplicaSpec], secrets: SecretReader, s3_endpoint: str,
+                   s3_region: str, s3_access_key: str, s3_secret: str,
+                   part_size: int = 16 << 20, parallel: int = 4) -> list[Replica]:
+    """One Replica per spec; S3 replicas read their secret key from Docker secret ``s3_secret``."""
+    replicas: list[Replica] = []
+    for spec in specs:
+        if spec.kind == "local":
+            replicas.append(LocalReplica(spec.location, part_size=part_size, parallel=parallel))
+        elif spec.kind == "rsync":
+            replicas.append(RsyncReplica(spec.location))
+        else:
+            client = S3Client(s3_endpoint, spec.location, s3_region, s3_access_key,
+                              secret_key=lambda: secrets.read(s3_secret))
+            replicas.append(S3Replica(client, spec.name, prefix=spec.prefix, part_size=part_size,
+                                      parallel=parallel))
+    return replicas
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from typing import Any
+
+from fiber.clients.compress import decompressor_argv
+from fiber.clients.dump_runner import RunOutcome, stop_process, write_creds
+from fiber.clients.engines import DumpEngine, RestoreFilter, build_default_engines
+from fiber.domain.models import Codec, DumpJob, Engine, RestoreTarget
+
+_CHUNK = 1 << 20
+
+
+def _file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        yield from iter(lambda: fh.read(_CHUNK), b"")
+
+
+class RestoreRunner:
+    """Runs an engine's restore command into a RestoreTarget.
+
+    When the engine can restore from stdin and the caller hands over ``chunks``, the
+    dump is fed through this process, through a zstd/pigz child first if it is
+    compressed. ``on_progress`` hears the running count of Bowl bytes fed, and the
+    outcome's bytes_written carries the total. Otherwise the restore tool reads in_path
+    itself. That covers parallel pg_restore -j, myloader and directory dumps, and
+    progress then arrives only at the end.
+
+    An engine's restore_filter (owner and grant statements out of a plain postgres
+    dump) runs on the decompressed bytes; a filtered format is streamed from in_path
+    when no ``chunks`` are given. A target with ``recreate`` has the destination
+    database dropped and created empty first. Like DumpRunner, this class only orchestrates; argv and credentials come
+    from the DumpEngine strategies.
+    """
+
+    def __init__(
+        self,
+        engines: Mapping[Engine, DumpEngine] | None = None,
+        process_factory: Callable[..., Awaitable[asyncio.subprocess.Process]] | None = None,
+    ) -> None:
+        self._engines = engines if engines is not None else build_default_engines()
+        self._process_factory: Callable[..., Awaitable[Any]] = (
+            process_factory if process_factory is not None else asyncio.create_subprocess_exec
+        )
+
+    async def run(
+        self, job: DumpJob, target: RestoreTarget, dbname: str, password: str, in_path: str,
+        chunks: Callable[[], Iterator[bytes]] | None = None, codec: Codec | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> RunOutcome:
+        engine = self._engines[job.engine]
+        creds_path: str | None = None
+        try:
+            content = engine.credentials_content(password)
+            if content is not None:
+                creds_path = write_creds(content)
+            env = {**os.environ, **engine.dump_env(password)}
+            if target.recreate:
+                returncode, stderr = await self._simple(engine.build_recreate_argv(target, dbname, creds_path), env)
+                if returncode != 0:
+                    return RunOutcome(returncode=returncode, stderr_tail=stderr[-4000:], cancelled=False)
+            transform = engine.restore_filter(job)
+            if chunks is None and transform is not None:
+                chunks = functools.partial(_file_chunks, in_path)
+            stream_argv = (engine.build_restore_stream_argv(job, target, dbname, creds_path)
+                           if chunks is not None else None)
+            procs: list[Any] = []
+            if stream_argv is None:
+                argv = engine.build_restore_argv(job, target, dbname, in_path, creds_path)
+                proc = await self._process_factory(
+                    *argv, env=env, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                procs.append(proc)
+                waiter = self._wait(proc)
+            else:
+                assert chunks is not None
+                proc = await self._process_factory(
+                    *stream_argv, env=env, stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                procs.append(proc)
+                decompressor = None
+                if codec is not None:
+                    decompressor = await self._process_factory(
+                        *decompressor_argv(codec), stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                    )
+                    procs.append(decompressor)
+                waiter = self._feed(proc, chunks(), decompressor, on_progress, transform)
+            try:
+                stderr, fed = await waiter
+            except asyncio.CancelledError:
+                for p in procs:
+                    await stop_process(p)
+                return RunOutcome(returncode=-1, stderr_tail="cancelled", cancelled=True)
+            returncode = next((p.returncode for p in procs if p.returncode), 0)
+            return RunOutcome(returncode=returncode, stderr_tail=stderr[-4000:], cancelled=False,
+                              bytes_written=fed)
+        finally:
+            if creds_path is not None:
+                try:
+                    os.unlink(creds_path)
+                except FileNotFoundError:
+                    pass
+
+    async def _simple(self, argv: list[str], env: dict[str, str]) -> tuple[int, str]:
+        proc = await self._process_factory(
+            *argv, env=env, stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        stderr, _ = await self._wait(proc)
+        return proc.returncode, stderr
+
+    @staticmethod
+    async def _wait(proc: asyncio.subprocess.Process) -> tuple[str, int]:
+        assert proc.stderr is not None
+        data = await proc.stderr.read()
+        await proc.wait()
+        return data.decode(errors="replace"), 0
+
+    @staticmethod
+    async def _feed(
+        proc: asyncio.subprocess.Process, chunks: Iterator[bytes],
+        decompressor: asyncio.subprocess.Process | None,
+        on_progress: Callable[[int], None] | None,
+        transform: RestoreFilter | None = None,
+    ) -> tuple[str, int]:
+        """Write ``chunks`` to the restore's stdin (via the decompressor, if any).
+
+        Bowl reads happen on a worker thread; stderr is drained concurrently so a
+        chatty restore can't deadlock on a full pipe. ``transform`` sees what the
+        restore reads, i.e. the decompressed stream; progress counts Bowl bytes.
+        """
+        assert proc.stdin is not None and proc.stderr is not None
+        restore_in = proc.stdin
+        sink = decompressor.stdin if decompressor is not None else restore_in
+        assert sink is not None
+        fed = 0
+
+        direct = transform if decompressor is None else None
+
+        async def pump() -> None:
+            nonlocal fed
+            try:
+                while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                    sink.write(direct.feed(chunk) if direct is not None else chunk)
+                    await sink.drain()
+                    fed += len(chunk)
+                    if on_progress is not None:
+                        on_progress(fed)
+                if direct is not None:
+                    sink.write(direct.finish())
+                    await sink.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the reader exited early; its return code says why
+            finally:
+                sink.close()
+
+        async def relay() -> None:
+            assert decompressor is not None and decompressor.stdout is not None
+            broken = False
+            while data := await decompressor.stdout.read(_CHUNK):
+                if broken:
+                    continue  # keep draining so the decompressor can exit
+                try:
+                    restore_in.write(transform.feed(data) if transform is not None else data)
+                    await restore_in.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    broken = True
+            if transform is not None and not broken:
+                try:
+                    restore_in.write(transform.finish())
+                    await restore_in.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            restore_in.close()
+
+        readers: list[Awaitable[Any]] = [proc.stderr.read(), pump()]
+        if decompressor is not None:
+            assert decompressor.stderr is not None
+            readers += [decompressor.stderr.read(), relay()]
+        results = await asyncio.gather(*readers)
+        await proc.wait()
+        stderr: bytes = results[0]
+        if decompressor is not None:
+            await decompressor.wait()
+            if not proc.returncode and decompressor.returncode:
+                stderr = b"decompressor: " + results[2]
+        return stderr.decode(errors="replace"), fed
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Callable
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return urllib.parse.quote(value, safe=safe)
+
+
+def _query(params: Mapping[str, str]) -> str:
+    return "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(params.items()))
+
+
+def sign_v4(method: str, host: str, path: str, query: Mapping[str, str], headers: Mapping[str, str],
+            payload_sha256: str, access_key: str, secret_key: str, region: str, now: datetime,
+            service: str = "s3") -> dict[str, str]:
+    """``headers`` plus host, x-amz-date, x-amz-content-sha256 and an AWS Signature V4 Authorization.
+
+    Every header passed in is signed. ``path`` is the raw (unencoded) request path.
+    """
+    amz_date = now.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    day = amz_date[:8]
+    signed = {k.lower(): " ".join(v.split()) for k, v in headers.items()}
+    signed.update({"host": host, "x-amz-date": amz_date, "x-amz-content-sha256": payload_sha256})
+    names = sorted(signed)
+    canonical = "\n".join([
+        method, _quote(path, safe="/-_.~"), _query(query),
+        "".join(f"{k}:{signed[k]}\n" for k in names), ";".join(names), payload_sha256,
+    ])
+    scope = f"{day}/{region}/{service}/aws4_request"
+    to_sign = "\n".join(["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical.encode()).hexdigest()])
+    key = f"AWS4{secret_key}".encode()
+    for part in (day, region, service, "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, to_sign.encode(), hashlib.sha256).hexdigest()
+    signed["authorization"] = (f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+                               f"SignedHeaders={';'.join(names)}, Signature={signature}")
+    return signed
+
+
+def _xml(body: bytes) -> ET.Element:
+    return ET.fromstring(body)
+
+
+def _text(node: ET.Element, tag: str) -> str:
+    return node.findtext(f"{{*}}{tag}") or node.findtext(tag) or ""
+
+
+class S3Client:
+    """The handful of S3 calls multipart replication needs, over plain urllib.
+
+    Requests are path-style (``<endpoint>/<bucket>/<key>``) so MinIO, Garage and
+    other S3-compatible servers work without DNS per bucket. The secret key is read
+    through ``secret_key`` on every request, so a rotated Docker secret is picked up.
+    Failures raise urllib's HTTPError/URLError (both OSErrors).
+    """
+
+    def __init__(self, endpoint: str, bucket: str, region: str, access_key: str,
+                 secret_key: Callable[[], str], timeout: float = 120.0,
+                 now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        parts = urllib.parse.urlsplit(endpoint)
+        self._scheme = parts.scheme or "https"
+        self._host = parts.netloc
+        self._bucket = bucket
+        self._region = region
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._timeout = timeout
+        self._now = now
+
+    def _request(self, method: str, key: str, query: Mapping[str, str] | None = None,
+                 body: bytes = b"", headers: Mapping[str, str] | None = None) -> tuple[dict[str, str], bytes]:
+        path = f"/{self._bucket}/{key}" if key else f"/{self._bucket}"
+        query = query or {}
+        hdrs = dict(headers or {})
+        if body:
+            hdrs["content-md5"] = base64.b64encode(hashlib.md5(body).digest()).decode()
+        signed = sign_v4(method, self._host, path, query, hdrs, hashlib.sha256(body).hexdigest(),
+                         self._access_key, self._secret_key(), self._region, self._now())
+        url = f"{self._scheme}://{self._host}{_quote(path, safe='/-_.~')}"
+        if query:
+            url += "?" + _query(query)
+        req = urllib.request.Request(url, data=body if method in ("PUT", "POST") else None,
+                                     method=method, headers=signed)
+        with urllib.request.urlopen(req, timeout=self._timeout) as resp:
+            return {k.lower(): v for k, v in resp.headers.items()}, resp.read()
+
+    def head(self, key: str) -> tuple[int, str] | None:
+        """(size, ETag) of an object, or None if there is none."""
+        try:
+            headers, _ = self._request("HEAD", key)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 404:
+                return None
+            raise
+        return int(headers.get("content-length", 0)), headers.get("etag", "").strip('"')
+
+    def put(self, key: str, data: bytes) -> str:
+        headers, _ = self._request("PUT", key, body=data)
+        return headers.get("etag", "").strip('"')
+
+    def create_upload(self, key: str) -> str:
+        _, body = self._request("POST", key, {"uploads": ""})
+        return _text(_xml(body), "UploadId")
+
+    def find_upload(self, key: str) -> str | None:
+        """The newest unfinished multipart upload of ``key``, if one was left behind."""
+        _, body = self._request("GET", "", {"uploads": "", "prefix": key})
+        ids = [_text(u, "UploadId") for u in _xml(body).iter()
+               if u.tag.rsplit("}", 1)[-1] == "Upload" and _text(u, "Key") == key]
+        return ids[-1] if ids else None
+
+    def list_parts(self, key: str, upload_id: str) -> dict[int, str]:
+        """Part number -> ETag of the parts already uploaded."""
+        parts: dict[int, str] = {}
+        marker = "0"
+        while True:
+            _, body = self._request("GET", key, {"uploadId": upload_id, "part-number-marker": marker})
+            root = _xml(body)
+            for p in root.iter():
+                if p.tag.rsplit("}", 1)[-1] == "Part":
+                    parts[int(_text(p, "PartNumber"))] = _text(p, "ETag").strip('"')
+            if _text(root, "IsTruncated") != "true":
+                return parts
+            marker = _text(root, "NextPartNumberMarker")
+
+    def upload_part(self, key: str, upload_id: str, number: int, data: bytes) -> str:
+        headers, _ = self._request("PUT", key, {"partNumber": str(number), "uploadId": upload_id}, data)
+        return headers.get("etag", "").strip('"')
+
+    def complete(self, key: str, upload_id: str, etags: Mapping[int, str]) -> None:
+        xml = "".join(f"<Part><PartNumber>{n}</PartNumber><ETag>\"{etags[n]}\"</ETag></Part>"
+                      for n in sorted(etags))
+        _, body = self._request("POST", key, {"uploadId": upload_id},
+                                f"<CompleteMultipartUpload>{xml}</CompleteMultipartUpload>".encode())
+        # S3 can answer 200 and still report the failure in the body.
+        if body and _xml(body).tag.rsplit("}", 1)[-1] == "Error":
+            raise OSError(f"completing {key} failed: {body.decode(errors='replace')[:500]}")
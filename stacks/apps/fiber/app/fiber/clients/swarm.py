@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from fiber.clients.discovery import LazyDockerGateway
+import docker
+
+from fiber.clients.discovery import LazyDockerGateway, change_from_event
 
 
 def extract_services(raw_services: list[dict[str, Any]]) -> dict[str, dict[str, str]]:
@@ -26,6 +28,9 @@ def extract_image(raw_service: dict[str, Any]) -> tuple[str | None, str | None]:
     return tag, (digest or None)
 
 
+_SERVICE_CHANGES = {"create": "upsert", "update": "upsert", "remove": "remove"}
+
+
 class DockerSwarmGateway(LazyDockerGateway):
     def list_dump_services(self) -> dict[str, dict[str, str]]:
         client = self._get_client()
@@ -36,3 +41,19 @@ class DockerSwarmGateway(LazyDockerGateway):
         client = self._get_client()
         svc = client.services.get(service)
         return extract_image(svc.attrs)
+
+    def event_stream(self) -> Any:
+        return self._get_client().events(decode=True, filters={"type": "service"})
+
+    def event_change(self, event: dict[str, Any]) -> tuple[str, str] | None:
+        return change_from_event(event, "service", _SERVICE_CHANGES)
+
+    def labels_of(self, service: str) -> dict[str, str] | None:
+        try:
+            svc = self._get_client().services.get(service)
+        except docker.errors.NotFound:
+            return None
+        labels = dict(svc.attrs.get("Spec", {}).get("Labels") or {})
+        if labels.get("fiber.enable") != "true":
+            return None
+        return labels
@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+
 import docker
 from dependency_injector import containers, providers
 from fastapi.templating import Jinja2Templates
 from prometheus_client import CollectorRegistry
 
 import fiber
-from fiber.clients.bowl import BowlStorage
+from fiber.clients.bowl import BowlCatalog, BowlStorage
+from fiber.clients.dedup_bowl import ChunkPools, DedupBowlStorage
 from fiber.clients.events import EventBroker
 from fiber.platform.clock import SystemClock
 from fiber.platform.config import Config
+from fiber.platform.executors import Executors
+from fiber.platform.tracing import span_exporter
 from fiber.db.database import Database
+from fiber.domain.replication import parse_replicas
+from fiber.domain.restore import verify_targets
 from fiber.clients.dump_runner import DumpRunner
 from fiber.clients.engines import build_default_engines
 from fiber.clients.probe import ConnectivityProbe
+from fiber.clients.replicas import build_replicas
+from fiber.clients.restore_runner import RestoreRunner
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
+from fiber.repositories.replications import ReplicationRepository
+from fiber.repositories.restores import RestoreRepository
 from fiber.platform.metrics import Metrics
 from fiber.services.dashboard import DashboardService
 from fiber.services.orchestrator import MovementOrchestrator
 from fiber.services.readiness import Readiness
 from fiber.services.registry_state import RegistryState
+from fiber.services.replicator import Replicator
+from fiber.services.restorer import Restorer
+from fiber.services.wall_feed import WallFeed
 from fiber.clients.secrets import SecretReader
 from fiber.clients.container import DockerContainerGateway
+from fiber.clients.discovery import EventDrivenDiscovery
 from fiber.clients.swarm import DockerSwarmGateway
 from fiber.services.worker_pool import WorkerPool
 
@@ -31,31 +47,106 @@ class Container(containers.DeclarativeContainer):
     registry = providers.Singleton(CollectorRegistry)
     metrics = providers.Singleton(Metrics, registry=registry)
     clock = providers.Singleton(SystemClock)
-    bowl = providers.Singleton(BowlStorage, root=config.provided.bowl_path)
-    database = providers.Singleton(Database, url=config.provided.db_url)
-    history_repository = providers.Singleton(HistoryRepository, session_factory=database.provided.session)
+    executors = providers.Singleton(
+        Executors, disk_workers=config.provided.disk_workers, net_workers=config.provided.net_workers,
+        db_workers=providers.Callable(lambda c: c.db_readers + 1, config),
+    )
+    spans = providers.Singleton(span_exporter, path=config.provided.trace_path,
+                                 max_mb=config.provided.trace_max_mb)
+    bowl_catalog = providers.Singleton(BowlCatalog)
+    chunk_pools = providers.Singleton(ChunkPools)
+    bowl_backend = providers.Callable(lambda c: c.bowl_backend, config)
+    bowl = providers.Selector(
+        bowl_backend,
+        plain=providers.Singleton(BowlStorage, root=config.provided.bowl_path, catalog=bowl_catalog),
+        dedup=providers.Singleton(
+            DedupBowlStorage, root=config.provided.bowl_path, catalog=bowl_catalog, pools=chunk_pools,
+        ),
+    )
+    database = providers.Singleton(
+        Database, url=config.provided.db_url, readers=config.provided.db_readers,
+        busy_timeout=config.provided.db_busy_timeout,
+    )
+    history_repository = providers.Singleton(
+        HistoryRepository, session_factory=database.provided.session,
+        read_session_factory=database.provided.read_session,
+    )
+    last_success = providers.Singleton(LastSuccessCache, history=history_repository, metrics=metrics)
     secrets = providers.Singleton(SecretReader, base_dir=config.provided.secrets_dir)
     engines = providers.Singleton(build_default_engines)
-    runner = providers.Singleton(DumpRunner, engines=engines)
-    probe = providers.Singleton(ConnectivityProbe, engines=engines)
+    runner = providers.Singleton(DumpRunner, engines=engines, executors=executors)
+    probe = providers.Singleton(
+        ConnectivityProbe, engines=engines,
+        timeout=config.provided.probe_timeout, ttl=config.provided.probe_ttl,
+        mode=config.provided.probe_mode, metrics=metrics,
+    )
     docker_client = providers.Factory(docker.DockerClient, base_url=config.provided.docker_host)
     swarm_gateway = providers.Singleton(DockerSwarmGateway, client_factory=docker_client.provider)
     container_gateway = providers.Singleton(DockerContainerGateway, client_factory=docker_client.provider)
     active_provider = providers.Callable(lambda c: c.provider, config)
-    discovery = providers.Selector(
+    gateway = providers.Selector(
         active_provider,
         swarm=swarm_gateway,
         docker=container_gateway,
     )
-    pool = providers.Singleton(WorkerPool, max_concurrent=config.provided.max_concurrent)
-    bowl_factory = providers.Factory(BowlStorage)
-    events = providers.Singleton(EventBroker)
+    watched_discovery = providers.Singleton(
+        EventDrivenDiscovery, gateway=gateway, resync_interval=config.provided.discovery_resync,
+    )
+    discovery_mode = providers.Callable(lambda c: c.discovery_mode, config)
+    discovery = providers.Selector(
+        discovery_mode,
+        poll=gateway,
+        events=watched_discovery,
+    )
+    discovery_changed = providers.Singleton(asyncio.Event)
+    pool = providers.Singleton(
+        WorkerPool, max_concurrent=config.provided.max_concurrent,
+        max_per_host=config.provided.max_per_host, max_per_volume=config.provided.max_per_volume,
+        default_volume=config.provided.bowl_path,
+    )
+    bowl_factory = providers.Selector(
+        bowl_backend,
+        plain=providers.Factory(BowlStorage, catalog=bowl_catalog),
+        dedup=providers.Factory(DedupBowlStorage, catalog=bowl_catalog, pools=chunk_pools),
+    )
+    events = providers.Singleton(EventBroker, metrics=metrics)
     registry_state = providers.Singleton(RegistryState)
+    replicas = providers.Singleton(
+        build_replicas, specs=providers.Callable(parse_replicas, config.provided.replicas), secrets=secrets,
+        s3_endpoint=config.provided.s3_endpoint, s3_region=config.provided.s3_region,
+        s3_access_key=config.provided.s3_access_key, s3_secret=config.provided.s3_secret,
+        part_size=providers.Callable(lambda c: c.replica_part_mb << 20, config),
+        parallel=config.provided.replica_parallel,
+    )
+    replication_repository = providers.Singleton(
+        ReplicationRepository, session_factory=database.provided.session,
+        read_session_factory=database.provided.read_session,
+    )
+    replicator = providers.Singleton(
+        Replicator, replicas=replicas, bowl_factory=bowl_factory.provider,
+        replications=replication_repository, history=history_repository, clock=clock, metrics=metrics,
+        executors=executors, concurrency=config.provided.replica_concurrency,
+    )
     orchestrator = providers.Singleton(
         MovementOrchestrator, bowl_factory=bowl_factory.provider, bowl_root=config.provided.bowl_path,
         secrets=secrets, runner=runner,
-        history=history_repository, discovery=discovery, clock=clock, fiber_version=fiber.__version__,
-        metrics=metrics, events=events,
+        history=history_repository, last_success=last_success, discovery=discovery, clock=clock,
+        fiber_version=fiber.__version__,
+        metrics=metrics, events=events, executors=executors, spans=spans, replicator=replicator,
+    )
+    restore_runner = providers.Singleton(RestoreRunner, engines=engines)
+    restore_repository = providers.Singleton(
+        RestoreRepository, session_factory=database.provided.session,
+        read_session_factory=database.provided.read_session,
+    )
+    restore_targets = providers.Singleton(
+        verify_targets, postgres=config.provided.restore_postgres, mysql=config.provided.restore_mysql,
+        secret=config.provided.restore_secret,
+    )
+    restorer = providers.Singleton(
+        Restorer, bowl_factory=bowl_factory.provider, secrets=secrets, runner=restore_runner,
+        history=history_repository, restores=restore_repository, clock=clock, metrics=metrics,
+        events=events, targets=restore_targets, executors=executors,
     )
     readiness = providers.Singleton(Readiness, bowl=bowl, history=history_repository, discovery=discovery)
     templates = providers.Singleton(Jinja2Templates, directory="fiber/templates")
@@ -67,4 +158,8 @@ class Container(containers.DeclarativeContainer):
         bowl=bowl,
         now=clock.provided.now,
         default_bowl_root=config.provided.bowl_path,
+        restorer=restorer,
+    )
+    wall_feed = providers.Singleton(
+        WallFeed, dashboard=dashboard_service, broker=events, templates=templates, executors=executors,
     )
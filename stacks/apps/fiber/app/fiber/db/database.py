@@ -1,26 +1,114 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable
 from contextlib import contextmanager
 from typing import Generator
 
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, SQLModel, create_engine
 
+from fiber.db import migrations
 import fiber.db.models  # noqa: F401 — registers SQLModel tables before create_all
 
 
+def _pragmas(engine: Engine, busy_timeout: float, query_only: bool = False) -> None:
+    """Tune every connection the engine opens; journal_mode=WAL sticks to the file."""
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _record) -> None:  # type: ignore[no-untyped-def]
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        if query_only:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+
+def _transactional_ddl(engine: Engine) -> None:
+    """Let SQLAlchemy issue BEGIN itself, so DDL commits or rolls back with its transaction.
+
+    pysqlite otherwise opens transactions only before INSERT/UPDATE/DELETE and runs
+    ALTER/CREATE/DROP in autocommit, which would leave a migration step half done.
+    """
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _record) -> None:  # type: ignore[no-untyped-def]
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn) -> None:  # type: ignore[no-untyped-def]
+        conn.exec_driver_sql("BEGIN")
+
+
 class Database:
-    def __init__(self, url: str) -> None:
-        self._engine = create_engine(url)
+    """The SQLite history file: one serialized writer and a pool of readers.
+
+    The file runs in WAL mode with synchronous=NORMAL, so readers never wait on a
+    movement being recorded and a commit costs no fsync until checkpoint. session()
+    is the writer: a single connection behind a lock, so writes queue in-process
+    instead of contending for SQLite's write lock. read_session() draws from
+    ``readers`` query-only connections. In-memory and non-SQLite URLs get one
+    ordinary engine for both.
+    """
+
+    def __init__(self, url: str, readers: int = 4, busy_timeout: float = 5.0) -> None:
+        self._write_lock = threading.Lock()
+        parsed = make_url(url)
+        if parsed.get_backend_name() != "sqlite":
+            self._engine = self._reader = create_engine(url)
+        elif parsed.database in (None, "", ":memory:"):
+            self._engine = self._reader = create_engine(url)
+            _transactional_ddl(self._engine)
+        else:
+            args = {"check_same_thread": False}
+            self._engine = create_engine(url, pool_size=1, max_overflow=0, connect_args=args)
+            _pragmas(self._engine, busy_timeout)
+            _transactional_ddl(self._engine)
+            self._reader = create_engine(url, pool_size=max(1, readers), max_overflow=0, connect_args=args)
+            _pragmas(self._reader, busy_timeout, query_only=True)
         self._session_factory = sessionmaker(
             class_=Session, autocommit=False, autoflush=False, bind=self._engine,
         )
+        self._read_factory = sessionmaker(
+            class_=Session, autocommit=False, autoflush=False, bind=self._reader,
+        )
+        # movement_old alone is a legacy upgrade that stopped after its rename.
+        existing = any(inspect(self._engine).has_table(t) for t in ("movement", "movement_old"))
         SQLModel.metadata.create_all(self._engine)
+        self._migrate(existing)
+
+    def _migrate(self, existing: bool) -> None:
+        """Stamp a fresh file at the latest schema, or upgrade an older one in place."""
+        if not existing:
+            with self._engine.begin() as conn:
+                migrations.stamp(conn, migrations.LATEST)
+            return
+        with self._engine.connect() as conn:
+            version = migrations.current_version(conn)
+        for target in range(version + 1, migrations.LATEST + 1):
+            with self._engine.begin() as conn:
+                migrations.MIGRATIONS[target - 1](conn)
+                migrations.stamp(conn, target)
 
     @contextmanager
     def session(self) -> Generator[Session, None, None]:
-        session: Session = self._session_factory()
+        """A session on the writer; one at a time, in the order they were asked for."""
+        with self._write_lock:
+            with self._open(self._session_factory) as session:
+                yield session
+
+    @contextmanager
+    def read_session(self) -> Generator[Session, None, None]:
+        """A session on a pooled query-only connection; never waits for the writer."""
+        with self._open(self._read_factory) as session:
+            yield session
+
+    @staticmethod
+    @contextmanager
+    def _open(factory: Callable[[], Session]) -> Generator[Session, None, None]:
+        session = factory()
         try:
             yield session
         except Exception:
@@ -0,0 +1,124 @@
+"""Ordered, in-place upgrades for fiber.db files written by older Fiber versions.
+
+A fresh database is created straight at the latest schema by SQLModel and stamped
+with LATEST. An existing file is upgraded by running every step after the version
+recorded in schema_version (0 when the table did not exist yet), each in its own
+transaction, so a crash mid-upgrade resumes from the last completed step.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import Connection, text
+
+from fiber.domain.schedule import blend_duration
+
+
+def _epoch(iso: str) -> int:
+    dt = datetime.fromisoformat(iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _epoch_timestamps(conn: Connection) -> None:
+    """Rebuild movement with integer epoch timestamps and the history indexes.
+
+    A movement_old left by an upgrade that died after its rename (older Fibers ran the
+    DDL outside the transaction) is picked up and its rows copied over.
+    """
+    if "started_at" in _columns(conn, "movement"):
+        conn.execute(text("ALTER TABLE movement RENAME TO movement_old"))
+    if not _columns(conn, "movement_old"):
+        return
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS movement ("
+        " id INTEGER NOT NULL PRIMARY KEY,"
+        " service VARCHAR NOT NULL,"
+        " engine VARCHAR NOT NULL,"
+        " started_ts INTEGER NOT NULL,"
+        " finished_ts INTEGER NOT NULL,"
+        " outcome VARCHAR NOT NULL,"
+        " bytes_written INTEGER NOT NULL,"
+        " bristol_type INTEGER,"
+        " sample_path VARCHAR,"
+        " receipt_path VARCHAR,"
+        " app_image VARCHAR,"
+        " app_digest VARCHAR)"
+    ))
+    rows = conn.execute(text("SELECT * FROM movement_old")).mappings().all()
+    if rows:
+        conn.execute(
+            text(
+                "INSERT OR IGNORE INTO movement (id, service, engine, started_ts, finished_ts, outcome,"
+                " bytes_written, bristol_type, sample_path, receipt_path, app_image, app_digest)"
+                " VALUES (:id, :service, :engine, :started_ts, :finished_ts, :outcome,"
+                " :bytes_written, :bristol_type, :sample_path, :receipt_path, :app_image, :app_digest)"
+            ),
+            [
+                {**r, "started_ts": _epoch(r["started_at"]), "finished_ts": _epoch(r["finished_at"])}
+                for r in rows
+            ],
+        )
+    conn.execute(text("DROP TABLE movement_old"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_movement_service_outcome_finished ON movement (service, outcome, finished_ts)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_movement_service_finished ON movement (service, finished_ts)"))
+
+
+def _backfill_summaries(conn: Connection) -> None:
+    """Seed service_summary from movement history written before the table existed."""
+    if conn.execute(text("SELECT 1 FROM service_summary LIMIT 1")).first() is not None:
+        return
+    conn.execute(text(
+        "INSERT INTO service_summary (service, last_id, clean_id) "
+        "SELECT s.service, "
+        "(SELECT id FROM movement m WHERE m.service = s.service "
+        " ORDER BY m.finished_ts DESC, m.id DESC LIMIT 1), "
+        "(SELECT id FROM movement m WHERE m.service = s.service AND m.outcome = 'clean' "
+        " ORDER BY m.finished_ts DESC, m.id DESC LIMIT 1) "
+        "FROM (SELECT DISTINCT service FROM movement) s"
+    ))
+
+
+def _summary_durations(conn: Connection) -> None:
+    """Add service_summary.duration_s and seed it from each service's recent clean movements."""
+    if "duration_s" not in _columns(conn, "service_summary"):
+        conn.execute(text("ALTER TABLE service_summary ADD COLUMN duration_s FLOAT"))
+    rows = conn.execute(text(
+        "SELECT service, finished_ts - started_ts FROM movement WHERE outcome = 'clean' "
+        "ORDER BY service, finished_ts, id"
+    )).all()
+    estimates: dict[str, float] = {}
+    for service, seconds in rows:
+        estimates[service] = blend_duration(estimates.get(service), float(seconds))
+    if estimates:
+        conn.execute(
+            text("UPDATE service_summary SET duration_s = :d WHERE service = :s"),
+            [{"s": s, "d": d} for s, d in estimates.items()],
+        )
+
+
+# Append only: position in this list is the schema version a step upgrades to.
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _epoch_timestamps,
+    _backfill_summaries,
+    _summary_durations,
+]
+
+LATEST = len(MIGRATIONS)
+
+
+def current_version(conn: Connection) -> int:
+    row = conn.execute(text("SELECT version FROM schema_version WHERE id = 1")).first()
+    return row[0] if row else 0
+
+
+def stamp(conn: Connection, version: int) -> None:
+    conn.execute(text("INSERT OR REPLACE INTO schema_version (id, version) VALUES (1, :v)"), {"v": version})
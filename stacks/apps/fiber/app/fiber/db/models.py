@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Movement(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_movement_service_outcome_finished", "service", "outcome", "finished_ts"),
+        Index("ix_movement_service_finished", "service", "finished_ts"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     service: str
     engine: str
-    started_at: str
-    finished_at: str
+    started_ts: int  # unix epoch seconds, UTC
+    finished_ts: int
     outcome: str
     bytes_written: int
     bristol_type: Optional[int] = None
@@ -18,3 +24,74 @@ class Movement(SQLModel, table=True):
     receipt_path: Optional[str] = None
     app_image: Optional[str] = None
     app_digest: Optional[str] = None
+
+
+class ServiceSummary(SQLModel, table=True):
+    """Per-service pointers to the newest movement and the newest clean one, plus the
+    running estimate of how long a clean movement takes.
+
+    Maintained by HistoryRepository.record so the dashboard reads one row per service
+    instead of re-querying the movement history for every card.
+    """
+
+    __tablename__ = "service_summary"
+
+    service: str = Field(primary_key=True)
+    last_id: int
+    clean_id: Optional[int] = None
+    duration_s: Optional[float] = None
+
+
+class MovementRollup(SQLModel, table=True):
+    """One service's movements for one UTC day, once the raw rows age out of retention."""
+
+    __tablename__ = "movement_rollup"
+
+    service: str = Field(primary_key=True)
+    day_ts: int = Field(primary_key=True)  # unix epoch seconds of 00:00 UTC
+    clean: int = 0
+    clogged: int = 0
+    pinched: int = 0
+    median_bytes: Optional[int] = None  # of clean movements only
+    p95_duration_s: int = 0
+
+
+class Restore(SQLModel, table=True):
+    """One restore of a Bowl dump into a target database; ``test`` marks scheduled verifications."""
+
+    __table_args__ = (Index("ix_restore_service_test", "service", "test"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    service: str
+    engine: str
+    dump_path: str
+    target: str
+    started_ts: int  # unix epoch seconds, UTC
+    finished_ts: int
+    outcome: str
+    bytes_read: int
+    test: bool
+
+
+class Replication(SQLModel, table=True):
+    """One attempt to copy a dump to an offsite replica; replicated_ts - dumped_ts is the lag."""
+
+    __table_args__ = (Index("ix_replication_service_target", "service", "target"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    service: str
+    target: str
+    dump_path: str
+    dumped_ts: int  # unix epoch seconds, UTC: when the movement finished
+    replicated_ts: int
+    outcome: str
+    bytes_sent: int
+
+
+class SchemaVersion(SQLModel, table=True):
+    """Single row recording which fiber.db.migrations step the file has reached."""
+
+    __tablename__ = "schema_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int
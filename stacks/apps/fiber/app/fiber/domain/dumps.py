@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from fiber.domain.models import BowlEntry
+import hashlib
+from collections.abc import Callable, Sequence
+from datetime import datetime
+
+from fiber.domain.models import BowlEntry, FileDigest, Retention
 
 
 def classify(size_bytes: int, baseline_median: int | None) -> int:
@@ -23,9 +27,67 @@ def classify(size_bytes: int, baseline_median: int | None) -> int:
     return 7
 
 
-def plan_sweep(entries: list[BowlEntry], retain: int) -> tuple[list[BowlEntry], list[BowlEntry]]:
-    """Split Bowl entries into (finals to delete beyond retain, leftover temp dingleberries)."""
+_SAMPLE = ".stool.log"
+
+_PERIODS: tuple[tuple[str, Callable[[datetime], object]], ...] = (
+    ("daily", lambda t: (t.year, t.month, t.day)),
+    ("weekly", lambda t: t.isocalendar()[:2]),
+    ("monthly", lambda t: (t.year, t.month)),
+    ("yearly", lambda t: t.year),
+)
+
+
+def plan_sweep(entries: list[BowlEntry], retain: int,
+               retention: Retention | None = None) -> tuple[list[BowlEntry], list[BowlEntry]]:
+    """Split Bowl entries into (finals to delete, oldest first; leftover temp dingleberries).
+
+    Without ``retention`` the newest ``retain`` dumps are kept (0 keeps everything).
+    With it, a dump is also kept when it is the newest of its UTC day, ISO week, month
+    or year, for as many of the most recent periods as the policy asks. Entries are
+    sorted once, newest first, and each is checked against every period in that pass.
+    Failure samples (.stool.log) never take a dump's slot; they are pruned on their own
+    to the newest ``retain`` (or, GFS-only, the largest period count).
+    """
     dingleberries = [e for e in entries if e.is_temp]
-    finals = sorted((e for e in entries if not e.is_temp), key=lambda e: e.modified_at)
-    to_delete = finals[:-retain] if retain > 0 and len(finals) > retain else []
-    return to_delete, dingleberries
+    finals = sorted((e for e in entries if not e.is_temp), key=lambda e: e.modified_at, reverse=True)
+    dumps = [e for e in finals if not e.path.endswith(_SAMPLE)]
+    samples = [e for e in finals if e.path.endswith(_SAMPLE)]
+    if retention is None and retain <= 0:
+        return [], dingleberries
+    limits = {name: getattr(retention, name) if retention else 0 for name, _ in _PERIODS}
+    kept = dict.fromkeys(limits, 0)
+    last: dict[str, object] = {}
+    to_delete: list[BowlEntry] = []
+    for i, entry in enumerate(dumps):
+        keep = i < retain
+        for name, period in _PERIODS:
+            if kept[name] >= limits[name]:
+                continue
+            key = period(entry.modified_at)
+            if last.get(name) != key:
+                last[name] = key
+                kept[name] += 1
+                keep = True
+        if not keep:
+            to_delete.append(entry)
+    to_delete += samples[retain if retain > 0 else max(limits.values()):]
+    return sorted(to_delete, key=lambda e: e.modified_at), dingleberries
+
+
+def merkle_root(files: Sequence[FileDigest]) -> str:
+    """Merkle root over per-file digests, in the order given (callers sort by path).
+
+    Leaves bind each file's relative path to its digest; an odd node is carried up a
+    level unchanged. Any single file can later be re-checked against its own leaf.
+    """
+    level = [hashlib.sha256(b"\x00" + f.path.encode() + b"\x00" + bytes.fromhex(f.sha256)).digest()
+             for f in files]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        paired = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from croniter import croniter
 
-from fiber.domain.models import DumpFormat, DumpJob, Engine, MisconfiguredJob
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob, Engine, MisconfiguredJob, Retention
 
 _DEFAULTS = {"schedule": "0 3 * * *", "retain": 7, "format": "custom", "jobs": 1, "port_pg": 5432, "port_mysql": 3306}
 
@@ -13,6 +15,38 @@ _ENGINE_FORMATS = {
 }
 
 
+_CODEC_LEVELS = {Codec.ZSTD: range(1, 20), Codec.GZIP: range(1, 10)}
+
+
+def _compression(raw: str) -> Compression:
+    """Parse codec[:level[:threads]], e.g. 'zstd', 'zstd:19', 'gzip:6:4'. Raises ValueError."""
+    parts = raw.strip().split(":")
+    if len(parts) > 3:
+        raise ValueError(raw)
+    codec = Codec(parts[0])
+    level = int(parts[1]) if len(parts) > 1 and parts[1] else None
+    threads = int(parts[2]) if len(parts) > 2 else 1
+    if (level is not None and level not in _CODEC_LEVELS[codec]) or threads < 1:
+        raise ValueError(raw)
+    return Compression(codec=codec, level=level, threads=threads)
+
+
+_RETENTION_PERIODS = ("daily", "weekly", "monthly", "yearly")
+
+
+def _retention(labels: dict[str, str]) -> Retention | None:
+    """GFS counts from fiber.retain.<period> labels; None when none are set. Raises ValueError."""
+    counts: dict[str, int] = {}
+    for period in _RETENTION_PERIODS:
+        raw = labels.get(f"fiber.retain.{period}")
+        if raw is None:
+            continue
+        if not raw.strip().isdigit():
+            raise ValueError(f"invalid fiber.retain.{period}: '{raw}'")
+        counts[period] = int(raw)
+    return Retention(**counts) if any(counts.values()) else None
+
+
 def _duration_seconds(raw: str) -> float:
     raw = raw.strip()
     units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
@@ -21,8 +55,28 @@ def _duration_seconds(raw: str) -> float:
     return float(raw)
 
 
+@lru_cache(maxsize=256)
+def _valid_schedule(schedule: str) -> bool:
+    return croniter.is_valid(schedule)
+
+
 def parse_job(service: str, labels: dict[str, str], active_provider: str = "swarm") -> DumpJob | MisconfiguredJob | None:
-    """Parse one discovered service's fiber.* labels into a DumpJob (or MisconfiguredJob)."""
+    """Parse one discovered service's fiber.* labels into a DumpJob (or MisconfiguredJob).
+
+    Results are memoised on the labels' content: both result types are frozen, so a
+    service whose labels haven't changed gets the very same object back every scan.
+    """
+    return _parse_cached(service, frozenset(labels.items()), active_provider)
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(
+    service: str, items: frozenset[tuple[str, str]], active_provider: str,
+) -> DumpJob | MisconfiguredJob | None:
+    return _parse(service, dict(items), active_provider)
+
+
+def _parse(service: str, labels: dict[str, str], active_provider: str) -> DumpJob | MisconfiguredJob | None:
     if labels.get("fiber.enable", "").lower() != "true":
         return None
 
@@ -41,7 +95,7 @@ def parse_job(service: str, labels: dict[str, str], active_provider: str = "swar
         return MisconfiguredJob(service=service, errors=tuple(errors))
 
     schedule = labels.get("fiber.schedule", _DEFAULTS["schedule"])
-    if not croniter.is_valid(schedule):
+    if not _valid_schedule(schedule):
         return MisconfiguredJob(service=service, errors=(f"invalid cron: '{schedule}'",))
 
     engine = Engine(labels.get("fiber.engine", "postgres"))
@@ -56,6 +110,28 @@ def parse_job(service: str, labels: dict[str, str], active_provider: str = "swar
             errors=(f"format '{fmt.value}' unsupported for {engine.value} engine",),
         )
 
+    compress_raw = labels.get("fiber.compress")
+    compression: Compression | None = None
+    if compress_raw:
+        try:
+            compression = _compression(compress_raw)
+        except ValueError:
+            return MisconfiguredJob(service=service, errors=(f"invalid fiber.compress: '{compress_raw}'",))
+        if fmt is DumpFormat.CUSTOM:
+            return MisconfiguredJob(
+                service=service,
+                errors=("fiber.compress needs plain or directory format; custom is already compressed",),
+            )
+
+    weight_raw = labels.get("fiber.weight", "1")
+    if not weight_raw.isdigit() or int(weight_raw) < 1:
+        return MisconfiguredJob(service=service, errors=(f"invalid fiber.weight: '{weight_raw}'",))
+
+    try:
+        retention = _retention(labels)
+    except ValueError as exc:
+        return MisconfiguredJob(service=service, errors=(str(exc),))
+
     return DumpJob(
         service=service,
         engine=engine,
@@ -73,6 +149,9 @@ def parse_job(service: str, labels: dict[str, str], active_provider: str = "swar
         app=labels.get("fiber.app"),
         schema_version_query=labels.get("fiber.schema_version_query"),
         path=labels.get("fiber.path"),
+        compression=compression,
+        weight=int(weight_raw),
+        retention=retention,
     )
 
 
@@ -16,12 +16,44 @@ class DumpFormat(str, Enum):
     PLAIN = "plain"
 
 
+class Codec(str, Enum):
+    ZSTD = "zstd"
+    GZIP = "gzip"
+
+    @property
+    def suffix(self) -> str:
+        return {Codec.ZSTD: "zst", Codec.GZIP: "gz"}[self]
+
+
+@dataclass(frozen=True)
+class Compression:
+    """Per-service compression stage, from the fiber.compress label (codec[:level[:threads]])."""
+
+    codec: Codec
+    level: int | None = None
+    threads: int = 1
+
+
 class MovementOutcome(str, Enum):
     CLEAN = "clean"
     CLOGGED = "clogged"
     PINCHED = "pinched"
 
 
+@dataclass(frozen=True)
+class Retention:
+    """Grandfather-father-son retention from the fiber.retain.<period> labels.
+
+    Each count is how many of the most recent days, ISO weeks, months or years keep
+    their newest dump; 0 leaves that period out.
+    """
+
+    daily: int = 0
+    weekly: int = 0
+    monthly: int = 0
+    yearly: int = 0
+
+
 @dataclass(frozen=True)
 class DumpJob:
     service: str
@@ -40,6 +72,9 @@ class DumpJob:
     app: str | None
     schema_version_query: str | None
     path: str | None = None
+    compression: Compression | None = None
+    weight: int = 1
+    retention: Retention | None = None  # GFS periods on top of the newest ``retain``
 
     @property
     def bowl_key(self) -> str:
@@ -58,6 +93,7 @@ class BowlEntry:
     size_bytes: int
     modified_at: datetime
     is_temp: bool
+    links: tuple[tuple[int, int, int], ...] = ()  # (device, inode, bytes) of files with other hard links
 
 
 @dataclass(frozen=True)
@@ -75,6 +111,137 @@ class MovementRecord:
     app_digest: str | None
 
 
+@dataclass(frozen=True)
+class RestoreTarget:
+    """A database server restores are written to, and the login Fiber uses there.
+
+    ``recreate`` drops and recreates the destination database first; only set it for
+    servers that hold nothing but restores (the test-restore instances).
+    """
+
+    host: str
+    port: int
+    user: str
+    secret: str
+    recreate: bool = False
+
+
+@dataclass(frozen=True)
+class RestoreRecord:
+    service: str
+    engine: Engine
+    dump_path: str
+    target: str  # host:port/dbname
+    started_at: datetime
+    finished_at: datetime
+    outcome: MovementOutcome
+    bytes_read: int
+    test: bool
+
+
+@dataclass(frozen=True)
+class RestoreProgress:
+    """A restore in flight: how much of the dump has been fed to the restore tool."""
+
+    started_at: datetime
+    bytes_done: int = 0
+    bytes_total: int | None = None
+
+
+@dataclass(frozen=True)
+class ReplicaSpec:
+    """One offsite copy destination from FIBER_REPLICAS.
+
+    ``kind`` is "local" (a directory, e.g. a second disk or NFS mount), "rsync" (an
+    SSH destination) or "s3"; ``location`` is the directory, the ``user@host:/path``
+    or the bucket, and ``prefix`` the key prefix inside an S3 bucket.
+    """
+
+    kind: str
+    location: str
+    prefix: str = ""
+
+    @property
+    def name(self) -> str:
+        if self.kind == "s3":
+            return f"s3://{self.location}/{self.prefix}".rstrip("/")
+        return self.location
+
+
+@dataclass(frozen=True)
+class Part:
+    """One piece of a multipart upload; ``number`` counts from 1 as S3 does."""
+
+    number: int
+    offset: int
+    length: int
+
+
+@dataclass(frozen=True)
+class ReplicationItem:
+    """A clean dump waiting to be copied offsite; ``done`` names replicas that already hold it."""
+
+    service: str
+    dump_path: str
+    receipt_path: str
+    dumped_at: datetime
+    done: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class ReplicationRecord:
+    service: str
+    target: str  # ReplicaSpec.name
+    dump_path: str
+    dumped_at: datetime
+    replicated_at: datetime
+    outcome: MovementOutcome
+    bytes_sent: int
+
+    @property
+    def lag_s(self) -> float:
+        """How long after the dump finished the replica held a full copy of it."""
+        return (self.replicated_at - self.dumped_at).total_seconds()
+
+
+@dataclass(frozen=True)
+class HistorySummary:
+    """What the dashboard needs per service from movement history, read in one go."""
+
+    last_success: datetime | None = None
+    last_outcome: MovementOutcome | None = None
+    latest_clean: MovementRecord | None = None
+    expected_duration_s: float | None = None
+
+
+@dataclass(frozen=True)
+class DailyRollup:
+    """Aggregate of one service's movements on one UTC day, kept after the raw rows are compacted."""
+
+    service: str
+    day: datetime
+    clean: int
+    clogged: int
+    pinched: int
+    median_bytes: int | None
+    p95_duration_s: int
+
+    @property
+    def worst(self) -> MovementOutcome:
+        if self.clogged:
+            return MovementOutcome.CLOGGED
+        if self.pinched:
+            return MovementOutcome.PINCHED
+        return MovementOutcome.CLEAN
+
+
+@dataclass(frozen=True)
+class FileDigest:
+    path: str  # relative to the dump directory
+    sha256: str
+    bytes: int
+
+
 @dataclass(frozen=True)
 class Manifest:
     service: str
@@ -90,3 +257,7 @@ class Manifest:
     fiber_version: str
     schema_marker: str | None
     finished_at: str
+    merkle_root: str | None = None  # DIRECTORY dumps: sha256 is this root over `files`
+    files: tuple[FileDigest, ...] = ()
+    codec: str | None = None
+    raw_bytes: int | None = None  # before compression; None when the engine compressed natively
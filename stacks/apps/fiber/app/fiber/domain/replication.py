@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import re
+
+from fiber.domain.models import Part, ReplicaSpec
+
+_MIN_PART = 5 << 20  # S3's floor for every part but the last
+_MAX_PARTS = 10_000
+_RSYNC = re.compile(r"^[^@\s/]+@[^:\s/]+:/\S*$")
+
+
+def parse_replicas(raw: str) -> list[ReplicaSpec]:
+    """FIBER_REPLICAS as specs: a comma-separated list of replica destinations.
+
+    ``/mnt/offsite`` or ``file:///mnt/offsite`` is a local directory,
+    ``user@host:/path`` or ``ssh://user@host/path`` an rsync-over-SSH destination and
+    ``s3://bucket[/prefix]`` a bucket on FIBER_S3_ENDPOINT.
+    """
+    specs: list[ReplicaSpec] = []
+    for item in (s.strip() for s in raw.split(",")):
+        if not item:
+            continue
+        if item.startswith("s3://"):
+            bucket, _, prefix = item[len("s3://"):].partition("/")
+            if not bucket:
+                raise ValueError(f"replica {item!r} names no bucket")
+            specs.append(ReplicaSpec(kind="s3", location=bucket, prefix=prefix.strip("/")))
+        elif item.startswith("ssh://"):
+            userhost, slash, path = item[len("ssh://"):].partition("/")
+            dest = f"{userhost}:/{path}"
+            if not slash or not _RSYNC.match(dest):
+                raise ValueError(f"replica {item!r} must look like ssh://user@host/path")
+            specs.append(ReplicaSpec(kind="rsync", location=dest.rstrip("/")))
+        elif _RSYNC.match(item):
+            specs.append(ReplicaSpec(kind="rsync", location=item.rstrip("/")))
+        elif item.startswith("file://") or item.startswith("/"):
+            path = item[len("file://"):] if item.startswith("file://") else item
+            specs.append(ReplicaSpec(kind="local", location=path.rstrip("/") or "/"))
+        else:
+            raise ValueError(f"replica {item!r} is not a path, user@host:/path or s3://bucket")
+    return specs
+
+
+def plan_parts(size: int, part_size: int) -> list[Part]:
+    """Split ``size`` bytes into upload parts of ``part_size``.
+
+    Parts grow past ``part_size`` when needed to stay within S3's 10,000-part limit and
+    never shrink below its 5 MiB minimum. An empty file is one empty part.
+    """
+    part_size = max(part_size, _MIN_PART, -(-size // _MAX_PARTS))
+    if size == 0:
+        return [Part(number=1, offset=0, length=0)]
+    return [Part(number=i + 1, offset=off, length=min(part_size, size - off))
+            for i, off in enumerate(range(0, size, part_size))]
+
+
+def multipart_etag(part_md5s: list[bytes]) -> str:
+    """The ETag S3 gives an object completed from parts with these MD5 digests.
+
+    A single-part upload's ETag is the plain MD5 of the object.
+    """
+    if len(part_md5s) == 1:
+        return part_md5s[0].hex()
+    return f"{hashlib.md5(b''.join(part_md5s)).hexdigest()}-{len(part_md5s)}"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+
+from fiber.domain.models import DumpJob, Engine, RestoreTarget
+
+_TARGET = re.compile(r"^(?P<user>[^@\s]+)@(?P<host>[^:\s]+)(?::(?P<port>\d+))?$")
+_DEFAULT_PORT = {Engine.POSTGRES: 5432, Engine.MYSQL: 3306}
+
+
+def parse_target(spec: str, engine: Engine, secret: str, recreate: bool = False) -> RestoreTarget | None:
+    """``user@host[:port]`` as a RestoreTarget, or None for an empty spec."""
+    if not spec:
+        return None
+    m = _TARGET.match(spec.strip())
+    if m is None:
+        raise ValueError(f"restore target must look like user@host[:port], got {spec!r}")
+    port = int(m["port"]) if m["port"] else _DEFAULT_PORT[engine]
+    return RestoreTarget(host=m["host"], port=port, user=m["user"], secret=secret, recreate=recreate)
+
+
+def verify_targets(postgres: str, mysql: str, secret: str) -> dict[Engine, RestoreTarget]:
+    """The throwaway instances test restores go to, per engine; engines left blank are not verified."""
+    targets = {engine: parse_target(spec, engine, secret, recreate=True)
+               for engine, spec in ((Engine.POSTGRES, postgres), (Engine.MYSQL, mysql))}
+    return {engine: t for engine, t in targets.items() if t is not None}
+
+
+def scratch_dbname(service: str) -> str:
+    """The database a test restore of ``service`` writes to; one per service so two apps'
+    identically named databases never restore over each other."""
+    return "fiber_verify_" + re.sub(r"\W", "_", service)
+
+
+def next_to_verify(jobs: list[DumpJob], verified: dict[str, datetime]) -> DumpJob | None:
+    """The job that has gone longest without a test restore; never-verified jobs first."""
+    never = sorted((j for j in jobs if j.service not in verified), key=lambda j: j.service)
+    if never:
+        return never[0]
+    return min(jobs, key=lambda j: (verified[j.service], j.service), default=None)
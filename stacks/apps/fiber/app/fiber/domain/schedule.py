@@ -1,19 +1,48 @@
 from __future__ import annotations
 
-from datetime import datetime
+import heapq
+import statistics
+from datetime import datetime, tzinfo
 
 from croniter import croniter
 
 from fiber.domain.models import DumpJob
 
+_EWMA_ALPHA = 0.3
+
+
+# schedule, tz -> (previous fire, next fire) around the last ``now`` seen for it
+_windows: dict[tuple[str, tzinfo | None], tuple[datetime, datetime]] = {}
+_MAX_WINDOWS = 1024
+
+
+def _window(schedule: str, now: datetime) -> tuple[datetime, datetime]:
+    """The fire times either side of ``now``, compiled once per fire interval.
+
+    While ``now`` stays strictly between the cached pair, croniter would return the
+    same two values, so the cron expression is only evaluated again once ``now``
+    crosses a fire time.
+    """
+    key = (schedule, now.tzinfo)
+    window = _windows.get(key)
+    if window is None or not window[0] < now < window[1]:
+        if len(_windows) >= _MAX_WINDOWS:
+            _windows.clear()
+        nxt = croniter(schedule, now).get_next(datetime)
+        window = (croniter(schedule, nxt).get_prev(datetime), nxt)
+        _windows[key] = window
+        if not window[0] < now:  # now is itself a fire time; croniter's previous is the one before
+            return croniter(schedule, now).get_prev(datetime), nxt
+    return window
+
 
 def _previous_fire(schedule: str, now: datetime) -> datetime:
-    return croniter(schedule, now).get_prev(datetime)
+    return _window(schedule, now)[0]
 
 
 def next_fire(schedule: str, now: datetime) -> datetime:
     """Return the next scheduled fire time after now."""
-    return croniter(schedule, now).get_next(datetime)
+    return _window(schedule, now)[1]
 
 
 def is_overdue(last_success: datetime | None, schedule: str, now: datetime) -> bool:
@@ -33,3 +62,83 @@ def due_jobs(
         if is_overdue(last_success.get(job.service), job.schedule, now):
             due.append(job)
     return due
+
+
+class FireHeap:
+    """When each job next needs the scan loop's attention, earliest first.
+
+    A min-heap holds each job's next cron fire; fires that have passed roll forward
+    to the one after. Holds keep a job that was just deferred or run from being
+    retried before they expire. The scan loop sleeps until next_wake() instead of
+    waking on a fixed interval.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, str, int]] = []
+        self._tokens: dict[str, tuple[str, int]] = {}  # service -> (schedule, token of its live entry)
+        self._holds: dict[str, datetime] = {}
+        self._seq = 0
+
+    def sync(self, jobs: list[DumpJob], now: datetime) -> None:
+        """Track exactly ``jobs``: plan new ones and changed schedules; drop the rest."""
+        current = {j.service: j.schedule for j in jobs}
+        tokens: dict[str, tuple[str, int]] = {}
+        for service, schedule in current.items():
+            known = self._tokens.get(service)
+            if known is not None and known[0] == schedule:
+                tokens[service] = known
+                continue
+            self._seq += 1
+            tokens[service] = (schedule, self._seq)
+            heapq.heappush(self._heap, (next_fire(schedule, now), service, self._seq))
+        self._tokens = tokens  # entries for dropped or re-planned jobs go stale and are skipped
+        self._holds = {s: t for s, t in self._holds.items() if s in current}
+
+    def hold(self, service: str, until: datetime) -> None:
+        self._holds[service] = until
+
+    def held(self, now: datetime) -> set[str]:
+        self._holds = {s: t for s, t in self._holds.items() if t > now}
+        return set(self._holds)
+
+    def next_wake(self, now: datetime) -> datetime | None:
+        while self._heap:
+            fire, service, token = self._heap[0]
+            live = self._tokens.get(service)
+            if live is None or live[1] != token:
+                heapq.heappop(self._heap)
+            elif fire <= now:
+                heapq.heapreplace(self._heap, (next_fire(live[0], now), service, token))
+            else:
+                break
+        candidates = [t for t in self._holds.values() if t > now]
+        if self._heap:
+            candidates.append(self._heap[0][0])
+        return min(candidates, default=None)
+
+
+def blend_duration(previous: float | None, sample: float) -> float:
+    """Fold one clean movement's duration into a service's running estimate (EWMA)."""
+    return sample if previous is None else _EWMA_ALPHA * sample + (1 - _EWMA_ALPHA) * previous
+
+
+def _estimates(jobs: list[DumpJob], expected: dict[str, float]) -> dict[str, float]:
+    # A service with no clean history yet is assumed to be typical of the rest.
+    known = [expected[j.service] for j in jobs if j.service in expected]
+    fallback = statistics.median(known) if known else 0.0
+    return {j.service: expected.get(j.service, fallback) for j in jobs}
+
+
+def longest_first(jobs: list[DumpJob], expected: dict[str, float]) -> list[DumpJob]:
+    """Order a due batch longest-predicted first (LPT), so long dumps never start last."""
+    est = _estimates(jobs, expected)
+    return sorted(jobs, key=lambda j: (-est[j.service], j.service))
+
+
+def predicted_makespan(jobs: list[DumpJob], expected: dict[str, float], slots: int) -> float:
+    """Seconds until the last of ``jobs`` finishes when started in order on ``slots`` workers."""
+    est = _estimates(jobs, expected)
+    free_at = [0.0] * max(1, slots)
+    for job in jobs:
+        heapq.heapreplace(free_at, free_at[0] + est[job.service])
+    return max(free_at)
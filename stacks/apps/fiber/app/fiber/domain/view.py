@@ -26,6 +26,7 @@ class CardVM:
     writes_to: str
     error: str | None
     progress: str | None = None
+    restore: str | None = None
 
     @property
     def severity(self) -> int:
@@ -2,28 +2,38 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+from datetime import timedelta
 
 from dependency_injector.wiring import Provide, inject
 
+from fiber.clients.bowl import BowlStorage
 from fiber.platform.clock import SystemClock
+from fiber.platform.executors import Executors
 from fiber.container import Container
 from fiber.platform.logger import get_logger
 from fiber.platform.metrics import Metrics
-from fiber.clients.discovery import DiscoveryProvider
+from fiber.clients.discovery import DiscoveryProvider, EventDrivenDiscovery
 from fiber.clients.probe import ConnectivityProbe
 from fiber.domain.jobs import reconcile
+from fiber.domain.restore import next_to_verify
 from fiber.repositories.history import HistoryRepository
-from fiber.domain.schedule import due_jobs
+from fiber.repositories.last_success import LastSuccessCache
+from fiber.domain.schedule import FireHeap, due_jobs, longest_first, predicted_makespan
 from fiber.services.orchestrator import MovementOrchestrator
 from fiber.services.registry_state import RegistryState, Snapshot
+from fiber.services.replicator import Replicator
+from fiber.services.restorer import Restorer
 from fiber.services.worker_pool import WorkerPool
 
 _logger = get_logger("fiber.main")
 
+# Wake this long after a cron fire, so the fire is strictly in the past when jobs are checked.
+_FIRE_SLACK_S = 1.0
+
 
 async def _scan_loop_inner(
     discovery: DiscoveryProvider,
-    history: HistoryRepository,
+    last_success: LastSuccessCache,
     pool: WorkerPool,
     orchestrator: MovementOrchestrator,
     clock: SystemClock,
@@ -33,11 +43,20 @@ async def _scan_loop_inner(
     registry_state: RegistryState,
     active_provider: str,
     probe: ConnectivityProbe,
+    changed: asyncio.Event | None = None,
+    timers: FireHeap | None = None,
+    executors: Executors | None = None,
+    idle: float | None = None,
 ) -> None:
+    """One scan, then a pause until the next timer, capped at ``idle`` (default: ``interval``)."""
+    if changed is not None:
+        changed.clear()
     now = clock.now()
     prev = registry_state.get()
     try:
-        jobs, misconfigured, skipped = reconcile(discovery.list_dump_services(), active_provider)
+        net = executors.net if executors is not None else asyncio.to_thread
+        services = await net(discovery.list_dump_services)
+        jobs, misconfigured, skipped = reconcile(services, active_provider)
     except Exception as exc:
         _logger.error("discovery failed: %s", exc)
         registry_state.set(Snapshot(
@@ -47,8 +66,7 @@ async def _scan_loop_inner(
             scanned_at=prev.scanned_at,
             error=str(exc),
         ))
-        with contextlib.suppress(asyncio.TimeoutError):
-            await asyncio.wait_for(stop.wait(), timeout=interval)
+        await _pause(stop, interval, changed)
         return
     for m in misconfigured:
         _logger.warning("misconfigured %s: %s", m.service, ", ".join(m.errors))
@@ -59,27 +77,76 @@ async def _scan_loop_inner(
         scanned_at=now,
         error=None,
     ))
-    last = {j.service: history.last_success(j.service) for j in jobs}
-    for job in due_jobs(jobs, clock.now(), last_success={k: v for k, v in last.items() if v},
-                        running=pool.running_services()):
-        if not (await probe.check(job)).ok:
+    held: set[str] = set()
+    if timers is not None:
+        timers.sync(jobs, now)
+        held = timers.held(now)
+    # The first scan loads the cache and unknown services miss to SQLite: both off the loop.
+    db = executors.db if executors is not None else asyncio.to_thread
+    last = await db(last_success.get_many, [j.service for j in jobs])
+    due = due_jobs(jobs, clock.now(), last_success={k: v for k, v in last.items() if v},
+                   running=pool.running_services() | held)
+    expected = last_success.durations()
+    due = longest_first(due, expected)
+    if due:
+        finish = clock.now() + timedelta(seconds=predicted_makespan(due, expected, pool.capacity))
+        metrics.batch_predicted_finish.set(finish.timestamp())
+        _logger.info("%d movements due; predicted to finish by %s", len(due), finish.isoformat())
+    ready = await probe.check_many(due)
+    for job in due:
+        if not ready[job.service].ok:
             metrics.skipped_not_ready.labels(db=job.service).inc()
             _logger.info("deferred %s: database not ready", job.service)
+            if timers is not None:
+                timers.hold(job.service, now + timedelta(seconds=interval))
             continue
-        result = pool.submit(job.service, lambda j=job: orchestrator.perform(j))
+        result = pool.submit(job.service, lambda j=job: orchestrator.perform(j), job=job)
         if result is None:
             metrics.skipped_overlap.labels(db=job.service).inc()
         else:
             _logger.info("enqueued movement for %s", job.service)
-    with contextlib.suppress(asyncio.TimeoutError):
-        await asyncio.wait_for(stop.wait(), timeout=interval)
+            if timers is not None:
+                result.add_done_callback(
+                    lambda _, s=job.service: _movement_done(s, timers, clock, interval, changed))
+    await _pause(stop, _sleep_for(timers, clock, interval if idle is None else idle), changed)
+
+
+def _movement_done(service: str, timers: FireHeap, clock: SystemClock, interval: float,
+                   changed: asyncio.Event | None) -> None:
+    # A movement that failed stays overdue; retry it after one interval, not straight away.
+    timers.hold(service, clock.now() + timedelta(seconds=interval))
+    if changed is not None:
+        changed.set()
+
+
+def _sleep_for(timers: FireHeap | None, clock: SystemClock, cap: float) -> float:
+    """Seconds until the earliest fire or hold, at most ``cap``."""
+    if timers is None:
+        return cap
+    now = clock.now()
+    wake = timers.next_wake(now)
+    if wake is None:
+        return cap
+    return min(cap, (wake - now).total_seconds() + _FIRE_SLACK_S)
+
+
+async def _pause(stop: asyncio.Event, interval: float, changed: asyncio.Event | None) -> None:
+    """Wait out the scan interval; stopping, or a discovery change, cuts it short."""
+    waits = [asyncio.ensure_future(stop.wait())]
+    if changed is not None:
+        waits.append(asyncio.ensure_future(changed.wait()))
+    try:
+        await asyncio.wait(waits, timeout=interval, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for w in waits:
+            w.cancel()
 
 
 @inject
 async def _scan_loop(
     stop: asyncio.Event,
     discovery: DiscoveryProvider = Provide[Container.discovery],
-    history: HistoryRepository = Provide[Container.history_repository],
+    last_success: LastSuccessCache = Provide[Container.last_success],
     pool: WorkerPool = Provide[Container.pool],
     orchestrator: MovementOrchestrator = Provide[Container.orchestrator],
     clock: SystemClock = Provide[Container.clock],
@@ -88,11 +155,20 @@ async def _scan_loop(
     registry_state: RegistryState = Provide[Container.registry_state],
     active_provider: str = Provide[Container.active_provider],
     probe: ConnectivityProbe = Provide[Container.probe],
+    changed: asyncio.Event = Provide[Container.discovery_changed],
+    executors: Executors = Provide[Container.executors],
+    discovery_mode: str = Provide[Container.config.provided.discovery_mode],
+    resync: float = Provide[Container.config.provided.discovery_resync],
 ) -> None:
+    # Polling only notices new labels by listing, so it wakes every interval. With the
+    # event stream, changes wake the loop themselves; it sleeps to the next timer, or
+    # to the resync that keeps the safety-net listing going.
+    idle = interval if discovery_mode == "poll" else resync
+    timers = FireHeap()
     while not stop.is_set():
         await _scan_loop_inner(
             discovery=discovery,
-            history=history,
+            last_success=last_success,
             pool=pool,
             orchestrator=orchestrator,
             clock=clock,
@@ -102,4 +178,143 @@ async def _scan_loop(
             registry_state=registry_state,
             active_provider=active_provider,
             probe=probe,
+            changed=changed,
+            timers=timers,
+            executors=executors,
+            idle=idle,
         )
+
+
+async def _discovery_watch_inner(
+    discovery: EventDrivenDiscovery,
+    changed: asyncio.Event,
+    stop: asyncio.Event,
+    retry: float,
+) -> None:
+    """Follow the Docker event stream once; if it ends or fails, wait ``retry`` before the next try."""
+    try:
+        await discovery.watch(changed.set)
+    except Exception as exc:
+        _logger.error("discovery event stream failed: %s", exc)
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(stop.wait(), timeout=retry)
+
+
+@inject
+async def _discovery_watch_loop(
+    stop: asyncio.Event,
+    discovery: EventDrivenDiscovery = Provide[Container.watched_discovery],
+    changed: asyncio.Event = Provide[Container.discovery_changed],
+) -> None:
+    """Keep the in-memory discovery map current and wake the scan loop when it changes."""
+    while not stop.is_set():
+        await _discovery_watch_inner(discovery=discovery, changed=changed, stop=stop, retry=5.0)
+
+
+async def _housekeeping_loop_inner(
+    bowl: BowlStorage,
+    history: HistoryRepository,
+    clock: SystemClock,
+    stop: asyncio.Event,
+    interval: float,
+    retention_days: int,
+    executors: Executors | None = None,
+) -> None:
+    disk = executors.disk if executors is not None else asyncio.to_thread
+    db = executors.db if executors is not None else asyncio.to_thread
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(stop.wait(), timeout=interval)
+    if stop.is_set():
+        return
+    try:
+        await disk(bowl.reconcile)
+    except Exception as exc:
+        _logger.error("bowl reconcile failed: %s", exc)
+    try:
+        cutoff = clock.now() - timedelta(days=retention_days)
+        compacted = await db(history.compact, cutoff)
+        if compacted:
+            _logger.info("compacted %d movements into daily rollups", compacted)
+    except Exception as exc:
+        _logger.error("history compaction failed: %s", exc)
+
+
+@inject
+async def _housekeeping_loop(
+    stop: asyncio.Event,
+    bowl: BowlStorage = Provide[Container.bowl],
+    history: HistoryRepository = Provide[Container.history_repository],
+    clock: SystemClock = Provide[Container.clock],
+    interval: float = Provide[Container.config.provided.housekeeping_interval],
+    retention_days: int = Provide[Container.config.provided.history_retention_days],
+    executors: Executors = Provide[Container.executors],
+) -> None:
+    """Slow background chores, off the scan path: re-walk the Bowl catalog for drift and
+    roll movement history older than the retention window into daily aggregates."""
+    while not stop.is_set():
+        await _housekeeping_loop_inner(bowl=bowl, history=history, clock=clock, stop=stop,
+                                       interval=interval, retention_days=retention_days,
+                                       executors=executors)
+
+
+async def _verify_loop_inner(
+    restorer: Restorer,
+    registry_state: RegistryState,
+    stop: asyncio.Event,
+    interval: float,
+) -> None:
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(stop.wait(), timeout=interval)
+    if stop.is_set():
+        return
+    job = next_to_verify(restorer.verifiable(registry_state.get().jobs), await restorer.rotation())
+    if job is None:
+        return
+    try:
+        rec = await restorer.verify(job)
+        if rec is not None:
+            _logger.info("test restore of %s: %s in %.0fs", job.service, rec.outcome.value,
+                         (rec.finished_at - rec.started_at).total_seconds())
+    except Exception as exc:
+        _logger.error("test restore of %s failed: %s", job.service, exc)
+
+
+@inject
+async def _verify_loop(
+    stop: asyncio.Event,
+    restorer: Restorer = Provide[Container.restorer],
+    registry_state: RegistryState = Provide[Container.registry_state],
+    interval: float = Provide[Container.config.provided.verify_interval],
+) -> None:
+    """Test-restore one service per interval, the one verified longest ago first."""
+    while not stop.is_set():
+        await _verify_loop_inner(restorer=restorer, registry_state=registry_state, stop=stop,
+                                 interval=interval)
+
+
+@inject
+async def _replication_loop(
+    stop: asyncio.Event,
+    replicator: Replicator = Provide[Container.replicator],
+) -> None:
+    """Copy clean dumps to the offsite replicas until stopped."""
+    await replicator.run(stop)
+
+
+async def _lag_monitor_inner(metrics: Metrics, stop: asyncio.Event, interval: float) -> None:
+    """Sleep one interval and record how late the event loop woke us."""
+    loop = asyncio.get_running_loop()
+    due = loop.time() + interval
+    await _pause(stop, interval, None)
+    if not stop.is_set():
+        metrics.event_loop_lag.set(max(0.0, loop.time() - due))
+
+
+@inject
+async def _lag_monitor_loop(
+    stop: asyncio.Event,
+    metrics: Metrics = Provide[Container.metrics],
+) -> None:
+    """Publish event-loop lag; a blocking call on the loop shows up here before the wall stalls."""
+    while not stop.is_set():
+        await _lag_monitor_inner(metrics=metrics, stop=stop, interval=0.5)
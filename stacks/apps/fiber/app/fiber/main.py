@@ -12,7 +12,8 @@ import fiber.routes as routes
 from fiber.platform.config import Config
 from fiber.container import Container
 from fiber.platform.logger import get_logger
-from fiber.loop import _scan_loop
+from fiber.loop import (_discovery_watch_loop, _housekeeping_loop, _lag_monitor_loop,
+                        _replication_loop, _scan_loop, _verify_loop)
 from fiber.routes import dashboard
 
 _logger = get_logger("fiber.main")
@@ -28,10 +29,16 @@ def create_app(container: Container | None = None) -> FastAPI:
 
     @contextlib.asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-        task: asyncio.Task[None] | None = None
         if container.config().scan_enabled:
             stop = asyncio.Event()
-            task = asyncio.create_task(_scan_loop(stop))
+            tasks = [asyncio.create_task(_scan_loop(stop)), asyncio.create_task(_housekeeping_loop(stop)),
+                     asyncio.create_task(_lag_monitor_loop(stop))]
+            if container.config().discovery_mode == "events":
+                tasks.append(asyncio.create_task(_discovery_watch_loop(stop)))
+            if container.config().verify_interval > 0 and container.restore_targets():
+                tasks.append(asyncio.create_task(_verify_loop(stop)))
+            if container.replicas():
+                tasks.append(asyncio.create_task(_replication_loop(stop)))
             try:
                 yield
             finally:
@@ -39,10 +46,11 @@ def create_app(container: Container | None = None) -> FastAPI:
                 pool = container.pool()
                 for svc in list(pool.running_services()):
                     pool.cancel(svc)
-                if task is not None:
+                for task in tasks:
                     task.cancel()
                     with contextlib.suppress(asyncio.CancelledError):
                         await task
+                container.executors().shutdown()
         else:
             yield
 
@@ -13,11 +13,39 @@ class Config:
     default_schedule: str
     default_retain: int
     max_concurrent: int
+    max_per_host: int
+    max_per_volume: int
     scan_interval: float
     metrics_port: int
     docker_host: str
     provider: str
     scan_enabled: bool
+    housekeeping_interval: float
+    history_retention_days: int
+    bowl_backend: str
+    probe_timeout: float
+    probe_ttl: float
+    probe_mode: str
+    discovery_mode: str
+    discovery_resync: float
+    disk_workers: int
+    net_workers: int
+    trace_path: str
+    restore_postgres: str
+    restore_mysql: str
+    restore_secret: str
+    verify_interval: float
+    replicas: str
+    replica_concurrency: int
+    replica_parallel: int
+    replica_part_mb: int
+    s3_endpoint: str
+    s3_region: str
+    s3_access_key: str
+    s3_secret: str
+    db_readers: int
+    db_busy_timeout: float
+    trace_max_mb: int
 
     @staticmethod
     def from_env() -> "Config":
@@ -27,6 +55,18 @@ class Config:
         provider = os.getenv("FIBER_PROVIDER", "swarm")
         if provider not in ("swarm", "docker"):
             raise ValueError(f"FIBER_PROVIDER must be 'swarm' or 'docker', got {provider!r}")
+        probe_mode = os.getenv("FIBER_PROBE_MODE", "wire")
+        if probe_mode not in ("wire", "process"):
+            raise ValueError(f"FIBER_PROBE_MODE must be 'wire' or 'process', got {probe_mode!r}")
+        discovery_mode = os.getenv("FIBER_DISCOVERY_MODE", "poll")
+        if discovery_mode not in ("poll", "events"):
+            raise ValueError(f"FIBER_DISCOVERY_MODE must be 'poll' or 'events', got {discovery_mode!r}")
+        bowl_backend = os.getenv("FIBER_BOWL_BACKEND", "plain")
+        if bowl_backend not in ("plain", "dedup"):
+            raise ValueError(f"FIBER_BOWL_BACKEND must be 'plain' or 'dedup', got {bowl_backend!r}")
+        max_concurrent = int(os.getenv("FIBER_MAX_CONCURRENT_MOVEMENTS", "2"))
+        if max_concurrent < 1:
+            raise ValueError(f"FIBER_MAX_CONCURRENT_MOVEMENTS must be at least 1, got {max_concurrent}")
         return Config(
             bowl_path=os.getenv("FIBER_BOWL_PATH", "/backups"),
             db_path=db_path,
@@ -34,10 +74,38 @@ class Config:
             secrets_dir=os.getenv("FIBER_SECRETS_DIR", "/run/secrets"),
             default_schedule=os.getenv("FIBER_DEFAULT_SCHEDULE", "0 3 * * *"),
             default_retain=int(os.getenv("FIBER_DEFAULT_RETAIN", "7")),
-            max_concurrent=int(os.getenv("FIBER_MAX_CONCURRENT_MOVEMENTS", "2")),
+            max_concurrent=max_concurrent,
+            max_per_host=int(os.getenv("FIBER_MAX_PER_HOST", "0")),
+            max_per_volume=int(os.getenv("FIBER_MAX_PER_VOLUME", "0")),
             scan_interval=float(os.getenv("FIBER_SCAN_INTERVAL", "60")),
             metrics_port=int(os.getenv("FIBER_METRICS_PORT", "9090")),
             docker_host=os.getenv("FIBER_DOCKER_HOST", "unix:///var/run/docker.sock"),
             provider=provider,
             scan_enabled=scan_enabled,
+            housekeeping_interval=float(os.getenv("FIBER_HOUSEKEEPING_INTERVAL", "600")),
+            history_retention_days=int(os.getenv("FIBER_HISTORY_RETENTION_DAYS", "90")),
+            bowl_backend=bowl_backend,
+            probe_timeout=float(os.getenv("FIBER_PROBE_TIMEOUT", "5")),
+            probe_ttl=float(os.getenv("FIBER_PROBE_TTL", "15")),
+            probe_mode=probe_mode,
+            discovery_mode=discovery_mode,
+            discovery_resync=float(os.getenv("FIBER_DISCOVERY_RESYNC", "900")),
+            disk_workers=int(os.getenv("FIBER_DISK_WORKERS", "4")),
+            net_workers=int(os.getenv("FIBER_NET_WORKERS", "8")),
+            trace_path=os.getenv("FIBER_TRACE_PATH", ""),
+            restore_postgres=os.getenv("FIBER_RESTORE_POSTGRES", ""),
+            restore_mysql=os.getenv("FIBER_RESTORE_MYSQL", ""),
+            restore_secret=os.getenv("FIBER_RESTORE_SECRET", "fiber-restore"),
+            verify_interval=float(os.getenv("FIBER_VERIFY_INTERVAL", "3600")),
+            replicas=os.getenv("FIBER_REPLICAS", ""),
+            replica_concurrency=int(os.getenv("FIBER_REPLICA_CONCURRENCY", "1")),
+            replica_parallel=int(os.getenv("FIBER_REPLICA_PARALLEL", "4")),
+            replica_part_mb=int(os.getenv("FIBER_REPLICA_PART_MB", "16")),
+            s3_endpoint=os.getenv("FIBER_S3_ENDPOINT", "https://s3.amazonaws.com"),
+            s3_region=os.getenv("FIBER_S3_REGION", "us-east-1"),
+            s3_access_key=os.getenv("FIBER_S3_ACCESS_KEY", ""),
+            s3_secret=os.getenv("FIBER_S3_SECRET", "fiber-s3"),
+            db_readers=int(os.getenv("FIBER_DB_READERS", "4")),
+            db_busy_timeout=float(os.getenv("FIBER_DB_BUSY_TIMEOUT", "5")),
+            trace_max_mb=int(os.getenv("FIBER_TRACE_MAX_MB", "64")),
         )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Executors:
+    """Thread pools for blocking calls made from async code.
+
+    Disk work (hashing, Bowl walks), network work (Docker API) and SQLite queries get
+    separate pools, so hashing a large dump never queues a discovery call or a
+    dashboard read behind it, and the event loop keeps serving the wall and the SSE
+    stream while any of them runs. Size the db pool to the Database's readers plus
+    its one writer.
+    """
+
+    def __init__(self, disk_workers: int = 4, net_workers: int = 8, db_workers: int = 5) -> None:
+        self._disk = ThreadPoolExecutor(max_workers=disk_workers, thread_name_prefix="fiber-disk")
+        self._net = ThreadPoolExecutor(max_workers=net_workers, thread_name_prefix="fiber-net")
+        self._db = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="fiber-db")
+
+    async def disk(self, fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+        return await self._run(self._disk, fn, *args, **kwargs)
+
+    async def db(self, fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+        """Run a repository call on the SQLite pool."""
+        return await self._run(self._db, fn, *args, **kwargs)
+
+    async def net(self, fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+        return await self._run(self._net, fn, *args, **kwargs)
+
+    @staticmethod
+    async def _run(pool: ThreadPoolExecutor, fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self._disk.shutdown(wait=False, cancel_futures=True)
+        self._net.shutdown(wait=False, cancel_futures=True)
+        self._db.shutdown(wait=False, cancel_futures=True)
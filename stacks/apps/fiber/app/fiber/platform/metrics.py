@@ -17,12 +17,56 @@ class Metrics:
         self.size = Gauge("fiber_movement_bytes", "Last dump size", ["db"], registry=registry)
         self.in_progress = Gauge("fiber_movement_in_progress", "In-flight movements",
                                  ["db"], registry=registry)
+        self.movement_phase = Histogram("fiber_movement_phase_seconds",
+                                        "Time spent in each phase of a movement",
+                                        ["db", "phase"], registry=registry)
+        self.throughput = Gauge("fiber_movement_throughput_bytes_per_second",
+                                "Dump bytes per second of the dump phase, last clean movement",
+                                ["db"], registry=registry)
+        self.restores = Counter("fiber_restores_total", "Restores by outcome and kind (test, manual)",
+                                ["db", "status", "kind"], registry=registry)
+        self.restore_duration = Histogram("fiber_restore_duration_seconds", "Restore duration",
+                                          ["db", "kind"], registry=registry)
+        self.restore_rto = Gauge("fiber_restore_rto_seconds",
+                                 "Duration of the last clean restore: the measured recovery time",
+                                 ["db"], registry=registry)
+        self.replications = Counter("fiber_replications_total", "Offsite copies by replica and outcome",
+                                    ["db", "target", "status"], registry=registry)
+        self.replication_lag = Gauge("fiber_replication_lag_seconds",
+                                     "From a dump finishing to the replica holding it, last clean copy",
+                                     ["db", "target"], registry=registry)
+        self.replication_bytes = Counter("fiber_replication_bytes_total",
+                                         "Bytes sent to each replica (parts it already had are not sent)",
+                                         ["target"], registry=registry)
+        self.replication_queue = Gauge("fiber_replication_queue_depth", "Dumps waiting to be replicated",
+                                       registry=registry)
+        self.linked_bytes = Counter("fiber_bowl_linked_bytes_total",
+                                    "Dump bytes stored as links to an identical earlier dump",
+                                    ["db"], registry=registry)
         self.skipped_overlap = Counter("fiber_skipped_overlap_total", "Skipped overlaps",
                                        ["db"], registry=registry)
         self.skipped_not_ready = Counter("fiber_skipped_not_ready_total", "Skipped: database not ready",
                                          ["db"], registry=registry)
         self.dingleberries = Counter("fiber_dingleberries_total", "Dingleberries swept",
                                      registry=registry)
+        self.event_queue_depth = Gauge("fiber_event_queue_depth",
+                                       "Deepest subscriber mailbox after the last publish",
+                                       registry=registry)
+        self.events_dropped = Counter("fiber_events_dropped_total",
+                                      "Notifications dropped from full subscriber mailboxes",
+                                      registry=registry)
+        self.probe_latency = Histogram("fiber_probe_latency_seconds",
+                                       "Readiness probe latency by phase (connect, handshake, process)",
+                                       ["db", "phase"], registry=registry)
+        self.batch_predicted_finish = Gauge("fiber_batch_predicted_finish_timestamp",
+                                            "Predicted finish of the last due batch (unix)",
+                                            registry=registry)
+        self.event_loop_lag = Gauge("fiber_event_loop_lag_seconds",
+                                    "How late the event loop ran a 0.5s timer, last sample",
+                                    registry=registry)
+        self.last_success_cache = Counter("fiber_last_success_cache_lookups_total",
+                                          "Scheduler last-success lookups by cache result",
+                                          ["result"], registry=registry)
 
     def record_outcome(self, db: str, outcome: MovementOutcome, duration_s: float,
                        nbytes: int, ts: float) -> None:
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+from fiber.platform.metrics import Metrics
+
+
+@dataclass(frozen=True)
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, str | int | float] = field(default_factory=dict)
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class JsonLinesSpanExporter:
+    """Appends finished spans to a file, one JSON object per line.
+
+    Field names follow the OpenTelemetry JSON encoding (traceId, spanId,
+    startTimeUnixNano, ...) so a collector's filelog receiver, or jq, can read it.
+    export() only buffers the line, since it is called on the event loop; flush()
+    does the write and belongs on a disk worker. When the file would pass
+    ``max_bytes`` it is rotated to ``<path>.1``, replacing the previous one.
+    Unflushed spans past ``max_buffered`` drop the oldest first.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 << 20, max_buffered: int = 10_000) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._pending: deque[str] = deque(maxlen=max_buffered)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps({
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "startTimeUnixNano": span.start_ns,
+            "endTimeUnixNano": span.end_ns,
+            "attributes": span.attributes,
+        })
+        with self._lock:
+            self._pending.append(line + "\n")
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                data = "".join(self._pending)
+                self._pending.clear()
+            if not data:
+                return
+            try:
+                size = os.path.getsize(self._path)
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self._max_bytes:
+                os.replace(self._path, self._path + ".1")
+            with open(self._path, "a", encoding="utf-8") as fh:
+                fh.write(data)
+
+
+def span_exporter(path: str, max_mb: int = 64) -> SpanExporter | None:
+    """The file exporter for ``path``, or None when tracing is off (empty path)."""
+    return JsonLinesSpanExporter(path, max_bytes=max_mb << 20) if path else None
+
+
+class PhaseTimer:
+    """Times the phases of one movement.
+
+    Every phase is observed into fiber_movement_phase_seconds{db,phase}. With an
+    exporter, each phase is also a child span of one "movement" span per run.
+    """
+
+    def __init__(self, db: str, metrics: Metrics, exporter: SpanExporter | None = None,
+                 clock: Callable[[], int] = time.time_ns) -> None:
+        self._db = db
+        self._metrics = metrics
+        self._exporter = exporter
+        self._clock = clock
+        self._trace_id = os.urandom(16).hex()
+        self._root_id = os.urandom(8).hex()
+        self._started = clock()
+        self._elapsed: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            end = self._clock()
+            seconds = (end - start) / 1e9
+            self._elapsed[name] = self._elapsed.get(name, 0.0) + seconds
+            self._metrics.movement_phase.labels(db=self._db, phase=name).observe(seconds)
+            if self._exporter is not None:
+                self._exporter.export(Span(self._trace_id, os.urandom(8).hex(), self._root_id,
+                                           name, start, end, {"db": self._db}))
+
+    def elapsed(self, name: str) -> float:
+        """Seconds spent in phase ``name`` so far; 0 if it never ran."""
+        return self._elapsed.get(name, 0.0)
+
+    def finish(self, **attributes: str | int | float) -> None:
+        if self._exporter is not None:
+            self._exporter.export(Span(self._trace_id, self._root_id, None, "movement",
+                                       self._started, self._clock(), {"db": self._db, **attributes}))
@@ -1,26 +1,81 @@
 from __future__ import annotations
 
+import math
 import statistics
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Sequence
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlmodel import select
+from sqlalchemy import Row
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, delete, select
 
-from fiber.db.models import Movement
-from fiber.domain.models import Engine, MovementOutcome, MovementRecord
+from fiber.db.models import Movement, MovementRollup, ServiceSummary
+from fiber.domain.models import DailyRollup, Engine, HistorySummary, MovementOutcome, MovementRecord
+from fiber.domain.schedule import blend_duration
+
+
+_DAY = 86_400
+_COMPACT_BATCH = 500
+# What compact() needs of a raw movement to fold it into its day.
+_FOLDED = (Movement.id, Movement.service, Movement.started_ts, Movement.finished_ts,
+           Movement.outcome, Movement.bytes_written, Movement.bristol_type)
+
+
+def _epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def _from_epoch(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _to_record(r: Movement) -> MovementRecord:
+    return MovementRecord(
+        service=r.service,
+        engine=Engine(r.engine),
+        started_at=_from_epoch(r.started_ts),
+        finished_at=_from_epoch(r.finished_ts),
+        outcome=MovementOutcome(r.outcome),
+        bytes_written=r.bytes_written,
+        bristol_type=r.bristol_type,
+        sample_path=r.sample_path,
+        receipt_path=r.receipt_path,
+        app_image=r.app_image,
+        app_digest=r.app_digest,
+    )
+
+
+def _p95(values: list[int]) -> int:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def _to_rollup(r: MovementRollup) -> DailyRollup:
+    return DailyRollup(
+        service=r.service,
+        day=_from_epoch(r.day_ts),
+        clean=r.clean,
+        clogged=r.clogged,
+        pinched=r.pinched,
+        median_bytes=r.median_bytes,
+        p95_duration_s=r.p95_duration_s,
+    )
 
 
 class HistoryRepository:
-    def __init__(self, session_factory: Callable) -> None:
+    def __init__(self, session_factory: Callable, read_session_factory: Callable | None = None) -> None:
         self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
 
     def record(self, rec: MovementRecord) -> None:
         with self._session_factory() as session:
             movement = Movement(
                 service=rec.service,
                 engine=rec.engine.value,
-                started_at=rec.started_at.isoformat(),
-                finished_at=rec.finished_at.isoformat(),
+                started_ts=_epoch(rec.started_at),
+                finished_ts=_epoch(rec.finished_at),
                 outcome=rec.outcome.value,
                 bytes_written=rec.bytes_written,
                 bristol_type=rec.bristol_type,
@@ -30,39 +85,77 @@ class HistoryRepository:
                 app_digest=rec.app_digest,
             )
             session.add(movement)
+            session.flush()
+            summary = session.get(ServiceSummary, rec.service) or ServiceSummary(
+                service=rec.service, last_id=movement.id)
+            summary.last_id = movement.id
+            if rec.outcome is MovementOutcome.CLEAN:
+                summary.clean_id = movement.id
+                summary.duration_s = blend_duration(
+                    summary.duration_s, (rec.finished_at - rec.started_at).total_seconds())
+            session.add(summary)
             session.commit()
 
-    def last_success(self, service: str) -> datetime | None:
-        with self._session_factory() as session:
-            results = session.exec(
-                select(Movement)
-                .where(Movement.service == service)
-                .where(Movement.outcome == MovementOutcome.CLEAN.value)
+    def summaries(self) -> dict[str, HistorySummary]:
+        """Last outcome, latest clean movement and expected duration per service, in one query."""
+        last = aliased(Movement)
+        clean = aliased(Movement)
+        with self._read_session_factory() as session:
+            rows = session.exec(
+                select(ServiceSummary.service, ServiceSummary.duration_s, last, clean)
+                .join(last, last.id == ServiceSummary.last_id)  # type: ignore[arg-type]
+                .outerjoin(clean, clean.id == ServiceSummary.clean_id)  # type: ignore[arg-type]
             ).all()
-        if not results:
-            return None
-        latest = max(results, key=lambda m: m.finished_at)
-        return datetime.fromisoformat(latest.finished_at).astimezone(timezone.utc)
+        out: dict[str, HistorySummary] = {}
+        for service, duration_s, last_row, clean_row in rows:
+            latest = _to_record(clean_row) if clean_row is not None else None
+            out[service] = HistorySummary(
+                last_success=latest.finished_at if latest else None,
+                last_outcome=MovementOutcome(last_row.outcome),
+                latest_clean=latest,
+                expected_duration_s=duration_s,
+            )
+        return out
+
+    def last_success(self, service: str) -> datetime | None:
+        latest = self.latest_clean(service)
+        return latest.finished_at if latest else None
 
     def median_bytes(self, service: str, limit: int) -> int | None:
-        with self._session_factory() as session:
+        """Median size of the last ``limit`` clean movements, topped up from daily rollups.
+
+        Movements without a Bristol type only know their compressed size, so they don't count.
+        """
+        with self._read_session_factory() as session:
             results = session.exec(
                 select(Movement)
                 .where(Movement.service == service)
                 .where(Movement.outcome == MovementOutcome.CLEAN.value)
-                .order_by(Movement.finished_at.desc())  # type: ignore[union-attr]
+                .where(Movement.bristol_type != None)  # noqa: E711
+                .order_by(Movement.finished_ts.desc(), Movement.id.desc())  # type: ignore[union-attr]
                 .limit(limit)
             ).all()
-        if not results:
+            sizes = [m.bytes_written for m in results]
+            if len(sizes) < limit:
+                rollups = session.exec(
+                    select(MovementRollup)
+                    .where(MovementRollup.service == service)
+                    .where(MovementRollup.median_bytes != None)  # noqa: E711
+                    .order_by(MovementRollup.day_ts.desc())  # type: ignore[attr-defined]
+                    .limit(limit - len(sizes))
+                ).all()
+                for r in rollups:
+                    sizes.extend([r.median_bytes] * min(r.clean, limit - len(sizes)))  # type: ignore[list-item]
+        if not sizes:
             return None
-        return int(statistics.median(m.bytes_written for m in results))
+        return int(statistics.median(sizes))
 
     def last_outcome(self, service: str) -> MovementOutcome | None:
-        with self._session_factory() as session:
+        with self._read_session_factory() as session:
             results = session.exec(
                 select(Movement)
                 .where(Movement.service == service)
-                .order_by(Movement.finished_at.desc())  # type: ignore[union-attr]
+                .order_by(Movement.finished_ts.desc(), Movement.id.desc())  # type: ignore[union-attr]
                 .limit(1)
             ).all()
         if not results:
@@ -70,52 +163,102 @@ class HistoryRepository:
         return MovementOutcome(results[0].outcome)
 
     def latest_clean(self, service: str) -> MovementRecord | None:
-        with self._session_factory() as session:
+        with self._read_session_factory() as session:
             results = session.exec(
                 select(Movement)
                 .where(Movement.service == service)
                 .where(Movement.outcome == MovementOutcome.CLEAN.value)
-                .order_by(Movement.finished_at.desc())  # type: ignore[union-attr]
+                .order_by(Movement.finished_ts.desc(), Movement.id.desc())  # type: ignore[union-attr]
                 .limit(1)
             ).all()
         if not results:
             return None
-        r = results[0]
-        return MovementRecord(
-            service=r.service,
-            engine=Engine(r.engine),
-            started_at=datetime.fromisoformat(r.started_at).astimezone(timezone.utc),
-            finished_at=datetime.fromisoformat(r.finished_at).astimezone(timezone.utc),
-            outcome=MovementOutcome(r.outcome),
-            bytes_written=r.bytes_written,
-            bristol_type=r.bristol_type,
-            sample_path=r.sample_path,
-            receipt_path=r.receipt_path,
-            app_image=r.app_image,
-            app_digest=r.app_digest,
-        )
+        return _to_record(results[0])
 
     def recent(self, service: str, limit: int) -> list[MovementRecord]:
-        with self._session_factory() as session:
+        with self._read_session_factory() as session:
             results = session.exec(
                 select(Movement)
                 .where(Movement.service == service)
-                .order_by(Movement.finished_at.desc())  # type: ignore[union-attr]
+                .order_by(Movement.finished_ts.desc(), Movement.id.desc())  # type: ignore[union-attr]
                 .limit(limit)
             ).all()
-        return [
-            MovementRecord(
-                service=r.service,
-                engine=Engine(r.engine),
-                started_at=datetime.fromisoformat(r.started_at).astimezone(timezone.utc),
-                finished_at=datetime.fromisoformat(r.finished_at).astimezone(timezone.utc),
-                outcome=MovementOutcome(r.outcome),
-                bytes_written=r.bytes_written,
-                bristol_type=r.bristol_type,
-                sample_path=r.sample_path,
-                receipt_path=r.receipt_path,
-                app_image=r.app_image,
-                app_digest=r.app_digest,
-            )
-            for r in results
-        ]
+        return [_to_record(r) for r in results]
+
+    def daily(self, service: str, limit: int) -> list[DailyRollup]:
+        """Newest-first daily rollups for movements already compacted out of the raw table."""
+        with self._read_session_factory() as session:
+            results = session.exec(
+                select(MovementRollup)
+                .where(MovementRollup.service == service)
+                .order_by(MovementRollup.day_ts.desc())  # type: ignore[attr-defined]
+                .limit(limit)
+            ).all()
+        return [_to_rollup(r) for r in results]
+
+    def compact(self, before: datetime, batch: int = _COMPACT_BATCH) -> int:
+        """Fold raw movements finished before ``before`` (floored to UTC midnight) into daily rollups.
+
+        Rows service_summary still points at stay raw, so the dashboard keeps a service's
+        last outcome and latest clean dump however old they are. A day compacted in two
+        passes merges approximately: the earlier median and p95 stand in for their rows.
+        Works through at most ``batch`` rows per write transaction, so a large backlog
+        never holds the writer for long. Returns the number of raw rows removed.
+        """
+        cutoff = _epoch(before) // _DAY * _DAY
+        removed = 0
+        while True:
+            with self._session_factory() as session:
+                pinned = {
+                    row_id for summary in session.exec(select(ServiceSummary)).all()
+                    for row_id in (summary.last_id, summary.clean_id) if row_id is not None
+                }
+                rows = session.exec(
+                    select(*_FOLDED)
+                    .where(Movement.finished_ts < cutoff, Movement.id.not_in(pinned))  # type: ignore[union-attr]
+                    .order_by(Movement.id)  # type: ignore[arg-type]
+                    .limit(batch)
+                ).all()
+                self._fold(session, rows)
+                session.commit()
+            removed += len(rows)
+            if len(rows) < batch:
+                return removed
+
+    @staticmethod
+    def _fold(session: Session, rows: Sequence[Row[Any]]) -> None:
+        """Merge rows into their daily rollups and delete them, in a handful of statements.
+
+        Plain column tuples, one query for every rollup touched and one DELETE keep the
+        write transaction (and the Python work holding the GIL) short next to readers.
+        """
+        if not rows:
+            return
+        groups: dict[tuple[str, int], list[Row[Any]]] = {}
+        for r in rows:
+            groups.setdefault((r.service, r.finished_ts // _DAY * _DAY), []).append(r)
+        days = [day for _, day in groups]
+        rollups = {
+            (r.service, r.day_ts): r for r in session.exec(
+                select(MovementRollup)
+                .where(MovementRollup.service.in_({service for service, _ in groups}))  # type: ignore[attr-defined]
+                .where(MovementRollup.day_ts.between(min(days), max(days)))  # type: ignore[attr-defined]
+            ).all()
+        }
+        for (service, day), members in groups.items():
+            rollup = rollups.get((service, day)) or MovementRollup(service=service, day_ts=day)
+            prior = rollup.clean + rollup.clogged + rollup.pinched
+            sizes = [m.bytes_written for m in members
+                     if m.outcome == MovementOutcome.CLEAN.value and m.bristol_type is not None]
+            if rollup.median_bytes is not None:
+                sizes += [rollup.median_bytes] * rollup.clean
+            durations = [m.finished_ts - m.started_ts for m in members]
+            durations += [rollup.p95_duration_s] * prior
+            counts = Counter(m.outcome for m in members)
+            rollup.clean += counts[MovementOutcome.CLEAN.value]
+            rollup.clogged += counts[MovementOutcome.CLOGGED.value]
+            rollup.pinched += counts[MovementOutcome.PINCHED.value]
+            rollup.median_bytes = int(statistics.median(sizes)) if sizes else None
+            rollup.p95_duration_s = _p95(durations)
+            session.add(rollup)
+        session.exec(delete(Movement).where(Movement.id.in_([r.id for r in rows])))  # type: ignore[union-attr]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+
+from fiber.domain.models import MovementOutcome, MovementRecord
+from fiber.domain.schedule import blend_duration
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+
+
+class LastSuccessCache:
+    """Write-through, in-memory view of each service's last clean movement.
+
+    Loaded with a single summaries() query on first use and kept current by the
+    orchestrator as movements finish, so the scan loop never asks SQLite when a
+    service last succeeded. A service the load did not know about costs one query,
+    after which its answer (even "never") is cached too. The expected duration of
+    each service's next movement rides along, for ordering a due batch.
+    """
+
+    def __init__(self, history: HistoryRepository, metrics: Metrics) -> None:
+        self._history = history
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._last: dict[str, datetime | None] | None = None
+        self._expected: dict[str, float] = {}
+
+    def _loaded(self) -> dict[str, datetime | None]:
+        if self._last is None:
+            summaries = self._history.summaries()
+            self._last = {s: summary.last_success for s, summary in summaries.items()}
+            self._expected = {s: summary.expected_duration_s for s, summary in summaries.items()
+                              if summary.expected_duration_s is not None}
+        return self._last
+
+    def get(self, service: str) -> datetime | None:
+        with self._lock:
+            last = self._loaded()
+            if service in last:
+                self._metrics.last_success_cache.labels(result="hit").inc()
+                return last[service]
+            self._metrics.last_success_cache.labels(result="miss").inc()
+            last[service] = self._history.last_success(service)
+            return last[service]
+
+    def get_many(self, services: list[str]) -> dict[str, datetime | None]:
+        """get() for each service; blocking on first use and on misses, so call it off the loop."""
+        return {s: self.get(s) for s in services}
+
+    def durations(self) -> dict[str, float]:
+        """Expected seconds for each service's next movement, where there is any clean history."""
+        with self._lock:
+            self._loaded()
+            return dict(self._expected)
+
+    def update(self, rec: MovementRecord) -> None:
+        """Fold a just-recorded movement in; only clean ones move the last success."""
+        if rec.outcome is not MovementOutcome.CLEAN:
+            return
+        with self._lock:
+            last = self._loaded()
+            current = last.get(rec.service)
+            if current is None or rec.finished_at > current:
+                last[rec.service] = rec.finished_at
+            self._expected[rec.service] = blend_duration(
+                self._expected.get(rec.service), (rec.finished_at - rec.started_at).total_seconds())
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from fiber.db.models import Replication
+from fiber.domain.models import MovementOutcome, ReplicationRecord
+
+
+def _epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def _from_epoch(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _to_record(r: Replication) -> ReplicationRecord:
+    return ReplicationRecord(
+        service=r.service,
+        target=r.target,
+        dump_path=r.dump_path,
+        dumped_at=_from_epoch(r.dumped_ts),
+        replicated_at=_from_epoch(r.replicated_ts),
+        outcome=MovementOutcome(r.outcome),
+        bytes_sent=r.bytes_sent,
+    )
+
+
+class ReplicationRepository:
+    def __init__(self, session_factory: Callable, read_session_factory: Callable | None = None) -> None:
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+
+    def record(self, rec: ReplicationRecord) -> None:
+        with self._session_factory() as session:
+            session.add(Replication(
+                service=rec.service,
+                target=rec.target,
+                dump_path=rec.dump_path,
+                dumped_ts=_epoch(rec.dumped_at),
+                replicated_ts=_epoch(rec.replicated_at),
+                outcome=rec.outcome.value,
+                bytes_sent=rec.bytes_sent,
+            ))
+            session.commit()
+
+    def latest(self, clean: bool = False) -> dict[tuple[str, str], ReplicationRecord]:
+        """Newest replication per (service, target); only clean ones when ``clean`` is set."""
+        newest = (select(Replication.service, Replication.target, func.max(Replication.id).label("id"))
+                  .group_by(Replication.service, Replication.target))
+        if clean:
+            newest = newest.where(Replication.outcome == MovementOutcome.CLEAN.value)
+        ids = newest.subquery()
+        with self._read_session_factory() as session:
+            rows = session.exec(
+                select(Replication).join(ids, Replication.id == ids.c.id)  # type: ignore[arg-type]
+            ).all()
+        return {(r.service, r.target): _to_record(r) for r in rows}
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from fiber.db.models import Restore
+from fiber.domain.models import Engine, MovementOutcome, RestoreRecord
+
+
+def _epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def _from_epoch(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _to_record(r: Restore) -> RestoreRecord:
+    return RestoreRecord(
+        service=r.service,
+        engine=Engine(r.engine),
+        dump_path=r.dump_path,
+        target=r.target,
+        started_at=_from_epoch(r.started_ts),
+        finished_at=_from_epoch(r.finished_ts),
+        outcome=MovementOutcome(r.outcome),
+        bytes_read=r.bytes_read,
+        test=r.test,
+    )
+
+
+class RestoreRepository:
+    def __init__(self, session_factory: Callable, read_session_factory: Callable | None = None) -> None:
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+
+    def record(self, rec: RestoreRecord) -> None:
+        with self._session_factory() as session:
+            session.add(Restore(
+                service=rec.service,
+                engine=rec.engine.value,
+                dump_path=rec.dump_path,
+                target=rec.target,
+                started_ts=_epoch(rec.started_at),
+                finished_ts=_epoch(rec.finished_at),
+                outcome=rec.outcome.value,
+                bytes_read=rec.bytes_read,
+                test=rec.test,
+            ))
+            session.commit()
+
+    def latest(self, test: bool | None = None) -> dict[str, RestoreRecord]:
+        """Newest restore per service; only test restores (or only manual ones) when ``test`` is set."""
+        newest = select(Restore.service, func.max(Restore.id).label("id")).group_by(Restore.service)
+        if test is not None:
+            newest = newest.where(Restore.test == test)
+        ids = newest.subquery()
+        with self._read_session_factory() as session:
+            rows = session.exec(
+                select(Restore).join(ids, Restore.id == ids.c.id)  # type: ignore[arg-type]
+            ).all()
+        return {r.service: _to_record(r) for r in rows}
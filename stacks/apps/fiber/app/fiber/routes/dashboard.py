@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from collections.abc import AsyncIterator
 
@@ -11,29 +10,18 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sse_starlette.sse import EventSourceResponse
 
-from fiber.clients.events import EventBroker
 from fiber.clients.probe import ConnectivityProbe
 from fiber.container import Container
+from fiber.platform.executors import Executors
 from fiber.services.dashboard import DashboardService
 from fiber.services.orchestrator import MovementOrchestrator
 from fiber.services.registry_state import RegistryState
+from fiber.services.restorer import Restorer
+from fiber.services.wall_feed import WallFeed
 from fiber.services.worker_pool import WorkerPool
-from fiber.domain.status import DBStatus
-from fiber.domain.view import CardVM
 
 _logger = logging.getLogger(__name__)
 
-
-def tiles_to_push(cards: list[CardVM], signalled: str | None) -> list[str]:
-    """Return the list of service names to push in an SSE cycle.
-
-    If *signalled* is given, push only that service (broker-triggered update).
-    Otherwise push only the straining services (2s timeout tick).
-    """
-    if signalled is not None:
-        return [signalled]
-    return [c.service for c in cards if c.status is DBStatus.STRAINING]
-
 router = APIRouter()
 
 
@@ -43,8 +31,9 @@ async def wall(
     request: Request,
     svc: DashboardService = Depends(Provide[Container.dashboard_service]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
-    vm = svc.build()
+    vm = await executors.db(svc.build)
     return templates.TemplateResponse(request, "wall.html", {"vm": vm})
 
 
@@ -55,8 +44,9 @@ async def drawer(
     request: Request,
     svc: DashboardService = Depends(Provide[Container.dashboard_service]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
-    d = svc.detail(service)
+    d = await executors.db(svc.detail, service)
     return templates.TemplateResponse(request, "_drawer.html", {"d": d})
 
 
@@ -70,12 +60,13 @@ async def flush(
     orchestrator: MovementOrchestrator = Depends(Provide[Container.orchestrator]),
     registry_state: RegistryState = Depends(Provide[Container.registry_state]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
     snap = registry_state.get()
     job = next((j for j in snap.jobs if j.service == service), None)
     if job is not None:
-        pool.submit(service, lambda j=job: orchestrator.perform(j))
-    c = svc.card(service)
+        pool.submit(service, lambda j=job: orchestrator.perform(j), job=job)
+    c = await executors.db(svc.card, service)
     return templates.TemplateResponse(request, "_tile.html", {"c": c})
 
 
@@ -87,9 +78,30 @@ async def pinch(
     svc: DashboardService = Depends(Provide[Container.dashboard_service]),
     pool: WorkerPool = Depends(Provide[Container.pool]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
     pool.cancel(service)
-    c = svc.card(service)
+    c = await executors.db(svc.card, service)
+    return templates.TemplateResponse(request, "_tile.html", {"c": c})
+
+
+@router.post("/db/{service}/verify", response_class=HTMLResponse)
+@inject
+async def verify(
+    service: str,
+    request: Request,
+    svc: DashboardService = Depends(Provide[Container.dashboard_service]),
+    restorer: Restorer = Depends(Provide[Container.restorer]),
+    registry_state: RegistryState = Depends(Provide[Container.registry_state]),
+    templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
+) -> HTMLResponse:
+    """Test-restore the service's latest clean dump now, instead of waiting for its turn."""
+    snap = registry_state.get()
+    job = next((j for j in snap.jobs if j.service == service), None)
+    if job is not None:
+        restorer.start_verify(job)
+    c = await executors.db(svc.card, service)
     return templates.TemplateResponse(request, "_tile.html", {"c": c})
 
 
@@ -102,11 +114,12 @@ async def flush_all(
     orchestrator: MovementOrchestrator = Depends(Provide[Container.orchestrator]),
     registry_state: RegistryState = Depends(Provide[Container.registry_state]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
     snap = registry_state.get()
     for job in snap.jobs:
-        pool.submit(job.service, lambda j=job: orchestrator.perform(j))
-    vm = svc.build()
+        pool.submit(job.service, lambda j=job: orchestrator.perform(j), job=job)
+    vm = await executors.db(svc.build)
     return templates.TemplateResponse(request, "_summary.html", {"vm": vm})
 
 
@@ -116,8 +129,9 @@ async def discovery(
     request: Request,
     svc: DashboardService = Depends(Provide[Container.dashboard_service]),
     templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    executors: Executors = Depends(Provide[Container.executors]),
 ) -> HTMLResponse:
-    vm = svc.build()
+    vm = await executors.db(svc.build)
     return templates.TemplateResponse(request, "_discovery.html", {"rows": vm.discovery})
 
 
@@ -144,33 +158,20 @@ async def test_connection(
 @inject
 async def events(
     request: Request,
-    svc: DashboardService = Depends(Provide[Container.dashboard_service]),
-    broker: EventBroker = Depends(Provide[Container.events]),
-    templates: Jinja2Templates = Depends(Provide[Container.templates]),
+    feed: WallFeed = Depends(Provide[Container.wall_feed]),
 ) -> EventSourceResponse:
     async def _stream() -> AsyncIterator[dict[str, str]]:
-        q = broker.subscribe()
+        q = feed.subscribe()
         try:
             while True:
                 if await request.is_disconnected():
                     break
                 try:
-                    signalled: str | None = await asyncio.wait_for(q.get(), timeout=2.0)
+                    data = await asyncio.wait_for(q.get(), timeout=2.0)
                 except asyncio.TimeoutError:
-                    signalled = None
-
-                vm = svc.build()
-                # push updated summary
-                summary_html = templates.get_template("_summary.html").render({"vm": vm})
-                yield {"data": json.dumps({"type": "summary", "html": summary_html})}
-
-                # push only relevant tiles
-                for svc_name in tiles_to_push(vm.cards, signalled):
-                    card = next((c for c in vm.cards if c.service == svc_name), None)
-                    if card is not None:
-                        tile_html = templates.get_template("_tile.html").render({"c": card})
-                        yield {"data": json.dumps({"type": "tile", "service": svc_name, "html": tile_html})}
+                    continue
+                yield {"data": data}
         finally:
-            broker.unsubscribe(q)
+            feed.unsubscribe(q)
 
     return EventSourceResponse(_stream())
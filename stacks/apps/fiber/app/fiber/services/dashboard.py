@@ -5,14 +5,17 @@ from collections.abc import Callable
 from datetime import datetime
 
 from fiber.clients.bowl import BowlStorage
-from fiber.domain.models import DumpJob, MisconfiguredJob, MovementOutcome
+from fiber.domain.models import DumpJob, HistorySummary, MisconfiguredJob, MovementOutcome
 from fiber.repositories.history import HistoryRepository
 from fiber.services.registry_state import RegistryState
+from fiber.services.restorer import Restorer
 from fiber.services.worker_pool import WorkerPool
 from fiber.domain.schedule import next_fire
 from fiber.domain.status import DBStatus, derive_status
 from fiber.domain.view import CardVM, Counts, DashboardVM, DiscoveryRow, DrawerVM
 
+_NO_HISTORY = HistorySummary()
+
 _ST_PLAIN = {
     "clean": "Backed up on schedule",
     "straining": "Dump in progress",
@@ -63,6 +66,7 @@ class DashboardService:
         bowl: BowlStorage,
         now: Callable[[], datetime],
         default_bowl_root: str,
+        restorer: Restorer | None = None,
     ) -> None:
         self._registry_state = registry_state
         self._history = history
@@ -70,17 +74,20 @@ class DashboardService:
         self._bowl = bowl
         self._now = now
         self._default_bowl_root = default_bowl_root
+        self._restorer = restorer
 
     def build(self) -> DashboardVM:
         snap = self._registry_state.get()
         now = self._now()
         cards: list[CardVM] = []
+        summaries = self._history.summaries()
 
         for job in snap.jobs:
             running_since = self._pool.started_at(job.service)
-            last_success = self._history.last_success(job.service)
-            last_outcome: MovementOutcome | None = self._history.last_outcome(job.service)
-            latest_clean = self._history.latest_clean(job.service)
+            summary = summaries.get(job.service, _NO_HISTORY)
+            last_success = summary.last_success
+            last_outcome: MovementOutcome | None = summary.last_outcome
+            latest_clean = summary.latest_clean
             status = derive_status(
                 misconfigured=False,
                 running=running_since is not None,
@@ -111,6 +118,7 @@ class DashboardService:
                 writes_to=job.path or self._default_bowl_root,
                 error=None,
                 progress=progress,
+                restore=self._restore_line(job.service, now),
             ))
 
         for m in snap.misconfigured:
@@ -151,6 +159,22 @@ class DashboardService:
             discovery_error=snap.error,
         )
 
+    def _restore_line(self, service: str, now: datetime) -> str | None:
+        """The tile's restore line: progress while one runs, else how the last one went."""
+        if self._restorer is None:
+            return None
+        running = self._restorer.progress(service)
+        if running is not None:
+            done = (f"{running.bytes_done * 100 // running.bytes_total}%" if running.bytes_total
+                    else _fmt_bytes(running.bytes_done))
+            return f"restoring {done} · {_fmt_elapsed(int((now - running.started_at).total_seconds()))}"
+        last = self._restorer.latest().get(service)
+        if last is None:
+            return None
+        took = _fmt_elapsed(int((last.finished_at - last.started_at).total_seconds()))
+        if last.outcome is MovementOutcome.CLEAN:
+            return f"restored in {took} · {_rel_time(last.finished_at, now)}"
+        return f"restore {last.outcome.value} · {_rel_time(last.finished_at, now)}"
 
     def card(self, service: str) -> CardVM:
         """Return a single card VM for the given service (used for SSE/HTMX tile re-renders)."""
@@ -224,8 +248,13 @@ class DashboardService:
 
         # --- build timeline ---
         recent = self._history.recent(service, 5)
+        # older history survives only as daily rollups once compacted, and those can be
+        # newer than the old rows compaction keeps (last outcome, latest clean dump)
+        entries = [(r.finished_at, r.outcome) for r in recent]
+        entries += [(d.day, d.worst) for d in self._history.daily(service, 5)]
+        entries.sort(key=lambda e: e[0], reverse=True)
         timeline: list[tuple[str, str]] = [
-            (_rel_time(r.finished_at, now), r.outcome.value) for r in recent
+            (_rel_time(at, now), outcome.value) for at, outcome in entries[:5]
         ]
 
         # --- latest clean movement ---
@@ -5,16 +5,21 @@ from datetime import datetime
 from typing import Callable
 
 from fiber.clients.bowl import BowlStorage
-from fiber.domain.dumps import classify
+from fiber.domain.dumps import classify, merkle_root
 from fiber.platform.clock import SystemClock
+from fiber.platform.executors import Executors
+from fiber.platform.tracing import PhaseTimer, SpanExporter
 from fiber.clients.dump_runner import DumpRunner
 from fiber.clients.events import EventBroker
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
 from fiber.platform.metrics import Metrics
-from fiber.domain.models import (DumpFormat, DumpJob, Manifest, MovementOutcome, MovementRecord)
+from fiber.domain.models import (DumpFormat, DumpJob, FileDigest, Manifest, MovementOutcome,
+                                 MovementRecord)
 from fiber.domain.dumps import plan_sweep
 from fiber.clients.secrets import SecretReader
 from fiber.clients.discovery import DiscoveryProvider
+from fiber.services.replicator import Replicator
 
 _EXT = {DumpFormat.CUSTOM: "dump", DumpFormat.DIRECTORY: "dir", DumpFormat.PLAIN: "sql"}
 
@@ -22,18 +27,25 @@ _EXT = {DumpFormat.CUSTOM: "dump", DumpFormat.DIRECTORY: "dir", DumpFormat.PLAIN
 class MovementOrchestrator:
     def __init__(self, bowl_factory: Callable[[str], BowlStorage], bowl_root: str,
                  secrets: SecretReader, runner: DumpRunner,
-                 history: HistoryRepository, discovery: DiscoveryProvider, clock: SystemClock,
-                 fiber_version: str, metrics: Metrics, events: EventBroker) -> None:
+                 history: HistoryRepository, last_success: LastSuccessCache,
+                 discovery: DiscoveryProvider, clock: SystemClock,
+                 fiber_version: str, metrics: Metrics, events: EventBroker,
+                 executors: Executors | None = None, spans: SpanExporter | None = None,
+                 replicator: Replicator | None = None) -> None:
         self._bowl_factory = bowl_factory
         self._bowl_root = bowl_root
         self._secrets = secrets
         self._runner = runner
         self._history = history
+        self._last_success = last_success
         self._discovery = discovery
         self._clock = clock
         self._version = fiber_version
         self._metrics = metrics
         self._events = events
+        self._executors = executors or Executors()
+        self._spans = spans
+        self._replicator = replicator
 
     async def perform(self, job: DumpJob) -> MovementRecord:
         self._metrics.in_progress.labels(db=job.service).inc()
@@ -44,66 +56,130 @@ class MovementOrchestrator:
             self._metrics.in_progress.labels(db=job.service).dec()
 
     async def _perform(self, job: DumpJob) -> MovementRecord:
+        # The movement span ends, and the spans are written out, however the run ends.
+        timer = PhaseTimer(job.service, self._metrics, self._spans)
+        rec: MovementRecord | None = None
+        try:
+            rec = await self._move(job, timer)
+            return rec
+        finally:
+            if rec is None:
+                timer.finish(outcome="error")
+            else:
+                timer.finish(outcome=rec.outcome.value, bytes=rec.bytes_written)
+            if self._spans is not None:
+                await self._executors.disk(self._spans.flush)
+
+    async def _move(self, job: DumpJob, timer: PhaseTimer) -> MovementRecord:
+        disk, net = self._executors.disk, self._executors.net
         bowl = self._bowl_factory(job.path or self._bowl_root)
         started = self._clock.now()
         ts = started.strftime("%Y%m%dT%H%M%S")
-        baseline = self._history.median_bytes(job.service, limit=10) or 0
-        required = max(baseline * 2, 1)
+        with timer.phase("space_check"):
+            baseline = await self._executors.db(self._history.median_bytes, job.service, limit=10) or 0
+            required = max(baseline * 2, 1)
+            room = await disk(bowl.has_room, required_bytes=required)
 
-        if not bowl.has_room(required_bytes=required):
+        if not room:
             finished = self._clock.now()
             return await self._finish(job, started, finished, MovementOutcome.CLOGGED, 0, None,
-                                      bowl.write_sample(job.service, ts, "no room in the Bowl"), None)
+                                      await disk(bowl.write_sample, job.service, ts, "no room in the Bowl"),
+                                      None, timer=timer)
 
-        password = self._secrets.read(job.secret)
-        temp = bowl.temp_path(job.service, ts, _EXT[job.fmt])
-        outcome = await self._runner.run(job, password=password, out_path=temp)
+        with timer.phase("secret"):
+            password = self._secrets.read(job.secret)
+        ext = _EXT[job.fmt]
+        if job.compression is not None and job.fmt is DumpFormat.PLAIN:
+            ext = f"{ext}.{job.compression.codec.suffix}"
+        temp = bowl.temp_path(job.service, ts, ext)
+        with timer.phase("dump"):
+            outcome = await self._runner.run(job, password=password, out_path=temp, open_out=bowl.open_temp)
 
         if outcome.cancelled:
-            self._sweep(job, bowl)
+            with timer.phase("sweep"):
+                await disk(self._sweep, job, bowl)
             finished = self._clock.now()
-            return await self._finish(job, started, finished, MovementOutcome.PINCHED, 0, None, None, None)
+            return await self._finish(job, started, finished, MovementOutcome.PINCHED, 0, None, None, None,
+                                      timer=timer)
         if outcome.returncode != 0:
-            sample = bowl.write_sample(job.service, ts, outcome.stderr_tail)
-            self._sweep(job, bowl)
+            sample = await disk(bowl.write_sample, job.service, ts, outcome.stderr_tail)
+            with timer.phase("sweep"):
+                await disk(self._sweep, job, bowl)
             finished = self._clock.now()
-            return await self._finish(job, started, finished, MovementOutcome.CLOGGED, 0, None, sample, None)
+            return await self._finish(job, started, finished, MovementOutcome.CLOGGED, 0, None, sample, None,
+                                      timer=timer)
 
-        final = bowl.promote(temp)
-        size = bowl.size(final)
-        sha = bowl.checksum(final)
-        bristol = classify(size, baseline or None)
-        image, digest = self._discovery.image_of(job.app) if job.app else (None, None)
+        with timer.phase("promote"):
+            final = await disk(bowl.promote, temp)
+        files: list[FileDigest] = []
+        root: str | None = None
+        with timer.phase("checksum"):
+            if outcome.sha256 is not None and outcome.bytes_written is not None:
+                # Hashed and counted while the dump streamed in; no second read of the file.
+                size, sha = outcome.bytes_written, outcome.sha256
+            elif job.fmt is DumpFormat.DIRECTORY:
+                files = await disk(bowl.digest_files, final)
+                root = merkle_root(files)
+                size, sha = sum(f.bytes for f in files), root
+            else:
+                size, sha = await disk(bowl.size, final), await disk(bowl.checksum, final)
+        with timer.phase("link"):
+            linked = await disk(bowl.link_previous, final, sha, files)
+        if linked:
+            self._metrics.linked_bytes.labels(db=job.service).inc(linked)
+        # History, baselines and the Bristol scale track the dump's raw size so turning
+        # compression on doesn't read as a shrunken dump. Engine-native compression
+        # (DIRECTORY) leaves only the stored size, which can't be held against a raw
+        # baseline: it goes unclassified, and median_bytes leaves unclassified rows out.
+        raw = outcome.raw_bytes if outcome.raw_bytes is not None else (
+            size if job.compression is None else None)
+        measured = raw if raw is not None else size
+        bristol = classify(measured, baseline or None) if raw is not None else None
+        with timer.phase("image"):
+            image, digest = await net(self._discovery.image_of, job.app) if job.app else (None, None)
         finished = self._clock.now()
         manifest = Manifest(service=job.service, engine=job.engine, server_version="",
                             app_service=job.app, app_image=image, app_digest=digest,
                             fmt=job.fmt, jobs=job.jobs, bytes=size, sha256=sha,
                             fiber_version=self._version, schema_marker=None,
-                            finished_at=finished.isoformat())
-        receipt = bowl.write_receipt(final, asdict(manifest))
-        self._sweep(job, bowl)
-        return await self._finish(job, started, finished, MovementOutcome.CLEAN, size, bristol, None,
-                                  receipt, image, digest)
+                            finished_at=finished.isoformat(),
+                            merkle_root=root, files=tuple(files),
+                            codec=job.compression.codec.value if job.compression else None,
+                            raw_bytes=raw)
+        with timer.phase("receipt"):
+            receipt = await disk(bowl.write_receipt, final, asdict(manifest))
+        with timer.phase("sweep"):
+            await disk(self._sweep, job, bowl)
+        return await self._finish(job, started, finished, MovementOutcome.CLEAN, measured, bristol, None,
+                                  receipt, image, digest, timer=timer)
 
     def _sweep(self, job: DumpJob, bowl: BowlStorage) -> None:
-        to_delete, dingleberries = plan_sweep(bowl.list_entries(job.service), job.retain)
-        for entry in (*to_delete, *dingleberries):
-            bowl.delete(entry.path)
+        to_delete, dingleberries = plan_sweep(bowl.list_entries(job.service), job.retain, job.retention)
+        if to_delete or dingleberries:
+            bowl.delete_many([e.path for e in (*to_delete, *dingleberries)])
 
     async def _finish(self, job: DumpJob, started: datetime, finished: datetime,
                       outcome: MovementOutcome, size: int,
                       bristol: int | None, sample: str | None, receipt: str | None,
-                      image: str | None = None, digest: str | None = None) -> MovementRecord:
+                      image: str | None = None, digest: str | None = None, *,
+                      timer: PhaseTimer) -> MovementRecord:
         rec = MovementRecord(service=job.service, engine=job.engine, started_at=started,
                              finished_at=finished, outcome=outcome, bytes_written=size,
                              bristol_type=bristol, sample_path=sample, receipt_path=receipt,
                              app_image=image, app_digest=digest)
-        self._history.record(rec)
+        with timer.phase("record"):
+            await self._executors.db(self._history.record, rec)
+            self._last_success.update(rec)
+        if self._replicator is not None:
+            self._replicator.enqueue(rec)
         self._metrics.record_outcome(
             job.service, outcome,
             duration_s=(finished - started).total_seconds(),
             nbytes=size,
             ts=finished.timestamp(),
         )
+        dump_s = timer.elapsed("dump")
+        if outcome is MovementOutcome.CLEAN and dump_s > 0:
+            self._metrics.throughput.labels(db=job.service).set(size / dump_s)
         await self._events.publish(job.service)
         return rec
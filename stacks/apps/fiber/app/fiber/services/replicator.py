@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable
+
+from fiber.clients.bowl import BowlStorage
+from fiber.clients.events import Mailbox
+from fiber.clients.replicas import Replica
+from fiber.domain.models import MovementOutcome, MovementRecord, ReplicationItem, ReplicationRecord
+from fiber.platform.clock import SystemClock
+from fiber.platform.executors import Executors
+from fiber.platform.logger import get_logger
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+from fiber.repositories.replications import ReplicationRepository
+
+_logger = get_logger("fiber.replicate")
+_MANIFEST = ".manifest.json"
+
+
+class Replicator:
+    """Copies each clean dump, then its receipt, to every replica, off the movement path.
+
+    enqueue() never waits, so a movement hands over its record and returns. The queue
+    is a Mailbox holding one pending dump per service: a service that dumps faster than
+    it replicates skips straight to its newest dump. run() works the queue with
+    ``concurrency`` dumps in flight. Replicas that fail are retried after
+    ``retry_delay`` unless a newer dump has superseded the item by then. On start,
+    clean dumps that the replication table shows were never copied are queued again.
+    """
+
+    def __init__(self, replicas: Sequence[Replica], bowl_factory: Callable[[str], BowlStorage],
+                 replications: ReplicationRepository, history: HistoryRepository, clock: SystemClock,
+                 metrics: Metrics, executors: Executors | None = None, concurrency: int = 1,
+                 retry_delay: float = 300.0) -> None:
+        self._replicas = list(replicas)
+        self._bowl_factory = bowl_factory
+        self._replications = replications
+        self._history = history
+        self._clock = clock
+        self._metrics = metrics
+        self._executors = executors or Executors()
+        self._concurrency = max(1, concurrency)
+        self._retry_delay = retry_delay
+        self._queue: Mailbox[ReplicationItem] = Mailbox()
+        self._newest: dict[str, ReplicationItem] = {}
+
+    def enqueue(self, rec: MovementRecord, done: frozenset[str] = frozenset()) -> None:
+        if not self._replicas or rec.outcome is not MovementOutcome.CLEAN or rec.receipt_path is None:
+            return
+        item = ReplicationItem(service=rec.service, dump_path=rec.receipt_path[: -len(_MANIFEST)],
+                               receipt_path=rec.receipt_path, dumped_at=rec.finished_at, done=done)
+        self._put(item)
+
+    def _put(self, item: ReplicationItem) -> None:
+        self._newest[item.service] = item
+        self._queue.put(item.service, item)
+        self._metrics.replication_queue.set(self._queue.qsize())
+
+    def _retry(self, item: ReplicationItem) -> None:
+        if self._newest.get(item.service) is item:
+            self._put(item)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await self._resume()
+        workers = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+        try:
+            await stop.wait()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            self._metrics.replication_queue.set(self._queue.qsize())
+            try:
+                records = await self.replicate(item)
+            except Exception as exc:  # the Bowl moved under us; the next dump tries again
+                _logger.error("replicating %s failed: %s", item.service, exc)
+                continue
+            done = item.done | {r.target for r in records if r.outcome is MovementOutcome.CLEAN}
+            if len(done) < len(self._replicas):
+                retry = replace(item, done=frozenset(done))
+                self._newest[item.service] = retry
+                asyncio.get_running_loop().call_later(self._retry_delay, self._retry, retry)
+
+    async def _resume(self) -> None:
+        """Queue each service's latest clean dump for the replicas that don't hold it yet."""
+        db = self._executors.db
+        copied = await db(self._replications.latest, clean=True)
+        for (service, target), rec in copied.items():
+            self._metrics.replication_lag.labels(db=service, target=target).set(rec.lag_s)
+        for service, summary in (await db(self._history.summaries)).items():
+            latest = summary.latest_clean
+            if latest is None or service in self._newest:
+                continue
+            done = frozenset(r.name for r in self._replicas
+                             if (c := copied.get((service, r.name))) is not None
+                             and c.dumped_at >= latest.finished_at)
+            if len(done) < len(self._replicas):
+                self.enqueue(latest, done)
+
+    async def replicate(self, item: ReplicationItem) -> list[ReplicationRecord]:
+        """Copy ``item`` to each replica not in ``item.done``; one record per replica tried."""
+        pending = [r for r in self._replicas if r.name not in item.done]
+        if not pending:
+            return []
+        files, scratch = await self._executors.disk(self._sources, item)
+        try:
+            return [await self._copy(replica, item, files) for replica in pending]
+        finally:
+            if scratch is not None:
+                os.unlink(scratch)
+
+    async def _copy(self, replica: Replica, item: ReplicationItem,
+                    files: list[tuple[str, str]]) -> ReplicationRecord:
+        sent = 0
+        outcome = MovementOutcome.CLEAN
+        try:
+            for key, path in files:
+                sent += await self._executors.net(replica.put, path, key)
+        except Exception as exc:
+            outcome = MovementOutcome.CLOGGED
+            _logger.error("replicating %s to %s failed: %s", item.service, replica.name, exc)
+        rec = ReplicationRecord(service=item.service, target=replica.name, dump_path=item.dump_path,
+                                dumped_at=item.dumped_at, replicated_at=self._clock.now(),
+                                outcome=outcome, bytes_sent=sent)
+        await self._executors.db(self._replications.record, rec)
+        self._metrics.replications.labels(db=rec.service, target=rec.target, status=outcome.value).inc()
+        self._metrics.replication_bytes.labels(target=rec.target).inc(sent)
+        if outcome is MovementOutcome.CLEAN:
+            self._metrics.replication_lag.labels(db=rec.service, target=rec.target).set(rec.lag_s)
+        return rec
+
+    def _sources(self, item: ReplicationItem) -> tuple[list[tuple[str, str]], str | None]:
+        """(key, local file) pairs to send, receipt last, and any scratch copy to remove after.
+
+        Keys mirror the Bowl layout, <service>/<dump name>[/<file>]. A dedup-stored dump
+        exists only as chunks, so it is rebuilt into a temporary file first.
+        """
+        dump = Path(item.dump_path)
+        base = f"{item.service}/{dump.name}"
+        bowl = self._bowl_factory(str(dump.parent.parent))
+        scratch: str | None = None
+        if dump.is_dir():
+            files = [(f"{base}/{rel}", path) for rel, path in bowl.files(str(dump))]
+        elif dump.exists():
+            files = [(base, str(dump))]
+        else:
+            fd, scratch = tempfile.mkstemp(prefix="fiber-replica-")
+            os.close(fd)
+            try:
+                files = [(base, bowl.materialise(str(dump), scratch))]
+            except BaseException:
+                os.unlink(scratch)
+                raise
+        files.append((f"{base}{_MANIFEST}", item.receipt_path))
+        return files, scratch
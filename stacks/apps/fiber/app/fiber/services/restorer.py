@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from fiber.clients.bowl import BowlStorage
+from fiber.clients.events import EventBroker
+from fiber.clients.restore_runner import RestoreRunner
+from fiber.clients.secrets import SecretReader
+from fiber.domain.models import (Codec, DumpFormat, DumpJob, Engine, MovementOutcome, RestoreProgress,
+                                 RestoreRecord, RestoreTarget)
+from fiber.domain.restore import scratch_dbname
+from fiber.platform.clock import SystemClock
+from fiber.platform.executors import Executors
+from fiber.platform.logger import get_logger
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+from fiber.repositories.restores import RestoreRepository
+
+_logger = get_logger("fiber.restore")
+_MANIFEST = ".manifest.json"
+
+
+class Restorer:
+    """Restores a service's latest clean dump and times it as a recovery (RTO) measurement.
+
+    verify() is the scheduled check: the dump goes into a scratch database on that
+    engine's throwaway instance, which is dropped and recreated first. restore() takes
+    any target. Progress per service is kept for the wall, whose refresh tick picks it
+    up; the broker is signalled when a restore starts and ends.
+    """
+
+    def __init__(self, bowl_factory: Callable[[str], BowlStorage], secrets: SecretReader,
+                 runner: RestoreRunner, history: HistoryRepository, restores: RestoreRepository,
+                 clock: SystemClock, metrics: Metrics, events: EventBroker,
+                 targets: Mapping[Engine, RestoreTarget] | None = None,
+                 executors: Executors | None = None) -> None:
+        self._bowl_factory = bowl_factory
+        self._secrets = secrets
+        self._runner = runner
+        self._history = history
+        self._restores = restores
+        self._clock = clock
+        self._metrics = metrics
+        self._events = events
+        self._targets = dict(targets or {})
+        self._executors = executors or Executors()
+        self._progress: dict[str, RestoreProgress] = {}
+        self._latest: dict[str, RestoreRecord] | None = None
+        self._rotation: dict[str, datetime] | None = None
+        self._tasks: set[asyncio.Task[RestoreRecord | None]] = set()
+
+    def verifiable(self, jobs: list[DumpJob]) -> list[DumpJob]:
+        """Jobs whose engine has a test-restore instance configured."""
+        return [j for j in jobs if j.engine in self._targets]
+
+    def progress(self, service: str) -> RestoreProgress | None:
+        return self._progress.get(service)
+
+    def latest(self) -> dict[str, RestoreRecord]:
+        """Newest restore per service, loaded once and kept current in memory."""
+        if self._latest is None:
+            self._latest = self._restores.latest()
+        return self._latest
+
+    async def rotation(self) -> dict[str, datetime]:
+        """When each service was last picked for a test restore, whether or not it had a dump."""
+        if self._rotation is None:
+            verified = await self._executors.db(self._restores.latest, test=True)
+            self._rotation = {s: r.finished_at for s, r in verified.items()}
+        return self._rotation
+
+    def start_verify(self, job: DumpJob) -> bool:
+        """Run verify() in the background; False if the engine has no instance or one is running."""
+        if job.engine not in self._targets or job.service in self._progress:
+            return False
+        task = asyncio.create_task(self.verify(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def verify(self, job: DumpJob) -> RestoreRecord | None:
+        target = self._targets.get(job.engine)
+        if target is None:
+            return None
+        (await self.rotation())[job.service] = self._clock.now()
+        return await self.restore(job, target, scratch_dbname(job.service), test=True)
+
+    async def restore(self, job: DumpJob, target: RestoreTarget, dbname: str,
+                      test: bool = False) -> RestoreRecord | None:
+        """Restore the latest clean dump of ``job`` into ``dbname`` on ``target``.
+
+        None when there is no clean dump to restore or a restore of it is already running.
+        """
+        disk = self._executors.disk
+        if job.service in self._progress:
+            return None
+        # Claimed before the first await, so a verify tick and the route can't both get past the check.
+        started = self._clock.now()
+        self._progress[job.service] = RestoreProgress(started_at=started)
+        try:
+            latest = await self._executors.db(self._history.latest_clean, job.service)
+            if latest is None or latest.receipt_path is None:
+                _logger.info("nothing to restore for %s: no clean dump", job.service)
+                return None
+            receipt = latest.receipt_path
+            dump_path = receipt[: -len(_MANIFEST)]
+            bowl = self._bowl_factory(str(Path(dump_path).parent.parent))
+            manifest = json.loads(await disk(bowl.read_text, receipt) or "{}")
+            fmt = DumpFormat(manifest.get("fmt", job.fmt.value))
+            codec = Codec(manifest["codec"]) if manifest.get("codec") and fmt is DumpFormat.PLAIN else None
+            restore_job = replace(job, fmt=fmt)
+            if fmt is not DumpFormat.DIRECTORY and not await disk(os.path.exists, dump_path):
+                # Chunk-stored dumps exist only as a stream; pg_restore -j needs a seekable file.
+                restore_job = replace(restore_job, jobs=1)
+            chunks = None if fmt is DumpFormat.DIRECTORY else (lambda: bowl.stream(dump_path))
+
+            self._progress[job.service] = RestoreProgress(started_at=started, bytes_total=manifest.get("bytes"))
+            await self._events.publish(job.service)
+            password = await disk(self._secrets.read, target.secret)
+            outcome = await self._runner.run(
+                restore_job, target, dbname, password, dump_path, chunks=chunks, codec=codec,
+                on_progress=lambda n: self._advance(job.service, n),
+            )
+        finally:
+            self._progress.pop(job.service, None)
+        finished = self._clock.now()
+        if outcome.cancelled:
+            result = MovementOutcome.PINCHED
+        elif outcome.returncode != 0:
+            result = MovementOutcome.CLOGGED
+            _logger.error("restore of %s into %s failed: %s", job.service, target.host, outcome.stderr_tail)
+        else:
+            result = MovementOutcome.CLEAN
+        rec = RestoreRecord(
+            service=job.service, engine=job.engine, dump_path=dump_path,
+            target=f"{target.host}:{target.port}/{dbname}", started_at=started, finished_at=finished,
+            outcome=result, bytes_read=outcome.bytes_written or 0, test=test,
+        )
+        await self._executors.db(self._restores.record, rec)
+        self.latest()[job.service] = rec
+        self._observe(rec)
+        await self._events.publish(job.service)
+        return rec
+
+    def _advance(self, service: str, nbytes: int) -> None:
+        current = self._progress.get(service)
+        if current is not None:
+            self._progress[service] = replace(current, bytes_done=nbytes)
+
+    def _observe(self, rec: RestoreRecord) -> None:
+        kind = "test" if rec.test else "manual"
+        seconds = (rec.finished_at - rec.started_at).total_seconds()
+        self._metrics.restores.labels(db=rec.service, status=rec.outcome.value, kind=kind).inc()
+        self._metrics.restore_duration.labels(db=rec.service, kind=kind).observe(seconds)
+        if rec.outcome is MovementOutcome.CLEAN:
+            self._metrics.restore_rto.labels(db=rec.service).set(seconds)
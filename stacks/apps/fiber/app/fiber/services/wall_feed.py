@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+
+from fastapi.templating import Jinja2Templates
+
+from fiber.clients.events import EventBroker, Mailbox
+from fiber.platform.executors import Executors
+from fiber.platform.logger import get_logger
+from fiber.services.dashboard import DashboardService
+from fiber.domain.view import CardVM
+
+_logger = get_logger("fiber.wall")
+
+
+class WallFeed:
+    """The one producer behind every open wall's /events stream.
+
+    Builds the DashboardVM once per tick or broker signal, renders only the summary
+    and tiles that changed since the previous build, and hands the same serialised
+    messages to every subscriber. It runs only while at least one wall is open, so
+    its cost does not grow with the number of screens.
+    """
+
+    def __init__(self, dashboard: DashboardService, broker: EventBroker,
+                 templates: Jinja2Templates, tick: float = 2.0,
+                 executors: Executors | None = None) -> None:
+        self._dashboard = dashboard
+        self._broker = broker
+        self._templates = templates
+        self._tick = tick
+        self._executors = executors
+        self._subscribers: set[Mailbox[str]] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._summary: str | None = None
+        self._cards: dict[str, CardVM] | None = None
+
+    def subscribe(self) -> Mailbox[str]:
+        q: Mailbox[str] = Mailbox()
+        if self._summary is not None:
+            q.put("summary", self._summary)
+        self._subscribers.add(q)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return q
+
+    def unsubscribe(self, q: Mailbox[str]) -> None:
+        self._subscribers.discard(q)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._summary = None
+            self._cards = None
+
+    async def _run(self) -> None:
+        signals = self._broker.subscribe()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(signals.get(), timeout=self._tick)
+                except asyncio.TimeoutError:
+                    pass
+                while not signals.empty():  # a burst of signals costs one build
+                    signals.get_nowait()
+                # Built on a worker from a snapshot and applied back here, so the state is
+                # only ever written on the loop (unsubscribe() resets it there too).
+                build = functools.partial(self._build, self._summary, self._cards)
+                try:
+                    self._summary, self._cards, messages = await (
+                        self._executors.db(build) if self._executors is not None else asyncio.to_thread(build))
+                except Exception as exc:
+                    _logger.error("wall refresh failed: %s", exc)
+                    continue
+                # a wall that is behind gets only the newest summary and tile per service
+                for q in list(self._subscribers):
+                    for key, message in messages:
+                        q.put(key, message)
+        finally:
+            self._broker.unsubscribe(signals)
+
+    def refresh(self) -> list[tuple[str, str]]:
+        """Rebuild the wall and return (key, message) pairs for whatever changed since last time."""
+        self._summary, self._cards, messages = self._build(self._summary, self._cards)
+        return messages
+
+    def _build(
+        self, prev_summary: str | None, prev_cards: dict[str, CardVM] | None,
+    ) -> tuple[str, dict[str, CardVM], list[tuple[str, str]]]:
+        """The new summary and cards, and the messages that take a wall from prev_* to them.
+
+        The first build after the feed starts only primes the tiles: the page that
+        opened the stream was rendered from the same state moments ago. A service that
+        has left the wall gets a removal under its tile's key, so a wall that is behind
+        drops any update still queued for it.
+        """
+        vm = self._dashboard.build()
+        messages: list[tuple[str, str]] = []
+        summary_html = self._templates.get_template("_summary.html").render({"vm": vm})
+        summary = json.dumps({"type": "summary", "html": summary_html})
+        if summary != prev_summary:
+            messages.append(("summary", summary))
+        cards = {c.service: c for c in vm.cards}
+        if prev_cards is not None:
+            for service, card in cards.items():
+                if prev_cards.get(service) != card:
+                    tile_html = self._templates.get_template("_tile.html").render({"c": card})
+                    messages.append((f"tile:{service}", json.dumps(
+                        {"type": "tile", "service": service, "html": tile_html})))
+            for service in prev_cards.keys() - cards.keys():
+                messages.append((f"tile:{service}", json.dumps({"type": "remove", "service": service})))
+        return summary, cards, messages
@@ -1,36 +1,75 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Awaitable, Callable, TypeVar
 
+from fiber.domain.models import DumpJob
+
 T = TypeVar("T")
 
 
 class WorkerPool:
+    """Runs at most one movement per service, within global and per-resource limits.
+
+    Every movement takes ``weight`` slots (1 unless the job says otherwise) from the
+    global limit and from each resource it touches: its database host:port and the
+    Bowl volume it writes to. A per-host or per-volume limit of 0 leaves that
+    resource class unbounded; the global limit must be at least 1. A weight above a
+    limit takes the whole limit, so a heavy job runs alone rather than never. A
+    movement waiting on a busy host does not hold up work for others.
+    """
+
     def __init__(
-        self, max_concurrent: int, now: Callable[[], datetime] | None = None
+        self, max_concurrent: int, now: Callable[[], datetime] | None = None,
+        max_per_host: int = 0, max_per_volume: int = 0, default_volume: str = "",
     ) -> None:
-        self._sem = asyncio.Semaphore(max_concurrent)
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        self._limits = {"": max_concurrent, "host": max_per_host, "volume": max_per_volume}
+        self._default_volume = default_volume
+        self._in_use: Counter[tuple[str, str]] = Counter()
+        self._cond = asyncio.Condition()
         self._running: dict[str, asyncio.Task[object]] = {}
         self._now = now or (lambda: datetime.now(timezone.utc))
         self._since: dict[str, datetime] = {}
 
-    def submit(self, service: str, work: Callable[[], Awaitable[T]]) -> asyncio.Task[T] | None:
+    def submit(self, service: str, work: Callable[[], Awaitable[T]],
+               job: DumpJob | None = None) -> asyncio.Task[T] | None:
         if service in self._running:
             return None
         self._since[service] = self._now()
-        task: asyncio.Task[T] = asyncio.create_task(self._guarded(service, work))
+        task: asyncio.Task[T] = asyncio.create_task(self._guarded(service, work, self._claims(job)))
         self._running[service] = task
         return task
 
-    async def _guarded(self, service: str, work: Callable[[], Awaitable[T]]) -> T:
-        async with self._sem:
+    def _claims(self, job: DumpJob | None) -> dict[tuple[str, str], int]:
+        """Slots this movement needs, per (resource class, resource) pair."""
+        weight = job.weight if job is not None else 1
+        keys = [("", "")]
+        if job is not None:
+            keys += [("host", f"{job.host}:{job.port}"), ("volume", job.path or self._default_volume)]
+        return {k: min(weight, self._limits[k[0]]) for k in keys if self._limits[k[0]] > 0}
+
+    def _fits(self, claims: dict[tuple[str, str], int]) -> bool:
+        return all(self._in_use[k] + n <= self._limits[k[0]] for k, n in claims.items())
+
+    async def _guarded(self, service: str, work: Callable[[], Awaitable[T]],
+                       claims: dict[tuple[str, str], int]) -> T:
+        try:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self._fits(claims))
+                self._in_use.update(claims)
             try:
                 return await work()
             finally:
-                self._running.pop(service, None)
-                self._since.pop(service, None)
+                async with self._cond:
+                    self._in_use.subtract(claims)
+                    self._cond.notify_all()
+        finally:
+            self._running.pop(service, None)
+            self._since.pop(service, None)
 
     def cancel(self, service: str) -> bool:
         task = self._running.get(service)
@@ -39,6 +78,10 @@ class WorkerPool:
         task.cancel()
         return True
 
+    @property
+    def capacity(self) -> int:
+        return self._limits[""]
+
     def running_services(self) -> set[str]:
         return set(self._running)
 
@@ -32,6 +32,12 @@ function startSSE() {
         // updateTile (tiles.js) morphs in place; returns true when it replaced the
         // node, in which case the grid needs re-laying out.
         if (el && updateTile(el, msg.html)) layoutWall();
+      } else if (msg.type === 'remove' && msg.service) {
+        const el = document.getElementById('tile-' + msg.service);
+        if (el) {
+          el.remove();
+          layoutWall();
+        }
       } else if (msg.type === 'summary') {
         const summary = document.getElementById('summary');
         if (summary) summary.innerHTML = msg.html;
@@ -25,6 +25,9 @@ class DumpJobFactory(DataclassFactory[DumpJob]):
     timeout = None
     app = None
     schema_version_query = None
+    compression = None
+    weight = 1
+    retention = None
 
 
 class MysqlDumpJobFactory(DataclassFactory[DumpJob]):
@@ -45,6 +48,9 @@ class MysqlDumpJobFactory(DataclassFactory[DumpJob]):
     timeout = None
     app = None
     schema_version_query = None
+    compression = None
+    weight = 1
+    retention = None
 
 
 class MovementRecordFactory(DataclassFactory[MovementRecord]):
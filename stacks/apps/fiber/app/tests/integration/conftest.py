@@ -14,6 +14,7 @@ from fiber.db.database import Database
 from fiber.platform.clock import SystemClock
 from fiber.platform.metrics import Metrics
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
 from fiber.services.orchestrator import MovementOrchestrator
 
 
@@ -24,16 +25,19 @@ def make_orchestrator(tmp_path: Path) -> MovementOrchestrator:
     real database container.
     """
     db = Database(url=f"sqlite:///{tmp_path}/fiber.db")
+    history = HistoryRepository(session_factory=db.session)
+    metrics = Metrics(registry=CollectorRegistry())
     return MovementOrchestrator(
         bowl_factory=lambda root: BowlStorage(root=root),
         bowl_root=str(tmp_path / "bowl"),
         secrets=SecretReader(base_dir=str(tmp_path / "secrets")),
         runner=DumpRunner(),
-        history=HistoryRepository(session_factory=db.session),
+        history=history,
+        last_success=LastSuccessCache(history=history, metrics=metrics),
         discovery=DockerSwarmGateway(client_factory=lambda: None),
         clock=SystemClock(),
         fiber_version="0.1.0",
-        metrics=Metrics(registry=CollectorRegistry()),
+        metrics=metrics,
         events=EventBroker(),
     )
 
@@ -23,8 +23,9 @@ from fiber.clients.bowl import BowlStorage
 from fiber.container import Container
 from fiber.main import create_app
 from fiber.platform.metrics import Metrics
-from fiber.domain.models import BowlEntry, MisconfiguredJob, MovementOutcome
+from fiber.domain.models import BowlEntry, HistorySummary, MisconfiguredJob, MovementOutcome
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.restores import RestoreRepository
 from fiber.services.registry_state import RegistryState, Snapshot
 from fiber.services.worker_pool import WorkerPool
 from tests.factories import DumpJobFactory
@@ -56,8 +57,15 @@ def container() -> Container:
     history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
     history.last_outcome.return_value = MovementOutcome.CLEAN
     history.latest_clean.return_value = None
+    history.summaries.return_value = {job.service: HistorySummary(
+        last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+    )}
     c.history_repository.override(history)
 
+    restores = create_autospec(RestoreRepository, instance=True)
+    restores.latest.return_value = {}
+    c.restore_repository.override(restores)
+
     pool = create_autospec(WorkerPool, instance=True)
     pool.started_at.return_value = None
     c.pool.override(pool)
@@ -70,7 +78,33 @@ def container() -> Container:
     mock_config = MagicMock()
     mock_config.scan_enabled = False
     mock_config.bowl_path = "/backups"
+    mock_config.bowl_backend = "plain"
     mock_config.max_concurrent = 2
+    mock_config.max_per_host = 0
+    mock_config.max_per_volume = 0
+    mock_config.probe_timeout = 5.0
+    mock_config.probe_ttl = 15.0
+    mock_config.probe_mode = "process"
+    mock_config.discovery_mode = "poll"
+    mock_config.discovery_resync = 900.0
+    mock_config.disk_workers = 2
+    mock_config.net_workers = 2
+    mock_config.trace_path = ""
+    mock_config.restore_postgres = ""
+    mock_config.restore_mysql = ""
+    mock_config.restore_secret = "fiber-restore"
+    mock_config.verify_interval = 0
+    mock_config.replicas = ""
+    mock_config.replica_concurrency = 1
+    mock_config.replica_parallel = 4
+    mock_config.replica_part_mb = 16
+    mock_config.s3_endpoint = "http://localhost:9000"
+    mock_config.s3_region = "us-east-1"
+    mock_config.s3_access_key = ""
+    mock_config.s3_secret = "fiber-s3"
+    mock_config.db_readers = 2
+    mock_config.db_busy_timeout = 5.0
+    mock_config.trace_max_mb = 64
     c.config.override(mock_config)
 
     # Override clock to use our fixed time
@@ -200,6 +234,7 @@ class TestDashboardRender:
         history.last_success.return_value = None
         history.last_outcome.return_value = None
         history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         container.history_repository.override(history)
 
         pool = create_autospec(WorkerPool, instance=True)
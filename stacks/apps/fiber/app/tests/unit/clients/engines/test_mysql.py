@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from fiber.clients.engines.base import DumpEngine
-from fiber.clients.engines.mysql import MysqlEngine, mysql_defaults_body
-from fiber.domain.models import DumpFormat, DumpJob
+from fiber.clients.engines.mysql import MysqlEngine, handshake_response, mysql_defaults_body
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob, RestoreTarget
 from tests.factories import MysqlDumpJobFactory
 
 
@@ -36,6 +38,16 @@ class TestMysqlEngine:
         assert "--single-transaction" in argv[:-1]
         assert "--result-file" in argv[:-1]
 
+    def test_plain_stream_argv_writes_stdout(self, subject: MysqlEngine) -> None:
+        argv = subject.build_stream_argv(_job(DumpFormat.PLAIN, options=("--single-transaction",)),
+                                         "/tmp/c.cnf")
+        assert argv == ["mariadb-dump", "--defaults-extra-file=/tmp/c.cnf",
+                        "-h", "postal-db", "-P", "3306", "-u", "postal",
+                        "--single-transaction", "postal"]
+
+    def test_directory_cannot_stream(self, subject: MysqlEngine) -> None:
+        assert subject.build_stream_argv(_job(DumpFormat.DIRECTORY), "/tmp/c.cnf") is None
+
     def test_directory_uses_mydumper_with_threads(self, subject: MysqlEngine) -> None:
         argv = subject.build_argv(_job(DumpFormat.DIRECTORY, jobs=4), "/bowl/x.dir", "/tmp/c.cnf")
         assert argv[0] == "mydumper"
@@ -45,6 +57,12 @@ class TestMysqlEngine:
         assert "-o" in argv and argv[argv.index("-o") + 1] == "/bowl/x.dir"
         assert "-t" in argv and argv[argv.index("-t") + 1] == "4"
 
+    def test_directory_compression_is_handed_to_mydumper(self, subject: MysqlEngine) -> None:
+        job = _job(DumpFormat.DIRECTORY, options=("--less-locking",),
+                   compression=Compression(Codec.ZSTD, level=3, threads=4))
+        argv = subject.build_argv(job, "/bowl/x.dir", "/tmp/c.cnf")
+        assert argv[-2:] == ["--compress=ZSTD", "--less-locking"]
+
     def test_binaries_are_overridable(self) -> None:
         engine = MysqlEngine(dump_binary="/x/mariadb-dump", mydumper_binary="/x/mydumper")
         assert engine.build_argv(_job(DumpFormat.PLAIN), "/bowl/x.sql", "/tmp/c.cnf")[0] == "/x/mariadb-dump"
@@ -54,9 +72,9 @@ class TestMysqlEngine:
         assert subject.dump_env("pw") == {}
 
     def test_credentials_content_carries_password_for_both_tools(self, subject: MysqlEngine) -> None:
-        # mariadb-dump reads [client]; mydumper reads its own [mydumper] group
+        # mariadb-dump reads [client]; mydumper and myloader read their own groups
         assert subject.credentials_content("s3cr3t") == (
-            "[client]\npassword=s3cr3t\n[mydumper]\npassword=s3cr3t\n")
+            "[client]\npassword=s3cr3t\n[mydumper]\npassword=s3cr3t\n[myloader]\npassword=s3cr3t\n")
 
     def test_probe_argv_is_mariadb_admin_ping(self, subject: MysqlEngine) -> None:
         job = MysqlDumpJobFactory.build(host="postal-db", port=3306, user="postal")
@@ -64,5 +82,105 @@ class TestMysqlEngine:
             "mariadb-admin", "ping", "-h", "postal-db", "-P", "3306", "-u", "postal"]
 
 
-def test_mysql_defaults_body_has_both_sections() -> None:
-    assert mysql_defaults_body("pw") == "[client]\npassword=pw\n[mydumper]\npassword=pw\n"
+_TARGET = RestoreTarget(host="verify-db", port=3307, user="root", secret="s")
+
+
+class TestMysqlRestore:
+    @pytest.fixture()
+    def subject(self) -> MysqlEngine:
+        return MysqlEngine()
+
+    def test_directory_restores_with_myloader_threads(self, subject: MysqlEngine) -> None:
+        argv = subject.build_restore_argv(_job(DumpFormat.DIRECTORY, jobs=6), _TARGET, "scratch",
+                                          "/bowl/x.dir", "/tmp/c.cnf")
+        assert argv == ["myloader", "--defaults-extra-file=/tmp/c.cnf", "-h", "verify-db", "-P", "3307",
+                        "-u", "root", "--protocol=tcp", "-d", "/bowl/x.dir", "-B", "scratch",
+                        "-t", "6", "-o"]
+        assert subject.build_restore_stream_argv(_job(DumpFormat.DIRECTORY), _TARGET, "scratch") is None
+
+    def test_plain_streams_into_the_mariadb_client(self, subject: MysqlEngine) -> None:
+        argv = subject.build_restore_stream_argv(_job(DumpFormat.PLAIN), _TARGET, "scratch", "/tmp/c.cnf")
+        assert argv == ["mariadb", "--defaults-extra-file=/tmp/c.cnf", "-h", "verify-db", "-P", "3307",
+                        "-u", "root", "scratch"]
+        from_file = subject.build_restore_argv(_job(DumpFormat.PLAIN), _TARGET, "scratch", "/bowl/x.sql")
+        assert from_file[-3:] == ["-e", "source /bowl/x.sql", "scratch"]
+
+    def test_restores_are_not_filtered(self, subject: MysqlEngine) -> None:
+        assert subject.restore_filter(MysqlDumpJobFactory.build(fmt=DumpFormat.PLAIN)) is None
+
+    def test_recreate_drops_and_creates_the_database(self, subject: MysqlEngine) -> None:
+        argv = subject.build_recreate_argv(_TARGET, "scratch", "/tmp/c.cnf")
+        assert argv[-2:] == ["-e", "DROP DATABASE IF EXISTS `scratch`; CREATE DATABASE `scratch`"]
+
+
+def test_mysql_defaults_body_has_every_section() -> None:
+    assert mysql_defaults_body("pw") == (
+        "[client]\npassword=pw\n[mydumper]\npassword=pw\n[myloader]\npassword=pw\n")
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.sent = b""
+
+    def write(self, data: bytes) -> None:
+        self.sent += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def _packet(seq: int, payload: bytes) -> bytes:
+    return len(payload).to_bytes(3, "little") + bytes([seq]) + payload
+
+
+def _server(*packets: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for p in packets:
+        reader.feed_data(p)
+    reader.feed_eof()
+    return reader
+
+
+_GREETING = _packet(0, b"\x0a11.4.2-MariaDB\0" + bytes(40))
+_ACCESS_DENIED = _packet(2, b"\xff\x15\x04#28000Access denied for user 'postal'")
+
+
+class TestMysqlHandshake:
+    @pytest.fixture()
+    def subject(self) -> MysqlEngine:
+        return MysqlEngine()
+
+    @pytest.fixture()
+    def job(self) -> DumpJob:
+        return MysqlDumpJobFactory.build(user="postal")
+
+    async def test_access_denied_after_greeting_means_alive(self, subject: MysqlEngine, job: DumpJob) -> None:
+        writer = _Writer()
+        ok, detail = await subject.probe_handshake(job, _server(_GREETING, _ACCESS_DENIED), writer)  # type: ignore[arg-type]
+        assert (ok, detail) == (True, "11.4.2-MariaDB is alive")
+        assert writer.sent == _packet(1, handshake_response("postal"))
+
+    async def test_auth_switch_is_answered_with_empty_password(
+            self, subject: MysqlEngine, job: DumpJob) -> None:
+        writer = _Writer()
+        switch = _packet(2, b"\xfecaching_sha2_password\0" + bytes(20))
+        server = _server(_GREETING, switch, _packet(4, b"\xff\x15\x04denied"))
+        ok, _ = await subject.probe_handshake(job, server, writer)  # type: ignore[arg-type]
+        assert ok is True
+        assert writer.sent.endswith(_packet(3, b""))
+
+    async def test_successful_login_is_closed_with_quit(self, subject: MysqlEngine, job: DumpJob) -> None:
+        writer = _Writer()
+        ok, _ = await subject.probe_handshake(job, _server(_GREETING, _packet(2, b"\x00\x00\x00")), writer)  # type: ignore[arg-type]
+        assert ok is True
+        assert writer.sent.endswith(_packet(0, b"\x01"))
+
+    async def test_error_greeting_is_not_ready(self, subject: MysqlEngine, job: DumpJob) -> None:
+        refused = _packet(0, b"\xff\x10\x04Too many connections")
+        ok, detail = await subject.probe_handshake(job, _server(refused), _Writer())  # type: ignore[arg-type]
+        assert (ok, detail) == (False, "error 1040: Too many connections")
+
+    async def test_non_mysql_greeting_is_not_ready(self, subject: MysqlEngine, job: DumpJob) -> None:
+        ok, detail = await subject.probe_handshake(job, _server(_packet(0, b"SSH-2.0")), _Writer())  # type: ignore[arg-type]
+        assert ok is False
+        assert "unexpected greeting" in detail
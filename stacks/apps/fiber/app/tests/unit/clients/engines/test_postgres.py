@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import struct
 from pathlib import Path
 
 import pytest
 
 from fiber.clients.engines.base import DumpEngine
-from fiber.clients.engines.postgres import PostgresEngine, select_pg_dump_binary
-from fiber.domain.models import DumpFormat, DumpJob
+from fiber.clients.engines.postgres import (PlainAclFilter, PostgresEngine, select_pg_dump_binary,
+                                           startup_packet)
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob, RestoreTarget
 from tests.factories import DumpJobFactory
 
 
@@ -32,6 +35,35 @@ class TestPostgresEngine:
         assert "-F" in argv and argv[argv.index("-F") + 1] == "d"
         assert "-j" in argv and argv[argv.index("-j") + 1] == "4"
 
+    def test_stream_argv_drops_output_file(self, subject: PostgresEngine) -> None:
+        argv = subject.build_stream_argv(_job(DumpFormat.CUSTOM, options=("--clean",)))
+        assert argv == ["pg_dump", "-h", "kenku-pg", "-p", "5432", "-U", "kenku", "-d", "kenku",
+                        "-F", "c", "--clean"]
+
+    def test_directory_format_compresses_natively(self, subject: PostgresEngine) -> None:
+        job = DumpJobFactory.build(fmt=DumpFormat.DIRECTORY, compression=Compression(Codec.ZSTD, level=9))
+        argv = subject.build_argv(job, "/bowl/x.dir")
+        assert argv[argv.index("-Z") + 1] == "zstd:9"
+
+    @pytest.mark.parametrize(("compression", "flags"), [
+        (Compression(Codec.GZIP, level=5), ["-Z", "5"]),
+        (Compression(Codec.GZIP), []),
+        (Compression(Codec.ZSTD, level=9), []),  # gzip, pg_dump's own default for -Fd
+    ])
+    def test_directory_compression_before_pg_dump_16_is_gzip_only(
+            self, compression: Compression, flags: list[str]) -> None:
+        old = PostgresEngine(binary="/usr/lib/postgresql/15/bin/pg_dump")
+        argv = old.build_argv(DumpJobFactory.build(fmt=DumpFormat.DIRECTORY, compression=compression), "/bowl/d")
+        z = argv.index("-Z") if "-Z" in argv else None
+        assert (argv[z:z + 2] if z is not None else []) == flags
+
+    def test_plain_stream_leaves_compression_to_the_runner(self, subject: PostgresEngine) -> None:
+        job = DumpJobFactory.build(fmt=DumpFormat.PLAIN, compression=Compression(Codec.GZIP))
+        assert "-Z" not in subject.build_stream_argv(job)  # type: ignore[operator]
+
+    def test_directory_format_cannot_stream(self, subject: PostgresEngine) -> None:
+        assert subject.build_stream_argv(_job(DumpFormat.DIRECTORY, jobs=4)) is None
+
     def test_binary_is_used(self) -> None:
         engine = PostgresEngine(binary="/x/pg_dump")
         assert engine.build_argv(_job(DumpFormat.CUSTOM), "/bowl/x.dump")[0] == "/x/pg_dump"
@@ -48,6 +80,86 @@ class TestPostgresEngine:
             "pg_isready", "-h", "kenku-pg", "-p", "5432", "-U", "kenku"]
 
 
+_TARGET = RestoreTarget(host="verify-pg", port=5433, user="fiber", secret="s")
+
+
+class TestPostgresRestore:
+    @pytest.fixture()
+    def subject(self) -> PostgresEngine:
+        return PostgresEngine(binary="/usr/lib/postgresql/17/bin/pg_dump")
+
+    def test_custom_restores_in_parallel_from_the_file(self, subject: PostgresEngine) -> None:
+        argv = subject.build_restore_argv(_job(DumpFormat.CUSTOM, jobs=4), _TARGET, "scratch", "/bowl/x.dump")
+        assert argv == ["/usr/lib/postgresql/17/bin/pg_restore", "-h", "verify-pg", "-p", "5433",
+                        "-U", "fiber", "-d", "scratch", "--no-owner", "--no-privileges",
+                        "--exit-on-error", "-j", "4", "/bowl/x.dump"]
+
+    def test_plain_restores_through_psql(self, subject: PostgresEngine) -> None:
+        argv = subject.build_restore_argv(_job(DumpFormat.PLAIN), _TARGET, "scratch", "/bowl/x.sql")
+        assert argv[0].endswith("/psql") and argv[-2:] == ["-f", "/bowl/x.sql"]
+        assert "ON_ERROR_STOP=1" in argv
+
+    def test_serial_custom_and_plain_stream_from_stdin(self, subject: PostgresEngine) -> None:
+        custom = subject.build_restore_stream_argv(_job(DumpFormat.CUSTOM), _TARGET, "scratch")
+        plain = subject.build_restore_stream_argv(_job(DumpFormat.PLAIN), _TARGET, "scratch")
+        assert custom is not None and custom[-1] == "--exit-on-error"
+        assert plain is not None and plain[-2:] == ["-f", "-"]
+
+    def test_parallel_and_directory_restores_need_a_file(self, subject: PostgresEngine) -> None:
+        assert subject.build_restore_stream_argv(_job(DumpFormat.CUSTOM, jobs=2), _TARGET, "s") is None
+        assert subject.build_restore_stream_argv(_job(DumpFormat.DIRECTORY), _TARGET, "s") is None
+
+    def test_recreate_drops_and_creates_the_database(self) -> None:
+        argv = PostgresEngine(binary="pg_dump").build_recreate_argv(_TARGET, "odd\"name's")
+        assert argv[0] == "psql" and argv[argv.index("-d") + 1] == "postgres"
+        assert argv[-5:] == [
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE datname = 'odd\"name''s' AND pid <> pg_backend_pid()",
+            "-c", 'DROP DATABASE IF EXISTS "odd""name\'s"',  # no WITH (FORCE): that needs PG13
+            "-c", 'CREATE DATABASE "odd""name\'s"']
+
+    def test_only_plain_dumps_are_filtered(self, subject: PostgresEngine) -> None:
+        assert isinstance(subject.restore_filter(_job(DumpFormat.PLAIN)), PlainAclFilter)
+        assert subject.restore_filter(_job(DumpFormat.CUSTOM)) is None
+
+
+_PLAIN = b"""SET client_encoding = 'UTF8';
+CREATE SCHEMA app;
+ALTER SCHEMA app OWNER TO app_owner;
+CREATE TABLE app.note (body text);
+ALTER TABLE app.note OWNER TO app_owner;
+ALTER FUNCTION app.touch(integer) OWNER TO app_owner;
+COPY app.note (body) FROM stdin;
+GRANT ALL ON app.note TO everyone;
+hello
+\\.
+REVOKE ALL ON SCHEMA public FROM PUBLIC;
+GRANT SELECT ON TABLE app.note TO reporting;
+ALTER DEFAULT PRIVILEGES FOR ROLE app_owner IN SCHEMA app GRANT SELECT ON TABLES TO reporting;
+CREATE INDEX note_body ON app.note (body);
+"""
+
+
+class TestPlainAclFilter:
+    @pytest.mark.parametrize("piece", [1, 5, 64, len(_PLAIN)])
+    def test_drops_owners_and_grants_but_not_copy_data(self, piece: int) -> None:
+        f = PlainAclFilter()
+        out = b"".join(f.feed(_PLAIN[i:i + piece]) for i in range(0, len(_PLAIN), piece)) + f.finish()
+        assert out == b"""SET client_encoding = 'UTF8';
+CREATE SCHEMA app;
+CREATE TABLE app.note (body text);
+COPY app.note (body) FROM stdin;
+GRANT ALL ON app.note TO everyone;
+hello
+\\.
+CREATE INDEX note_body ON app.note (body);
+"""
+
+    def test_last_line_without_a_newline_is_filtered(self) -> None:
+        f = PlainAclFilter()
+        assert f.feed(b"CREATE TABLE t ();\nALTER TABLE t OWNER TO x;") + f.finish() == b"CREATE TABLE t ();\n"
+
+
 class TestSelectPgDumpBinary:
     def test_picks_highest_major(self, tmp_path: Path) -> None:
         for major in (13, 16, 14):
@@ -63,3 +175,68 @@ class TestSelectPgDumpBinary:
         (tmp_path / "16" / "bin").mkdir(parents=True)
         (tmp_path / "utils").mkdir()
         assert select_pg_dump_binary(bindir=str(tmp_path)) == f"{tmp_path}/16/bin/pg_dump"
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.sent = b""
+
+    def write(self, data: bytes) -> None:
+        self.sent += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def _server(*replies: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for r in replies:
+        reader.feed_data(r)
+    reader.feed_eof()
+    return reader
+
+
+def _error(code: str, message: str) -> bytes:
+    body = f"SFATAL\0C{code}\0M{message}\0\0".encode()
+    return b"E" + struct.pack("!I", len(body) + 4) + body
+
+
+class TestPostgresHandshake:
+    @pytest.fixture()
+    def subject(self) -> PostgresEngine:
+        return PostgresEngine(binary="pg_dump")
+
+    @pytest.fixture()
+    def job(self) -> DumpJob:
+        return DumpJobFactory.build(user="kenku", dbname="kenku")
+
+    async def test_auth_request_means_accepting(self, subject: PostgresEngine, job: DumpJob) -> None:
+        writer = _Writer()
+        auth_md5 = b"R" + struct.pack("!II", 12, 5) + b"salt"
+        ok, detail = await subject.probe_handshake(job, _server(b"N", auth_md5), writer)  # type: ignore[arg-type]
+        assert (ok, detail) == (True, "accepting connections")
+        assert writer.sent == struct.pack("!II", 8, 80877103) + startup_packet("kenku", "kenku")
+
+    async def test_starting_up_is_not_ready(self, subject: PostgresEngine, job: DumpJob) -> None:
+        reply = _error("57P03", "the database system is starting up")
+        ok, detail = await subject.probe_handshake(job, _server(b"N", reply), _Writer())  # type: ignore[arg-type]
+        assert (ok, detail) == (False, "the database system is starting up")
+
+    async def test_other_errors_still_mean_the_server_is_up(self, subject: PostgresEngine, job: DumpJob) -> None:
+        reply = _error("28000", "no pg_hba.conf entry")
+        ok, _ = await subject.probe_handshake(job, _server(b"N", reply), _Writer())  # type: ignore[arg-type]
+        assert ok is True
+
+    async def test_tls_offer_means_accepting(self, subject: PostgresEngine, job: DumpJob) -> None:
+        ok, detail = await subject.probe_handshake(job, _server(b"S"), _Writer())  # type: ignore[arg-type]
+        assert ok is True
+        assert "TLS" in detail
+
+    async def test_non_postgres_server_is_not_ready(self, subject: PostgresEngine, job: DumpJob) -> None:
+        ok, detail = await subject.probe_handshake(job, _server(b"H"), _Writer())  # type: ignore[arg-type]
+        assert ok is False
+        assert "not a postgres server" in detail
+
+    async def test_unexpected_reply_is_not_ready(self, subject: PostgresEngine, job: DumpJob) -> None:
+        ok, _ = await subject.probe_handshake(job, _server(b"N", b"Z\0\0\0\x05I"), _Writer())  # type: ignore[arg-type]
+        assert ok is False
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
+from dataclasses import asdict
 from pathlib import Path
 
 import pytest
 
-from fiber.clients.bowl import BowlStorage
+from fiber.clients import bowl as bowl_module
+from fiber.clients.bowl import BowlCatalog, BowlStorage
+from fiber.domain.dumps import merkle_root
+from fiber.domain.models import FileDigest
 
 
 class TestBowlStorage:
@@ -66,10 +71,18 @@ class TestBowlStorage:
         (d / "b.dat").write_bytes(b"second")
         (d / "a.dat").write_bytes(b"first")
         assert subject.checksum(str(d)) == subject.checksum(str(d))
-        h = hashlib.sha256()
-        h.update(b"first")
-        h.update(b"second")
-        assert subject.checksum(str(d)) == h.hexdigest()
+        assert subject.checksum(str(d)) == merkle_root(subject.digest_files(str(d)))
+
+    def test_digest_files_lists_every_file_sorted(self, subject: BowlStorage, tmp_path: Path) -> None:
+        d = tmp_path / "kenku-pg" / "ts3.dir"
+        (d / "sub").mkdir(parents=True)
+        (d / "toc.dat").write_bytes(b"toc")
+        (d / "sub" / "3001.dat").write_bytes(b"rows")
+        digests = BowlStorage(root=str(tmp_path), hash_workers=4).digest_files(str(d))
+        assert digests == [
+            FileDigest(path="sub/3001.dat", sha256=hashlib.sha256(b"rows").hexdigest(), bytes=4),
+            FileDigest(path="toc.dat", sha256=hashlib.sha256(b"toc").hexdigest(), bytes=3),
+        ]
 
     def test_delete_removes_file(self, subject: BowlStorage) -> None:
         final = subject.promote(subject.temp_path("kenku-pg", "t6", "dump"))
@@ -78,6 +91,25 @@ class TestBowlStorage:
         subject.delete(final)
         assert not Path(final).exists()
 
+    def test_delete_many_removes_files_and_directories(self, subject: BowlStorage, tmp_path: Path) -> None:
+        final = subject.promote(subject.temp_path("kenku-pg", "t6", "dump"))
+        Path(final).write_bytes(b"data")
+        d = tmp_path / "kenku-pg" / "t7.dir"
+        d.mkdir()
+        (d / "toc.dat").write_bytes(b"toc")
+        subject.reconcile()
+        subject.delete_many([final, str(d)])
+        assert not Path(final).exists() and not d.exists()
+        assert subject.list_entries("kenku-pg") == []
+        assert subject.usage()[0] == 0
+
+    def test_materialise_copies_single_file_dump(self, subject: BowlStorage, tmp_path: Path) -> None:
+        temp = subject.temp_path("kenku-pg", "t7", "sql")
+        Path(temp).write_bytes(b"INSERT 1;\n" * 3)
+        final = subject.promote(temp)
+        dest = subject.materialise(final, str(tmp_path / "restore.sql"))
+        assert Path(dest).read_bytes() == b"INSERT 1;\n" * 3
+
     def test_write_sample_creates_log_file(self, subject: BowlStorage) -> None:
         path = subject.write_sample("kenku-pg", "20260615T030000", "stderr output")
         assert Path(path).read_text() == "stderr output"
@@ -85,8 +117,9 @@ class TestBowlStorage:
 
     def test_usage_returns_used_and_free(self, subject: BowlStorage, tmp_path: Path) -> None:
         # Write known content to a service dir so used > 0
-        final = subject.promote(subject.temp_path("kenku-pg", "ts-u", "dump"))
-        Path(final).write_bytes(b"x" * 100)
+        temp = subject.temp_path("kenku-pg", "ts-u", "dump")
+        Path(temp).write_bytes(b"x" * 100)
+        subject.promote(temp)
         used, free = subject.usage()
         assert used >= 100
         assert free > 0
@@ -101,3 +134,160 @@ class TestBowlStorage:
     def test_read_text_returns_none_when_missing(self, tmp_path: Path) -> None:
         bowl = BowlStorage(root=str(tmp_path))
         assert bowl.read_text(str(tmp_path / "nonexistent.log")) is None
+
+
+def _nightly(bowl: BowlStorage, ts: str, data: bytes, ext: str = "dump") -> str:
+    temp = bowl.temp_path("kenku-pg", ts, ext)
+    Path(temp).write_bytes(data)
+    final = bowl.promote(temp)
+    sha = bowl.checksum(final)
+    bowl.write_receipt(final, {"sha256": sha})
+    return final
+
+
+class TestLinkPrevious:
+    @pytest.fixture()
+    def subject(self, tmp_path: Path) -> BowlStorage:
+        return BowlStorage(root=str(tmp_path))
+
+    def test_identical_dump_becomes_a_hard_link_counted_once(self, subject: BowlStorage) -> None:
+        first = _nightly(subject, "20260614T030000", b"x" * 1000)
+        before = subject.usage()[0]
+        temp = subject.temp_path("kenku-pg", "20260615T030000", "dump")
+        Path(temp).write_bytes(b"x" * 1000)
+        second = subject.promote(temp)
+        assert subject.link_previous(second, subject.checksum(second)) == 1000
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+        assert subject.usage()[0] == before
+        subject.delete(first)
+        assert Path(second).read_bytes() == b"x" * 1000
+        assert subject.usage()[0] == before  # the bytes live on under the second name
+        subject.delete(second)
+        assert subject.usage()[0] == before - 1000
+
+    def test_entries_order_by_name_not_shared_mtime(self, subject: BowlStorage) -> None:
+        _nightly(subject, "20260614T030000", b"same")
+        temp = subject.temp_path("kenku-pg", "20260615T030000", "dump")
+        Path(temp).write_bytes(b"same")
+        second = subject.promote(temp)
+        subject.link_previous(second, subject.checksum(second))
+        stamps = sorted((e.modified_at, Path(e.path).name) for e in subject.list_entries("kenku-pg"))
+        assert [name for _, name in stamps] == ["20260614T030000.dump", "20260615T030000.dump"]
+
+    def test_changed_dump_or_other_kind_is_left_alone(self, subject: BowlStorage) -> None:
+        _nightly(subject, "20260614T030000", b"old")
+        _nightly(subject, "20260614T040000", b"new", ext="sql")
+        temp = subject.temp_path("kenku-pg", "20260615T030000", "dump")
+        Path(temp).write_bytes(b"new")
+        second = subject.promote(temp)
+        assert subject.link_previous(second, subject.checksum(second)) == 0
+        assert os.stat(second).st_nlink == 1
+
+    def test_first_dump_has_nothing_to_link(self, subject: BowlStorage) -> None:
+        temp = subject.temp_path("kenku-pg", "20260615T030000", "dump")
+        Path(temp).write_bytes(b"x")
+        final = subject.promote(temp)
+        assert subject.link_previous(final, subject.checksum(final)) == 0
+
+    def test_directory_dumps_link_unchanged_files(self, subject: BowlStorage, tmp_path: Path) -> None:
+        def dump(ts: str, rows: bytes) -> str:
+            temp = Path(subject.temp_path("kenku-pg", ts, "dir"))
+            temp.mkdir()
+            (temp / "toc.dat").write_bytes(b"toc")
+            (temp / "3001.dat").write_bytes(rows)
+            return subject.promote(str(temp))
+
+        first = dump("20260614T030000", b"rows v1")
+        subject.write_receipt(first, {"files": [asdict(f) for f in subject.digest_files(first)]})
+        second = dump("20260615T030000", b"rows v2")
+        assert subject.link_previous(second, "", subject.digest_files(second)) == 3
+        assert os.stat(f"{first}/toc.dat").st_ino == os.stat(f"{second}/toc.dat").st_ino
+        assert os.stat(f"{first}/3001.dat").st_ino != os.stat(f"{second}/3001.dat").st_ino
+        used = subject.usage()[0]
+        subject.reconcile()
+        assert subject.usage()[0] == used  # a fresh walk agrees on the shared inode
+
+    def test_falls_back_to_reflink_then_gives_up(self, subject: BowlStorage, monkeypatch) -> None:
+        _nightly(subject, "20260614T030000", b"same")
+        temp = subject.temp_path("kenku-pg", "20260615T030000", "dump")
+        Path(temp).write_bytes(b"same")
+        second = subject.promote(temp)
+
+        def no_link(src: object, dst: object) -> None:
+            raise OSError("EMLINK")
+
+        monkeypatch.setattr(bowl_module.os, "link", no_link)
+        cloned: list[int] = []
+
+        def clone(fd: int, op: int, src: int) -> None:
+            cloned.append(op)
+            os.write(fd, os.pread(src, 64, 0))
+
+        monkeypatch.setattr(bowl_module.fcntl, "ioctl", clone)
+        assert subject.link_previous(second, subject.checksum(second)) == 4
+        assert cloned == [bowl_module._FICLONE]
+
+        def no_clone(fd: int, op: int, src: int) -> None:
+            raise OSError("EOPNOTSUPP")
+
+        monkeypatch.setattr(bowl_module.fcntl, "ioctl", no_clone)
+        assert subject.link_previous(second, subject.checksum(second)) == 0
+        assert Path(second).read_bytes() == b"same"
+        assert not Path(f"{second}.link").exists()
+
+
+class TestBowlCatalog:
+    def test_indexes_existing_root_on_first_read(self, tmp_path: Path) -> None:
+        (tmp_path / "kenku-pg").mkdir()
+        (tmp_path / "kenku-pg" / "t1.dump").write_bytes(b"x" * 10)
+        (tmp_path / "kenku-pg" / "t1.dump.manifest.json").write_text("{}")
+        bowl = BowlStorage(root=str(tmp_path))
+        assert [Path(e.path).name for e in bowl.list_entries("kenku-pg")] == ["t1.dump"]
+        assert bowl.usage()[0] == 12
+
+    def test_mutations_update_catalog_without_rescanning(self, tmp_path: Path) -> None:
+        bowl = BowlStorage(root=str(tmp_path))
+        assert bowl.usage()[0] == 0  # indexes the (empty) root
+        temp = bowl.temp_path("kenku-pg", "t1", "dump")
+        Path(temp).write_bytes(b"abcd")
+        final = bowl.promote(temp)
+        bowl.write_receipt(final, {"sha256": "abc"})
+        receipt_bytes = (tmp_path / "kenku-pg" / "t1.dump.manifest.json").stat().st_size
+        assert bowl.usage()[0] == 4 + receipt_bytes
+        # out-of-band writes are invisible until a reconcile
+        (tmp_path / "kenku-pg" / "stray.dump").write_bytes(b"y" * 50)
+        assert bowl.usage()[0] == 4 + receipt_bytes
+        bowl.delete(final)
+        assert bowl.usage()[0] == receipt_bytes
+        bowl.reconcile()
+        assert bowl.usage()[0] == receipt_bytes + 50
+
+    def test_temp_entries_are_sized_live(self, tmp_path: Path) -> None:
+        bowl = BowlStorage(root=str(tmp_path))
+        bowl.usage()
+        temp = bowl.temp_path("kenku-pg", "t1", "dump")
+        assert [e.size_bytes for e in bowl.list_entries("kenku-pg")] == [0]
+        Path(temp).write_bytes(b"z" * 7)
+        assert [e.size_bytes for e in bowl.list_entries("kenku-pg")] == [7]
+
+    def test_catalog_is_shared_across_instances(self, tmp_path: Path) -> None:
+        catalog = BowlCatalog()
+        dashboard = BowlStorage(root=str(tmp_path), catalog=catalog)
+        dashboard.usage()
+        mover = BowlStorage(root=str(tmp_path), catalog=catalog)
+        temp = mover.temp_path("kenku-pg", "t1", "dump")
+        Path(temp).write_bytes(b"q" * 9)
+        mover.promote(temp)
+        assert dashboard.usage()[0] == 9
+        assert len(dashboard.list_entries("kenku-pg")) == 1
+
+    def test_reconcile_covers_other_known_roots(self, tmp_path: Path) -> None:
+        catalog = BowlCatalog()
+        main, extra = tmp_path / "main", tmp_path / "extra"
+        BowlStorage(root=str(main), catalog=catalog).usage()
+        other = BowlStorage(root=str(extra), catalog=catalog)
+        other.usage()
+        (extra / "svc").mkdir()
+        (extra / "svc" / "t.dump").write_bytes(b"1234")
+        BowlStorage(root=str(main), catalog=catalog).reconcile()
+        assert other.usage()[0] == 4
@@ -73,3 +73,44 @@ class TestDockerContainerGateway:
         gw.list_dump_services()
         gw.list_dump_services()
         assert calls == 1
+
+
+class TestDockerContainerGatewayEvents:
+    @pytest.fixture()
+    def docker_client(self) -> MagicMock:
+        return create_autospec(docker.DockerClient, instance=True)
+
+    @pytest.fixture()
+    def subject(self, docker_client: MagicMock) -> DockerContainerGateway:
+        return DockerContainerGateway(client_factory=lambda: docker_client)
+
+    def test_event_stream_follows_enrolled_containers(self, subject, docker_client) -> None:
+        subject.event_stream()
+        docker_client.events.assert_called_once_with(
+            decode=True, filters={"type": "container", "label": "fiber.enable=true"})
+
+    @pytest.mark.parametrize(("action", "change"), [
+        ("start", "upsert"), ("die", "remove"), ("destroy", "remove"), ("exec_start", None)])
+    def test_event_change_maps_container_lifecycle(self, subject, action: str, change: str | None) -> None:
+        event = {"Type": "container", "Action": action, "Actor": {"Attributes": {"name": "e2e-pg"}}}
+        assert subject.event_change(event) == (None if change is None else (change, "e2e-pg"))
+
+    def test_labels_of_running_enrolled_container(self, subject, docker_client) -> None:
+        fake = MagicMock()
+        fake.status = "running"
+        fake.labels = {"fiber.enable": "true"}
+        docker_client.containers.get.return_value = fake
+        assert subject.labels_of("e2e-pg") == {"fiber.enable": "true"}
+
+    def test_labels_of_stopped_or_unenrolled_container_is_none(self, subject, docker_client) -> None:
+        fake = MagicMock()
+        fake.status = "exited"
+        fake.labels = {"fiber.enable": "true"}
+        docker_client.containers.get.return_value = fake
+        assert subject.labels_of("e2e-pg") is None
+        fake.status, fake.labels = "running", {}
+        assert subject.labels_of("e2e-pg") is None
+
+    def test_labels_of_missing_container_is_none(self, subject, docker_client) -> None:
+        docker_client.containers.get.side_effect = docker.errors.NotFound("gone")
+        assert subject.labels_of("e2e-pg") is None
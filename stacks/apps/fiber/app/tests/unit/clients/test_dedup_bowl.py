@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+from fiber.clients import dedup_bowl
+from fiber.clients.bowl import BowlCatalog
+from fiber.clients.dedup_bowl import ChunkPool, ChunkPools, DedupBowlStorage, chunk_stream
+
+
+def _rows(start: int, stop: int) -> bytes:
+    return b"".join(f"INSERT INTO t VALUES ({i}, 'row {i}');\n".encode() for i in range(start, stop))
+
+
+@pytest.fixture()
+def small_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(dedup_bowl, "_MIN_CHUNK", 256)
+    monkeypatch.setattr(dedup_bowl, "_MAX_CHUNK", 4096)
+    monkeypatch.setattr(dedup_bowl, "_BOUNDARY_MASK", 0x7)
+
+
+def _store(bowl: DedupBowlStorage, ts: str, data: bytes) -> str:
+    temp = bowl.temp_path("kenku-pg", ts, "sql")
+    Path(temp).write_bytes(data)
+    return bowl.promote(temp)
+
+
+def _pool_files(root: Path) -> list[Path]:
+    return [p for p in (root / ".pool").glob("*/*") if p.is_file()]
+
+
+class TestChunkStream:
+    def test_chunks_reassemble_to_the_input(self, small_chunks) -> None:
+        data = _rows(0, 500)
+        chunks = list(chunk_stream(io.BytesIO(data)))
+        assert len(chunks) > 1
+        assert b"".join(chunks) == data
+
+    def test_an_insert_only_disturbs_nearby_chunks(self, small_chunks) -> None:
+        before = list(chunk_stream(io.BytesIO(_rows(0, 2000))))
+        after = list(chunk_stream(io.BytesIO(_rows(0, 1000) + b"-- new row\n" + _rows(1000, 2000))))
+        assert len(set(before) - set(after)) <= 2
+
+    def test_runs_without_a_boundary_are_capped(self, small_chunks) -> None:
+        chunks = list(chunk_stream(io.BytesIO(b"x" * 10000)))
+        assert b"".join(chunks) == b"x" * 10000
+        assert max(len(c) for c in chunks) <= dedup_bowl._MAX_CHUNK
+
+    def test_binary_dumps_without_newlines_still_dedup(self, small_chunks) -> None:
+        data = random.Random(0).randbytes(50_000).replace(b"\n", b" ")
+        before = list(chunk_stream(io.BytesIO(data)))
+        after = list(chunk_stream(io.BytesIO(data[:25_000] + b"PGDMP" + data[25_000:])))
+        assert b"".join(after) == data[:25_000] + b"PGDMP" + data[25_000:]
+        assert len(set(before) - set(after)) <= 2
+
+    def test_chunks_do_not_depend_on_how_the_stream_is_split(self, small_chunks) -> None:
+        data = random.Random(1).randbytes(30_000) + _rows(0, 300)
+        rng = random.Random(2)
+        chunker = dedup_bowl._Chunker()
+        chunks: list[bytes] = []
+        pos = 0
+        while pos < len(data):
+            step = rng.randint(1, 3000)
+            chunks += chunker.feed(data[pos:pos + step])
+            pos += step
+        chunks += chunker.finish()
+        assert chunks == list(chunk_stream(io.BytesIO(data)))
+
+    def test_default_sizes_cut_between_the_limits(self) -> None:
+        data = random.Random(3).randbytes(8 << 20)
+        chunks = list(chunk_stream(io.BytesIO(data)))
+        assert b"".join(chunks) == data
+        assert all(len(c) >= dedup_bowl._MIN_CHUNK for c in chunks[:-1])
+        assert len(chunks) > 16  # content boundaries, not just _MAX_CHUNK cuts
+
+
+class TestChunkPool:
+    def test_writes_run_outside_the_pool_lock(self, tmp_path: Path, monkeypatch) -> None:
+        pool = ChunkPool(tmp_path)
+        entered, proceed = threading.Event(), threading.Event()
+        replace = os.replace
+
+        def slow_replace(src: Path, dst: Path) -> None:
+            if Path(dst).name == hashlib.sha256(b"slow").hexdigest():
+                entered.set()
+                proceed.wait(5)
+            replace(src, dst)
+
+        monkeypatch.setattr(dedup_bowl.os, "replace", slow_replace)
+        slow = threading.Thread(target=pool.put, args=(b"slow",))
+        slow.start()
+        assert entered.wait(5)
+        fast = threading.Thread(target=pool.put, args=(b"fast",))
+        fast.start()
+        fast.join(timeout=5)
+        assert not fast.is_alive()  # not queued behind the slow write
+        again = threading.Thread(target=pool.put, args=(b"slow",))
+        again.start()
+        again.join(timeout=0.2)
+        assert again.is_alive()  # the same chunk waits for its one write
+        proceed.set()
+        slow.join()
+        again.join()
+        assert pool.used() == len(b"slow") + len(b"fast")
+        pool.release([hashlib.sha256(b"slow").hexdigest()])
+        assert pool.read(hashlib.sha256(b"slow").hexdigest()) == b"slow"  # still referenced once
+
+
+class TestDedupBowlStorage:
+    @pytest.fixture()
+    def subject(self, tmp_path: Path, small_chunks) -> DedupBowlStorage:
+        return DedupBowlStorage(root=str(tmp_path))
+
+    def test_promote_leaves_recipe_and_logical_path(self, subject: DedupBowlStorage) -> None:
+        data = _rows(0, 300)
+        final = _store(subject, "t1", data)
+        assert final.endswith("t1.sql")
+        assert not Path(final).exists()
+        assert Path(f"{final}.recipe.json").exists()
+        assert subject.size(final) == len(data)
+        assert subject.checksum(final) == hashlib.sha256(data).hexdigest()
+        assert b"".join(subject.stream(final)) == data
+
+    def test_materialise_rebuilds_the_dump(self, subject: DedupBowlStorage, tmp_path: Path) -> None:
+        data = _rows(0, 300)
+        final = _store(subject, "t1", data)
+        dest = subject.materialise(final, str(tmp_path / "restore.sql"))
+        assert Path(dest).read_bytes() == data
+
+    def test_similar_dumps_share_chunks(self, subject: DedupBowlStorage, tmp_path: Path) -> None:
+        _store(subject, "t1", _rows(0, 2000))
+        first = sum(p.stat().st_size for p in _pool_files(tmp_path))
+        _store(subject, "t2", _rows(0, 2000) + _rows(2000, 2010))
+        added = sum(p.stat().st_size for p in _pool_files(tmp_path)) - first
+        assert added <= len(_rows(2000, 2010)) + dedup_bowl._MAX_CHUNK  # the new rows and the old tail chunk
+
+    def test_streamed_dump_is_chunked_as_it_is_written(self, subject: DedupBowlStorage) -> None:
+        data = _rows(0, 300)
+        temp = subject.temp_path("kenku-pg", "t1", "sql")
+        with subject.open_temp(temp) as fh:
+            for i in range(0, len(data), 1000):
+                fh.write(data[i:i + 1000])
+            assert subject.list_entries("kenku-pg")[0].size_bytes > 0  # sized live from the stage
+        assert Path(temp).read_bytes() == b""  # nothing for promote to read back
+        final = subject.promote(temp)
+        assert subject.checksum(final) == hashlib.sha256(data).hexdigest()
+        assert subject.size(final) == len(data)
+        assert b"".join(subject.stream(final)) == data
+        assert subject._recipe(final)["chunks"] == [  # type: ignore[index]
+            hashlib.sha256(c).hexdigest() for c in chunk_stream(io.BytesIO(data))]
+
+    def test_swept_temp_releases_its_staged_chunks(self, subject: DedupBowlStorage, tmp_path: Path) -> None:
+        temp = subject.temp_path("kenku-pg", "t1", "sql")
+        with subject.open_temp(temp) as fh:
+            fh.write(_rows(0, 300))
+        assert _pool_files(tmp_path)
+        subject.delete_many([temp])
+        assert _pool_files(tmp_path) == []
+        assert subject.usage()[0] == 0
+        assert subject.list_entries("kenku-pg") == []
+
+    def test_entries_list_logical_paths(self, subject: DedupBowlStorage) -> None:
+        final = _store(subject, "t1", _rows(0, 10))
+        entries = subject.list_entries("kenku-pg")
+        assert [e.path for e in entries] == [final]
+        assert not entries[0].is_temp
+
+    def test_chunked_dumps_are_not_hard_linked(self, subject: DedupBowlStorage) -> None:
+        first = _store(subject, "20260614T030000", _rows(0, 10))
+        subject.write_receipt(first, {"sha256": subject.checksum(first)})
+        second = _store(subject, "20260615T030000", _rows(0, 10))
+        assert subject.link_previous(second, subject.checksum(second)) == 0  # the pool already shares them
+
+    def test_usage_counts_pool_once(self, subject: DedupBowlStorage) -> None:
+        data = _rows(0, 2000)
+        _store(subject, "t1", data)
+        _store(subject, "t2", data)
+        used, _ = subject.usage()
+        assert len(data) <= used < 2 * len(data)
+
+    def test_delete_keeps_shared_chunks_until_last_reference(
+            self, subject: DedupBowlStorage, tmp_path: Path) -> None:
+        data = _rows(0, 500)
+        first = _store(subject, "t1", data)
+        second = _store(subject, "t2", data)
+        subject.delete(first)
+        assert b"".join(subject.stream(second)) == data
+        subject.delete(second)
+        assert _pool_files(tmp_path) == []
+        assert subject.list_entries("kenku-pg") == []
+        assert subject.usage()[0] == 0
+
+    def test_delete_many_releases_chunks_of_every_dump(
+            self, subject: DedupBowlStorage, tmp_path: Path) -> None:
+        data = _rows(0, 500)
+        keep = _store(subject, "t3", _rows(500, 600))
+        subject.delete_many([_store(subject, "t1", data), _store(subject, "t2", data)])
+        assert [e.path for e in subject.list_entries("kenku-pg")] == [keep]
+        assert b"".join(subject.stream(keep)) == _rows(500, 600)
+        subject.delete_many([keep])
+        assert _pool_files(tmp_path) == []
+        assert subject.usage()[0] == 0
+
+    def test_refcounts_rebuild_from_recipes_and_drop_orphans(self, tmp_path: Path, small_chunks) -> None:
+        final = _store(DedupBowlStorage(root=str(tmp_path)), "t1", _rows(0, 500))
+        orphan = tmp_path / ".pool" / "ff" / ("f" * 64)
+        orphan.parent.mkdir(parents=True, exist_ok=True)
+        orphan.write_bytes(b"left by a crashed promote")
+        fresh = DedupBowlStorage(root=str(tmp_path))
+        assert fresh.usage()[0] > 0
+        assert not orphan.exists()
+        fresh.delete(final)
+        assert _pool_files(tmp_path) == []
+
+    def test_instances_on_one_root_share_a_pool(self, tmp_path: Path, small_chunks) -> None:
+        catalog, pools = BowlCatalog(), ChunkPools()
+        data = _rows(0, 500)
+        first = _store(DedupBowlStorage(root=str(tmp_path), catalog=catalog, pools=pools), "t1", data)
+        other = DedupBowlStorage(root=str(tmp_path), catalog=catalog, pools=pools)
+        second = _store(other, "t2", data)
+        other.delete(first)
+        assert b"".join(other.stream(second)) == data
+
+    def test_directory_dumps_are_stored_as_is(self, subject: DedupBowlStorage) -> None:
+        temp = subject.temp_path("kenku-pg", "t1", "dir")
+        Path(temp).mkdir()
+        (Path(temp) / "toc.dat").write_bytes(b"toc")
+        final = subject.promote(temp)
+        assert (Path(final) / "toc.dat").read_bytes() == b"toc"
+        subject.delete(final)
+        assert not Path(final).exists()
@@ -1,8 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
 from fiber.clients.container import DockerContainerGateway
-from fiber.clients.discovery import DiscoveryProvider
+from fiber.clients.discovery import DiscoveryProvider, EventDrivenDiscovery, WatchableDiscovery, change_from_event
 from fiber.clients.swarm import DockerSwarmGateway
 
 
 def test_both_gateways_satisfy_discovery_protocol() -> None:
     assert isinstance(DockerSwarmGateway(client_factory=lambda: None), DiscoveryProvider)
     assert isinstance(DockerContainerGateway(client_factory=lambda: None), DiscoveryProvider)
+
+
+def test_both_gateways_can_be_watched() -> None:
+    assert isinstance(DockerSwarmGateway(client_factory=lambda: None), WatchableDiscovery)
+    assert isinstance(DockerContainerGateway(client_factory=lambda: None), WatchableDiscovery)
+
+
+def _event(kind: str, action: str, name: str | None = "kenku-pg") -> dict[str, Any]:
+    return {"Type": kind, "Action": action, "Actor": {"Attributes": {"name": name} if name else {}}}
+
+
+def test_change_from_event_maps_known_actions() -> None:
+    actions = {"update": "upsert", "remove": "remove"}
+    assert change_from_event(_event("service", "update"), "service", actions) == ("upsert", "kenku-pg")
+    assert change_from_event(_event("service", "remove"), "service", actions) == ("remove", "kenku-pg")
+    assert change_from_event(_event("service", "exec_start"), "service", actions) is None
+    assert change_from_event(_event("container", "update"), "service", actions) is None
+    assert change_from_event(_event("service", "update", name=None), "service", actions) is None
+
+
+class FakeStream:
+    """Blocking event stream: yields queued events until close() is called."""
+
+    def __init__(self, events: list[dict[str, Any]]) -> None:
+        self._events = list(events)
+        self._closed = threading.Event()
+        self.closed = False
+
+    def __iter__(self):
+        yield from self._events
+        self._closed.wait(5)
+        if self._closed.is_set():
+            raise OSError("stream closed")
+
+    def close(self) -> None:
+        self.closed = True
+        self._closed.set()
+
+
+class FakeGateway:
+    def __init__(self) -> None:
+        self.services: dict[str, dict[str, str]] = {"kenku-pg": {"fiber.enable": "true"}}
+        self.lists = 0
+        self.stream = FakeStream([])
+
+    def list_dump_services(self) -> dict[str, dict[str, str]]:
+        self.lists += 1
+        return {k: dict(v) for k, v in self.services.items()}
+
+    def image_of(self, name: str) -> tuple[str | None, str | None]:
+        return ("img:1", None)
+
+    def event_stream(self) -> FakeStream:
+        return self.stream
+
+    def event_change(self, event: dict[str, Any]) -> tuple[str, str] | None:
+        return change_from_event(event, "service", {"update": "upsert", "remove": "remove"})
+
+    def labels_of(self, name: str) -> dict[str, str] | None:
+        return dict(self.services[name]) if name in self.services else None
+
+
+class TestEventDrivenDiscovery:
+    def test_lists_once_then_serves_from_memory_until_resync(self) -> None:
+        gateway, clock = FakeGateway(), [0.0]
+        subject = EventDrivenDiscovery(gateway, resync_interval=60.0, now=lambda: clock[0])
+        assert subject.list_dump_services() == {"kenku-pg": {"fiber.enable": "true"}}
+        subject.list_dump_services()
+        assert gateway.lists == 1
+        clock[0] = 61.0
+        subject.list_dump_services()
+        assert gateway.lists == 2
+        assert subject.image_of("kenku-pg") == ("img:1", None)
+
+    def test_apply_folds_single_changes(self) -> None:
+        gateway = FakeGateway()
+        subject = EventDrivenDiscovery(gateway)
+        subject.list_dump_services()
+        gateway.services["immich"] = {"fiber.enable": "true"}
+        assert subject.apply("upsert", "immich") is True
+        assert subject.apply("upsert", "immich") is False  # nothing new
+        assert subject.apply("remove", "kenku-pg") is True
+        assert subject.apply("remove", "kenku-pg") is False
+        assert subject.list_dump_services() == {"immich": {"fiber.enable": "true"}}
+        assert gateway.lists == 1
+
+    def test_apply_before_first_list_defers_to_full_sync(self) -> None:
+        subject = EventDrivenDiscovery(FakeGateway())
+        assert subject.apply("upsert", "kenku-pg") is True
+
+    async def test_watch_applies_events_and_signals_changes(self) -> None:
+        gateway = FakeGateway()
+        gateway.services["immich"] = {"fiber.enable": "true"}
+        gateway.stream = FakeStream([_event("service", "update", "immich"), _event("service", "exec_start")])
+        subject = EventDrivenDiscovery(gateway)
+        subject.list_dump_services()
+        changed = asyncio.Event()
+        calls = 0
+
+        def on_change() -> None:
+            nonlocal calls
+            calls += 1
+            changed.set()
+
+        task = asyncio.create_task(subject.watch(on_change))
+        await asyncio.wait_for(changed.wait(), timeout=1)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert gateway.stream.closed is True
+        assert calls >= 1
+        # reopening the stream marked the map stale, so the next list is a full resync
+        assert "immich" in subject.list_dump_services()
+        assert gateway.lists == 2
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import io
 import os
+import threading
 from pathlib import Path
 from typing import Any
 
 import pytest
 
 from fiber.clients.dump_runner import DumpRunner, RunOutcome
-from fiber.domain.models import DumpJob
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob
+from fiber.platform.executors import Executors
 from tests.factories import DumpJobFactory, MysqlDumpJobFactory
 
 
@@ -16,13 +20,25 @@ from tests.factories import DumpJobFactory, MysqlDumpJobFactory
 # FakeProcess + factory fixture
 # ---------------------------------------------------------------------------
 
+class FakeStream:
+    def __init__(self, data: bytes = b"") -> None:
+        self._data = data
+
+    async def read(self, n: int = -1) -> bytes:
+        n = len(self._data) if n < 0 else n
+        chunk, self._data = self._data[:n], self._data[n:]
+        return chunk
+
+
 class FakeProcess:
-    def __init__(self, returncode: int = 0, stderr_data: bytes = b"", *, hang: bool = False) -> None:
+    def __init__(self, returncode: int = 0, stderr_data: bytes = b"", *, hang: bool = False,
+                 stdout_data: bytes = b"") -> None:
         self._returncode: int | None = None
         self._final_returncode = returncode
         self._stderr_data = stderr_data
         self._hang = hang
         self.stderr: Any = self
+        self.stdout = FakeStream(stdout_data)
         self.terminated = False
         self.killed = False
 
@@ -49,6 +65,31 @@ class FakeProcess:
         self._returncode = -1
 
 
+class FakeSink:
+    def __init__(self, broken: bool = False) -> None:
+        self.data = b""
+        self.closed = False
+        self._broken = broken
+
+    def write(self, chunk: bytes) -> None:
+        if self._broken:
+            raise BrokenPipeError
+        self.data += chunk
+
+    async def drain(self) -> None:
+        await asyncio.sleep(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeCompressor(FakeProcess):
+    def __init__(self, compressed: bytes, returncode: int = 0, stderr_data: bytes = b"",
+                 broken: bool = False) -> None:
+        super().__init__(returncode=returncode, stderr_data=stderr_data, stdout_data=compressed)
+        self.stdin = FakeSink(broken=broken)
+
+
 def _make_job(timeout: float | None = None) -> DumpJob:
     return DumpJobFactory.build(timeout=timeout)
 
@@ -69,35 +110,36 @@ class TestDumpRunner:
         return DumpRunner(process_factory=factory)
 
     async def test_success_returns_zero_returncode(
-        self, subject: DumpRunner, fake_proc: FakeProcess
+        self, subject: DumpRunner, fake_proc: FakeProcess, tmp_path: Path
     ) -> None:
-        outcome = await subject.run(_make_job(), password="pw", out_path="/bowl/x.dump")
-        assert outcome == RunOutcome(returncode=0, stderr_tail="", cancelled=False)
+        outcome = await subject.run(_make_job(), password="pw", out_path=str(tmp_path / "x.dump"))
+        assert outcome == RunOutcome(returncode=0, stderr_tail="", cancelled=False,
+                                     sha256=hashlib.sha256(b"").hexdigest(), bytes_written=0, raw_bytes=0)
 
-    async def test_failure_captures_stderr_tail(self) -> None:
+    async def test_failure_captures_stderr_tail(self, tmp_path: Path) -> None:
         proc = FakeProcess(returncode=1, stderr_data=b"boom")
 
         async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
             return proc
 
         runner = DumpRunner(process_factory=factory)
-        outcome = await runner.run(_make_job(), password="pw", out_path="/bowl/x.dump")
+        outcome = await runner.run(_make_job(), password="pw", out_path=str(tmp_path / "x.dump"))
         assert outcome.returncode == 1
         assert outcome.cancelled is False
         assert "boom" in outcome.stderr_tail
 
-    async def test_timeout_cancels_and_terminates(self) -> None:
+    async def test_timeout_cancels_and_terminates(self, tmp_path: Path) -> None:
         proc = FakeProcess(returncode=0, hang=True)
 
         async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
             return proc
 
         runner = DumpRunner(process_factory=factory)
-        outcome = await runner.run(_make_job(timeout=0.01), password="pw", out_path="/bowl/x.dump")
+        outcome = await runner.run(_make_job(timeout=0.01), password="pw", out_path=str(tmp_path / "x.dump"))
         assert outcome.cancelled is True
         assert proc.terminated is True
 
-    async def test_external_cancel_cancels_and_terminates(self) -> None:
+    async def test_external_cancel_cancels_and_terminates(self, tmp_path: Path) -> None:
         proc = FakeProcess(returncode=0, hang=True)
 
         async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
@@ -106,7 +148,7 @@ class TestDumpRunner:
         runner = DumpRunner(process_factory=factory)
 
         async def _run() -> RunOutcome:
-            return await runner.run(_make_job(), password="pw", out_path="/bowl/x.dump")
+            return await runner.run(_make_job(), password="pw", out_path=str(tmp_path / "x.dump"))
 
         task = asyncio.create_task(_run())
         await asyncio.sleep(0.01)
@@ -116,6 +158,168 @@ class TestDumpRunner:
         assert proc.terminated is True
 
 
+# ---------------------------------------------------------------------------
+# Streaming: hash + count while the dump lands
+# ---------------------------------------------------------------------------
+
+class TestDumpRunnerStreaming:
+    async def test_streamed_dump_is_written_hashed_and_counted(self, tmp_path: Path) -> None:
+        payload = b"PGDMP" + b"x" * (3 << 20)  # spans several read chunks
+        captured: dict[str, Any] = {}
+
+        async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
+            captured["argv"], captured["stdout"] = args, kwargs["stdout"]
+            return FakeProcess(returncode=0, stdout_data=payload)
+
+        out = tmp_path / "x.dump.partial"
+        outcome = await DumpRunner(process_factory=factory).run(
+            DumpJobFactory.build(fmt=DumpFormat.CUSTOM, timeout=None), password="pw", out_path=str(out))
+
+        assert out.read_bytes() == payload
+        assert outcome.sha256 == hashlib.sha256(payload).hexdigest()
+        assert outcome.bytes_written == len(payload)
+        assert captured["stdout"] == asyncio.subprocess.PIPE
+        assert "-f" not in captured["argv"]
+
+    async def test_streamed_dump_is_hashed_and_written_off_the_event_loop(self, tmp_path: Path) -> None:
+        payload = b"PGDMP" + b"x" * (3 << 20)
+        loop_thread = threading.get_ident()
+        threads: set[int] = set()
+
+        class Recorded(Executors):
+            async def disk(self, fn: Any, *args: object, **kwargs: object) -> Any:
+                def recorded() -> Any:
+                    threads.add(threading.get_ident())
+                    return fn(*args, **kwargs)
+                return await super().disk(recorded)
+
+        async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
+            return FakeProcess(returncode=0, stdout_data=payload)
+
+        out = tmp_path / "x.dump.partial"
+        executors = Recorded(disk_workers=2)
+        try:
+            outcome = await DumpRunner(process_factory=factory, executors=executors).run(
+                DumpJobFactory.build(fmt=DumpFormat.CUSTOM, timeout=None), password="pw", out_path=str(out))
+        finally:
+            executors.shutdown()
+        assert out.read_bytes() == payload
+        assert outcome.sha256 == hashlib.sha256(payload).hexdigest()
+        assert threads and loop_thread not in threads
+
+    async def test_streamed_dump_goes_to_the_writer_it_is_given(self, tmp_path: Path) -> None:
+        payload = b"PGDMP" + b"x" * (3 << 20)
+        sink = io.BytesIO()
+        opened: list[str] = []
+
+        def open_out(path: str) -> io.BytesIO:
+            opened.append(path)
+            sink.close = lambda: None  # type: ignore[method-assign]
+            return sink
+
+        async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
+            return FakeProcess(returncode=0, stdout_data=payload)
+
+        out = tmp_path / "x.dump.partial"
+        outcome = await DumpRunner(process_factory=factory).run(
+            DumpJobFactory.build(fmt=DumpFormat.CUSTOM, timeout=None), password="pw", out_path=str(out),
+            open_out=open_out)
+        assert opened == [str(out)]
+        assert sink.getvalue() == payload
+        assert not out.exists()
+        assert outcome.sha256 == hashlib.sha256(payload).hexdigest()
+
+    async def test_directory_dump_writes_itself_and_is_not_hashed(self, tmp_path: Path) -> None:
+        captured: dict[str, Any] = {}
+
+        async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
+            captured["argv"], captured["stdout"] = args, kwargs["stdout"]
+            return FakeProcess(returncode=0)
+
+        out = str(tmp_path / "x.dir.partial")
+        outcome = await DumpRunner(process_factory=factory).run(
+            DumpJobFactory.build(fmt=DumpFormat.DIRECTORY, timeout=None), password="pw", out_path=out)
+
+        assert outcome.sha256 is None and outcome.bytes_written is None
+        assert captured["stdout"] == asyncio.subprocess.DEVNULL
+        assert captured["argv"][-2:] == ("-f", out)
+
+
+class TestDumpRunnerCompression:
+    def _factory(self, dump: FakeProcess, compressor: FakeCompressor, calls: list[tuple[Any, ...]]):
+        async def factory(*args: Any, **kwargs: Any) -> FakeProcess:
+            calls.append(args)
+            return dump if len(calls) == 1 else compressor
+        return factory
+
+    def _job(self) -> DumpJob:
+        return DumpJobFactory.build(fmt=DumpFormat.PLAIN, timeout=None,
+                                    compression=Compression(Codec.ZSTD, level=19, threads=4))
+
+    async def test_stream_is_compressed_on_its_way_to_disk(self, tmp_path: Path) -> None:
+        payload = b"INSERT INTO t VALUES (1);\n" * 100_000
+        calls: list[tuple[Any, ...]] = []
+        compressor = FakeCompressor(compressed=b"\x28\xb5\x2f\xfd small")
+        runner = DumpRunner(process_factory=self._factory(
+            FakeProcess(stdout_data=payload), compressor, calls))
+        out = tmp_path / "x.sql.zst.partial"
+
+        outcome = await runner.run(self._job(), password="pw", out_path=str(out))
+
+        assert calls[1] == ("zstd", "-q", "-c", "-19", "-T4")
+        assert compressor.stdin.data == payload and compressor.stdin.closed
+        assert out.read_bytes() == b"\x28\xb5\x2f\xfd small"
+        assert outcome.sha256 == hashlib.sha256(b"\x28\xb5\x2f\xfd small").hexdigest()
+        assert outcome.bytes_written == len(b"\x28\xb5\x2f\xfd small")
+        assert outcome.raw_bytes == len(payload)
+        assert outcome.returncode == 0
+
+    async def test_compressor_failure_fails_the_movement(self, tmp_path: Path) -> None:
+        calls: list[tuple[Any, ...]] = []
+        compressor = FakeCompressor(compressed=b"", returncode=1, stderr_data=b"zstd: no space left")
+        runner = DumpRunner(process_factory=self._factory(
+            FakeProcess(stdout_data=b"data"), compressor, calls))
+
+        outcome = await runner.run(self._job(), password="pw", out_path=str(tmp_path / "x.partial"))
+
+        assert outcome.returncode == 1
+        assert outcome.stderr_tail == "compressor: zstd: no space left"
+
+    async def test_dead_compressor_does_not_wedge_the_dump(self, tmp_path: Path) -> None:
+        calls: list[tuple[Any, ...]] = []
+        compressor = FakeCompressor(compressed=b"", returncode=2, broken=True)
+        runner = DumpRunner(process_factory=self._factory(
+            FakeProcess(stdout_data=b"x" * (3 << 20)), compressor, calls))
+
+        outcome = await runner.run(self._job(), password="pw", out_path=str(tmp_path / "x.partial"))
+
+        assert outcome.returncode == 2
+        assert outcome.raw_bytes == 3 << 20
+
+    async def test_dump_failure_reports_dump_stderr(self, tmp_path: Path) -> None:
+        calls: list[tuple[Any, ...]] = []
+        runner = DumpRunner(process_factory=self._factory(
+            FakeProcess(returncode=1, stderr_data=b"access denied"), FakeCompressor(compressed=b""), calls))
+
+        outcome = await runner.run(self._job(), password="pw", out_path=str(tmp_path / "x.partial"))
+
+        assert outcome.returncode == 1
+        assert outcome.stderr_tail == "access denied"
+
+    async def test_timeout_kills_both_processes(self, tmp_path: Path) -> None:
+        calls: list[tuple[Any, ...]] = []
+        dump = FakeProcess(hang=True)
+        compressor = FakeCompressor(compressed=b"")
+        runner = DumpRunner(process_factory=self._factory(dump, compressor, calls))
+        job = DumpJobFactory.build(fmt=DumpFormat.PLAIN, timeout=0.01, compression=Compression(Codec.GZIP))
+
+        outcome = await runner.run(job, password="pw", out_path=str(tmp_path / "x.partial"))
+
+        assert outcome.cancelled is True
+        assert dump.terminated is True and compressor.terminated is True
+        assert calls[1] == ("pigz", "-c", "-p", "1")
+
+
 # ---------------------------------------------------------------------------
 # Engine dispatch + credentials-file lifecycle
 # ---------------------------------------------------------------------------
@@ -1,6 +1,10 @@
 import asyncio
 
-from fiber.clients.events import EventBroker
+import pytest
+from prometheus_client import CollectorRegistry
+
+from fiber.clients.events import EventBroker, Mailbox
+from fiber.platform.metrics import Metrics
 
 
 async def test_subscriber_receives_publish() -> None:
@@ -10,3 +14,50 @@ async def test_subscriber_receives_publish() -> None:
     assert await asyncio.wait_for(q.get(), 1) == "immich"
     broker.unsubscribe(q)
     assert q not in broker.subscribers
+
+
+async def test_burst_for_one_service_is_delivered_once() -> None:
+    broker = EventBroker()
+    q = broker.subscribe()
+    for _ in range(50):
+        await broker.publish("immich")
+    await broker.publish("forgejo")
+    assert q.qsize() == 2
+    assert [q.get_nowait(), q.get_nowait()] == ["immich", "forgejo"]
+    assert q.empty()
+
+
+async def test_full_mailbox_drops_oldest_and_counts_it() -> None:
+    metrics = Metrics(registry=CollectorRegistry())
+    broker = EventBroker(metrics=metrics, maxsize=2)
+    q = broker.subscribe()
+    for service in ("a", "b", "c"):
+        await broker.publish(service)
+    assert [q.get_nowait(), q.get_nowait()] == ["b", "c"]
+    assert q.dropped == 1
+    assert metrics.registry.get_sample_value("fiber_events_dropped_total") == 1.0
+    assert metrics.registry.get_sample_value("fiber_event_queue_depth") == 2.0
+
+
+async def test_publish_never_waits_on_a_stalled_subscriber() -> None:
+    broker = EventBroker(maxsize=1)
+    broker.subscribe()  # never read
+    for i in range(1000):
+        await asyncio.wait_for(broker.publish(f"svc-{i}"), 0.1)
+
+
+async def test_mailbox_get_waits_for_a_put() -> None:
+    box: Mailbox[str] = Mailbox()
+    waiter = asyncio.create_task(box.get())
+    await asyncio.sleep(0)
+    box.put("tile:immich", "<div/>")
+    assert await asyncio.wait_for(waiter, 1) == "<div/>"
+
+
+def test_mailbox_merges_pending_value_for_same_key() -> None:
+    box: Mailbox[str] = Mailbox()
+    box.put("tile:immich", "old")
+    box.put("tile:immich", "new")
+    assert box.get_nowait() == "new"
+    with pytest.raises(asyncio.QueueEmpty):
+        box.get_nowait()
@@ -4,8 +4,10 @@ import asyncio
 from typing import Any
 
 import pytest
+from prometheus_client import CollectorRegistry
 
 from fiber.clients.probe import ConnectivityProbe, ProbeResult
+from fiber.platform.metrics import Metrics
 from tests.factories import DumpJobFactory
 
 
@@ -49,14 +51,14 @@ class TestConnectivityProbe:
         async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
             return ok_process
 
-        return ConnectivityProbe(process_factory=factory)
+        return ConnectivityProbe(mode="process", process_factory=factory)
 
     @pytest.fixture()
     def subject_fail(self, fail_process: FakeProbeProcess) -> ConnectivityProbe:
         async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
             return fail_process
 
-        return ConnectivityProbe(process_factory=factory)
+        return ConnectivityProbe(mode="process", process_factory=factory)
 
     async def test_ok_when_exit_zero(self, subject_ok: ConnectivityProbe, job: Any) -> None:
         result = await subject_ok.check(job)
@@ -83,7 +85,179 @@ class TestConnectivityProbe:
         async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
             raise FileNotFoundError("pg_isready not found")
 
-        probe = ConnectivityProbe(process_factory=factory)
+        probe = ConnectivityProbe(mode="process", process_factory=factory)
         result = await probe.check(job)
         assert result.ok is False
         assert "pg_isready" in result.detail
+
+
+class HangingProcess(FakeProbeProcess):
+    def __init__(self) -> None:
+        super().__init__(returncode=0)
+        self.killed = False
+        self.reaped = False
+
+    async def read(self) -> bytes:
+        await asyncio.sleep(3600)
+        return b""
+
+    async def wait(self) -> int:
+        self.reaped = self.killed
+        return await super().wait()
+
+    def kill(self) -> None:
+        self.killed = True
+
+
+class TestConnectivityProbeBatching:
+    @pytest.fixture()
+    def clock(self) -> list[float]:
+        return [0.0]
+
+    @pytest.fixture()
+    def spawned(self) -> list[tuple[Any, ...]]:
+        return []
+
+    @pytest.fixture()
+    def subject(self, clock: list[float], spawned: list[tuple[Any, ...]]) -> ConnectivityProbe:
+        async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
+            spawned.append(args)
+            await asyncio.sleep(0.01)
+            return FakeProbeProcess(returncode=0, stdout_data=b"accepting connections")
+
+        return ConnectivityProbe(mode="process", process_factory=factory, ttl=10.0, max_parallel=2, now=lambda: clock[0])
+
+    async def test_results_are_cached_per_endpoint_until_ttl(
+        self, subject: ConnectivityProbe, clock: list[float], spawned: list[tuple[Any, ...]]
+    ) -> None:
+        job = DumpJobFactory.build(service="kenku-pg", host="pg", port=5432)
+        sibling = DumpJobFactory.build(service="immich", host="pg", port=5432)
+        assert subject.cached(job) is None
+        await subject.check(job)
+        assert (await subject.check(sibling)).ok is True
+        assert len(spawned) == 1
+        clock[0] = 11.0
+        assert subject.cached(job) is None
+        await subject.check(job)
+        assert len(spawned) == 2
+
+    async def test_check_many_runs_concurrently_and_shares_endpoints(
+        self, subject: ConnectivityProbe, spawned: list[tuple[Any, ...]]
+    ) -> None:
+        jobs = [DumpJobFactory.build(service=f"db{i}", host=f"pg{i % 3}", port=5432) for i in range(6)]
+        results = await subject.check_many(jobs)
+        assert set(results) == {j.service for j in jobs}
+        assert all(r.ok for r in results.values())
+        assert len(spawned) == 3
+
+    async def test_check_many_bounds_fan_out(self, clock: list[float]) -> None:
+        active = peak = 0
+
+        async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return FakeProbeProcess(returncode=0)
+
+        probe = ConnectivityProbe(mode="process", process_factory=factory, max_parallel=2, now=lambda: clock[0])
+        await probe.check_many([DumpJobFactory.build(service=f"db{i}", host=f"h{i}") for i in range(5)])
+        assert peak == 2
+
+    async def test_hung_probe_times_out_and_is_killed(self) -> None:
+        proc = HangingProcess()
+
+        async def factory(*args: Any, **kwargs: Any) -> HangingProcess:
+            return proc
+
+        probe = ConnectivityProbe(mode="process", process_factory=factory, timeout=0.01)
+        result = await probe.check(DumpJobFactory.build())
+        assert result.ok is False
+        assert "no answer within 0.01s" in result.detail
+        assert proc.killed is True
+        assert proc.reaped is True
+
+
+class TestConnectivityProbeWire:
+    @pytest.fixture()
+    async def pg_server(self):
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.readexactly(8)
+            writer.write(b"N")
+            size = int.from_bytes(await reader.readexactly(4), "big")
+            await reader.readexactly(size - 4)
+            writer.write(b"R\0\0\0\x08\0\0\0\x03")  # AuthenticationCleartextPassword
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        yield server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+    @pytest.fixture()
+    def metrics(self) -> Metrics:
+        return Metrics(registry=CollectorRegistry())
+
+    async def test_speaks_postgres_without_forking(self, pg_server: int, metrics: Metrics) -> None:
+        async def no_fork(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("wire mode must not spawn a process")
+
+        probe = ConnectivityProbe(process_factory=no_fork, metrics=metrics)
+        result = await probe.check(DumpJobFactory.build(service="kenku-pg", host="127.0.0.1", port=pg_server))
+        assert result == ProbeResult(ok=True, detail="accepting connections")
+        for phase in ("connect", "handshake"):
+            count = metrics.registry.get_sample_value(
+                "fiber_probe_latency_seconds_count", {"db": "kenku-pg", "phase": phase})
+            assert count == 1.0
+
+    async def test_refused_connection_is_not_ready(self) -> None:
+        async def refuse(host: str, port: int) -> Any:
+            raise ConnectionRefusedError(111, "Connection refused")
+
+        result = await ConnectivityProbe(connect=refuse).check(DumpJobFactory.build())
+        assert result.ok is False
+        assert "cannot connect" in result.detail
+
+    async def test_connect_timeout_is_not_ready(self) -> None:
+        async def hang(host: str, port: int) -> Any:
+            await asyncio.sleep(3600)
+
+        result = await ConnectivityProbe(connect=hang, timeout=0.01).check(DumpJobFactory.build())
+        assert result == ProbeResult(ok=False, detail="no answer within 0.01s")
+
+    async def test_silent_server_times_out(self) -> None:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.read()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            result = await ConnectivityProbe(timeout=0.05).check(DumpJobFactory.build(host="127.0.0.1", port=port))
+        finally:
+            server.close()
+        assert result.ok is False
+        assert "no answer" in result.detail
+
+    async def test_dropped_connection_is_not_ready(self) -> None:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            result = await ConnectivityProbe().check(DumpJobFactory.build(host="127.0.0.1", port=port))
+        finally:
+            server.close()
+        assert result.ok is False
+        assert "handshake failed" in result.detail
+
+    async def test_process_mode_records_latency(self, metrics: Metrics) -> None:
+        async def factory(*args: Any, **kwargs: Any) -> FakeProbeProcess:
+            return FakeProbeProcess(returncode=0)
+
+        probe = ConnectivityProbe(mode="process", process_factory=factory, metrics=metrics)
+        await probe.check(DumpJobFactory.build(service="kenku-pg"))
+        assert metrics.registry.get_sample_value(
+            "fiber_probe_latency_seconds_count", {"db": "kenku-pg", "phase": "process"}) == 1.0
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from fiber.clients.replicas import LocalReplica, Replica, RsyncReplica, S3Replica, build_replicas
+from fiber.clients.secrets import SecretReader
+from fiber.domain.models import ReplicaSpec
+
+_MIB = 1 << 20
+
+
+@pytest.fixture()
+def dump(tmp_path: Path) -> Path:
+    path = tmp_path / "bowl" / "t.dump"
+    path.parent.mkdir()
+    path.write_bytes(os.urandom(11 * _MIB))
+    return path
+
+
+class TestLocalReplica:
+    def test_copies_into_place_under_the_key(self, tmp_path: Path, dump: Path) -> None:
+        subject = LocalReplica(str(tmp_path / "offsite"), part_size=5 * _MIB, parallel=3)
+        assert isinstance(subject, Replica)
+        assert subject.put(str(dump), "kenku-pg/t.dump") == 11 * _MIB
+        copied = tmp_path / "offsite" / "kenku-pg" / "t.dump"
+        assert copied.read_bytes() == dump.read_bytes()
+        assert not copied.with_name("t.dump.partial").exists()
+
+    def test_verified_copy_is_not_sent_again(self, tmp_path: Path, dump: Path) -> None:
+        subject = LocalReplica(str(tmp_path / "offsite"), part_size=5 * _MIB)
+        subject.put(str(dump), "kenku-pg/t.dump")
+        assert subject.put(str(dump), "kenku-pg/t.dump") == 0
+
+    def test_resume_rewrites_only_parts_that_differ(self, tmp_path: Path, dump: Path) -> None:
+        partial = tmp_path / "offsite" / "kenku-pg" / "t.dump.partial"
+        partial.parent.mkdir(parents=True)
+        data = dump.read_bytes()
+        partial.write_bytes(data[: 5 * _MIB] + b"x" * _MIB)  # part 1 landed, part 2 half-written
+        subject = LocalReplica(str(tmp_path / "offsite"), part_size=5 * _MIB)
+        assert subject.put(str(dump), "kenku-pg/t.dump") == 6 * _MIB
+        assert (tmp_path / "offsite" / "kenku-pg" / "t.dump").read_bytes() == data
+
+    def test_changed_source_is_copied_over(self, tmp_path: Path, dump: Path) -> None:
+        subject = LocalReplica(str(tmp_path / "offsite"), part_size=5 * _MIB)
+        subject.put(str(dump), "kenku-pg/t.dump")
+        with open(dump, "r+b") as fh:
+            fh.seek(7 * _MIB)
+            fh.write(b"changed")
+        assert subject.put(str(dump), "kenku-pg/t.dump") > 0
+        assert (tmp_path / "offsite" / "kenku-pg" / "t.dump").read_bytes() == dump.read_bytes()
+
+
+class TestRsyncReplica:
+    def test_resumes_partial_transfers_and_reports_bytes_sent(self) -> None:
+        run = MagicMock(return_value=subprocess.CompletedProcess(
+            [], 0, stdout="Number of files: 1\nTotal bytes sent: 1,048,700\n", stderr=""))
+        subject = RsyncReplica("backup@nas:/volume1/fiber", run=run)
+        assert subject.put("/bowl/kenku-pg/t.dump", "kenku-pg/t.dump") == 1_048_700
+        argv = run.call_args.args[0]
+        assert argv[:3] == ["rsync", "--partial", "--append-verify"]
+        assert argv[-2:] == ["/bowl/kenku-pg/t.dump", "backup@nas:/volume1/fiber/kenku-pg/t.dump"]
+
+    def test_failure_raises_with_stderr(self) -> None:
+        run = MagicMock(return_value=subprocess.CompletedProcess(
+            [], 255, stdout="", stderr="ssh: connect to host nas port 22: No route to host\n"))
+        with pytest.raises(OSError, match="No route to host"):
+            RsyncReplica("backup@nas:/volume1/fiber", run=run).put("/bowl/t.dump", "t.dump")
+
+
+def test_build_replicas_makes_one_per_spec(tmp_path: Path) -> None:
+    (tmp_path / "fiber-s3").write_text("SK\n")
+    replicas = build_replicas(
+        [ReplicaSpec("local", "/mnt/offsite"), ReplicaSpec("rsync", "backup@nas:/fiber"),
+         ReplicaSpec("s3", "offsite", "homelab")],
+        secrets=SecretReader(base_dir=str(tmp_path)), s3_endpoint="http://minio:9000", s3_region="us-east-1",
+        s3_access_key="AK", s3_secret="fiber-s3",
+    )
+    assert [type(r) for r in replicas] == [LocalReplica, RsyncReplica, S3Replica]
+    assert [r.name for r in replicas] == ["/mnt/offsite", "backup@nas:/fiber", "s3://offsite/homelab"]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from fiber.clients.engines.postgres import PlainAclFilter
+from fiber.clients.restore_runner import RestoreRunner
+from fiber.domain.models import Codec, DumpFormat, DumpJob, Engine, RestoreTarget
+from tests.factories import DumpJobFactory
+
+_TARGET = RestoreTarget(host="verify-pg", port=5432, user="fiber", secret="s")
+
+
+class ShellEngine:
+    """A DumpEngine stand-in whose restore commands are shell snippets over ``out``."""
+
+    def __init__(self, out: Path, stream: bool = True, recreate: str = "true",
+                 restore: str = "cat > {out}") -> None:
+        self._out = out
+        self._stream = stream
+        self._recreate = recreate
+        self._restore = restore
+
+    def credentials_content(self, password: str) -> str | None:
+        return None
+
+    def dump_env(self, password: str) -> dict[str, str]:
+        return {"PGPASSWORD": password}
+
+    def build_restore_argv(self, job: DumpJob, target: RestoreTarget, dbname: str, in_path: str,
+                           creds_path: str | None = None) -> list[str]:
+        return ["sh", "-c", f"cp {in_path} {self._out}"]
+
+    def build_restore_stream_argv(self, job: DumpJob, target: RestoreTarget, dbname: str,
+                                  creds_path: str | None = None) -> list[str] | None:
+        return ["sh", "-c", self._restore.format(out=self._out)] if self._stream else None
+
+    def build_recreate_argv(self, target: RestoreTarget, dbname: str,
+                            creds_path: str | None = None) -> list[str]:
+        return ["sh", "-c", f"{self._recreate} && echo {dbname} > {self._out}.recreated"]
+
+    def restore_filter(self, job: DumpJob) -> PlainAclFilter | None:
+        return PlainAclFilter() if job.fmt is DumpFormat.PLAIN else None
+
+
+def _chunks(*parts: bytes) -> Iterator[bytes]:
+    yield from parts
+
+
+class TestRestoreRunner:
+    @pytest.fixture()
+    def job(self) -> DumpJob:
+        return DumpJobFactory.build(engine=Engine.POSTGRES, fmt=DumpFormat.CUSTOM, jobs=1)
+
+    async def test_streams_chunks_and_reports_progress(self, tmp_path: Path, job: DumpJob) -> None:
+        out = tmp_path / "restored"
+        seen: list[int] = []
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        outcome = await runner.run(job, _TARGET, "scratch", "pw", "/unused",
+                                   chunks=lambda: _chunks(b"abc", b"defg"), on_progress=seen.append)
+        assert outcome.returncode == 0 and not outcome.cancelled
+        assert out.read_bytes() == b"abcdefg"
+        assert seen == [3, 7]
+        assert outcome.bytes_written == 7
+
+    @pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd not installed")
+    async def test_compressed_chunks_go_through_the_decompressor(self, tmp_path: Path, job: DumpJob) -> None:
+        out = tmp_path / "restored"
+        packed = subprocess.run(["zstd", "-q", "-c"], input=b"select 1;\n" * 100,
+                                capture_output=True, check=True).stdout
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        outcome = await runner.run(job, _TARGET, "scratch", "pw", "/unused",
+                                   chunks=lambda: _chunks(packed), codec=Codec.ZSTD)
+        assert outcome.returncode == 0
+        assert out.read_bytes() == b"select 1;\n" * 100
+        assert outcome.bytes_written == len(packed)
+
+    async def test_plain_dumps_lose_owners_and_grants_on_the_way_in(self, tmp_path: Path) -> None:
+        out = tmp_path / "restored"
+        plain = DumpJobFactory.build(engine=Engine.POSTGRES, fmt=DumpFormat.PLAIN)
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        outcome = await runner.run(plain, _TARGET, "scratch", "pw", "/unused", chunks=lambda: _chunks(
+            b"CREATE TABLE t ();\nALTER TABLE t OWN", b"ER TO app;\nGRANT SELECT ON t TO r;\n"))
+        assert outcome.returncode == 0
+        assert out.read_bytes() == b"CREATE TABLE t ();\n"
+        assert outcome.bytes_written == 71  # Bowl bytes, before the filter
+
+    @pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd not installed")
+    async def test_filter_sees_the_decompressed_dump(self, tmp_path: Path) -> None:
+        out = tmp_path / "restored"
+        packed = subprocess.run(["zstd", "-q", "-c"], input=b"CREATE TABLE t ();\nGRANT SELECT ON t TO r;\n",
+                                capture_output=True, check=True).stdout
+        plain = DumpJobFactory.build(engine=Engine.POSTGRES, fmt=DumpFormat.PLAIN)
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        outcome = await runner.run(plain, _TARGET, "scratch", "pw", "/unused",
+                                   chunks=lambda: _chunks(packed), codec=Codec.ZSTD)
+        assert outcome.returncode == 0
+        assert out.read_bytes() == b"CREATE TABLE t ();\n"
+
+    async def test_filtered_dumps_stream_from_the_file_without_chunks(self, tmp_path: Path) -> None:
+        dump, out = tmp_path / "x.sql", tmp_path / "restored"
+        dump.write_bytes(b"CREATE TABLE t ();\nALTER TABLE t OWNER TO app;\n")
+        plain = DumpJobFactory.build(engine=Engine.POSTGRES, fmt=DumpFormat.PLAIN)
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        outcome = await runner.run(plain, _TARGET, "scratch", "pw", str(dump))
+        assert outcome.returncode == 0
+        assert out.read_bytes() == b"CREATE TABLE t ();\n"
+
+    async def test_engines_that_cannot_stream_read_the_file(self, tmp_path: Path, job: DumpJob) -> None:
+        dump, out = tmp_path / "x.dump", tmp_path / "restored"
+        dump.write_bytes(b"whole file")
+        runner = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out, stream=False)})
+        outcome = await runner.run(job, _TARGET, "scratch", "pw", str(dump),
+                                   chunks=lambda: _chunks(b"ignored"))
+        assert outcome.returncode == 0
+        assert out.read_bytes() == b"whole file"
+
+    async def test_recreate_runs_first_and_its_failure_stops_the_restore(
+            self, tmp_path: Path, job: DumpJob) -> None:
+        out = tmp_path / "restored"
+        target = RestoreTarget(host="verify-pg", port=5432, user="fiber", secret="s", recreate=True)
+        ok = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(out)})
+        assert (await ok.run(job, target, "scratch", "pw", "/unused", chunks=lambda: _chunks(b"x"))).returncode == 0
+        assert (tmp_path / "restored.recreated").read_text() == "scratch\n"
+
+        failing = RestoreRunner(engines={Engine.POSTGRES: ShellEngine(tmp_path / "again", recreate="false")})
+        outcome = await failing.run(job, target, "scratch", "pw", "/unused", chunks=lambda: _chunks(b"x"))
+        assert outcome.returncode == 1
+        assert not (tmp_path / "again").exists()
+
+    async def test_restore_failure_carries_stderr(self, tmp_path: Path, job: DumpJob) -> None:
+        engine = ShellEngine(tmp_path / "out", restore="cat >/dev/null; echo 'relation exists' >&2; exit 3")
+        outcome = await RestoreRunner(engines={Engine.POSTGRES: engine}).run(
+            job, _TARGET, "scratch", "pw", "/unused", chunks=lambda: _chunks(b"x"))
+        assert outcome.returncode == 3
+        assert "relation exists" in outcome.stderr_tail
+
+    async def test_cancellation_stops_the_restore(self, tmp_path: Path, job: DumpJob) -> None:
+        engine = ShellEngine(tmp_path / "out", restore="cat >/dev/null; exec sleep 30")
+        runner = RestoreRunner(engines={Engine.POSTGRES: engine})
+        task = asyncio.create_task(runner.run(job, _TARGET, "scratch", "pw", "/unused",
+                                              chunks=lambda: _chunks(b"x")))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        outcome = await asyncio.wait_for(task, 10)
+        assert outcome.cancelled
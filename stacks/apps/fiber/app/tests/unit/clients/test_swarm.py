@@ -121,3 +121,35 @@ class TestDockerSwarmGateway:
         gateway.list_dump_services()
         gateway.image_of("kenku-pg")
         assert call_count == 1, "factory called more than once (must be cached)"
+
+
+class TestDockerSwarmGatewayEvents:
+    @pytest.fixture()
+    def docker_client(self) -> MagicMock:
+        return create_autospec(docker.DockerClient, instance=True)
+
+    @pytest.fixture()
+    def subject(self, docker_client: MagicMock) -> DockerSwarmGateway:
+        return DockerSwarmGateway(client_factory=lambda: docker_client)
+
+    def test_event_stream_follows_service_events(self, subject, docker_client) -> None:
+        subject.event_stream()
+        docker_client.events.assert_called_once_with(decode=True, filters={"type": "service"})
+
+    def test_event_change_maps_service_actions(self, subject) -> None:
+        event = {"Type": "service", "Action": "update", "Actor": {"Attributes": {"name": "kenku-pg"}}}
+        assert subject.event_change(event) == ("upsert", "kenku-pg")
+        assert subject.event_change({**event, "Action": "remove"}) == ("remove", "kenku-pg")
+
+    def test_labels_of_reads_one_service(self, subject, docker_client) -> None:
+        docker_client.services.get.return_value.attrs = {"Spec": {"Labels": {"fiber.enable": "true"}}}
+        assert subject.labels_of("kenku-pg") == {"fiber.enable": "true"}
+        docker_client.services.get.assert_called_once_with("kenku-pg")
+
+    def test_labels_of_service_not_opted_in_is_none(self, subject, docker_client) -> None:
+        docker_client.services.get.return_value.attrs = {"Spec": {"Labels": {"fiber.enable": "false"}}}
+        assert subject.labels_of("kenku-pg") is None
+
+    def test_labels_of_missing_service_is_none(self, subject, docker_client) -> None:
+        docker_client.services.get.side_effect = docker.errors.NotFound("gone")
+        assert subject.labels_of("kenku-pg") is None
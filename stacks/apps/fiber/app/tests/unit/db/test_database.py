@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from fiber.db.database import Database
+from fiber.domain.models import MovementOutcome
+from fiber.repositories.history import HistoryRepository
+from tests.factories import MovementRecordFactory
+
+
+def _pragma(session, name: str) -> object:  # type: ignore[no-untyped-def]
+    return session.exec(text(f"PRAGMA {name}")).one()[0]  # type: ignore[call-overload]
+
+
+class TestDatabase:
+    @pytest.fixture()
+    def db(self, tmp_path: Path) -> Database:
+        return Database(f"sqlite:///{tmp_path / 'fiber.db'}", readers=2, busy_timeout=2.5)
+
+    def test_file_runs_in_wal_with_tuned_pragmas(self, db: Database) -> None:
+        for open_session in (db.session, db.read_session):
+            with open_session() as session:
+                assert _pragma(session, "journal_mode") == "wal"
+                assert _pragma(session, "synchronous") == 1  # NORMAL
+                assert _pragma(session, "busy_timeout") == 2500
+
+    def test_read_sessions_are_query_only(self, db: Database) -> None:
+        with db.read_session() as session, pytest.raises(OperationalError, match="readonly"):
+            session.exec(text("DELETE FROM movement"))  # type: ignore[call-overload]
+
+    def test_readers_see_committed_rows_while_a_write_is_open(self, db: Database) -> None:
+        history = HistoryRepository(session_factory=db.session, read_session_factory=db.read_session)
+        t = datetime(2026, 6, 15, 3, tzinfo=timezone.utc)
+        history.record(MovementRecordFactory.build(
+            service="kenku-pg", started_at=t, finished_at=t, outcome=MovementOutcome.CLEAN))
+        with db.session() as writer:
+            writer.exec(text("DELETE FROM movement"))  # type: ignore[call-overload]
+            started = time.monotonic()
+            assert history.last_success("kenku-pg") == t  # the snapshot before the uncommitted delete
+            assert time.monotonic() - started < 1.0
+            writer.rollback()
+
+    def test_writers_take_turns(self, db: Database) -> None:
+        order: list[str] = []
+
+        def second() -> None:
+            with db.session():
+                order.append("second")
+
+        with db.session():
+            order.append("first")
+            t = threading.Thread(target=second)
+            t.start()
+            t.join(timeout=0.2)
+            assert t.is_alive()  # waiting for the writer, not failing on SQLITE_BUSY
+            order.append("first done")
+        t.join()
+        assert order == ["first", "first done", "second"]
+
+    def test_in_memory_database_shares_one_engine(self) -> None:
+        db = Database("sqlite:///:memory:")
+        history = HistoryRepository(session_factory=db.session, read_session_factory=db.read_session)
+        t = datetime(2026, 6, 15, 3, tzinfo=timezone.utc)
+        history.record(MovementRecordFactory.build(
+            service="kenku-pg", started_at=t, finished_at=t, outcome=MovementOutcome.CLEAN))
+        assert history.last_success("kenku-pg") == t
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from fiber.db import migrations
+from fiber.db.database import Database
+from fiber.domain.models import MovementOutcome
+from fiber.repositories.history import HistoryRepository
+
+_LEGACY_SCHEMA = """
+CREATE TABLE movement (
+    id INTEGER NOT NULL PRIMARY KEY,
+    service VARCHAR NOT NULL,
+    engine VARCHAR NOT NULL,
+    started_at VARCHAR NOT NULL,
+    finished_at VARCHAR NOT NULL,
+    outcome VARCHAR NOT NULL,
+    bytes_written INTEGER NOT NULL,
+    bristol_type INTEGER,
+    sample_path VARCHAR,
+    receipt_path VARCHAR,
+    app_image VARCHAR,
+    app_digest VARCHAR
+)
+"""
+
+
+def _legacy_db(path: Path) -> str:
+    conn = sqlite3.connect(path)
+    conn.execute(_LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO movement (service, engine, started_at, finished_at, outcome, bytes_written)"
+        " VALUES (?, 'postgres', ?, ?, ?, ?)",
+        [
+            ("kenku-pg", "2026-06-15T03:00:00+00:00", "2026-06-15T03:01:00+00:00", "clean", 100),
+            ("kenku-pg", "2026-06-16T03:00:00+00:00", "2026-06-16T03:02:30.500000+00:00", "clogged", 0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+class TestMigrations:
+    def test_fresh_database_is_stamped_latest(self, tmp_path: Path) -> None:
+        db = Database(f"sqlite:///{tmp_path / 'fiber.db'}")
+        with db.session() as session:
+            version = session.exec(text("SELECT version FROM schema_version")).one()[0]  # type: ignore[call-overload]
+        assert version == migrations.LATEST
+
+    def test_legacy_iso_history_upgraded_in_place(self, tmp_path: Path) -> None:
+        url = _legacy_db(tmp_path / "fiber.db")
+        repo = HistoryRepository(session_factory=Database(url).session)
+        assert repo.last_success("kenku-pg") == datetime(2026, 6, 15, 3, 1, tzinfo=timezone.utc)
+        [latest, first] = repo.recent("kenku-pg", limit=5)
+        assert latest.finished_at == datetime(2026, 6, 16, 3, 2, 30, tzinfo=timezone.utc)
+        assert first.bytes_written == 100
+        summary = repo.summaries()["kenku-pg"]
+        assert summary.last_outcome is MovementOutcome.CLOGGED
+        assert summary.latest_clean is not None
+
+    def test_upgrade_seeds_expected_durations(self, tmp_path: Path) -> None:
+        repo = HistoryRepository(session_factory=Database(_legacy_db(tmp_path / "fiber.db")).session)
+        assert repo.summaries()["kenku-pg"].expected_duration_s == 60.0
+
+    def test_upgrade_creates_history_indexes(self, tmp_path: Path) -> None:
+        path = tmp_path / "fiber.db"
+        Database(_legacy_db(path))
+        conn = sqlite3.connect(path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(movement)")}
+        plan = " ".join(str(r) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM movement WHERE service = 'x' AND outcome = 'clean'"
+            " ORDER BY finished_ts DESC LIMIT 1"
+        ))
+        conn.close()
+        assert {"ix_movement_service_outcome_finished", "ix_movement_service_finished"} <= indexes
+        assert "ix_movement_service_outcome_finished" in plan
+
+    def test_reopening_does_not_rerun_migrations(self, tmp_path: Path) -> None:
+        url = _legacy_db(tmp_path / "fiber.db")
+        Database(url)
+        repo = HistoryRepository(session_factory=Database(url).session)
+        assert len(repo.recent("kenku-pg", limit=5)) == 2
+
+    def test_failed_step_rolls_back_its_ddl(self, tmp_path: Path, monkeypatch) -> None:
+        path = tmp_path / "fiber.db"
+        url = _legacy_db(path)
+
+        def crash(iso: str) -> int:
+            raise RuntimeError("power cut")
+
+        monkeypatch.setattr(migrations, "_epoch", crash)
+        with pytest.raises(RuntimeError):
+            Database(url)
+        conn = sqlite3.connect(path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(movement)")}
+        conn.close()
+        assert "movement_old" not in tables and "started_at" in columns  # the rename was undone
+        monkeypatch.undo()
+        repo = HistoryRepository(session_factory=Database(url).session)
+        assert len(repo.recent("kenku-pg", limit=5)) == 2
+
+    def test_upgrade_stopped_after_the_rename_finishes_the_copy(self, tmp_path: Path) -> None:
+        path = tmp_path / "fiber.db"
+        url = _legacy_db(path)
+        conn = sqlite3.connect(path)  # what an older Fiber left behind when it died mid-step
+        conn.execute("ALTER TABLE movement RENAME TO movement_old")
+        conn.commit()
+        conn.close()
+        repo = HistoryRepository(session_factory=Database(url).session)
+        assert [r.bytes_written for r in repo.recent("kenku-pg", limit=5)] == [0, 100]
+        assert repo.summaries()["kenku-pg"].last_outcome is MovementOutcome.CLOGGED
+        conn = sqlite3.connect(path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert "movement_old" not in tables
@@ -1,7 +1,9 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from fiber.domain.dumps import classify, plan_sweep
-from fiber.domain.models import BowlEntry
+import hashlib
+
+from fiber.domain.dumps import classify, merkle_root, plan_sweep
+from fiber.domain.models import BowlEntry, FileDigest, Retention
 
 
 # ---------------------------------------------------------------------------
@@ -52,3 +54,88 @@ def test_temp_artifacts_are_dingleberries_not_counted_in_retention() -> None:
     to_delete, dingleberries = plan_sweep(entries, retain=2)
     assert [e.path for e in dingleberries] == ["tmp"]
     assert to_delete == []
+
+
+def _nightly(days: int) -> list[BowlEntry]:
+    start = datetime(2025, 1, 1, 3, tzinfo=timezone.utc)
+    return [BowlEntry(path=(start + timedelta(days=i)).strftime("%Y%m%d"), size_bytes=10,
+                      modified_at=start + timedelta(days=i), is_temp=False) for i in range(days)]
+
+
+def test_gfs_keeps_newest_per_day_week_month_and_year() -> None:
+    entries = _nightly(400)  # 2025-01-01 .. 2026-02-04
+    to_delete, _ = plan_sweep(entries, retain=0,
+                              retention=Retention(daily=7, weekly=4, monthly=12, yearly=3))
+    kept = sorted({e.path for e in entries} - {e.path for e in to_delete})
+    assert kept[-7:] == [f"202601{d:02d}" for d in range(29, 32)] + [f"202602{d:02d}" for d in range(1, 5)]
+    assert "20260125" in kept and "20260118" in kept  # Sundays closing the ISO weeks before
+    assert "20251231" in kept and "20250331" in kept  # month ends
+    assert "20250228" not in kept  # thirteen months back
+    # 7 days; 2 more weeks (the newest two fall inside the days); 10 more months (Mar-Dec 2025);
+    # the yearly picks (Feb 4, Dec 31) are already kept
+    assert len(kept) == 7 + 2 + 10
+    assert to_delete == sorted(to_delete, key=lambda e: e.modified_at)
+
+
+def test_gfs_is_a_union_with_keep_newest() -> None:
+    entries = _nightly(30)
+    to_delete, _ = plan_sweep(entries, retain=10, retention=Retention(monthly=1))
+    assert len(entries) - len(to_delete) == 10  # the January pick is among the newest ten
+    to_delete, _ = plan_sweep(entries, retain=2, retention=Retention(yearly=1, weekly=1))
+    assert {e.path for e in entries} - {e.path for e in to_delete} == {"20250130", "20250129"}
+
+
+def test_gfs_never_counts_temp_artifacts() -> None:
+    entries = [*_nightly(3), _entry("tmp", 4, is_temp=True)]
+    to_delete, dingleberries = plan_sweep(entries, retain=0, retention=Retention(daily=1))
+    assert [e.path for e in to_delete] == ["20250101", "20250102"]
+    assert [e.path for e in dingleberries] == ["tmp"]
+
+
+def _at(name: str, when: datetime) -> BowlEntry:
+    return BowlEntry(path=name, size_bytes=10, modified_at=when, is_temp=False)
+
+
+def test_failure_samples_never_take_a_dumps_gfs_slot() -> None:
+    entries = [_at("20260130T030000.dump", datetime(2026, 1, 30, 3, tzinfo=timezone.utc)),
+               _at("20260131T030000.stool.log", datetime(2026, 1, 31, 3, tzinfo=timezone.utc)),
+               _at("20260228T030000.dump", datetime(2026, 2, 28, 3, tzinfo=timezone.utc))]
+    to_delete, _ = plan_sweep(entries, retain=1, retention=Retention(monthly=3))
+    assert to_delete == []  # January keeps its dump; the one sample is within retain
+
+
+def test_failure_samples_are_pruned_to_their_own_count() -> None:
+    start = datetime(2026, 1, 1, 3, tzinfo=timezone.utc)
+    samples = [_at(f"s{i}.stool.log", start + timedelta(days=i)) for i in range(5)]
+    dumps = [_at(f"d{i}.dump", start + timedelta(days=i, hours=1)) for i in range(5)]
+    to_delete, _ = plan_sweep([*samples, *dumps], retain=2)
+    assert [e.path for e in to_delete] == ["s0.stool.log", "d0.dump", "s1.stool.log", "d1.dump",
+                                           "s2.stool.log", "d2.dump"]
+    to_delete, _ = plan_sweep([*samples, *dumps], retain=0, retention=Retention(daily=3, weekly=1))
+    assert [e.path for e in to_delete if e.path.endswith(".stool.log")] == ["s0.stool.log", "s1.stool.log"]
+
+
+# ---------------------------------------------------------------------------
+# merkle_root — directory-dump checksum over per-file digests
+# ---------------------------------------------------------------------------
+
+def _fd(path: str, body: bytes) -> FileDigest:
+    return FileDigest(path=path, sha256=hashlib.sha256(body).hexdigest(), bytes=len(body))
+
+
+def test_merkle_root_of_nothing_is_empty_hash() -> None:
+    assert merkle_root([]) == hashlib.sha256(b"").hexdigest()
+
+
+def test_merkle_root_changes_with_any_file_or_name() -> None:
+    files = [_fd("a.dat", b"1"), _fd("b.dat", b"2"), _fd("c.dat", b"3")]
+    root = merkle_root(files)
+    assert merkle_root(files) == root
+    assert merkle_root([files[0], files[1], _fd("c.dat", b"4")]) != root
+    assert merkle_root([files[0], files[1], _fd("d.dat", b"3")]) != root
+
+
+def test_merkle_root_pairs_leaves() -> None:
+    a, b = _fd("a", b"1"), _fd("b", b"2")
+    leaf = lambda f: hashlib.sha256(b"\x00" + f.path.encode() + b"\x00" + bytes.fromhex(f.sha256)).digest()
+    assert merkle_root([a, b]) == hashlib.sha256(b"\x01" + leaf(a) + leaf(b)).hexdigest()
@@ -1,5 +1,7 @@
+import pytest
+
 from fiber.domain.jobs import parse_job, reconcile
-from fiber.domain.models import DumpFormat, DumpJob, Engine, MisconfiguredJob
+from fiber.domain.models import Codec, Compression, DumpFormat, DumpJob, Engine, MisconfiguredJob, Retention
 
 
 # ---------------------------------------------------------------------------
@@ -149,6 +151,102 @@ def test_docker_provider_label_accepted_when_active() -> None:
     assert isinstance(parse_job("e2e-pg", labels, active_provider="docker"), DumpJob)
 
 
+def _compress_labels(compress: str, fmt: str = "plain") -> dict[str, str]:
+    return {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+            "fiber.format": fmt, "fiber.compress": compress}
+
+
+@pytest.mark.parametrize(("raw", "expected"), [
+    ("zstd", Compression(Codec.ZSTD)),
+    ("zstd:19", Compression(Codec.ZSTD, level=19)),
+    ("gzip:6:4", Compression(Codec.GZIP, level=6, threads=4)),
+    ("zstd::8", Compression(Codec.ZSTD, threads=8)),
+])
+def test_compress_label_parsed(raw: str, expected: Compression) -> None:
+    job = parse_job("kenku-pg", _compress_labels(raw))
+    assert isinstance(job, DumpJob)
+    assert job.compression == expected
+
+
+def test_compress_absent_by_default() -> None:
+    job = parse_job("kenku-pg", {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k",
+                                 "fiber.secret": "s"})
+    assert isinstance(job, DumpJob)
+    assert job.compression is None
+
+
+@pytest.mark.parametrize("raw", ["lz4", "zstd:20", "gzip:10", "zstd:3:0", "zstd:x", "zstd:1:2:3"])
+def test_invalid_compress_label_is_misconfigured(raw: str) -> None:
+    result = parse_job("kenku-pg", _compress_labels(raw))
+    assert isinstance(result, MisconfiguredJob)
+    assert result.errors == (f"invalid fiber.compress: '{raw}'",)
+
+
+def test_compress_with_custom_format_is_misconfigured() -> None:
+    result = parse_job("kenku-pg", _compress_labels("zstd", fmt="custom"))
+    assert isinstance(result, MisconfiguredJob)
+    assert "custom is already compressed" in result.errors[0]
+
+
+def test_weight_label_parsed() -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+              "fiber.weight": "3"}
+    job = parse_job("kenku-pg", labels)
+    assert isinstance(job, DumpJob)
+    assert job.weight == 3
+
+
+@pytest.mark.parametrize("raw", ["0", "-1", "heavy"])
+def test_invalid_weight_label_is_misconfigured(raw: str) -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+              "fiber.weight": raw}
+    result = parse_job("kenku-pg", labels)
+    assert isinstance(result, MisconfiguredJob)
+    assert result.errors == (f"invalid fiber.weight: '{raw}'",)
+
+
+def test_gfs_retention_labels_parsed() -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+              "fiber.retain.daily": "7", "fiber.retain.weekly": "4", "fiber.retain.yearly": "2"}
+    job = parse_job("kenku-pg", labels)
+    assert isinstance(job, DumpJob)
+    assert job.retention == Retention(daily=7, weekly=4, monthly=0, yearly=2)
+    assert job.retain == 7  # the newest-N default still applies alongside
+
+
+def test_zero_gfs_labels_leave_retention_off() -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+              "fiber.retain.monthly": "0"}
+    job = parse_job("kenku-pg", labels)
+    assert isinstance(job, DumpJob)
+    assert job.retention is None
+
+
+@pytest.mark.parametrize("raw", ["-1", "weekly", ""])
+def test_invalid_gfs_label_is_misconfigured(raw: str) -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s",
+              "fiber.retain.weekly": raw}
+    result = parse_job("kenku-pg", labels)
+    assert isinstance(result, MisconfiguredJob)
+    assert result.errors == (f"invalid fiber.retain.weekly: '{raw}'",)
+
+
+def test_unchanged_labels_return_the_same_parsed_job() -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s"}
+    first = parse_job("kenku-pg", labels)
+    assert parse_job("kenku-pg", dict(labels)) is first
+    changed = parse_job("kenku-pg", {**labels, "fiber.retain": "3"})
+    assert isinstance(changed, DumpJob) and changed is not first
+    assert changed.retain == 3
+
+
+def test_parse_cache_is_keyed_by_service_and_provider() -> None:
+    labels = {"fiber.enable": "true", "fiber.dbname": "k", "fiber.user": "k", "fiber.secret": "s"}
+    assert parse_job("a", labels).service == "a"  # type: ignore[union-attr]
+    assert parse_job("b", labels).service == "b"  # type: ignore[union-attr]
+    assert isinstance(parse_job("a", labels, active_provider="docker"), MisconfiguredJob)
+
+
 # ---------------------------------------------------------------------------
 # reconcile — many services at once
 # ---------------------------------------------------------------------------
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from fiber.domain.models import Part, ReplicaSpec
+from fiber.domain.replication import multipart_etag, parse_replicas, plan_parts
+
+
+def test_parse_replicas_reads_every_kind() -> None:
+    specs = parse_replicas("/mnt/offsite/, file:///srv/copy, backup@nas:/volume1/fiber,"
+                           " ssh://backup@nas/volume1/fiber, s3://offsite/homelab/fiber/, s3://bare")
+    assert specs == [
+        ReplicaSpec("local", "/mnt/offsite"),
+        ReplicaSpec("local", "/srv/copy"),
+        ReplicaSpec("rsync", "backup@nas:/volume1/fiber"),
+        ReplicaSpec("rsync", "backup@nas:/volume1/fiber"),
+        ReplicaSpec("s3", "offsite", "homelab/fiber"),
+        ReplicaSpec("s3", "bare"),
+    ]
+    assert [s.name for s in specs[-2:]] == ["s3://offsite/homelab/fiber", "s3://bare"]
+    assert parse_replicas("") == []
+
+
+@pytest.mark.parametrize("spec", ["offsite", "s3://", "ssh://nas", "https://example.com/x"])
+def test_parse_replicas_rejects_unknown_destinations(spec: str) -> None:
+    with pytest.raises(ValueError, match="replica"):
+        parse_replicas(spec)
+
+
+def test_plan_parts_covers_the_file_with_a_short_tail() -> None:
+    mib = 1 << 20
+    assert plan_parts(12 * mib, 5 * mib) == [
+        Part(1, 0, 5 * mib), Part(2, 5 * mib, 5 * mib), Part(3, 10 * mib, 2 * mib)]
+
+
+def test_plan_parts_respects_s3_limits() -> None:
+    assert plan_parts(10, 1) == [Part(1, 0, 10)]  # parts never go below 5 MiB
+    assert plan_parts(0, 1 << 20) == [Part(1, 0, 0)]
+    huge = plan_parts(200_000 << 20, 5 << 20)  # 200 GB at 5 MiB would be 40,000 parts
+    assert len(huge) <= 10_000
+    assert sum(p.length for p in huge) == 200_000 << 20
+
+
+def test_multipart_etag_matches_s3() -> None:
+    a, b = hashlib.md5(b"a").digest(), hashlib.md5(b"b").digest()
+    assert multipart_etag([a]) == a.hex()
+    assert multipart_etag([a, b]) == f"{hashlib.md5(a + b).hexdigest()}-2"
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from fiber.domain.models import Engine, RestoreTarget
+from fiber.domain.restore import next_to_verify, parse_target, scratch_dbname, verify_targets
+from tests.factories import DumpJobFactory
+
+UTC = timezone.utc
+
+
+def test_parse_target_defaults_the_engine_port() -> None:
+    assert parse_target("fiber@verify-pg", Engine.POSTGRES, "s") == RestoreTarget(
+        host="verify-pg", port=5432, user="fiber", secret="s")
+    assert parse_target("root@verify-db:3307", Engine.MYSQL, "s").port == 3307  # type: ignore[union-attr]
+    assert parse_target("", Engine.MYSQL, "s") is None
+
+
+def test_parse_target_rejects_malformed_specs() -> None:
+    with pytest.raises(ValueError, match="user@host"):
+        parse_target("verify-pg:5432", Engine.POSTGRES, "s")
+
+
+def test_verify_targets_recreate_and_skip_blank_engines() -> None:
+    targets = verify_targets(postgres="fiber@verify-pg", mysql="", secret="restore-pw")
+    assert list(targets) == [Engine.POSTGRES]
+    assert targets[Engine.POSTGRES].recreate is True
+    assert targets[Engine.POSTGRES].secret == "restore-pw"
+
+
+def test_scratch_dbname_is_per_service_and_safe() -> None:
+    assert scratch_dbname("kenku-pg") == "fiber_verify_kenku_pg"
+
+
+def test_next_to_verify_prefers_never_then_oldest() -> None:
+    a, b, c = (DumpJobFactory.build(service=s) for s in ("a", "b", "c"))
+    verified = {"a": datetime(2026, 6, 15, tzinfo=UTC), "b": datetime(2026, 6, 14, tzinfo=UTC)}
+    assert next_to_verify([a, b, c], verified) is c
+    assert next_to_verify([a, b], verified) is b
+    assert next_to_verify([], verified) is None
@@ -1,7 +1,11 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+import pytest
+from croniter import croniter
+
+from fiber.domain import schedule as schedule_mod
 from fiber.domain.models import DumpJob
-from fiber.domain.schedule import due_jobs, next_fire
+from fiber.domain.schedule import FireHeap, blend_duration, due_jobs, longest_first, next_fire, predicted_makespan
 from tests.factories import DumpJobFactory
 
 UTC = timezone.utc
@@ -45,3 +49,117 @@ def test_running_job_is_skipped() -> None:
 def test_next_fire_returns_next_occurrence() -> None:
     now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
     assert next_fire("0 3 * * *", now) == datetime(2026, 6, 16, 3, 0, tzinfo=UTC)
+
+
+# ---------------------------------------------------------------------------
+# compiled schedule windows
+# ---------------------------------------------------------------------------
+
+def test_fire_times_match_croniter_across_boundaries() -> None:
+    start = datetime(2026, 6, 15, 2, 0, tzinfo=UTC)
+    for step in range(0, 48 * 60, 17):
+        now = start + timedelta(minutes=step)
+        assert next_fire("0 3 * * *", now) == croniter("0 3 * * *", now).get_next(datetime)
+        assert schedule_mod._previous_fire("*/15 * * * *", now) == \
+            croniter("*/15 * * * *", now).get_prev(datetime)
+
+
+def test_exact_fire_time_moves_to_the_following_one() -> None:
+    fire = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
+    next_fire("0 3 * * *", fire - timedelta(minutes=1))
+    assert next_fire("0 3 * * *", fire) == datetime(2026, 6, 16, 3, 0, tzinfo=UTC)
+    assert schedule_mod._previous_fire("0 3 * * *", fire) == datetime(2026, 6, 14, 3, 0, tzinfo=UTC)
+    # a later tick must still see today's 03:00 as the previous fire
+    assert schedule_mod._previous_fire("0 3 * * *", fire + timedelta(hours=6)) == fire
+
+
+def test_cron_is_evaluated_once_per_fire_interval(monkeypatch) -> None:
+    built: list[str] = []
+
+    def counting(expr: str, start: datetime) -> croniter:
+        built.append(expr)
+        return croniter(expr, start)
+
+    monkeypatch.setattr(schedule_mod, "croniter", counting)
+    monkeypatch.setattr(schedule_mod, "_windows", {})
+    now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
+    for minute in range(120):
+        due_jobs([_job("a"), _job("b")], now=now + timedelta(minutes=minute), last_success={}, running=set())
+        next_fire("0 3 * * *", now + timedelta(minutes=minute))
+    assert len(built) == 2  # one previous + one next, shared by every job and tick
+    next_fire("0 3 * * *", datetime(2026, 6, 16, 3, 30, tzinfo=UTC))
+    assert len(built) == 4
+
+
+# ---------------------------------------------------------------------------
+# timer heap
+# ---------------------------------------------------------------------------
+
+def test_next_wake_is_the_earliest_fire() -> None:
+    now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
+    heap = FireHeap()
+    heap.sync([_job("nightly"), _job("quarter", "*/15 * * * *")], now)
+    assert heap.next_wake(now) == datetime(2026, 6, 15, 9, 15, tzinfo=UTC)
+
+
+def test_passed_fires_roll_forward() -> None:
+    now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
+    heap = FireHeap()
+    heap.sync([_job("quarter", "*/15 * * * *")], now)
+    later = datetime(2026, 6, 15, 9, 15, tzinfo=UTC)
+    assert heap.next_wake(later) == datetime(2026, 6, 15, 9, 30, tzinfo=UTC)
+
+
+def test_sync_replans_changed_and_drops_removed_jobs() -> None:
+    now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
+    heap = FireHeap()
+    heap.sync([_job("a", "*/15 * * * *"), _job("b", "*/5 * * * *")], now)
+    heap.sync([_job("a", "0 12 * * *")], now)
+    assert heap.next_wake(now) == datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+    heap.sync([], now)
+    assert heap.next_wake(now) is None
+
+
+def test_holds_wake_the_loop_and_expire() -> None:
+    now = datetime(2026, 6, 15, 9, 0, tzinfo=UTC)
+    heap = FireHeap()
+    heap.sync([_job("a")], now)
+    heap.hold("a", now + timedelta(minutes=1))
+    assert heap.held(now) == {"a"}
+    assert heap.next_wake(now) == now + timedelta(minutes=1)
+    assert heap.held(now + timedelta(minutes=2)) == set()
+
+
+# ---------------------------------------------------------------------------
+# longest-first batches
+# ---------------------------------------------------------------------------
+
+def test_blend_duration_starts_from_first_sample_and_leans_recent() -> None:
+    assert blend_duration(None, 100.0) == 100.0
+    assert blend_duration(100.0, 200.0) == pytest.approx(130.0)
+
+
+def test_longest_first_orders_by_expected_duration() -> None:
+    jobs = [_job("small"), _job("huge"), _job("mid")]
+    ordered = longest_first(jobs, {"small": 10.0, "huge": 3600.0, "mid": 300.0})
+    assert [j.service for j in ordered] == ["huge", "mid", "small"]
+
+
+def test_unknown_duration_is_treated_as_typical() -> None:
+    jobs = [_job("new"), _job("a"), _job("b"), _job("c")]
+    ordered = longest_first(jobs, {"a": 10.0, "b": 100.0, "c": 1000.0})
+    assert [j.service for j in ordered] == ["c", "b", "new", "a"]
+
+
+def test_predicted_makespan_packs_onto_slots() -> None:
+    jobs = [_job("a"), _job("b"), _job("c"), _job("d")]
+    expected = {"a": 60.0, "b": 40.0, "c": 30.0, "d": 30.0}
+    assert predicted_makespan(longest_first(jobs, expected), expected, slots=2) == 90.0
+    assert predicted_makespan([], expected, slots=2) == 0.0
+
+
+def test_longest_first_shortens_the_batch() -> None:
+    jobs = [_job("s1"), _job("s2"), _job("long")]
+    expected = {"s1": 10.0, "s2": 10.0, "long": 100.0}
+    assert predicted_makespan(jobs, expected, slots=2) == 110.0
+    assert predicted_makespan(longest_first(jobs, expected), expected, slots=2) == 100.0
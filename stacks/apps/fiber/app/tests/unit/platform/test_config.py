@@ -29,6 +29,8 @@ def test_from_env_uses_defaults_and_overrides(monkeypatch) -> None:
     assert cfg.max_concurrent == 3
     assert cfg.metrics_port == 9090           # default
     assert cfg.scan_interval == 60.0          # default
+    assert cfg.housekeeping_interval == 600.0  # default
+    assert cfg.history_retention_days == 90  # default
 
 
 def test_scan_enabled_defaults_to_true(monkeypatch) -> None:
@@ -49,3 +51,93 @@ def test_scan_enabled_true_for_truthy_strings(monkeypatch, value: str) -> None:
     monkeypatch.setenv("FIBER_SCAN_ENABLED", value)
     cfg = Config.from_env()
     assert cfg.scan_enabled is True
+
+
+def test_bowl_backend_defaults_to_plain(monkeypatch) -> None:
+    monkeypatch.delenv("FIBER_BOWL_BACKEND", raising=False)
+    assert Config.from_env().bowl_backend == "plain"
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_max_concurrent_below_one_raises(monkeypatch, value: str) -> None:
+    monkeypatch.setenv("FIBER_MAX_CONCURRENT_MOVEMENTS", value)
+    with pytest.raises(ValueError, match="FIBER_MAX_CONCURRENT_MOVEMENTS must be at least 1"):
+        Config.from_env()
+
+
+def test_invalid_bowl_backend_raises(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_BOWL_BACKEND", "zfs")
+    with pytest.raises(ValueError, match="FIBER_BOWL_BACKEND must be"):
+        Config.from_env()
+
+
+def test_resource_limits_default_to_unbounded_per_host(monkeypatch) -> None:
+    monkeypatch.delenv("FIBER_MAX_PER_HOST", raising=False)
+    monkeypatch.setenv("FIBER_MAX_PER_VOLUME", "2")
+    cfg = Config.from_env()
+    assert cfg.max_per_host == 0
+    assert cfg.max_per_volume == 2
+
+
+def test_probe_settings_read_env(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_PROBE_TIMEOUT", "2.5")
+    monkeypatch.delenv("FIBER_PROBE_TTL", raising=False)
+    cfg = Config.from_env()
+    assert cfg.probe_timeout == 2.5
+    assert cfg.probe_ttl == 15.0
+
+
+def test_probe_mode_defaults_to_wire(monkeypatch) -> None:
+    monkeypatch.delenv("FIBER_PROBE_MODE", raising=False)
+    assert Config.from_env().probe_mode == "wire"
+
+
+def test_invalid_probe_mode_raises(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_PROBE_MODE", "ping")
+    with pytest.raises(ValueError, match="FIBER_PROBE_MODE must be"):
+        Config.from_env()
+
+
+def test_discovery_mode_defaults_to_poll(monkeypatch) -> None:
+    monkeypatch.delenv("FIBER_DISCOVERY_MODE", raising=False)
+    cfg = Config.from_env()
+    assert cfg.discovery_mode == "poll"
+    assert cfg.discovery_resync == 900.0
+
+
+def test_invalid_discovery_mode_raises(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_DISCOVERY_MODE", "inotify")
+    with pytest.raises(ValueError, match="FIBER_DISCOVERY_MODE must be"):
+        Config.from_env()
+
+
+def test_executor_pool_sizes_read_env(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_DISK_WORKERS", "2")
+    monkeypatch.delenv("FIBER_NET_WORKERS", raising=False)
+    cfg = Config.from_env()
+    assert (cfg.disk_workers, cfg.net_workers) == (2, 8)
+
+
+def test_sqlite_tuning_reads_env(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_DB_READERS", "8")
+    monkeypatch.delenv("FIBER_DB_BUSY_TIMEOUT", raising=False)
+    cfg = Config.from_env()
+    assert (cfg.db_readers, cfg.db_busy_timeout) == (8, 5.0)
+
+
+def test_test_restores_are_off_until_a_target_is_set(monkeypatch) -> None:
+    for name in ("FIBER_RESTORE_POSTGRES", "FIBER_RESTORE_MYSQL", "FIBER_RESTORE_SECRET"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("FIBER_VERIFY_INTERVAL", "600")
+    cfg = Config.from_env()
+    assert (cfg.restore_postgres, cfg.restore_mysql, cfg.restore_secret) == ("", "", "fiber-restore")
+    assert cfg.verify_interval == 600
+
+
+def test_replication_is_off_until_replicas_are_listed(monkeypatch) -> None:
+    monkeypatch.delenv("FIBER_REPLICAS", raising=False)
+    monkeypatch.setenv("FIBER_REPLICA_PART_MB", "64")
+    cfg = Config.from_env()
+    assert cfg.replicas == ""
+    assert (cfg.replica_concurrency, cfg.replica_parallel, cfg.replica_part_mb) == (1, 4, 64)
+    assert (cfg.s3_region, cfg.s3_secret) == ("us-east-1", "fiber-s3")
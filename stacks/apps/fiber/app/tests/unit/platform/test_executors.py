@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from fiber.platform.executors import Executors
+
+
+async def test_calls_run_on_their_own_pools() -> None:
+    executors = Executors(disk_workers=1, net_workers=1)
+    try:
+        disk = await executors.disk(lambda: threading.current_thread().name)
+        net = await executors.net(lambda: threading.current_thread().name)
+        db = await executors.db(lambda: threading.current_thread().name)
+    finally:
+        executors.shutdown()
+    assert disk.startswith("fiber-disk") and net.startswith("fiber-net") and db.startswith("fiber-db")
+
+
+async def test_passes_arguments_through() -> None:
+    executors = Executors(disk_workers=1, net_workers=1)
+    try:
+        assert await executors.disk(divmod, 7, 2) == (3, 1)
+        assert await executors.net(int, "ff", base=16) == 255
+    finally:
+        executors.shutdown()
+
+
+async def test_blocking_disk_work_leaves_the_loop_and_network_pool_free() -> None:
+    executors = Executors(disk_workers=1, net_workers=1)
+    try:
+        hashing = asyncio.ensure_future(executors.disk(time.sleep, 0.3))
+        ticks = 0
+        while not hashing.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+            if ticks == 3:
+                assert await executors.net(lambda: "docker") == "docker"
+        assert ticks > 10
+    finally:
+        executors.shutdown()
+
+
+async def test_queries_do_not_queue_behind_disk_work() -> None:
+    executors = Executors(disk_workers=1, net_workers=1, db_workers=1)
+    try:
+        hashing = asyncio.ensure_future(executors.disk(time.sleep, 0.3))
+        await asyncio.sleep(0.01)
+        assert await executors.db(lambda: "summaries") == "summaries"
+        assert not hashing.done()
+        await hashing
+    finally:
+        executors.shutdown()
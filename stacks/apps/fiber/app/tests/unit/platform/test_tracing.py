@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from itertools import count
+from pathlib import Path
+
+from prometheus_client import CollectorRegistry
+
+from fiber.platform.metrics import Metrics
+from fiber.platform.tracing import JsonLinesSpanExporter, PhaseTimer, Span, span_exporter
+
+
+def _ticks(step_ns: int = 1_000_000_000):
+    c = count(0, step_ns)
+    return lambda: next(c)
+
+
+def test_phase_is_observed_and_accumulated() -> None:
+    metrics = Metrics(registry=CollectorRegistry())
+    timer = PhaseTimer("kenku-pg", metrics, clock=_ticks())
+    with timer.phase("sweep"):
+        pass
+    with timer.phase("sweep"):
+        pass
+    assert timer.elapsed("sweep") == 2.0
+    assert timer.elapsed("dump") == 0.0
+    assert metrics.registry.get_sample_value(
+        "fiber_movement_phase_seconds_sum", {"db": "kenku-pg", "phase": "sweep"}) == 2.0
+
+
+def test_phase_is_timed_when_it_raises() -> None:
+    metrics = Metrics(registry=CollectorRegistry())
+    timer = PhaseTimer("kenku-pg", metrics, clock=_ticks())
+    try:
+        with timer.phase("dump"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert timer.elapsed("dump") == 1.0
+
+
+def test_spans_are_written_as_json_lines(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonLinesSpanExporter(str(path))
+    timer = PhaseTimer("kenku-pg", Metrics(registry=CollectorRegistry()), exporter=exporter, clock=_ticks())
+    with timer.phase("dump"):
+        pass
+    timer.finish(outcome="clean")
+    assert not path.exists()  # buffered until flushed off the event loop
+    exporter.flush()
+    child, root = [json.loads(line) for line in path.read_text().splitlines()]
+    assert child["name"] == "dump" and child["parentSpanId"] == root["spanId"]
+    assert child["traceId"] == root["traceId"]
+    assert root["parentSpanId"] == "" and root["attributes"] == {"db": "kenku-pg", "outcome": "clean"}
+    assert child["endTimeUnixNano"] - child["startTimeUnixNano"] == 1_000_000_000
+
+
+def test_empty_trace_path_disables_export(tmp_path: Path) -> None:
+    assert span_exporter("") is None
+    assert isinstance(span_exporter(str(tmp_path / "s.jsonl")), JsonLinesSpanExporter)
+
+
+def test_trace_file_rotates_past_its_cap(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonLinesSpanExporter(str(path), max_bytes=450)
+    for i in range(3):
+        exporter.export(Span("t" * 32, f"{i:016x}", None, "movement", 0, 1, {"db": "kenku-pg"}))
+        exporter.flush()
+    kept = [json.loads(line)["spanId"] for line in path.read_text().splitlines()]
+    rotated = [json.loads(line)["spanId"] for line in (tmp_path / "spans.jsonl.1").read_text().splitlines()]
+    assert rotated + kept == [f"{i:016x}" for i in range(3)]
+    assert path.stat().st_size <= 450
+
+
+def test_unflushed_spans_are_capped(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonLinesSpanExporter(str(path), max_buffered=2)
+    for i in range(3):
+        exporter.export(Span("t" * 32, f"{i:016x}", None, "movement", 0, 1))
+    exporter.flush()
+    exporter.flush()  # nothing pending: no write
+    assert [json.loads(line)["spanId"] for line in path.read_text().splitlines()] == [f"{i:016x}" for i in (1, 2)]
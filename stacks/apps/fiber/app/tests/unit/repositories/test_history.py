@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlmodel import Session
 
 from fiber.db.database import Database
 from fiber.repositories.history import HistoryRepository
@@ -17,6 +21,14 @@ def _rec(service: str, minute: int, outcome: MovementOutcome, nbytes: int) -> Mo
     )
 
 
+def _on_day(service: str, day: int, outcome: MovementOutcome, nbytes: int, took_s: int = 60) -> MovementRecord:
+    t = datetime(2026, 6, day, 3, 0, tzinfo=timezone.utc)
+    return MovementRecordFactory.build(
+        service=service, started_at=t, finished_at=t + timedelta(seconds=took_s),
+        outcome=outcome, bytes_written=nbytes,
+    )
+
+
 class TestHistoryRepository:
     @pytest.fixture()
     def subject(self) -> HistoryRepository:
@@ -39,6 +51,15 @@ class TestHistoryRepository:
             subject.record(_rec("kenku-pg", m, MovementOutcome.CLEAN, b))
         assert subject.median_bytes("kenku-pg", limit=10) == 200
 
+    def test_median_bytes_skips_unclassified_runs(self, subject: HistoryRepository) -> None:
+        subject.record(_rec("kenku-pg", 1, MovementOutcome.CLEAN, 1000))
+        compressed = replace(_rec("kenku-pg", 2, MovementOutcome.CLEAN, 10), bristol_type=None)
+        subject.record(compressed)
+        assert subject.median_bytes("kenku-pg", limit=10) == 1000
+        subject.compact(datetime(2026, 7, 1, tzinfo=timezone.utc))  # rollups leave them out too
+        subject.record(_rec("kenku-pg", 3, MovementOutcome.CLOGGED, 0))
+        assert subject.median_bytes("kenku-pg", limit=10) == 1000
+
     def test_median_bytes_none_when_no_clean_runs(self, subject: HistoryRepository) -> None:
         assert subject.median_bytes("kenku-pg", limit=10) is None
 
@@ -91,3 +112,111 @@ class TestHistoryRepository:
 
     def test_latest_clean_returns_none_for_unknown_service(self, subject: HistoryRepository) -> None:
         assert subject.latest_clean("ghost") is None
+
+    def test_summaries_empty_without_history(self, subject: HistoryRepository) -> None:
+        assert subject.summaries() == {}
+
+    def test_summaries_cover_every_service_in_one_call(self, subject: HistoryRepository) -> None:
+        subject.record(_rec("kenku-pg", 1, MovementOutcome.CLEAN, 100))
+        subject.record(_rec("kenku-pg", 2, MovementOutcome.CLOGGED, 0))
+        subject.record(_rec("immich", 3, MovementOutcome.PINCHED, 0))
+        summaries = subject.summaries()
+        assert set(summaries) == {"kenku-pg", "immich"}
+        kenku = summaries["kenku-pg"]
+        assert kenku.last_outcome is MovementOutcome.CLOGGED
+        assert kenku.last_success == datetime(2026, 6, 15, 3, 1, tzinfo=timezone.utc)
+        assert kenku.latest_clean is not None
+        assert kenku.latest_clean.bytes_written == 100
+        immich = summaries["immich"]
+        assert immich.last_outcome is MovementOutcome.PINCHED
+        assert immich.last_success is None
+        assert immich.latest_clean is None
+
+    def test_summaries_carry_expected_duration_of_clean_movements(self, subject: HistoryRepository) -> None:
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 100, took_s=100))
+        subject.record(_on_day("kenku-pg", 2, MovementOutcome.CLOGGED, 0, took_s=5))
+        subject.record(_on_day("kenku-pg", 3, MovementOutcome.CLEAN, 100, took_s=200))
+        subject.record(_on_day("immich", 3, MovementOutcome.PINCHED, 0))
+        summaries = subject.summaries()
+        assert summaries["kenku-pg"].expected_duration_s == pytest.approx(130.0)
+        assert summaries["immich"].expected_duration_s is None
+
+    def test_same_second_movements_order_by_insertion(self, subject: HistoryRepository) -> None:
+        subject.record(_rec("kenku-pg", 1, MovementOutcome.CLEAN, 100))
+        subject.record(_rec("kenku-pg", 1, MovementOutcome.CLOGGED, 0))
+        assert subject.last_outcome("kenku-pg") is MovementOutcome.CLOGGED
+
+
+class TestHistoryCompaction:
+    @pytest.fixture()
+    def subject(self) -> HistoryRepository:
+        db = Database("sqlite:///:memory:")
+        return HistoryRepository(session_factory=db.session)
+
+    def test_old_rows_fold_into_daily_rollup(self, subject: HistoryRepository) -> None:
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 100, took_s=10))
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLOGGED, 0, took_s=200))
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 300, took_s=30))
+        subject.record(_on_day("kenku-pg", 20, MovementOutcome.CLEAN, 500))
+        removed = subject.compact(datetime(2026, 6, 10, 15, 0, tzinfo=timezone.utc))
+        assert removed == 3
+        [day] = subject.daily("kenku-pg", limit=5)
+        assert day.day == datetime(2026, 6, 1, tzinfo=timezone.utc)
+        assert (day.clean, day.clogged, day.pinched) == (2, 1, 0)
+        assert day.median_bytes == 200
+        assert day.p95_duration_s == 200
+        assert day.worst is MovementOutcome.CLOGGED
+        assert [r.bytes_written for r in subject.recent("kenku-pg", limit=5)] == [500]
+
+    def test_cutoff_is_floored_to_midnight(self, subject: HistoryRepository) -> None:
+        subject.record(_on_day("kenku-pg", 10, MovementOutcome.CLEAN, 100))
+        subject.record(_on_day("kenku-pg", 11, MovementOutcome.CLEAN, 100))
+        assert subject.compact(datetime(2026, 6, 10, 23, 0, tzinfo=timezone.utc)) == 0
+
+    def test_rows_behind_the_dashboard_summary_are_kept(self, subject: HistoryRepository) -> None:
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 100))
+        subject.record(_on_day("kenku-pg", 2, MovementOutcome.CLOGGED, 0))
+        assert subject.compact(datetime(2026, 6, 30, tzinfo=timezone.utc)) == 0
+        summary = subject.summaries()["kenku-pg"]
+        assert summary.last_outcome is MovementOutcome.CLOGGED
+        assert summary.latest_clean is not None
+
+    def test_second_pass_merges_into_existing_day(self, subject: HistoryRepository) -> None:
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 100))
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 100))
+        subject.record(_on_day("kenku-pg", 1, MovementOutcome.CLEAN, 400))  # pinned as latest clean
+        subject.compact(datetime(2026, 6, 5, tzinfo=timezone.utc))
+        subject.record(_on_day("kenku-pg", 3, MovementOutcome.CLEAN, 100))
+        subject.compact(datetime(2026, 6, 5, tzinfo=timezone.utc))
+        day1 = subject.daily("kenku-pg", limit=5)[-1]
+        assert day1.clean == 3
+        assert day1.median_bytes == 100
+
+    def test_compacts_in_bounded_write_transactions(self) -> None:
+        db = Database("sqlite:///:memory:")
+        sessions = 0
+
+        @contextmanager
+        def counted() -> Iterator[Session]:
+            nonlocal sessions
+            sessions += 1
+            with db.session() as session:
+                yield session
+
+        subject = HistoryRepository(session_factory=counted)
+        for day in (1, 1, 1, 2, 2, 3):
+            subject.record(_on_day("kenku-pg", day, MovementOutcome.CLEAN, 100))
+        subject.record(_on_day("kenku-pg", 20, MovementOutcome.CLEAN, 500))
+        sessions = 0
+        assert subject.compact(datetime(2026, 6, 10, tzinfo=timezone.utc), batch=2) == 6
+        assert sessions == 4  # three full batches, then one that comes up short
+        assert [(d.day.day, d.clean) for d in subject.daily("kenku-pg", limit=5)] == [(3, 1), (2, 2), (1, 3)]
+        assert [r.bytes_written for r in subject.recent("kenku-pg", limit=5)] == [500]
+
+    def test_median_bytes_tops_up_from_rollups(self, subject: HistoryRepository) -> None:
+        for day in (1, 2, 3):
+            subject.record(_on_day("kenku-pg", day, MovementOutcome.CLEAN, 1000))
+        subject.record(_on_day("kenku-pg", 20, MovementOutcome.CLEAN, 10))
+        subject.compact(datetime(2026, 6, 10, tzinfo=timezone.utc))
+        assert subject.median_bytes("kenku-pg", limit=3) == 1000
+        assert subject.median_bytes("kenku-pg", limit=1) == 10
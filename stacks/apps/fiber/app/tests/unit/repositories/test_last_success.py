@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import create_autospec
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from fiber.domain.models import HistorySummary, MovementOutcome
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
+from tests.factories import MovementRecordFactory
+
+T1 = datetime(2026, 6, 15, 3, 0, tzinfo=timezone.utc)
+T2 = datetime(2026, 6, 16, 3, 0, tzinfo=timezone.utc)
+
+
+class TestLastSuccessCache:
+    @pytest.fixture()
+    def history(self):
+        m = create_autospec(HistoryRepository, instance=True)
+        m.summaries.return_value = {
+            "kenku-pg": HistorySummary(last_success=T1, last_outcome=MovementOutcome.CLEAN,
+                                       expected_duration_s=100.0),
+            "immich": HistorySummary(last_outcome=MovementOutcome.CLOGGED),
+        }
+        m.last_success.return_value = None
+        return m
+
+    @pytest.fixture()
+    def metrics(self) -> Metrics:
+        return Metrics(registry=CollectorRegistry())
+
+    @pytest.fixture()
+    def subject(self, history, metrics: Metrics) -> LastSuccessCache:
+        return LastSuccessCache(history=history, metrics=metrics)
+
+    def _count(self, metrics: Metrics, result: str) -> float | None:
+        return metrics.registry.get_sample_value(
+            "fiber_last_success_cache_lookups_total", {"result": result})
+
+    def test_loads_every_service_with_one_query(self, subject: LastSuccessCache, history, metrics) -> None:
+        assert subject.get("kenku-pg") == T1
+        assert subject.get("immich") is None
+        assert subject.get("kenku-pg") == T1
+        history.summaries.assert_called_once_with()
+        history.last_success.assert_not_called()
+        assert self._count(metrics, "hit") == 3.0
+
+    def test_unknown_service_queried_once_then_cached(self, subject: LastSuccessCache, history, metrics) -> None:
+        assert subject.get("ghost") is None
+        assert subject.get("ghost") is None
+        history.last_success.assert_called_once_with("ghost")
+        assert self._count(metrics, "miss") == 1.0
+        assert self._count(metrics, "hit") == 1.0
+
+    def test_get_many_loads_once_and_queries_only_misses(self, subject: LastSuccessCache, history) -> None:
+        assert subject.get_many(["kenku-pg", "ghost"]) == {"kenku-pg": T1, "ghost": None}
+        history.summaries.assert_called_once_with()
+        history.last_success.assert_called_once_with("ghost")
+
+    def test_clean_movement_advances_last_success(self, subject: LastSuccessCache) -> None:
+        subject.update(MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLEAN, finished_at=T2))
+        assert subject.get("kenku-pg") == T2
+
+    def test_failed_movement_leaves_last_success(self, subject: LastSuccessCache) -> None:
+        subject.update(MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLOGGED, finished_at=T2))
+        assert subject.get("kenku-pg") == T1
+
+    def test_older_clean_movement_does_not_rewind(self, subject: LastSuccessCache) -> None:
+        subject.update(MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLEAN, finished_at=T2))
+        subject.update(MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLEAN, finished_at=T1))
+        assert subject.get("kenku-pg") == T2
+
+    def test_durations_loaded_and_folded_on_clean_movements(self, subject: LastSuccessCache, history) -> None:
+        assert subject.durations() == {"kenku-pg": 100.0}
+        subject.update(MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLEAN, started_at=T2 - timedelta(seconds=200),
+            finished_at=T2))
+        subject.update(MovementRecordFactory.build(
+            service="immich", outcome=MovementOutcome.CLOGGED, started_at=T1, finished_at=T2))
+        assert subject.durations() == {"kenku-pg": pytest.approx(130.0)}
+        history.summaries.assert_called_once_with()
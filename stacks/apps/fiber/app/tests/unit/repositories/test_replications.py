@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fiber.db.database import Database
+from fiber.domain.models import MovementOutcome, ReplicationRecord
+from fiber.repositories.replications import ReplicationRepository
+
+_T0 = datetime(2026, 6, 15, 3, tzinfo=timezone.utc)
+
+
+def _rec(target: str, minutes: int, outcome: MovementOutcome = MovementOutcome.CLEAN) -> ReplicationRecord:
+    return ReplicationRecord(service="kenku-pg", target=target, dump_path="/bowl/kenku-pg/t.dump",
+                             dumped_at=_T0, replicated_at=_T0 + timedelta(minutes=minutes),
+                             outcome=outcome, bytes_sent=100)
+
+
+class TestReplicationRepository:
+    @pytest.fixture()
+    def subject(self, tmp_path) -> ReplicationRepository:
+        return ReplicationRepository(session_factory=Database(f"sqlite:///{tmp_path}/fiber.db").session)
+
+    def test_latest_is_per_service_and_target(self, subject: ReplicationRepository) -> None:
+        subject.record(_rec("/mnt/offsite", 1))
+        subject.record(_rec("/mnt/offsite", 5))
+        subject.record(_rec("s3://offsite", 9))
+        latest = subject.latest()
+        assert latest[("kenku-pg", "/mnt/offsite")].lag_s == 300
+        assert latest[("kenku-pg", "s3://offsite")].lag_s == 540
+
+    def test_latest_clean_skips_failures(self, subject: ReplicationRepository) -> None:
+        subject.record(_rec("s3://offsite", 1))
+        subject.record(_rec("s3://offsite", 2, MovementOutcome.CLOGGED))
+        assert subject.latest()[("kenku-pg", "s3://offsite")].outcome is MovementOutcome.CLOGGED
+        assert subject.latest(clean=True)[("kenku-pg", "s3://offsite")] == _rec("s3://offsite", 1)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fiber.db.database import Database
+from fiber.domain.models import Engine, MovementOutcome, RestoreRecord
+from fiber.repositories.restores import RestoreRepository
+
+
+def _rec(service: str, hour: int, test: bool = True,
+         outcome: MovementOutcome = MovementOutcome.CLEAN) -> RestoreRecord:
+    t = datetime(2026, 6, 15, hour, tzinfo=timezone.utc)
+    return RestoreRecord(service=service, engine=Engine.POSTGRES, dump_path=f"/bowl/{service}/t.dump",
+                         target="verify-pg:5432/fiber_verify", started_at=t,
+                         finished_at=t + timedelta(seconds=90), outcome=outcome, bytes_read=100,
+                         test=test)
+
+
+class TestRestoreRepository:
+    @pytest.fixture()
+    def subject(self, tmp_path) -> RestoreRepository:
+        return RestoreRepository(session_factory=Database(f"sqlite:///{tmp_path}/fiber.db").session)
+
+    def test_latest_is_the_newest_per_service(self, subject: RestoreRepository) -> None:
+        subject.record(_rec("a", 1))
+        subject.record(_rec("a", 2, outcome=MovementOutcome.CLOGGED))
+        subject.record(_rec("b", 1))
+        latest = subject.latest()
+        assert latest["a"] == _rec("a", 2, outcome=MovementOutcome.CLOGGED)
+        assert set(latest) == {"a", "b"}
+
+    def test_latest_can_be_limited_to_test_restores(self, subject: RestoreRepository) -> None:
+        subject.record(_rec("a", 1))
+        subject.record(_rec("a", 2, test=False))
+        subject.record(_rec("b", 3, test=False))
+        assert subject.latest(test=True) == {"a": _rec("a", 1)}
+        assert subject.latest() == {"a": _rec("a", 2, test=False), "b": _rec("b", 3, test=False)}
@@ -12,6 +12,7 @@ from fiber.clients.events import EventBroker
 from fiber.clients.probe import ConnectivityProbe, ProbeResult
 from fiber.services.dashboard import DashboardService
 from fiber.services.registry_state import RegistryState, Snapshot
+from fiber.services.restorer import Restorer
 from fiber.services.worker_pool import WorkerPool
 from fiber.services.orchestrator import MovementOrchestrator
 from fiber.domain.status import DBStatus
@@ -45,59 +46,6 @@ def _make_vm(*services: str) -> DashboardVM:
     )
 
 
-class TestTilesToPush:
-    """Unit tests for the pure tiles_to_push helper."""
-
-    def _make_card(self, service: str, status: DBStatus) -> CardVM:
-        return CardVM(
-            service=service,
-            engine="postgres",
-            status=status,
-            last_rel="1h ago",
-            size="—",
-            next_run="—",
-            bristol=None,
-            writes_to="/backups",
-            error=None,
-        )
-
-    def test_returns_signalled_service_when_provided(self) -> None:
-        from fiber.routes.dashboard import tiles_to_push
-        cards = [
-            self._make_card("immich", DBStatus.CLEAN),
-            self._make_card("forgejo", DBStatus.STRAINING),
-        ]
-        assert tiles_to_push(cards, "immich") == ["immich"]
-
-    def test_returns_straining_services_when_no_signal(self) -> None:
-        from fiber.routes.dashboard import tiles_to_push
-        cards = [
-            self._make_card("immich", DBStatus.CLEAN),
-            self._make_card("forgejo", DBStatus.STRAINING),
-            self._make_card("paperless", DBStatus.STRAINING),
-        ]
-        result = tiles_to_push(cards, None)
-        assert sorted(result) == ["forgejo", "paperless"]
-
-    def test_returns_empty_when_no_signal_and_no_straining(self) -> None:
-        from fiber.routes.dashboard import tiles_to_push
-        cards = [
-            self._make_card("immich", DBStatus.CLEAN),
-            self._make_card("forgejo", DBStatus.CLOGGED),
-        ]
-        assert tiles_to_push(cards, None) == []
-
-    def test_signalled_takes_priority_over_straining(self) -> None:
-        from fiber.routes.dashboard import tiles_to_push
-        cards = [
-            self._make_card("immich", DBStatus.STRAINING),
-            self._make_card("forgejo", DBStatus.STRAINING),
-        ]
-        # when signalled, only push the signalled service
-        result = tiles_to_push(cards, "immich")
-        assert result == ["immich"]
-
-
 class TestDashboardRoutes:
     @pytest.fixture()
     def mock_dashboard_service(self) -> MagicMock:
@@ -140,6 +88,12 @@ class TestDashboardRoutes:
         m.check = AsyncMock(return_value=ProbeResult(ok=True, detail="accepting connections"))
         return m
 
+    @pytest.fixture()
+    def mock_restorer(self) -> MagicMock:
+        m = create_autospec(Restorer, instance=True)
+        m.start_verify.return_value = True
+        return m
+
     @pytest.fixture()
     def templates(self, tmp_path) -> Jinja2Templates:
         # Minimal templates for unit tests
@@ -174,11 +128,13 @@ class TestDashboardRoutes:
         mock_orchestrator: MagicMock,
         mock_registry_state: MagicMock,
         mock_probe: MagicMock,
+        mock_restorer: MagicMock,
         templates: Jinja2Templates,
     ) -> FastAPI:
         from fiber.platform.config import Config
         from fiber.container import Container
         from fiber.main import create_app
+        from fiber.platform.executors import Executors
 
         container = Container()
         mock_config = MagicMock(spec=Config)
@@ -190,7 +146,9 @@ class TestDashboardRoutes:
         container.orchestrator.override(mock_orchestrator)
         container.registry_state.override(mock_registry_state)
         container.probe.override(mock_probe)
+        container.restorer.override(mock_restorer)
         container.templates.override(templates)
+        container.executors.override(Executors(disk_workers=1, net_workers=1))
         app = create_app(container)
         return app
 
@@ -229,6 +187,17 @@ class TestDashboardRoutes:
         assert resp.status_code == 200
         mock_pool.cancel.assert_called_once_with("immich")
 
+    def test_post_verify_starts_a_test_restore(
+        self, app: FastAPI, mock_restorer: MagicMock
+    ) -> None:
+        with TestClient(app) as client:
+            resp = client.post("/db/immich/verify")
+            missing = client.post("/db/nope/verify")
+        assert resp.status_code == 200 and "tile-immich" in resp.text
+        assert missing.status_code == 200
+        mock_restorer.start_verify.assert_called_once()
+        assert mock_restorer.start_verify.call_args[0][0].service == "immich"
+
     def test_get_drawer_returns_partial(self, app: FastAPI) -> None:
         with TestClient(app) as client:
             resp = client.get("/db/immich")
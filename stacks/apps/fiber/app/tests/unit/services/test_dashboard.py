@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, create_autospec
 
@@ -7,7 +8,7 @@ import pytest
 
 from fiber.clients.bowl import BowlStorage
 from fiber.repositories.history import HistoryRepository
-from fiber.domain.models import BowlEntry, MovementOutcome, MovementRecord
+from fiber.domain.models import BowlEntry, DailyRollup, HistorySummary, MovementOutcome, MovementRecord
 from fiber.services.dashboard import DashboardService
 from fiber.services.registry_state import RegistryState, Snapshot
 from fiber.services.worker_pool import WorkerPool
@@ -44,6 +45,9 @@ class TestDashboardService:
         m.last_outcome.return_value = MovementOutcome.CLEAN
         m.recent.return_value = []
         m.latest_clean.return_value = None
+        m.summaries.return_value = {"immich": HistorySummary(
+            last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+        )}
         return m
 
     @pytest.fixture()
@@ -118,10 +122,14 @@ class TestDashboardService:
         immich_rows = [r for r in vm.discovery if r.service == "immich"]
         assert immich_rows[0].result == "discovered"
 
-    def test_history_queried_per_job(self, subject: DashboardService, history: MagicMock) -> None:
+    def test_history_read_in_one_query_for_all_jobs(
+        self, subject: DashboardService, history: MagicMock,
+    ) -> None:
         subject.build()
-        history.last_success.assert_called_with("immich")
-        history.last_outcome.assert_called_with("immich")
+        history.summaries.assert_called_once_with()
+        history.last_success.assert_not_called()
+        history.last_outcome.assert_not_called()
+        history.latest_clean.assert_not_called()
 
     def test_build_populates_size_and_bristol_from_latest_clean(
         self, registry_state: RegistryState, pool: MagicMock, bowl: MagicMock
@@ -133,9 +141,10 @@ class TestDashboardService:
             bristol_type=4,
         )
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
-        history.last_outcome.return_value = MovementOutcome.CLEAN
-        history.latest_clean.return_value = clean_rec
+        history.summaries.return_value = {"immich": HistorySummary(
+            last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+            latest_clean=clean_rec,
+        )}
         svc = DashboardService(
             registry_state=registry_state,
             history=history,
@@ -156,9 +165,7 @@ class TestDashboardService:
         self, registry_state: RegistryState, pool: MagicMock, bowl: MagicMock
     ) -> None:
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         svc = DashboardService(
             registry_state=registry_state,
             history=history,
@@ -188,6 +195,26 @@ class TestDashboardService:
         assert c.status is DBStatus.MISCONFIGURED
         assert c.error == "not found"
 
+    def test_restore_line_shows_progress_then_the_last_result(
+        self, registry_state: RegistryState, history: MagicMock, pool: MagicMock, bowl: MagicMock,
+    ) -> None:
+        from fiber.domain.models import Engine, RestoreProgress, RestoreRecord
+        from fiber.services.restorer import Restorer
+
+        restorer = create_autospec(Restorer, instance=True)
+        restorer.progress.return_value = RestoreProgress(
+            started_at=NOW - timedelta(seconds=75), bytes_done=250, bytes_total=1000)
+        subject = DashboardService(registry_state=registry_state, history=history, pool=pool, bowl=bowl,
+                                   now=lambda: NOW, default_bowl_root="/backups", restorer=restorer)
+        assert subject.card("immich").restore == "restoring 25% · 1:15"
+
+        restorer.progress.return_value = None
+        restorer.latest.return_value = {"immich": RestoreRecord(
+            service="immich", engine=Engine.POSTGRES, dump_path="/x", target="t",
+            started_at=NOW - timedelta(hours=2, seconds=95), finished_at=NOW - timedelta(hours=2),
+            outcome=MovementOutcome.CLEAN, bytes_read=1000, test=True)}
+        assert subject.card("immich").restore == "restored in 1:35 · 2h ago"
+
     def test_detail_returns_drawer_vm(self, subject: DashboardService) -> None:
         from fiber.domain.view import DrawerVM
         d = subject.detail("immich")
@@ -281,6 +308,40 @@ class TestDashboardServiceDetail:
         assert len(vm.timeline) == 2
         assert vm.timeline[0][1] == "clean"
 
+    def test_detail_timeline_continues_into_daily_rollups(self, clean_job, clean_movement) -> None:
+        history = create_autospec(HistoryRepository, instance=True)
+        history.recent.return_value = [clean_movement]
+        history.daily.return_value = [DailyRollup(
+            service="immich", day=datetime(2026, 3, 1, tzinfo=UTC), clean=1, clogged=1, pinched=0,
+            median_bytes=100, p95_duration_s=60,
+        )]
+        history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
+        history.last_outcome.return_value = MovementOutcome.CLEAN
+        bowl = create_autospec(BowlStorage, instance=True)
+        bowl.read_text.return_value = None
+        subject = self._make_subject([clean_job], [], history, bowl)
+        vm = subject.detail("immich")
+        history.daily.assert_called_once_with("immich", 5)
+        assert [outcome for _, outcome in vm.timeline] == ["clean", "clogged"]
+
+    def test_detail_timeline_is_newest_first_across_rows_and_rollups(self, clean_job, clean_movement) -> None:
+        history = create_autospec(HistoryRepository, instance=True)
+        pinned = replace(clean_movement, finished_at=datetime(2026, 1, 10, 3, 0, tzinfo=UTC))
+        failed = replace(clean_movement, outcome=MovementOutcome.CLOGGED,
+                         finished_at=datetime(2026, 6, 15, 3, 0, tzinfo=UTC))
+        history.recent.return_value = [failed, pinned]  # the latest clean row outlives compaction
+        history.daily.return_value = [DailyRollup(
+            service="immich", day=datetime(2026, 3, 1, tzinfo=UTC), clean=0, clogged=0, pinched=1,
+            median_bytes=None, p95_duration_s=60,
+        )]
+        history.last_success.return_value = datetime(2026, 1, 10, 3, 0, tzinfo=UTC)
+        history.last_outcome.return_value = MovementOutcome.CLOGGED
+        bowl = create_autospec(BowlStorage, instance=True)
+        bowl.read_text.return_value = None
+        subject = self._make_subject([clean_job], [], history, bowl)
+        vm = subject.detail("immich")
+        assert [outcome for _, outcome in vm.timeline] == ["clogged", "pinched", "clean"]
+
     def test_detail_sha_from_receipt_json(self, clean_job, clean_movement) -> None:
         history = create_autospec(HistoryRepository, instance=True)
         history.recent.return_value = [clean_movement]
@@ -377,9 +438,9 @@ class TestDiscoveryHealth:
         )
         rs.set(snap)
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
-        history.last_outcome.return_value = MovementOutcome.CLEAN
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {"immich": HistorySummary(
+            last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+        )}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -401,9 +462,7 @@ class TestDiscoveryHealth:
         rs = RegistryState()
         rs.set(Snapshot(jobs=[job], misconfigured=[], skipped=[]))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -429,9 +488,7 @@ class TestDiscoveryHealth:
             error="docker unavailable",
         ))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -476,19 +533,18 @@ class TestDashboardSort:
         snap = Snapshot(jobs=[clean_job, constipated_job, clogged_job], misconfigured=[], skipped=[])
         rs.set(snap)
         history = create_autospec(HistoryRepository, instance=True)
-        history.latest_clean.return_value = None
-        history.last_success.return_value = None
-        history.last_outcome.side_effect = lambda svc: {
-            "clogged-svc": MovementOutcome.CLOGGED,
-            "constipated-svc": MovementOutcome.CLEAN,
-            "clean-svc": MovementOutcome.CLEAN,
-        }.get(svc)
         # constipated-svc has a last_success far in the past to trigger CONSTIPATED
-        history.last_success.side_effect = lambda svc: {
-            "clogged-svc": None,
-            "constipated-svc": datetime(2026, 1, 1, 3, 0, tzinfo=UTC),  # far in past
-            "clean-svc": datetime(2026, 6, 15, 3, 0, tzinfo=UTC),
-        }.get(svc)
+        history.summaries.return_value = {
+            "clogged-svc": HistorySummary(last_outcome=MovementOutcome.CLOGGED),
+            "constipated-svc": HistorySummary(
+                last_success=datetime(2026, 1, 1, 3, 0, tzinfo=UTC),  # far in past
+                last_outcome=MovementOutcome.CLEAN,
+            ),
+            "clean-svc": HistorySummary(
+                last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC),
+                last_outcome=MovementOutcome.CLEAN,
+            ),
+        }
         svc = self._build_service(rs, MovementOutcome.CLEAN, history)
         vm = svc.build()
         statuses = [c.status for c in vm.cards]
@@ -504,9 +560,9 @@ class TestNextRun:
         rs = RegistryState()
         rs.set(Snapshot(jobs=[job], misconfigured=[], skipped=[]))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
-        history.last_outcome.return_value = MovementOutcome.CLEAN
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {"immich": HistorySummary(
+            last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+        )}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -530,9 +586,7 @@ class TestNextRun:
         rs = RegistryState()
         rs.set(Snapshot(jobs=[job], misconfigured=[], skipped=[]))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = NOW - timedelta(seconds=30)
         bowl = create_autospec(BowlStorage, instance=True)
@@ -559,9 +613,7 @@ class TestNextRun:
             skipped=[],
         ))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -587,9 +639,7 @@ class TestStrainProgress:
         rs.set(Snapshot(jobs=[job], misconfigured=[], skipped=[]))
 
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = None
-        history.last_outcome.return_value = None
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {}
 
         started = NOW - timedelta(seconds=98)
         pool = create_autospec(WorkerPool, instance=True)
@@ -630,9 +680,9 @@ class TestStrainProgress:
         rs = RegistryState()
         rs.set(Snapshot(jobs=[job], misconfigured=[], skipped=[]))
         history = create_autospec(HistoryRepository, instance=True)
-        history.last_success.return_value = datetime(2026, 6, 15, 3, 0, tzinfo=UTC)
-        history.last_outcome.return_value = MovementOutcome.CLEAN
-        history.latest_clean.return_value = None
+        history.summaries.return_value = {"immich": HistorySummary(
+            last_success=datetime(2026, 6, 15, 3, 0, tzinfo=UTC), last_outcome=MovementOutcome.CLEAN,
+        )}
         pool = create_autospec(WorkerPool, instance=True)
         pool.started_at.return_value = None
         bowl = create_autospec(BowlStorage, instance=True)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import inspect
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
@@ -12,8 +12,11 @@ from fiber.clients.events import EventBroker
 from fiber.platform.clock import SystemClock
 from fiber.clients.dump_runner import DumpRunner, RunOutcome
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
 from fiber.platform.metrics import Metrics
-from fiber.domain.models import DumpFormat, DumpJob, Engine, MovementOutcome
+from fiber.domain.dumps import merkle_root
+from fiber.domain.models import (BowlEntry, Codec, Compression, DumpFormat, DumpJob, Engine, FileDigest,
+                                 MovementOutcome, Retention)
 from fiber.services.orchestrator import MovementOrchestrator
 from fiber.clients.secrets import SecretReader
 from fiber.clients.swarm import DockerSwarmGateway
@@ -30,6 +33,7 @@ class TestMovementOrchestrator:
         m.size.return_value = 2048
         m.checksum.return_value = "abc"
         m.list_entries.return_value = []
+        m.link_previous.return_value = 0
         return m
 
     @pytest.fixture()
@@ -54,6 +58,10 @@ class TestMovementOrchestrator:
         m.median_bytes.return_value = None
         return m
 
+    @pytest.fixture()
+    def last_success(self) -> MagicMock:
+        return MagicMock(spec=LastSuccessCache)
+
     @pytest.fixture()
     def swarm(self) -> MagicMock:
         m = MagicMock(spec=DockerSwarmGateway)
@@ -81,6 +89,7 @@ class TestMovementOrchestrator:
         secrets: MagicMock,
         runner: MagicMock,
         history: MagicMock,
+        last_success: MagicMock,
         swarm: MagicMock,
         clock: MagicMock,
         metrics: Metrics,
@@ -88,11 +97,28 @@ class TestMovementOrchestrator:
     ) -> MovementOrchestrator:
         return MovementOrchestrator(
             bowl_factory=bowl_factory, bowl_root="/backups",
-            secrets=secrets, runner=runner, history=history,
+            secrets=secrets, runner=runner, history=history, last_success=last_success,
             discovery=swarm, clock=clock, fiber_version="0.1.0", metrics=metrics,
             events=broker,
         )
 
+    async def test_sweep_deletes_outside_gfs_retention_in_one_call(
+        self, subject: MovementOrchestrator, bowl: MagicMock
+    ) -> None:
+        start = datetime(2026, 5, 1, 3, tzinfo=timezone.utc)
+        bowl.list_entries.return_value = [
+            BowlEntry(path=f"/bowl/kenku-pg/{i}.dump", size_bytes=1, modified_at=start + timedelta(days=i),
+                      is_temp=False) for i in range(45)
+        ] + [BowlEntry(path="/bowl/kenku-pg/x.dump.partial", size_bytes=1, modified_at=start, is_temp=True)]
+        job = DumpJobFactory.build(app=None, dbname="k", user="k", retain=3, retention=Retention(monthly=2))
+        await subject.perform(job)
+        bowl.delete_many.assert_called_once()
+        deleted = bowl.delete_many.call_args.args[0]
+        assert deleted[0] == "/bowl/kenku-pg/0.dump" and deleted[-1] == "/bowl/kenku-pg/x.dump.partial"
+        assert "/bowl/kenku-pg/30.dump" not in deleted  # May 31 keeps May
+        assert len(deleted) == 45 - 3 - 1 + 1
+        bowl.delete.assert_not_called()
+
     async def test_clean_movement_promotes_and_records(
         self, subject: MovementOrchestrator, bowl: MagicMock, runner: MagicMock, history: MagicMock
     ) -> None:
@@ -104,6 +130,62 @@ class TestMovementOrchestrator:
         bowl.write_receipt.assert_called_once()
         history.record.assert_called_once()
 
+    async def test_finished_movement_updates_last_success_cache(
+        self, subject: MovementOrchestrator, last_success: MagicMock
+    ) -> None:
+        rec = await subject.perform(DumpJobFactory.build(app="downloads_kenku", dbname="k", user="k"))
+        last_success.update.assert_called_once_with(rec)
+
+    async def test_streamed_digest_skips_second_read(
+        self, subject: MovementOrchestrator, bowl: MagicMock, runner: MagicMock
+    ) -> None:
+        runner.run.return_value = RunOutcome(0, "", False, sha256="streamed", bytes_written=4096)
+        rec = await subject.perform(DumpJobFactory.build(app=None, dbname="k", user="k"))
+        assert rec.bytes_written == 4096
+        bowl.size.assert_not_called()
+        bowl.checksum.assert_not_called()
+        assert bowl.write_receipt.call_args.args[1]["sha256"] == "streamed"
+
+    async def test_compressed_dump_records_raw_and_stored_sizes(
+        self, subject: MovementOrchestrator, bowl: MagicMock, runner: MagicMock, history: MagicMock
+    ) -> None:
+        history.median_bytes.return_value = 10_000
+        runner.run.return_value = RunOutcome(0, "", False, sha256="zst", bytes_written=1_000,
+                                             raw_bytes=10_000)
+        job = DumpJobFactory.build(app=None, fmt=DumpFormat.PLAIN, compression=Compression(Codec.ZSTD))
+        rec = await subject.perform(job)
+        assert bowl.temp_path.call_args.args[2] == "sql.zst"
+        assert rec.bytes_written == 10_000
+        assert rec.bristol_type == 4  # judged on the raw size, not the 10x smaller file
+        manifest = bowl.write_receipt.call_args.args[1]
+        assert (manifest["codec"], manifest["bytes"], manifest["raw_bytes"]) == ("zstd", 1_000, 10_000)
+
+    async def test_natively_compressed_directory_has_no_raw_size(
+        self, subject: MovementOrchestrator, bowl: MagicMock
+    ) -> None:
+        bowl.promote.return_value = "/bowl/kenku-pg/ts.dir"
+        bowl.digest_files.return_value = [FileDigest("toc.dat", "bb" * 32, 5)]
+        job = DumpJobFactory.build(app=None, fmt=DumpFormat.DIRECTORY, compression=Compression(Codec.GZIP))
+        rec = await subject.perform(job)
+        assert bowl.temp_path.call_args.args[2] == "dir"
+        assert rec.bytes_written == 5
+        assert rec.bristol_type is None  # a stored size can't be judged against a raw baseline
+        manifest = bowl.write_receipt.call_args.args[1]
+        assert (manifest["codec"], manifest["raw_bytes"]) == ("gzip", None)
+
+    async def test_directory_dump_records_per_file_digests_and_merkle_root(
+        self, subject: MovementOrchestrator, bowl: MagicMock
+    ) -> None:
+        files = [FileDigest("a.dat", "aa" * 32, 3), FileDigest("toc.dat", "bb" * 32, 5)]
+        bowl.promote.return_value = "/bowl/kenku-pg/ts.dir"
+        bowl.digest_files.return_value = files
+        rec = await subject.perform(DumpJobFactory.build(app=None, fmt=DumpFormat.DIRECTORY))
+        assert rec.bytes_written == 8
+        manifest = bowl.write_receipt.call_args.args[1]
+        assert manifest["sha256"] == manifest["merkle_root"] == merkle_root(files)
+        assert [f["path"] for f in manifest["files"]] == ["a.dat", "toc.dat"]
+        bowl.checksum.assert_not_called()
+
     async def test_no_room_is_clogged_before_dumping(
         self, subject: MovementOrchestrator, bowl: MagicMock, runner: MagicMock
     ) -> None:
@@ -174,3 +256,84 @@ class TestMovementOrchestrator:
         await subject.perform(job)
         assert broker.publish.await_count >= 1
         broker.publish.assert_any_await(job.service)
+
+    async def test_phases_are_timed_per_db(
+        self, subject: MovementOrchestrator, metrics: Metrics
+    ) -> None:
+        job = DumpJobFactory.build(app="downloads_kenku", dbname="k", user="k")
+        await subject.perform(job)
+        for phase in ("space_check", "secret", "dump", "promote", "checksum", "link", "image", "receipt",
+                      "sweep", "record"):
+            assert metrics.registry.get_sample_value(
+                "fiber_movement_phase_seconds_count", {"db": job.service, "phase": phase}) == 1.0, phase
+
+    async def test_unchanged_dump_is_linked_to_the_previous_one(
+        self, subject: MovementOrchestrator, bowl: MagicMock, metrics: Metrics
+    ) -> None:
+        bowl.link_previous.return_value = 2048
+        job = DumpJobFactory.build(app=None, dbname="k", user="k", fmt=DumpFormat.CUSTOM, compression=None)
+        rec = await subject.perform(job)
+        bowl.link_previous.assert_called_once_with("/bowl/kenku-pg/ts.dump", "abc", [])
+        assert rec.bytes_written == 2048
+        assert metrics.registry.get_sample_value(
+            "fiber_bowl_linked_bytes_total", {"db": job.service}) == 2048
+
+    async def test_finished_movement_is_handed_to_the_replicator(
+        self, bowl_factory: MagicMock, secrets: MagicMock, runner: MagicMock, history: MagicMock,
+        last_success: MagicMock, swarm: MagicMock, clock: MagicMock, metrics: Metrics,
+        broker: MagicMock,
+    ) -> None:
+        from fiber.services.replicator import Replicator
+
+        replicator = create_autospec(Replicator, instance=True)
+        subject = MovementOrchestrator(
+            bowl_factory=bowl_factory, bowl_root="/backups",
+            secrets=secrets, runner=runner, history=history, last_success=last_success,
+            discovery=swarm, clock=clock, fiber_version="0.1.0", metrics=metrics,
+            events=broker, replicator=replicator,
+        )
+        rec = await subject.perform(DumpJobFactory.build())
+        replicator.enqueue.assert_called_once_with(rec)
+
+    async def test_clean_movement_records_throughput_and_spans(
+        self, bowl_factory: MagicMock, secrets: MagicMock, runner: MagicMock, history: MagicMock,
+        last_success: MagicMock, swarm: MagicMock, clock: MagicMock, metrics: Metrics,
+        broker: MagicMock,
+    ) -> None:
+        spans = MagicMock()
+        subject = MovementOrchestrator(
+            bowl_factory=bowl_factory, bowl_root="/backups",
+            secrets=secrets, runner=runner, history=history, last_success=last_success,
+            discovery=swarm, clock=clock, fiber_version="0.1.0", metrics=metrics,
+            events=broker, spans=spans,
+        )
+        job = DumpJobFactory.build(app=None, dbname="k", user="k")
+        await subject.perform(job)
+        assert metrics.registry.get_sample_value(
+            "fiber_movement_throughput_bytes_per_second", {"db": job.service}) > 0
+        exported = [c.args[0] for c in spans.export.call_args_list]
+        root = exported[-1]
+        assert root.name == "movement" and root.parent_id is None
+        assert root.attributes["outcome"] == "clean" and root.attributes["bytes"] == 2048
+        assert {s.parent_id for s in exported[:-1]} == {root.span_id}
+        spans.flush.assert_called_once_with()
+
+    async def test_spans_are_flushed_when_the_movement_raises(
+        self, bowl_factory: MagicMock, secrets: MagicMock, runner: MagicMock, history: MagicMock,
+        last_success: MagicMock, swarm: MagicMock, clock: MagicMock, metrics: Metrics,
+        broker: MagicMock,
+    ) -> None:
+        spans = MagicMock()
+        runner.run.side_effect = OSError("disk full")
+        subject = MovementOrchestrator(
+            bowl_factory=bowl_factory, bowl_root="/backups",
+            secrets=secrets, runner=runner, history=history, last_success=last_success,
+            discovery=swarm, clock=clock, fiber_version="0.1.0", metrics=metrics,
+            events=broker, spans=spans,
+        )
+        with pytest.raises(OSError, match="disk full"):
+            await subject.perform(DumpJobFactory.build())
+        exported = [c.args[0] for c in spans.export.call_args_list]
+        assert exported[-1].name == "movement" and exported[-1].attributes["outcome"] == "error"
+        assert "dump" in {s.name for s in exported[:-1]}
+        spans.flush.assert_called_once_with()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from fiber.clients.bowl import BowlStorage
+from fiber.clients.dedup_bowl import DedupBowlStorage
+from fiber.domain.models import HistorySummary, MovementOutcome, ReplicationItem, ReplicationRecord
+from fiber.platform.clock import SystemClock
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+from fiber.repositories.replications import ReplicationRepository
+from fiber.services.replicator import Replicator
+from tests.factories import MovementRecordFactory
+
+_DUMPED = datetime(2026, 6, 15, 3, tzinfo=timezone.utc)
+
+
+class FakeReplica:
+    def __init__(self, name: str, fail: bool = False) -> None:
+        self.name = name
+        self.fail = fail
+        self.sent: dict[str, bytes] = {}
+
+    def put(self, src: str, key: str) -> int:
+        if self.fail:
+            raise OSError("connection reset")
+        self.sent[key] = Path(src).read_bytes()
+        return len(self.sent[key])
+
+
+def _dump(bowl_root: Path, name: str = "20260615T030000.dump") -> str:
+    path = bowl_root / "kenku-pg" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"PGDMP" * 100)
+    receipt = path.with_name(path.name + ".manifest.json")
+    receipt.write_text(json.dumps({"sha256": "abc"}))
+    return str(receipt)
+
+
+def _item(receipt: str) -> ReplicationItem:
+    return ReplicationItem(service="kenku-pg", dump_path=receipt[: -len(".manifest.json")],
+                           receipt_path=receipt, dumped_at=_DUMPED)
+
+
+class TestReplicator:
+    @pytest.fixture()
+    def replications(self) -> MagicMock:
+        m = create_autospec(ReplicationRepository, instance=True)
+        m.latest.return_value = {}
+        return m
+
+    @pytest.fixture()
+    def history(self) -> MagicMock:
+        m = create_autospec(HistoryRepository, instance=True)
+        m.summaries.return_value = {}
+        return m
+
+    @pytest.fixture()
+    def metrics(self) -> Metrics:
+        return Metrics(registry=CollectorRegistry())
+
+    @pytest.fixture()
+    def clock(self) -> MagicMock:
+        m = create_autospec(SystemClock, instance=True)
+        m.now.return_value = _DUMPED + timedelta(minutes=4)
+        return m
+
+    def _subject(self, replicas: list[FakeReplica], replications: MagicMock, history: MagicMock,
+                 clock: MagicMock, metrics: Metrics, bowl_factory=BowlStorage, **kw: object) -> Replicator:
+        return Replicator(replicas=replicas, bowl_factory=bowl_factory, replications=replications,
+                          history=history, clock=clock, metrics=metrics, **kw)  # type: ignore[arg-type]
+
+    async def test_copies_dump_then_receipt_and_records_lag(
+            self, tmp_path: Path, replications: MagicMock, history: MagicMock, clock: MagicMock,
+            metrics: Metrics) -> None:
+        replica = FakeReplica("/mnt/offsite")
+        subject = self._subject([replica], replications, history, clock, metrics)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(subject.run(stop))
+        subject.enqueue(MovementRecordFactory.build(receipt_path=_dump(tmp_path), finished_at=_DUMPED))
+        for _ in range(100):
+            if replications.record.called:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await runner
+        assert list(replica.sent) == ["kenku-pg/20260615T030000.dump",
+                                      "kenku-pg/20260615T030000.dump.manifest.json"]
+        rec = replications.record.call_args.args[0]
+        assert rec.outcome is MovementOutcome.CLEAN and rec.bytes_sent == 500 + len('{"sha256": "abc"}')
+        assert metrics.registry.get_sample_value(
+            "fiber_replication_lag_seconds", {"db": "kenku-pg", "target": "/mnt/offsite"}) == 240.0
+
+    async def test_dedup_and_directory_dumps_are_sent_as_files(
+            self, tmp_path: Path, replications: MagicMock, history: MagicMock, clock: MagicMock,
+            metrics: Metrics) -> None:
+        bowl = DedupBowlStorage(str(tmp_path))
+        temp = bowl.temp_path("kenku-pg", "20260615T030000", "sql")
+        Path(temp).write_bytes(b"insert into t values (1);\n" * 50)
+        final = bowl.promote(temp)
+        receipt = bowl.write_receipt(final, {"fmt": "plain"})
+        directory = tmp_path / "kenku-pg" / "20260616T030000.dir"
+        (directory / "sub").mkdir(parents=True)
+        (directory / "toc.dat").write_bytes(b"toc")
+        (directory / "sub" / "3001.dat").write_bytes(b"rows")
+        (tmp_path / "kenku-pg" / "20260616T030000.dir.manifest.json").write_text("{}")
+
+        replica = FakeReplica("/mnt/offsite")
+        subject = self._subject([replica], replications, history, clock, metrics, bowl_factory=DedupBowlStorage)
+        await subject.replicate(_item(receipt))
+        await subject.replicate(_item(str(directory) + ".manifest.json"))
+        assert replica.sent["kenku-pg/20260615T030000.sql"] == b"insert into t values (1);\n" * 50
+        assert replica.sent["kenku-pg/20260616T030000.dir/sub/3001.dat"] == b"rows"
+        assert "kenku-pg/20260616T030000.dir.manifest.json" in replica.sent
+
+    async def test_failed_replica_is_retried_alone(
+            self, tmp_path: Path, replications: MagicMock, history: MagicMock, clock: MagicMock,
+            metrics: Metrics) -> None:
+        good, bad = FakeReplica("/mnt/offsite"), FakeReplica("s3://offsite", fail=True)
+        subject = self._subject([good, bad], replications, history, clock, metrics, retry_delay=0.01)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(subject.run(stop))
+        subject.enqueue(MovementRecordFactory.build(receipt_path=_dump(tmp_path), finished_at=_DUMPED))
+        for _ in range(100):
+            if replications.record.call_count >= 3:
+                break
+            await asyncio.sleep(0.01)
+        bad.fail = False
+        for _ in range(100):
+            if bad.sent:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await runner
+        targets = [c.args[0].target for c in replications.record.call_args_list]
+        assert targets.count("/mnt/offsite") == 1
+        assert bad.sent
+        assert metrics.registry.get_sample_value(
+            "fiber_replications_total", {"db": "kenku-pg", "target": "s3://offsite", "status": "clogged"}) >= 1
+
+    async def test_startup_queues_dumps_the_replicas_never_got(
+            self, tmp_path: Path, replications: MagicMock, history: MagicMock, clock: MagicMock,
+            metrics: Metrics) -> None:
+        latest = MovementRecordFactory.build(receipt_path=_dump(tmp_path), finished_at=_DUMPED)
+        history.summaries.return_value = {"kenku-pg": HistorySummary(latest_clean=latest)}
+        replications.latest.return_value = {("kenku-pg", "/mnt/offsite"): ReplicationRecord(
+            service="kenku-pg", target="/mnt/offsite", dump_path="x", dumped_at=_DUMPED,
+            replicated_at=_DUMPED + timedelta(minutes=1), outcome=MovementOutcome.CLEAN, bytes_sent=1)}
+        done, missing = FakeReplica("/mnt/offsite"), FakeReplica("s3://offsite")
+        subject = self._subject([done, missing], replications, history, clock, metrics)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(subject.run(stop))
+        for _ in range(100):
+            if replications.record.called:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await runner
+        assert not done.sent and missing.sent
+        replications.latest.assert_called_once_with(clean=True)
+        assert metrics.registry.get_sample_value(
+            "fiber_replication_lag_seconds", {"db": "kenku-pg", "target": "/mnt/offsite"}) == 60.0
+
+    def test_enqueue_ignores_unclean_movements_and_empty_replica_lists(
+            self, replications: MagicMock, history: MagicMock, clock: MagicMock, metrics: Metrics) -> None:
+        subject = self._subject([FakeReplica("/mnt/offsite")], replications, history, clock, metrics)
+        subject.enqueue(MovementRecordFactory.build(outcome=MovementOutcome.CLOGGED, receipt_path=None))
+        idle = self._subject([], replications, history, clock, metrics)
+        idle.enqueue(MovementRecordFactory.build(receipt_path="/bowl/kenku-pg/t.dump.manifest.json"))
+        assert metrics.registry.get_sample_value("fiber_replication_queue_depth") == 0
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from fiber.clients.bowl import BowlStorage
+from fiber.clients.dump_runner import RunOutcome
+from fiber.clients.events import EventBroker
+from fiber.clients.restore_runner import RestoreRunner
+from fiber.clients.secrets import SecretReader
+from fiber.domain.models import (Engine, MovementOutcome, RestoreProgress, RestoreRecord,
+                                 RestoreTarget)
+from fiber.platform.clock import SystemClock
+from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
+from fiber.repositories.restores import RestoreRepository
+from fiber.services.restorer import Restorer
+from tests.factories import DumpJobFactory, MovementRecordFactory
+
+_T0 = datetime(2026, 6, 15, 4, tzinfo=timezone.utc)
+_TARGET = RestoreTarget(host="verify-pg", port=5432, user="fiber", secret="restore-pw", recreate=True)
+
+
+class TestRestorer:
+    @pytest.fixture()
+    def dump(self, tmp_path: Path) -> Path:
+        path = tmp_path / "kenku-pg" / "20260615T030000Z.dump"
+        path.parent.mkdir()
+        path.write_bytes(b"PGDMP" * 10)
+        path.with_name(path.name + ".manifest.json").write_text(json.dumps({"fmt": "custom", "bytes": 50}))
+        return path
+
+    @pytest.fixture()
+    def history(self, dump: Path) -> MagicMock:
+        m = MagicMock(spec=HistoryRepository)
+        m.latest_clean.return_value = MovementRecordFactory.build(
+            service="kenku-pg", outcome=MovementOutcome.CLEAN, receipt_path=f"{dump}.manifest.json")
+        return m
+
+    @pytest.fixture()
+    def runner(self) -> MagicMock:
+        m = create_autospec(RestoreRunner, instance=True)
+        m.run.return_value = RunOutcome(0, "", False, bytes_written=50)
+        return m
+
+    @pytest.fixture()
+    def restores(self) -> MagicMock:
+        m = create_autospec(RestoreRepository, instance=True)
+        m.latest.return_value = {}
+        return m
+
+    @pytest.fixture()
+    def clock(self) -> MagicMock:
+        m = create_autospec(SystemClock, instance=True)
+        m.now.side_effect = [_T0 + timedelta(seconds=i * 90) for i in range(10)]
+        return m
+
+    @pytest.fixture()
+    def metrics(self) -> Metrics:
+        return Metrics(registry=CollectorRegistry())
+
+    @pytest.fixture()
+    def subject(self, history: MagicMock, runner: MagicMock, restores: MagicMock, clock: MagicMock,
+                metrics: Metrics) -> Restorer:
+        secrets = MagicMock(spec=SecretReader)
+        secrets.read.return_value = "pw"
+        return Restorer(
+            bowl_factory=BowlStorage, secrets=secrets, runner=runner, history=history,
+            restores=restores, clock=clock, metrics=metrics,
+            events=create_autospec(EventBroker, instance=True), targets={Engine.POSTGRES: _TARGET},
+        )
+
+    async def test_verify_restores_into_the_scratch_database(
+            self, subject: Restorer, runner: MagicMock, restores: MagicMock, dump: Path, metrics: Metrics) -> None:
+        rec = await subject.verify(DumpJobFactory.build(jobs=4))
+        assert rec is not None and rec.outcome is MovementOutcome.CLEAN and rec.test
+        assert rec.target == "verify-pg:5432/fiber_verify_kenku_pg"
+        args = runner.run.call_args
+        assert args.args[1:5] == (_TARGET, "fiber_verify_kenku_pg", "pw", str(dump))
+        assert args.args[0].jobs == 4  # the file is on disk, so pg_restore -j can read it
+        assert b"".join(args.kwargs["chunks"]()) == b"PGDMP" * 10
+        restores.record.assert_called_once_with(rec)
+        assert metrics.registry.get_sample_value("fiber_restore_rto_seconds", {"db": "kenku-pg"}) == 90.0
+        assert subject.latest()["kenku-pg"] is rec
+
+    async def test_verify_skips_engines_without_a_target(self, subject: Restorer, runner: MagicMock) -> None:
+        assert await subject.verify(DumpJobFactory.build(engine=Engine.MYSQL)) is None
+        assert subject.start_verify(DumpJobFactory.build(engine=Engine.MYSQL)) is False
+        runner.run.assert_not_called()
+
+    async def test_nothing_to_restore_without_a_clean_dump(
+            self, subject: Restorer, history: MagicMock, runner: MagicMock) -> None:
+        history.latest_clean.return_value = None
+        assert await subject.verify(DumpJobFactory.build()) is None
+        runner.run.assert_not_called()
+        assert "kenku-pg" in await subject.rotation()  # still rotated past, so it isn't retried every tick
+
+    async def test_dump_missing_from_disk_streams_serially(
+            self, subject: Restorer, runner: MagicMock, dump: Path) -> None:
+        dump.unlink()
+        await subject.verify(DumpJobFactory.build(jobs=4))
+        assert runner.run.call_args.args[0].jobs == 1
+
+    async def test_failed_restore_is_clogged_and_leaves_rto_alone(
+            self, subject: Restorer, runner: MagicMock, metrics: Metrics) -> None:
+        runner.run.return_value = RunOutcome(1, "relation exists", False)
+        rec = await subject.verify(DumpJobFactory.build())
+        assert rec is not None and rec.outcome is MovementOutcome.CLOGGED
+        assert metrics.registry.get_sample_value("fiber_restore_rto_seconds", {"db": "kenku-pg"}) is None
+        assert metrics.registry.get_sample_value(
+            "fiber_restores_total", {"db": "kenku-pg", "status": "clogged", "kind": "test"}) == 1.0
+
+    async def test_progress_is_visible_while_running(self, subject: Restorer, runner: MagicMock) -> None:
+        seen: list[RestoreProgress | None] = []
+
+        async def run(*args: object, on_progress, **kwargs: object) -> RunOutcome:
+            on_progress(20)
+            seen.append(subject.progress("kenku-pg"))
+            return RunOutcome(0, "", False, bytes_written=50)
+
+        runner.run.side_effect = run
+        await subject.verify(DumpJobFactory.build())
+        assert seen == [RestoreProgress(started_at=_T0 + timedelta(seconds=90), bytes_done=20, bytes_total=50)]
+        assert subject.progress("kenku-pg") is None
+
+    async def test_concurrent_restores_of_one_service_run_once(
+            self, subject: Restorer, runner: MagicMock) -> None:
+        async def run(*args: object, **kwargs: object) -> RunOutcome:
+            await asyncio.sleep(0.05)
+            return RunOutcome(0, "", False, bytes_written=50)
+
+        runner.run.side_effect = run
+        job = DumpJobFactory.build()
+        results = await asyncio.gather(subject.verify(job), subject.restore(job, _TARGET, "kenku_copy"))
+        assert runner.run.call_count == 1
+        assert sum(r is not None for r in results) == 1
+        assert subject.progress("kenku-pg") is None
+
+    async def test_rotation_loads_test_restores_once(self, subject: Restorer, restores: MagicMock) -> None:
+        prior = RestoreRecord(service="a", engine=Engine.POSTGRES, dump_path="/x", target="t",
+                              started_at=_T0, finished_at=_T0, outcome=MovementOutcome.CLEAN,
+                              bytes_read=1, test=True)
+        restores.latest.return_value = {"a": prior}
+        assert await subject.rotation() == {"a": _T0}
+        await subject.rotation()
+        restores.latest.assert_called_once_with(test=True)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from unittest.mock import create_autospec
+
+import pytest
+from fastapi.templating import Jinja2Templates
+
+from fiber.clients.events import EventBroker
+from fiber.domain.status import DBStatus
+from fiber.domain.view import CardVM, Counts, DashboardVM
+from fiber.services.dashboard import DashboardService
+from fiber.services.wall_feed import WallFeed
+
+
+def _card(service: str, progress: str | None = None) -> CardVM:
+    return CardVM(
+        service=service, engine="postgres", status=DBStatus.CLEAN, last_rel="4h ago",
+        size="100 MB", next_run="in 18h", bristol=4, writes_to="/backups", error=None,
+        progress=progress,
+    )
+
+
+def _vm(*cards: CardVM) -> DashboardVM:
+    return DashboardVM(
+        cards=list(cards), counts=Counts.from_cards(list(cards)), discovery=[],
+        bowl_path="/backups", bowl_used="1 GB", bowl_free="9 GB",
+    )
+
+
+class TestWallFeed:
+    @pytest.fixture()
+    def templates(self, tmp_path) -> Jinja2Templates:
+        (tmp_path / "_summary.html").write_text("{{ vm.cards | length }} on the wall")
+        (tmp_path / "_tile.html").write_text("<div id='tile-{{ c.service }}'>{{ c.progress }}</div>")
+        return Jinja2Templates(directory=str(tmp_path))
+
+    @pytest.fixture()
+    def dashboard(self):
+        m = create_autospec(DashboardService, instance=True)
+        m.build.return_value = _vm(_card("immich"), _card("forgejo"))
+        return m
+
+    @pytest.fixture()
+    def broker(self) -> EventBroker:
+        return EventBroker()
+
+    @pytest.fixture()
+    def subject(self, dashboard, broker: EventBroker, templates: Jinja2Templates) -> WallFeed:
+        return WallFeed(dashboard=dashboard, broker=broker, templates=templates, tick=60.0)
+
+    def test_first_refresh_sends_summary_only(self, subject: WallFeed) -> None:
+        [(key, message)] = subject.refresh()
+        assert key == "summary"
+        assert json.loads(message) == {"type": "summary", "html": "2 on the wall"}
+
+    def test_unchanged_wall_sends_nothing(self, subject: WallFeed) -> None:
+        subject.refresh()
+        assert subject.refresh() == []
+
+    def test_only_changed_tiles_are_rendered(self, subject: WallFeed, dashboard) -> None:
+        subject.refresh()
+        dashboard.build.return_value = _vm(_card("immich", progress="1 GB · 0:12"), _card("forgejo"))
+        [(key, message)] = subject.refresh()
+        assert key == "tile:immich"
+        assert json.loads(message) == {
+            "type": "tile", "service": "immich", "html": "<div id='tile-immich'>1 GB · 0:12</div>"}
+
+    def test_summary_resent_when_it_changes(self, subject: WallFeed, dashboard) -> None:
+        subject.refresh()
+        dashboard.build.return_value = _vm(_card("immich"))
+        messages = dict(subject.refresh())
+        assert json.loads(messages["summary"])["type"] == "summary"
+
+    def test_departed_service_is_removed(self, subject: WallFeed, dashboard) -> None:
+        subject.refresh()
+        dashboard.build.return_value = _vm(_card("immich"))
+        messages = dict(subject.refresh())
+        assert json.loads(messages["tile:forgejo"]) == {"type": "remove", "service": "forgejo"}
+
+    async def test_state_is_only_written_on_the_loop(self, dashboard, broker: EventBroker,
+                                                     templates: Jinja2Templates) -> None:
+        writers: set[int] = set()
+
+        class Recorded(WallFeed):
+            def __setattr__(self, name: str, value: object) -> None:
+                if name in ("_summary", "_cards"):
+                    writers.add(threading.get_ident())
+                super().__setattr__(name, value)
+
+        subject = Recorded(dashboard=dashboard, broker=broker, templates=templates, tick=0.01)
+        q = subject.subscribe()
+        await asyncio.wait_for(q.get(), 1)
+        subject.unsubscribe(q)
+        assert writers == {threading.get_ident()}
+
+    async def test_one_build_fans_out_to_every_subscriber(
+        self, subject: WallFeed, dashboard, broker: EventBroker
+    ) -> None:
+        first, second = subject.subscribe(), subject.subscribe()
+        await asyncio.sleep(0)  # let the producer subscribe to the broker
+        await broker.publish("immich")
+        a = await asyncio.wait_for(first.get(), 1)
+        b = await asyncio.wait_for(second.get(), 1)
+        assert a == b
+        assert dashboard.build.call_count == 1
+        subject.unsubscribe(first)
+        subject.unsubscribe(second)
+
+    async def test_signal_burst_costs_one_build(self, subject: WallFeed, dashboard, broker: EventBroker) -> None:
+        q = subject.subscribe()
+        await asyncio.sleep(0)
+        for _ in range(5):
+            await broker.publish("immich")
+        await asyncio.wait_for(q.get(), 1)
+        await asyncio.sleep(0)
+        assert dashboard.build.call_count == 1
+        subject.unsubscribe(q)
+
+    async def test_late_subscriber_gets_current_summary(self, subject: WallFeed, broker: EventBroker) -> None:
+        first = subject.subscribe()
+        await asyncio.sleep(0)
+        await broker.publish("immich")
+        summary = await asyncio.wait_for(first.get(), 1)
+        late = subject.subscribe()
+        assert late.get_nowait() == summary
+        subject.unsubscribe(first)
+        subject.unsubscribe(late)
+
+    async def test_producer_stops_with_last_subscriber(self, subject: WallFeed, broker: EventBroker) -> None:
+        q = subject.subscribe()
+        await asyncio.sleep(0)
+        assert len(broker.subscribers) == 1
+        subject.unsubscribe(q)
+        await asyncio.sleep(0.01)
+        assert broker.subscribers == set()
+
+    async def test_refresh_errors_do_not_kill_the_producer(
+        self, dashboard, broker: EventBroker, templates: Jinja2Templates
+    ) -> None:
+        dashboard.build.side_effect = [RuntimeError("database is locked"), _vm(_card("immich"))]
+        subject = WallFeed(dashboard=dashboard, broker=broker, templates=templates, tick=0.01)
+        q = subject.subscribe()
+        message = await asyncio.wait_for(q.get(), 1)
+        assert json.loads(message)["type"] == "summary"
+        subject.unsubscribe(q)
+
+    async def test_slow_wall_keeps_only_newest_tile(self, subject: WallFeed, dashboard) -> None:
+        q = subject.subscribe()
+        subject.refresh()
+        for progress in ("1 GB · 0:02", "2 GB · 0:04", "3 GB · 0:06"):
+            dashboard.build.return_value = _vm(_card("immich", progress=progress), _card("forgejo"))
+            for key, message in subject.refresh():
+                q.put(key, message)
+        assert q.qsize() == 1
+        assert "3 GB" in json.loads(q.get_nowait())["html"]
+        subject.unsubscribe(q)
@@ -5,6 +5,7 @@ import asyncio
 import pytest
 
 from fiber.services.worker_pool import WorkerPool
+from tests.factories import DumpJobFactory
 
 
 class TestWorkerPool:
@@ -66,3 +67,95 @@ class TestWorkerPool:
 
     def test_running_services_empty_initially(self, subject: WorkerPool) -> None:
         assert subject.running_services() == set()
+
+
+class _Tracker:
+    """Work factory that records the peak number of concurrent runs per label."""
+
+    def __init__(self) -> None:
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.gate = asyncio.Event()
+
+    def work(self, label: str):
+        async def run() -> None:
+            self.active[label] = self.active.get(label, 0) + 1
+            self.peak[label] = max(self.peak.get(label, 0), self.active[label])
+            await self.gate.wait()
+            self.active[label] -= 1
+        return run
+
+
+class TestWorkerPoolResources:
+    async def test_limits_movements_per_host(self) -> None:
+        pool = WorkerPool(max_concurrent=4, max_per_host=1)
+        t = _Tracker()
+        jobs = [DumpJobFactory.build(service=f"db{i}", host="pg-main" if i < 2 else f"pg{i}", port=5432)
+                for i in range(4)]
+        tasks = [pool.submit(j.service, t.work(j.host), job=j) for j in jobs]
+        await asyncio.sleep(0.01)
+        assert t.peak == {"pg-main": 1, "pg2": 1, "pg3": 1}
+        t.gate.set()
+        await asyncio.gather(*tasks)
+        assert t.peak["pg-main"] == 1
+        assert pool.running_services() == set()
+
+    async def test_limits_movements_per_volume(self) -> None:
+        pool = WorkerPool(max_concurrent=4, max_per_volume=1, default_volume="/backups")
+        t = _Tracker()
+        jobs = [DumpJobFactory.build(service=f"db{i}", host=f"pg{i}", path=p)
+                for i, p in enumerate([None, None, "/mnt/fast"])]
+        tasks = [pool.submit(j.service, t.work(j.path or "/backups"), job=j) for j in jobs]
+        await asyncio.sleep(0.01)
+        assert t.active == {"/backups": 1, "/mnt/fast": 1}
+        t.gate.set()
+        await asyncio.gather(*tasks)
+
+    async def test_weight_takes_several_global_slots(self) -> None:
+        pool = WorkerPool(max_concurrent=3)
+        t = _Tracker()
+        heavy = DumpJobFactory.build(service="heavy", host="a", weight=2)
+        light = [DumpJobFactory.build(service=f"l{i}", host=f"h{i}") for i in range(2)]
+        tasks = [pool.submit("heavy", t.work("all"), job=heavy)]
+        tasks += [pool.submit(j.service, t.work("all"), job=j) for j in light]
+        await asyncio.sleep(0.01)
+        assert t.active["all"] == 2  # heavy (2 slots) + one light
+        t.gate.set()
+        await asyncio.gather(*tasks)
+
+    async def test_weight_above_limit_still_runs_alone(self) -> None:
+        pool = WorkerPool(max_concurrent=2)
+        heavy = DumpJobFactory.build(weight=5)
+        task = pool.submit(heavy.service, lambda: asyncio.sleep(0, result="done"), job=heavy)
+        assert await task == "done"
+
+    async def test_busy_host_does_not_block_other_hosts(self) -> None:
+        pool = WorkerPool(max_concurrent=2, max_per_host=1)
+        t = _Tracker()
+        a1, a2, b = (DumpJobFactory.build(service=s, host=h) for s, h in
+                     [("a1", "pg-a"), ("a2", "pg-a"), ("b", "pg-b")])
+        tasks = [pool.submit(j.service, t.work(j.host), job=j) for j in (a1, a2, b)]
+        await asyncio.sleep(0.01)
+        assert t.active == {"pg-a": 1, "pg-b": 1}
+        t.gate.set()
+        await asyncio.gather(*tasks)
+
+    async def test_cancel_while_waiting_frees_the_service(self) -> None:
+        pool = WorkerPool(max_concurrent=1)
+        gate = asyncio.Event()
+        first = pool.submit("a", gate.wait)
+        waiting = pool.submit("b", gate.wait)
+        await asyncio.sleep(0)
+        assert pool.cancel("b") is True
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert pool.running_services() == {"a"}
+        gate.set()
+        await first
+
+    def test_capacity_is_the_global_limit(self) -> None:
+        assert WorkerPool(max_concurrent=3, max_per_host=1).capacity == 3
+
+    def test_global_limit_cannot_be_unbounded(self) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            WorkerPool(max_concurrent=0)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, create_autospec
 
@@ -8,15 +10,22 @@ import pytest
 from prometheus_client import CollectorRegistry
 
 from fiber.platform.clock import SystemClock
+from fiber.platform.executors import Executors
 from fiber.repositories.history import HistoryRepository
+from fiber.repositories.last_success import LastSuccessCache
 from fiber.platform.metrics import Metrics
-from fiber.clients.discovery import DiscoveryProvider
+from fiber.clients.discovery import DiscoveryProvider, EventDrivenDiscovery
 from fiber.clients.probe import ConnectivityProbe, ProbeResult
 from fiber.services.registry_state import RegistryState
 from fiber.services.worker_pool import WorkerPool
 from tests.factories import DumpJobFactory
 
 
+def _probing(result: ProbeResult):
+    """check_many stand-in answering ``result`` for every job."""
+    return lambda jobs: {j.service: result for j in jobs}
+
+
 def _base_mocks() -> tuple[MagicMock, MagicMock, MagicMock, MagicMock, Metrics, asyncio.Event, RegistryState, AsyncMock]:
     swarm = MagicMock(spec=DiscoveryProvider)
     swarm.list_dump_services.return_value = {
@@ -30,11 +39,14 @@ def _base_mocks() -> tuple[MagicMock, MagicMock, MagicMock, MagicMock, Metrics,
             "fiber.secret": "s",
         }
     }
-    history = MagicMock(spec=HistoryRepository)
-    history.last_success.return_value = None
-    history.median_bytes.return_value = None
+    last_success = MagicMock(spec=LastSuccessCache)
+    last_success.durations.return_value = {}
+    last_success.get.return_value = None
+    last_success.get_many.side_effect = lambda services: {s: last_success.get(s) for s in services}
 
     pool = MagicMock(spec=WorkerPool)
+
+    pool.capacity = 2
     pool.running_services.return_value = set()
 
     clock = create_autospec(SystemClock, instance=True)
@@ -48,21 +60,21 @@ def _base_mocks() -> tuple[MagicMock, MagicMock, MagicMock, MagicMock, Metrics,
     registry_state = RegistryState()
 
     probe = AsyncMock(spec=ConnectivityProbe)
-    probe.check.return_value = ProbeResult(ok=True, detail="")
+    probe.check_many.side_effect = _probing(ProbeResult(ok=True, detail=""))
 
-    return swarm, history, pool, clock, metrics, stop, registry_state, probe
+    return swarm, last_success, pool, clock, metrics, stop, registry_state, probe
 
 
 async def test_skipped_overlap_incremented_when_pool_returns_none() -> None:
     """When pool.submit returns None (already running), skipped_overlap counter must be incremented."""
-    swarm, history, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
     pool.submit.return_value = None  # signals overlap
     orchestrator = AsyncMock()
 
     from fiber.loop import _scan_loop_inner
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -80,14 +92,14 @@ async def test_skipped_overlap_incremented_when_pool_returns_none() -> None:
 
 async def test_job_enqueued_when_pool_submit_returns_task() -> None:
     """When pool.submit returns a task (not None), the job is enqueued (else branch covered)."""
-    swarm, history, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
     pool.submit.return_value = asyncio.create_task(asyncio.sleep(0))  # non-None task
     orchestrator = AsyncMock()
 
     from fiber.loop import _scan_loop_inner
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -109,8 +121,11 @@ async def test_misconfigured_service_logs_warning() -> None:
     swarm.list_dump_services.return_value = {
         "bad-svc": {"fiber.enable": "true"}  # missing host, port, user, dbname, secret
     }
-    history = MagicMock(spec=HistoryRepository)
+    last_success = MagicMock(spec=LastSuccessCache)
+    last_success.durations.return_value = {}
+    last_success.get_many.return_value = {}
     pool = MagicMock(spec=WorkerPool)
+    pool.capacity = 2
     pool.running_services.return_value = set()
     clock = create_autospec(SystemClock, instance=True)
     clock.now.return_value = datetime(2026, 6, 16, 4, tzinfo=timezone.utc)
@@ -120,13 +135,13 @@ async def test_misconfigured_service_logs_warning() -> None:
     orchestrator = AsyncMock()
     registry_state = RegistryState()
     probe = AsyncMock(spec=ConnectivityProbe)
-    probe.check.return_value = ProbeResult(ok=True, detail="")
+    probe.check_many.side_effect = _probing(ProbeResult(ok=True, detail=""))
 
     from fiber.loop import _scan_loop_inner
     # Should not raise; warning is logged
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -139,9 +154,29 @@ async def test_misconfigured_service_logs_warning() -> None:
     )
 
 
+async def test_due_batch_starts_longest_first_and_predicts_finish() -> None:
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    labels = {"fiber.enable": "true", "fiber.user": "k", "fiber.dbname": "k", "fiber.secret": "s"}
+    swarm.list_dump_services.return_value = {"quick": labels, "slow": labels, "mid": labels}
+    last_success.durations.return_value = {"quick": 60.0, "slow": 3600.0, "mid": 600.0}
+    pool.submit.return_value = None
+    orchestrator = AsyncMock()
+
+    from fiber.loop import _scan_loop_inner
+    await _scan_loop_inner(
+        discovery=swarm, last_success=last_success, pool=pool, orchestrator=orchestrator,
+        clock=clock, metrics=metrics, stop=stop, interval=0, registry_state=registry_state,
+        active_provider="swarm", probe=probe,
+    )
+
+    assert [c.args[0] for c in pool.submit.call_args_list] == ["slow", "mid", "quick"]
+    finish = metrics.registry.get_sample_value("fiber_batch_predicted_finish_timestamp")
+    assert finish == clock.now.return_value.timestamp() + 3600.0
+
+
 async def test_scan_loop_updates_registry_state_with_snapshot() -> None:
     """After one scan iteration, registry_state holds the discovered jobs and skipped services."""
-    swarm, history, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
     # Add an unenrolled service to be skipped
     swarm.list_dump_services.return_value = {
         "kenku-pg": {
@@ -161,7 +196,7 @@ async def test_scan_loop_updates_registry_state_with_snapshot() -> None:
     from fiber.loop import _scan_loop_inner
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -182,14 +217,14 @@ async def test_scan_loop_updates_registry_state_with_snapshot() -> None:
 
 async def test_scan_loop_sets_scanned_at_on_success() -> None:
     """After a successful scan, snapshot.scanned_at is set to a non-None datetime."""
-    swarm, history, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
     pool.submit.return_value = None
     orchestrator = AsyncMock()
 
     from fiber.loop import _scan_loop_inner
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -215,7 +250,7 @@ async def test_scan_loop_preserves_jobs_on_swarm_error() -> None:
     # First, seed the registry_state with a known good snapshot
     from fiber.services.registry_state import Snapshot
     from fiber.domain.models import DumpJob
-    swarm, history, pool, clock, metrics, _, registry_state, probe = _base_mocks()
+    swarm, last_success, pool, clock, metrics, _, registry_state, probe = _base_mocks()
 
     # Pre-seed registry with one job and a scanned_at
     good_job = DumpJobFactory.build(service="kenku-pg")
@@ -236,7 +271,7 @@ async def test_scan_loop_preserves_jobs_on_swarm_error() -> None:
 
     await _scan_loop_inner(
         discovery=swarm,
-        history=history,
+        last_success=last_success,
         pool=pool,
         orchestrator=orchestrator,
         clock=clock,
@@ -260,14 +295,14 @@ async def test_scan_loop_preserves_jobs_on_swarm_error() -> None:
 
 async def test_skips_and_counts_when_probe_not_ready() -> None:
     """When probe reports not-ready, pool.submit must not be called and skipped_not_ready is incremented."""
-    swarm, history, pool, clock, metrics, stop, registry_state, _ = _base_mocks()
+    swarm, last_success, pool, clock, metrics, stop, registry_state, _ = _base_mocks()
     orchestrator = AsyncMock()
     probe = AsyncMock(spec=ConnectivityProbe)
-    probe.check.return_value = ProbeResult(ok=False, detail="no response")
+    probe.check_many.side_effect = _probing(ProbeResult(ok=False, detail="no response"))
 
     from fiber.loop import _scan_loop_inner
     await _scan_loop_inner(
-        discovery=swarm, history=history, pool=pool, orchestrator=orchestrator,
+        discovery=swarm, last_success=last_success, pool=pool, orchestrator=orchestrator,
         clock=clock, metrics=metrics, stop=stop, interval=0,
         registry_state=registry_state, active_provider="swarm", probe=probe,
     )
@@ -286,9 +321,12 @@ async def test_scan_loop_runs_until_stop_is_set() -> None:
     c = Container()
     swarm_mock = MagicMock(spec=DiscoveryProvider)
     swarm_mock.list_dump_services.return_value = {}
-    history_mock = MagicMock(spec=HistoryRepository)
-    history_mock.last_success.return_value = None
+    last_success_mock = MagicMock(spec=LastSuccessCache)
+    last_success_mock.durations.return_value = {}
+    last_success_mock.get.return_value = None
+    last_success_mock.get_many.side_effect = lambda services: {s: last_success_mock.get(s) for s in services}
     pool_mock = MagicMock(spec=WorkerPool)
+    pool_mock.capacity = 2
     pool_mock.running_services.return_value = set()
     orchestrator_mock = AsyncMock()
     clock_mock = create_autospec(SystemClock, instance=True)
@@ -296,16 +334,18 @@ async def test_scan_loop_runs_until_stop_is_set() -> None:
     metrics_instance = Metrics(registry=CollectorRegistry())
     config_mock = MagicMock()
     config_mock.scan_interval = 0
+    config_mock.discovery_mode = "poll"
     registry_state_instance = RegistryState()
 
     c.discovery.override(swarm_mock)
-    c.history_repository.override(history_mock)
+    c.last_success.override(last_success_mock)
     c.pool.override(pool_mock)
     c.orchestrator.override(orchestrator_mock)
     c.clock.override(clock_mock)
     c.metrics.override(metrics_instance)
     c.config.override(config_mock)
     c.registry_state.override(registry_state_instance)
+    c.executors.override(Executors(disk_workers=1, net_workers=1))
 
     c.wire(modules=["fiber.loop"])
 
@@ -319,3 +359,239 @@ async def test_scan_loop_runs_until_stop_is_set() -> None:
         await asyncio.gather(_scan_loop(stop), set_stop_soon())
     finally:
         c.unwire()
+
+
+async def _housekeeping(bowl: MagicMock, history: MagicMock | None = None, stopped: bool = False) -> MagicMock:
+    from fiber.loop import _housekeeping_loop_inner
+
+    history = history or create_autospec(HistoryRepository, instance=True)
+    clock = create_autospec(SystemClock, instance=True)
+    clock.now.return_value = datetime(2026, 6, 16, 4, tzinfo=timezone.utc)
+    stop = asyncio.Event()
+    if stopped:
+        stop.set()
+    await _housekeeping_loop_inner(bowl=bowl, history=history, clock=clock, stop=stop,
+                                   interval=0, retention_days=30)
+    return history
+
+
+async def test_housekeeping_reconciles_bowl_after_interval() -> None:
+    from fiber.clients.bowl import BowlStorage
+
+    bowl = MagicMock(spec=BowlStorage)
+    await _housekeeping(bowl)
+    bowl.reconcile.assert_called_once()
+
+
+async def test_housekeeping_skips_work_once_stopped() -> None:
+    from fiber.clients.bowl import BowlStorage
+
+    bowl = MagicMock(spec=BowlStorage)
+    history = await _housekeeping(bowl, stopped=True)
+    bowl.reconcile.assert_not_called()
+    history.compact.assert_not_called()
+
+
+async def test_housekeeping_survives_reconcile_errors() -> None:
+    from fiber.clients.bowl import BowlStorage
+
+    bowl = MagicMock(spec=BowlStorage)
+    bowl.reconcile.side_effect = OSError("bowl unmounted")
+    history = await _housekeeping(bowl)
+    history.compact.assert_called_once()
+
+
+async def test_housekeeping_compacts_history_older_than_retention() -> None:
+    from fiber.clients.bowl import BowlStorage
+
+    history = create_autospec(HistoryRepository, instance=True)
+    history.compact.return_value = 12
+    await _housekeeping(MagicMock(spec=BowlStorage), history)
+    history.compact.assert_called_once_with(datetime(2026, 5, 17, 4, tzinfo=timezone.utc))
+
+
+async def test_housekeeping_survives_compaction_errors() -> None:
+    from fiber.clients.bowl import BowlStorage
+
+    history = create_autospec(HistoryRepository, instance=True)
+    history.compact.side_effect = RuntimeError("database is locked")
+    await _housekeeping(MagicMock(spec=BowlStorage), history)
+
+
+async def test_discovery_change_cuts_the_scan_pause_short() -> None:
+    from fiber.loop import _pause
+
+    stop, changed = asyncio.Event(), asyncio.Event()
+    asyncio.get_running_loop().call_later(0.01, changed.set)
+    await asyncio.wait_for(_pause(stop, 3600, changed), timeout=1)
+
+
+async def test_scan_sleeps_until_the_next_fire() -> None:
+    from fiber.domain.schedule import FireHeap
+    from fiber.loop import _scan_loop_inner, _sleep_for
+
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm.list_dump_services.return_value["kenku-pg"]["fiber.schedule"] = "5 4 * * *"
+    last_success.get.return_value = datetime(2026, 6, 16, 3, 5, tzinfo=timezone.utc)
+    timers = FireHeap()
+    await _scan_loop_inner(
+        discovery=swarm, last_success=last_success, pool=pool, orchestrator=AsyncMock(),
+        clock=clock, metrics=metrics, stop=stop, interval=0,
+        registry_state=registry_state, active_provider="swarm", probe=probe, timers=timers,
+    )
+    pool.submit.assert_not_called()
+    assert _sleep_for(timers, clock, cap=3600) == 5 * 60 + 1.0
+    assert _sleep_for(timers, clock, cap=60) == 60
+
+
+@pytest.mark.parametrize(("idle", "expected"), [(None, 60), (900, 5 * 60 + 1.0)])
+async def test_only_polling_caps_the_pause_at_the_scan_interval(
+        monkeypatch, idle: float | None, expected: float) -> None:
+    import fiber.loop
+    from fiber.domain.schedule import FireHeap
+    from fiber.loop import _scan_loop_inner
+
+    pauses: list[float] = []
+
+    async def pause(stop: asyncio.Event, timeout: float, changed: asyncio.Event | None) -> None:
+        pauses.append(timeout)
+
+    monkeypatch.setattr(fiber.loop, "_pause", pause)
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    swarm.list_dump_services.return_value["kenku-pg"]["fiber.schedule"] = "5 4 * * *"
+    last_success.get.return_value = datetime(2026, 6, 16, 3, 5, tzinfo=timezone.utc)
+    await _scan_loop_inner(
+        discovery=swarm, last_success=last_success, pool=pool, orchestrator=AsyncMock(),
+        clock=clock, metrics=metrics, stop=stop, interval=60,
+        registry_state=registry_state, active_provider="swarm", probe=probe, timers=FireHeap(), idle=idle,
+    )
+    assert pauses == [expected]
+
+
+async def test_not_ready_job_is_held_for_an_interval() -> None:
+    from fiber.domain.schedule import FireHeap
+    from fiber.loop import _scan_loop_inner
+
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    probe.check_many.side_effect = _probing(ProbeResult(ok=False, detail="starting"))
+    timers = FireHeap()
+    for _ in range(2):
+        await _scan_loop_inner(
+            discovery=swarm, last_success=last_success, pool=pool, orchestrator=AsyncMock(),
+            clock=clock, metrics=metrics, stop=stop, interval=60,
+            registry_state=registry_state, active_provider="swarm", probe=probe, timers=timers,
+        )
+    assert [len(c.args[0]) for c in probe.check_many.call_args_list] == [1, 0]
+    assert timers.held(clock.now()) == {"kenku-pg"}
+
+
+async def test_finished_movement_replans_and_holds_the_job() -> None:
+    from fiber.domain.schedule import FireHeap
+    from fiber.loop import _scan_loop_inner
+
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    task = asyncio.create_task(asyncio.sleep(0))
+    pool.submit.return_value = task
+    changed, timers = asyncio.Event(), FireHeap()
+    await _scan_loop_inner(
+        discovery=swarm, last_success=last_success, pool=pool, orchestrator=AsyncMock(),
+        clock=clock, metrics=metrics, stop=stop, interval=60,
+        registry_state=registry_state, active_provider="swarm", probe=probe,
+        changed=changed, timers=timers,
+    )
+    await task
+    await asyncio.sleep(0)
+    assert changed.is_set()
+    assert timers.held(clock.now()) == {"kenku-pg"}
+
+
+async def test_discovery_watch_survives_stream_failures() -> None:
+    from fiber.loop import _discovery_watch_inner
+
+    discovery = AsyncMock(spec=EventDrivenDiscovery)
+    discovery.watch.side_effect = ConnectionError("docker went away")
+    changed, stop = asyncio.Event(), asyncio.Event()
+    await _discovery_watch_inner(discovery=discovery, changed=changed, stop=stop, retry=0)
+    discovery.watch.assert_awaited_once_with(changed.set)
+
+
+async def test_lag_monitor_records_how_late_the_loop_woke() -> None:
+    from fiber.loop import _lag_monitor_inner
+
+    metrics = Metrics(registry=CollectorRegistry())
+    asyncio.get_running_loop().call_soon(time.sleep, 0.05)  # a blocking call on the loop
+    await _lag_monitor_inner(metrics=metrics, stop=asyncio.Event(), interval=0.01)
+    assert metrics.registry.get_sample_value("fiber_event_loop_lag_seconds") >= 0.03
+
+
+async def _verify(restorer: MagicMock, jobs: list) -> None:
+    from fiber.loop import _verify_loop_inner
+    from fiber.services.registry_state import Snapshot
+
+    registry_state = RegistryState()
+    registry_state.set(Snapshot(jobs=jobs))
+    await _verify_loop_inner(restorer=restorer, registry_state=registry_state, stop=asyncio.Event(),
+                             interval=0)
+
+
+async def test_verify_loop_restores_the_least_recently_verified_job() -> None:
+    from fiber.services.restorer import Restorer
+
+    a, b = DumpJobFactory.build(service="a"), DumpJobFactory.build(service="b")
+    restorer = create_autospec(Restorer, instance=True)
+    restorer.verifiable.side_effect = lambda jobs: jobs
+    restorer.rotation.return_value = {"a": datetime(2026, 6, 16, tzinfo=timezone.utc),
+                                      "b": datetime(2026, 6, 15, tzinfo=timezone.utc)}
+    restorer.verify.return_value = None
+    await _verify(restorer, [a, b])
+    restorer.verify.assert_awaited_once_with(b)
+
+
+async def test_verify_loop_survives_restore_errors_and_idles_without_targets() -> None:
+    from fiber.services.restorer import Restorer
+
+    restorer = create_autospec(Restorer, instance=True)
+    restorer.verifiable.return_value = []
+    restorer.rotation.return_value = {}
+    await _verify(restorer, [DumpJobFactory.build()])
+    restorer.verify.assert_not_awaited()
+
+    restorer.verifiable.return_value = [DumpJobFactory.build()]
+    restorer.verify.side_effect = OSError("bowl unmounted")
+    await _verify(restorer, [DumpJobFactory.build()])
+
+
+async def test_replication_loop_runs_the_replicator_until_stopped() -> None:
+    from fiber.loop import _replication_loop
+    from fiber.services.replicator import Replicator
+
+    replicator = create_autospec(Replicator, instance=True)
+    stop = asyncio.Event()
+    await _replication_loop(stop, replicator=replicator)
+    replicator.run.assert_awaited_once_with(stop)
+
+
+async def test_scan_reads_last_success_off_the_event_loop() -> None:
+    from fiber.loop import _scan_loop_inner
+    from fiber.platform.executors import Executors
+
+    swarm, last_success, pool, clock, metrics, stop, registry_state, probe = _base_mocks()
+    loop_thread = threading.get_ident()
+    threads: list[int] = []
+
+    def get_many(services: list[str]) -> dict[str, datetime | None]:
+        threads.append(threading.get_ident())
+        return dict.fromkeys(services)
+
+    last_success.get_many.side_effect = get_many
+    executors = Executors(disk_workers=1, net_workers=1, db_workers=1)
+    try:
+        await _scan_loop_inner(
+            discovery=swarm, last_success=last_success, pool=pool, orchestrator=AsyncMock(),
+            clock=clock, metrics=metrics, stop=stop, interval=0,
+            registry_state=registry_state, active_provider="swarm", probe=probe, executors=executors,
+        )
+    finally:
+        executors.shutdown()
+    assert threads and loop_thread not in threads
+    last_success.get.assert_not_called()
@@ -11,6 +11,7 @@ from fiber.platform.config import Config
 from fiber.container import Container
 from fiber.main import create_app
 from fiber.platform.metrics import Metrics
+from fiber.repositories.history import HistoryRepository
 from fiber.services.registry_state import RegistryState
 
 
@@ -20,10 +21,40 @@ def _make_container(scan_enabled: bool = True) -> Container:
     mock_config = MagicMock(spec=Config)
     mock_config.scan_enabled = scan_enabled
     mock_config.scan_interval = 0.0
+    mock_config.housekeeping_interval = 3600.0
+    mock_config.history_retention_days = 90
     mock_config.bowl_path = "/tmp/test-bowl"
+    mock_config.bowl_backend = "plain"
     mock_config.max_concurrent = 1
+    mock_config.max_per_host = 0
+    mock_config.max_per_volume = 0
+    mock_config.probe_timeout = 5.0
+    mock_config.probe_ttl = 15.0
+    mock_config.probe_mode = "process"
+    mock_config.discovery_mode = "poll"
+    mock_config.discovery_resync = 900.0
+    mock_config.disk_workers = 2
+    mock_config.net_workers = 2
+    mock_config.trace_path = ""
+    mock_config.restore_postgres = ""
+    mock_config.restore_mysql = ""
+    mock_config.restore_secret = "fiber-restore"
+    mock_config.verify_interval = 0
+    mock_config.replicas = ""
+    mock_config.replica_concurrency = 1
+    mock_config.replica_parallel = 4
+    mock_config.replica_part_mb = 16
+    mock_config.s3_endpoint = "http://localhost:9000"
+    mock_config.s3_region = "us-east-1"
+    mock_config.s3_access_key = ""
+    mock_config.s3_secret = "fiber-s3"
+    mock_config.db_readers = 2
+    mock_config.db_busy_timeout = 5.0
+    mock_config.trace_max_mb = 64
+    mock_config.secrets_dir = "/run/secrets"
     c.config.override(mock_config)
     c.metrics.override(Metrics(registry=CollectorRegistry()))
+    c.history_repository.override(MagicMock(spec=HistoryRepository))
     rs = RegistryState()
     c.registry_state.override(rs)
     return c
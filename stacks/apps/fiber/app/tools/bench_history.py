@@ -0,0 +1,164 @@
+"""Benchmark — dashboard reads against the history file while movements are recorded.
+
+Seeds a throwaway SQLite file with a few months of nightly history, then runs
+reader threads making the dashboard's queries (summaries() plus a card's recent())
+against a writer recording movements back to back (a commit each, as the
+orchestrator does) and compacting old days into rollups once a second, as
+housekeeping does. "idle" is the readers alone, for reference; "default" is a
+plain create_engine() on a rollback-journal file, as Fiber had before; "tuned" is
+fiber.db.database.Database (WAL, synchronous=NORMAL, busy timeout, pooled readers,
+one serialized writer). Reports read latency percentiles, reads that failed with
+"database is locked", and movements recorded per second. A read is a few ms of
+Python either way, so with several reader threads its latency is mostly time spent
+waiting for the GIL; read it next to writes/s, not on its own.
+
+    python -m tools.bench_history [--seconds 5] [--readers 4] [--services 40] [--dir /state]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine
+
+from fiber.db.database import Database
+from fiber.domain.models import Engine, MovementOutcome, MovementRecord
+from fiber.repositories.history import HistoryRepository
+
+START = datetime(2025, 1, 1, 3, tzinfo=timezone.utc)
+_DAY_MINUTES = 24 * 60
+_SEED_DAYS = 120
+
+
+def _rec(service: str, i: int) -> MovementRecord:
+    t = START + timedelta(minutes=i)
+    return MovementRecord(service=service, engine=Engine.POSTGRES, started_at=t, finished_at=t + timedelta(seconds=90),
+                          outcome=MovementOutcome.CLEAN if i % 7 else MovementOutcome.CLOGGED,
+                          bytes_written=200_000_000 + i, bristol_type=4, sample_path=None,
+                          receipt_path=f"/backups/{service}/{i}.dump.manifest.json",
+                          app_image=None, app_digest=None)
+
+
+def _default(path: Path) -> HistoryRepository:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @contextmanager
+    def session() -> Iterator[Session]:
+        with Session(engine) as s:
+            yield s
+
+    return HistoryRepository(session_factory=session)
+
+
+def _tuned(path: Path, readers: int) -> HistoryRepository:
+    db = Database(f"sqlite:///{path}", readers=readers)
+    return HistoryRepository(session_factory=db.session, read_session_factory=db.read_session)
+
+
+def _seed(path: Path, services: list[str], days: int) -> None:
+    """A history of ``days`` nightly movements per service, written without fsyncs."""
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+
+    @contextmanager
+    def session() -> Iterator[Session]:
+        with Session(engine) as s:
+            s.exec(text("PRAGMA synchronous=OFF"))  # type: ignore[call-overload]
+            yield s
+
+    seed = HistoryRepository(session_factory=session)
+    for day in range(days):
+        for service in services:
+            seed.record(_rec(service, day * _DAY_MINUTES))
+    engine.dispose()
+
+
+def _run(history: HistoryRepository, services: list[str], seconds: float, readers: int,
+         writer: bool = True) -> dict[str, float]:
+    stop = threading.Event()
+    latencies: list[float] = []
+    locked = 0
+    writes = 0
+    lock = threading.Lock()
+
+    def write() -> None:
+        # Movements finishing, plus housekeeping folding ten more days into rollups each second.
+        nonlocal writes
+        i, cutoff, compacted_at = 0, START, time.monotonic()
+        while not stop.is_set():
+            try:
+                history.record(_rec(services[i % len(services)], _SEED_DAYS * _DAY_MINUTES + i))
+                writes += 1
+                if time.monotonic() - compacted_at >= 1.0:
+                    cutoff += timedelta(days=10)
+                    history.compact(cutoff)
+                    compacted_at = time.monotonic()
+            except OperationalError:
+                pass
+            i += 1
+
+    def read() -> None:
+        nonlocal locked
+        n = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                history.summaries()
+                history.recent(services[n % len(services)], 5)
+            except OperationalError:
+                with lock:
+                    locked += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+            n += 1
+
+    threads = [threading.Thread(target=read) for _ in range(readers)]
+    if writer:
+        threads.append(threading.Thread(target=write))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {"reads": len(latencies), "p50_ms": q[49] * 1e3, "p95_ms": q[94] * 1e3, "p99_ms": q[98] * 1e3,
+            "max_ms": max(latencies, default=0.0) * 1e3, "locked": locked, "writes_per_s": writes / seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--services", type=int, default=40)
+    parser.add_argument("--dir", default=None, help="where to put the files; use the disk /state lives on")
+    args = parser.parse_args()
+    services = [f"svc-{i:02d}" for i in range(args.services)]
+    builds: list[tuple[str, Callable[[Path], HistoryRepository], bool]] = [
+        ("idle", lambda p: _tuned(p, args.readers), False),
+        ("default", _default, True),
+        ("tuned", lambda p: _tuned(p, args.readers), True),
+    ]
+    print(f"{'':8} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'locked':>7} {'writes/s':>9}")
+    for name, build, writer in builds:
+        with tempfile.TemporaryDirectory(prefix="fiber-bench-", dir=args.dir) as tmp:
+            path = Path(tmp) / "fiber.db"
+            _seed(path, services, _SEED_DAYS)
+            r = _run(build(path), services, args.seconds, args.readers, writer)
+        print(f"{name:8} {r['reads']:>7.0f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['max_ms']:>8.1f} {r['locked']:>7.0f} {r['writes_per_s']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()